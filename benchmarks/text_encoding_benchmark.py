@@ -0,0 +1,138 @@
+"""Benchmark the character encoding validation of large text files.
+
+A text file of the given size is generated in a temporary directory and
+validated with TextEncodingExtractor without the read limit. The time of
+scanning the decoded chunks for forbidden characters is compared with the
+previous implementation, which searched each forbidden character
+separately. With ``--workers``, validating the file in parallel worker
+processes is timed as well.
+
+Run from the root of the repository, e.g.::
+
+    python -m benchmarks.text_encoding_benchmark --size 500 \\
+        --charset ISO-8859-15
+"""
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from file_scraper.textfile.textfile_extractor import (
+    _FORBIDDEN,
+    _FORBIDDEN_ISO_8859_15,
+    TextEncodingExtractor,
+)
+from file_scraper.utils import iter_utf_bytes
+
+LINE = "Lorem ipsum dolor sit amet, consectetur adipiscing elit; {}\n"
+NON_ASCII = {
+    "UTF-8": "äöå €",
+    "UTF-16": "äöå €",
+    "ISO-8859-15": "äöå €",
+}
+
+
+def generate_file(path: Path, size_mb: int, charset: str) -> None:
+    """Write a text file of approximately the given size.
+
+    :param path: Path of the file
+    :param size_mb: Size of the file in megabytes
+    :param charset: Character encoding of the file
+    """
+    block = "".join(
+        LINE.format(NON_ASCII[charset] if i % 10 == 0 else i)
+        for i in range(10000)
+    ).encode(charset)
+    if charset == "UTF-16":
+        # Write the byte order mark only once
+        block = block[2:]
+    with open(path, "wb") as outfile:
+        if charset == "UTF-16":
+            outfile.write("﻿".encode("UTF-16")[:2])
+        for _ in range(size_mb * 1024 ** 2 // len(block) + 1):
+            outfile.write(block)
+
+
+def legacy_scan(path: Path, charset: str) -> float:
+    """Decode the file and search each forbidden character separately.
+
+    :param path: Path of the file
+    :param charset: Character encoding of the file
+    :returns: Elapsed time in seconds
+    """
+    forbidden = (_FORBIDDEN_ISO_8859_15 if charset == "ISO-8859-15"
+                 else _FORBIDDEN)
+    start = time.perf_counter()
+    with open(path, "rb") as infile:
+        for chunk in iter_utf_bytes(
+                infile, TextEncodingExtractor._chunksize, charset):
+            decoded_chunk = chunk.decode(charset)
+            for forb_char in forbidden:
+                decoded_chunk.find(forb_char)
+    return time.perf_counter() - start
+
+
+def extractor_scan(
+    path: Path, charset: str, workers: int | None = None
+) -> float:
+    """Validate the file with TextEncodingExtractor.
+
+    :param path: Path of the file
+    :param charset: Character encoding of the file
+    :param workers: Number of worker processes, or None for validating
+        the file in this process
+    :returns: Elapsed time in seconds
+    """
+    extractor = TextEncodingExtractor(
+        filename=path, mimetype="text/plain", charset=charset,
+        params={"text_encoding_workers": workers}
+    )
+    start = time.perf_counter()
+    extractor.extract()
+    elapsed = time.perf_counter() - start
+    if extractor.errors():
+        raise RuntimeError(f"Validation failed: {extractor.errors()}")
+    return elapsed
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--size", type=int, default=300,
+                        help="Size of the generated file in MB")
+    parser.add_argument("--charset", default="UTF-8",
+                        choices=sorted(NON_ASCII))
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="Number of timed runs, the best is reported")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Number of worker processes to compare with")
+    args = parser.parse_args()
+
+    # Validate the whole file
+    TextEncodingExtractor._limit = 0
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = Path(temp_dir) / "benchmark.txt"
+        generate_file(path, args.size, args.charset)
+        size_mb = path.stat().st_size / 1024 ** 2
+        print(f"{size_mb:.0f} MB {args.charset} text file")
+
+        runs = [("per-character find", legacy_scan),
+                ("TextEncodingExtractor", extractor_scan)]
+        if args.workers:
+            runs.append((
+                f"{args.workers} worker processes",
+                lambda path, charset: extractor_scan(
+                    path, charset, args.workers)
+            ))
+        for name, func in runs:
+            elapsed = min(func(path, args.charset)
+                          for _ in range(args.repeat))
+            print(f"{name:>24}: {elapsed:6.2f} s, "
+                  f"{size_mb / elapsed:7.1f} MB/s")
+
+
+if __name__ == "__main__":
+    main()
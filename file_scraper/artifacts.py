@@ -0,0 +1,138 @@
+"""Artifacts of a file shared by the extractors of a single scraping.
+
+Some extractors need the same expensive intermediate result of the file,
+e.g. the parsed XML tree. Instead of each of them parsing the file, the
+first extractor needing an artifact creates it into the
+:class:`ArtifactStore` of the scraping, and the other extractors read it
+from there.
+
+Each extractor declares the names of the artifacts it uses in
+``BaseExtractor._artifacts``. The store counts the extractors expecting
+each artifact and drops the artifact when the last of them has finished,
+so that a large artifact is kept in memory only as long as it is needed.
+"""
+from __future__ import annotations
+
+import threading
+from collections import Counter
+from collections.abc import Callable, Iterable
+from pathlib import Path
+from typing import Any, TypeVar
+
+from lxml import etree
+
+T = TypeVar("T")
+
+# Name of the XML tree parsed without recovering from errors, see
+# parse_xml
+XML_TREE = "xml_tree"
+
+
+class _Artifact:
+    """Artifact created once, also when requested concurrently."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._created = False
+        self._value: Any = None
+        self._exception: Exception | None = None
+
+    def get(self, factory: Callable[[], T]) -> T:
+        """
+        Return the artifact, creating it on the first call.
+
+        :param factory: Function creating the artifact
+        :returns: The artifact
+        :raises: The exception raised when creating the artifact
+        """
+        with self._lock:
+            if not self._created:
+                try:
+                    self._value = factory()
+                except Exception as exception:  # pylint: disable=broad-except
+                    self._exception = exception
+                self._created = True
+        if self._exception is not None:
+            raise self._exception
+        return self._value
+
+
+class ArtifactStore:
+    """Artifacts of a file shared by the extractors of a scraping."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._users: Counter[str] = Counter()
+        self._artifacts: dict[str, _Artifact] = {}
+
+    def expect(self, names: Iterable[str]) -> None:
+        """
+        Register an extractor using the given artifacts.
+
+        :param names: Names of the artifacts
+        """
+        with self._lock:
+            self._users.update(names)
+
+    def release(self, names: Iterable[str]) -> None:
+        """
+        Unregister a finished extractor.
+
+        An artifact is dropped when no registered extractor needs it.
+
+        :param names: Names of the artifacts used by the extractor
+        """
+        with self._lock:
+            for name in names:
+                self._users[name] -= 1
+                if self._users[name] <= 0:
+                    del self._users[name]
+                    self._artifacts.pop(name, None)
+
+    def get(self, name: str, factory: Callable[[], T]) -> T:
+        """
+        Return an artifact, creating it if it does not exist yet.
+
+        An exception raised by the factory is stored as well, and raised
+        to every extractor requesting the artifact. An artifact which no
+        registered extractor expects is not stored.
+
+        :param name: Name of the artifact
+        :param factory: Function creating the artifact
+        :returns: The artifact
+        """
+        with self._lock:
+            if name not in self._users:
+                artifact = None
+            else:
+                artifact = self._artifacts.setdefault(name, _Artifact())
+        if artifact is None:
+            return factory()
+        return artifact.get(factory)
+
+    def __contains__(self, name: str) -> bool:
+        with self._lock:
+            return name in self._artifacts
+
+
+def parse_xml(path: Path) -> etree._ElementTree:
+    """
+    Parse an XML file without recovering from errors.
+
+    DTDs and external entities are not loaded, and the network is not
+    accessed.
+
+    :param path: Path to the file
+    :returns: Parsed document
+    :raises etree.XMLSyntaxError: If the document is not well-formed
+    :raises OSError: If the file can not be read, or it has invalid
+        bytes in its character encoding
+    """
+    parser = etree.XMLParser(
+        dtd_validation=False,
+        no_network=True,
+        resolve_entities=False,
+        recover=False,
+    )
+    with open(path, "rb") as file_:
+        return etree.parse(file_, parser)
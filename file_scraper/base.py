@@ -3,17 +3,21 @@
 from __future__ import annotations
 
 import abc
+import asyncio
 from typing import TYPE_CHECKING, Any, Generic, Literal, TypeVar, cast, final
 
 from file_scraper.defaults import UNAP, UNAV
 from file_scraper.exceptions import SkipElementException
+from file_scraper.probe import FileProbe
 from file_scraper.utils import filter_unwanted_chars
 
 if TYPE_CHECKING:
     from collections.abc import Callable, Iterator
     from pathlib import Path
 
+    from file_scraper.artifacts import ArtifactStore
     from file_scraper.metadata import MetadataMethod
+    from file_scraper.streaming import StreamConsumer
 
 
 class BaseApparatus(metaclass=abc.ABCMeta):
@@ -51,11 +55,16 @@ class BaseApparatus(metaclass=abc.ABCMeta):
             if message
         ]
 
+    @classmethod
     @abc.abstractmethod
-    def tools(self) -> dict[str, dict[str, Any]]:
+    def tools(cls) -> dict[str, dict[str, Any]]:
         """Return information about the software used by the extractor or
         detector.
 
+        The tools do not depend on the scraped file, so that the current
+        versions of the tools can be resolved without scraping a file,
+        e.g. by :class:`file_scraper.cache.ResultCache`.
+
         :returns: Dictionary where each key is the name of the software tool,
             and each value is another dictionary containing details about the
             tool (e.g. version). If no tools are available, an empty
@@ -205,6 +214,7 @@ class BaseMeta:
 
 
 AnyMeta = TypeVar("AnyMeta", bound=BaseMeta)
+T = TypeVar("T")
 
 
 class BaseExtractor(BaseApparatus, Generic[AnyMeta]):
@@ -213,10 +223,20 @@ class BaseExtractor(BaseApparatus, Generic[AnyMeta]):
     _supported_metadata: list[type[AnyMeta]] = []
     _only_wellformed = False
 
+    # Set to True in extractors whose is_supported result depends on the
+    # extra parameters. Support of other extractors is resolved only once
+    # per file format, see file_scraper.iterator.extractor_plan.
+    _support_depends_on_params: bool = False
+
     _allow_unav_mime: bool = False
     _allow_unav_version: bool = False
     _allow_unap_version: bool = False
 
+    # Names of the artifacts of the file shared with the other extractors,
+    # see file_scraper.artifacts
+    _artifacts: tuple[str, ...] = ()
+    _artifact_store: ArtifactStore | None = None
+
     def __init__(
         self,
         filename: Path,
@@ -356,14 +376,87 @@ class BaseExtractor(BaseApparatus, Generic[AnyMeta]):
             ):
                 yield md_class(**kwargs)
 
+    def stream_consumer(self) -> StreamConsumer | None:
+        """
+        Return a consumer reading the file in a pass shared by extractors.
+
+        Extractors which read the whole file in Python can get the file
+        contents from a single pass over the file, see
+        :func:`file_scraper.streaming.stream_file`. If the consumer is
+        finished before :meth:`extract` is called, the extractor uses the
+        results of the consumer instead of reading the file again.
+
+        :returns: Consumer of the file contents, or None if the extractor
+            reads the file by itself
+        """
+        return None
+
+    def use_artifacts(self, store: ArtifactStore) -> None:
+        """
+        Share the artifacts of the file with the other extractors.
+
+        The artifacts used by the extractor are kept in the store until
+        the extractor has been run.
+
+        :param store: Artifacts of the scraping
+        """
+        self._artifact_store = store
+        store.expect(self._artifacts)
+
+    def _artifact(self, name: str, factory: Callable[[], T]) -> T:
+        """
+        Return an artifact of the file.
+
+        :param name: Name of the artifact, listed in :attr:`_artifacts`
+        :param factory: Function creating the artifact, if no other
+            extractor has created it yet
+        :returns: The artifact
+        """
+        if self._artifact_store is None:
+            return factory()
+        return self._artifact_store.get(name, factory)
+
     @abc.abstractmethod
     def _extract(self):
         """Implemented in subclasses."""
 
+    async def _aextract(self) -> None:
+        """
+        Asynchronous version of :meth:`_extract`.
+
+        By default, :meth:`_extract` is run in a separate thread. Extractors
+        running 3rd party tools override this to run the tools with
+        :class:`file_scraper.shell.AsyncShell`, so that no thread is
+        blocked while the tools are running.
+        """
+        await asyncio.to_thread(self._extract)
+
     @final
     def extract(self):
         """Extract and validate the results found"""
-        self._extract()
+        try:
+            self._extract()
+        finally:
+            self._release_artifacts()
+        self._finish()
+
+    @final
+    async def aextract(self) -> None:
+        """Asynchronous version of :meth:`extract`."""
+        try:
+            await self._aextract()
+        finally:
+            self._release_artifacts()
+        self._finish()
+
+    def _release_artifacts(self) -> None:
+        """Release the artifacts used by the extractor."""
+        if self._artifact_store is not None:
+            self._artifact_store.release(self._artifacts)
+            self._artifact_store = None
+
+    def _finish(self) -> None:
+        """Validate the results found."""
         self._validate()
         self._messages.append(
             f"The file was analyzed with {self.__class__.__name__}."
@@ -376,15 +469,26 @@ class BaseDetector(BaseApparatus):
     def __init__(
         self,
         filename: Path,
+        probe: FileProbe | None = None,
     ) -> None:
         """Initialize detector.
 
         :param filename: Path to the identified file
+        :param probe: Head and tail of the file shared by the detectors.
+            A new probe is created if not given.
         """
         super().__init__(filename)
 
         self._mimetype = None  # Identified mimetype
         self.version = None  # Identified file version
+        self._probe = probe
+
+    @property
+    def probe(self) -> FileProbe:
+        """Return the head and tail of the file."""
+        if self._probe is None:
+            self._probe = FileProbe(self.filename)
+        return self._probe
 
     @property
     def well_formed(self) -> Literal[False] | None:
@@ -0,0 +1,149 @@
+"""Scrape batches of files using a pool of worker processes."""
+from __future__ import annotations
+
+import os
+from collections.abc import Iterable, Iterator
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ProcessPoolExecutor,
+    wait,
+)
+from typing import Any
+
+from file_scraper.logger import LOGGER
+from file_scraper.scraper import Scraper, ScraperResults
+
+
+def _scrape_file(
+    path: str | os.PathLike,
+    check_wellformed: bool,
+    kwargs: dict[str, Any],
+) -> ScraperResults:
+    """Scrape a single file in a worker process.
+
+    :param path: Path to the file
+    :param check_wellformed: True for the full well-formed check, False
+        for just identification and metadata scraping
+    :param kwargs: Extra arguments for the Scraper
+    :returns: Scraper results of the file
+    """
+    return Scraper(path, **kwargs).scrape(check_wellformed=check_wellformed)
+
+
+class BatchScraper:
+    """Scrape multiple files in parallel using worker processes.
+
+    The worker processes are started when the first batch is scraped and
+    they are kept alive until the BatchScraper is closed. Therefore the
+    modules and the cached data loaded by the scrapers (e.g. Fido format
+    definitions) are reused between the files and the batches.
+
+    The BatchScraper can be used as a context manager::
+
+        with BatchScraper(workers=8) as batch:
+            for results in batch.scrape_many(paths):
+                ...
+    """
+
+    def __init__(self, workers: int | None = None) -> None:
+        """Initialize batch scraper.
+
+        :param workers: Number of worker processes. By default, the
+            number of CPUs is used.
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self._executor: ProcessPoolExecutor | None = None
+
+    def __enter__(self) -> BatchScraper:
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    @property
+    def executor(self) -> ProcessPoolExecutor:
+        """Return the process pool, starting it if necessary."""
+        if self._executor is None:
+            LOGGER.debug(
+                "Starting process pool with %d workers", self.workers
+            )
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        return self._executor
+
+    def close(self) -> None:
+        """Shut down the worker processes."""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def scrape_many(
+        self,
+        paths: Iterable[str | os.PathLike],
+        check_wellformed: bool = True,
+        **kwargs: Any,
+    ) -> Iterator[ScraperResults]:
+        """Scrape given files and yield the results as they are finished.
+
+        The results are yielded in the order the files are finished, not
+        in the order of the given paths. The ``path`` member of the
+        results can be used to match the results with the files.
+
+        At most two files per worker are submitted to the pool at the
+        same time, so the paths can be a lazy iterable of any length.
+
+        :param paths: Paths of the files to scrape
+        :param check_wellformed: True for the full well-formed check,
+            False for just identification and metadata scraping
+        :param kwargs: Extra arguments for the Scraper. The same arguments
+            are used for all files.
+        :returns: Iterator of scraper results
+        :raises: Any exception raised by Scraper for a file is raised
+            when the results of the file would be yielded.
+        """
+        executor = self.executor
+        paths = iter(paths)
+        pending: set[Future] = set()
+        max_pending = 2 * self.workers
+
+        while True:
+            for path in paths:
+                pending.add(executor.submit(
+                    _scrape_file, path, check_wellformed, kwargs
+                ))
+                if len(pending) >= max_pending:
+                    break
+            if not pending:
+                return
+
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+
+
+def scrape_many(
+    paths: Iterable[str | os.PathLike],
+    workers: int | None = None,
+    check_wellformed: bool = True,
+    **kwargs: Any,
+) -> Iterator[ScraperResults]:
+    """Scrape given files in parallel using worker processes.
+
+    This is a shorthand for scraping a single batch with
+    :class:`BatchScraper`. The worker processes are shut down when all
+    results have been yielded. Use BatchScraper directly to reuse the
+    workers for multiple batches.
+
+    :param paths: Paths of the files to scrape
+    :param workers: Number of worker processes. By default, the number
+        of CPUs is used.
+    :param check_wellformed: True for the full well-formed check, False
+        for just identification and metadata scraping
+    :param kwargs: Extra arguments for the Scraper
+    :returns: Iterator of scraper results in the order the files are
+        finished
+    """
+    with BatchScraper(workers=workers) as batch:
+        yield from batch.scrape_many(
+            paths, check_wellformed=check_wellformed, **kwargs
+        )
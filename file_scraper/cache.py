@@ -0,0 +1,354 @@
+"""Persistent cache of scraper results.
+
+The results are stored in an SQLite database and keyed by the content of
+the scraped file, the scraper parameters, the content of the files given
+in the parameters and the file-scraper version. The
+versions of the 3rd party tools used to produce the results are stored
+with the results, so that the results can be invalidated when the tools
+are upgraded.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from contextlib import closing
+from typing import TYPE_CHECKING, Any
+
+from file_scraper import __version__
+from file_scraper.base import BaseApparatus
+from file_scraper.logger import LOGGER
+from file_scraper.utils import hexdigest
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from pathlib import Path
+
+    from file_scraper.scraper import ScraperResults
+
+DEFAULT_CACHE_PATH = "~/.file-scraper/result-cache"
+DEFAULT_MAX_SIZE = 1024**3
+
+# Parameters giving paths to files used in scraping. catalog_path may
+# contain several paths separated by colons.
+FILE_PARAMS = ("schema", "schematron", "catalog_path")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    key TEXT PRIMARY KEY,
+    results TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    accessed REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS tools (
+    key TEXT NOT NULL REFERENCES results(key) ON DELETE CASCADE,
+    name TEXT NOT NULL,
+    version TEXT,
+    PRIMARY KEY (key, name)
+);
+CREATE INDEX IF NOT EXISTS results_accessed ON results(accessed);
+CREATE INDEX IF NOT EXISTS tools_name ON tools(name);
+"""
+
+
+class ResultCache:
+    """Content-addressed on-disk cache of scraper results.
+
+    The cache can be given to :meth:`file_scraper.scraper.Scraper.scrape`,
+    which returns the cached results instead of running the detectors and
+    extractors, if the same file has already been scraped with the same
+    parameters.
+
+    The least recently used results are evicted when the total size of the
+    cached results exceeds the given maximum size. The results produced
+    with an old version of a 3rd party tool can be removed with
+    :meth:`invalidate`. Additionally, cached results are ignored if they
+    were produced with a different version of a tool than the current
+    version resolved by the detector or extractor that used the tool.
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike | None = None,
+        max_size: int = DEFAULT_MAX_SIZE,
+    ) -> None:
+        """Initialize the cache.
+
+        :param path: Directory of the cache database. Defaults to
+            ``~/.file-scraper/result-cache``.
+        :param max_size: Maximum total size of the cached results in bytes
+        """
+        self.path = os.path.expanduser(path or DEFAULT_CACHE_PATH)
+        self.max_size = max_size
+        self._database = os.path.join(self.path, "results.sqlite")
+
+        os.makedirs(self.path, exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+
+    def _connect(self) -> closing[sqlite3.Connection]:
+        """Open a connection to the cache database.
+
+        A new connection is opened for each operation, so that the cache
+        can be shared between threads and processes.
+        """
+        conn = sqlite3.connect(self._database, timeout=60)
+        conn.execute("PRAGMA foreign_keys = ON")
+        return closing(conn)
+
+    @staticmethod
+    def key(
+        path: str | Path,
+        check_wellformed: bool,
+        params: dict[str, Any],
+    ) -> str:
+        """Return the cache key of a file.
+
+        The key includes the digests of the files given in the parameters,
+        such as the schema, so that the results are not reused after the
+        files have been changed.
+
+        :param path: Path to the file
+        :param check_wellformed: True for the full well-formed check,
+            False for just identification and metadata scraping
+        :param params: Extra parameters given to the Scraper
+        :returns: Cache key
+        """
+        key = {
+            "content": hexdigest(path, "sha256"),
+            "check_wellformed": check_wellformed,
+            "params": params,
+            "param_files": _param_file_digests(params),
+            "file-scraper": __version__,
+        }
+        return hashlib.sha256(
+            json.dumps(key, sort_keys=True, default=str).encode("utf-8")
+        ).hexdigest()
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        """Return cached results.
+
+        :param key: Cache key, see :meth:`key`
+        :returns: Cached results as a dict with the members of
+            ScraperResults, or None if the results are not found or they
+            were produced with an outdated tool.
+        """
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT results FROM results WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+
+        results = _decode_results(row[0])
+        outdated = _outdated_tool(results["info"])
+        with self._connect() as conn, conn:
+            if outdated is not None:
+                LOGGER.info(
+                    "Cached results were produced with %s %s instead of "
+                    "%s, discarding", *outdated
+                )
+                conn.execute("DELETE FROM results WHERE key = ?", (key,))
+                return None
+
+            conn.execute(
+                "UPDATE results SET accessed = ? WHERE key = ?",
+                (time.time(), key)
+            )
+
+        return results
+
+    def put(self, key: str, results: ScraperResults) -> None:
+        """Store results to the cache.
+
+        :param key: Cache key, see :meth:`key`
+        :param results: Scraper results
+        """
+        tools = dict(_iter_tools(results.info))
+
+        encoded = json.dumps(results._asdict(), default=str)
+        with self._connect() as conn, conn:
+            conn.execute("DELETE FROM results WHERE key = ?", (key,))
+            conn.execute(
+                "INSERT INTO results VALUES (?, ?, ?, ?)",
+                (key, encoded, len(encoded), time.time())
+            )
+            conn.executemany(
+                "INSERT INTO tools VALUES (?, ?, ?)",
+                [(key, name, version) for name, version in tools.items()]
+            )
+        self._evict()
+
+    def _evict(self) -> None:
+        """Remove least recently used results until the cache fits in the
+        maximum size."""
+        with self._connect() as conn, conn:
+            total = conn.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM results"
+            ).fetchone()[0]
+            if total <= self.max_size:
+                return
+
+            evicted = []
+            for key, size in conn.execute(
+                    "SELECT key, size FROM results ORDER BY accessed"):
+                if total <= self.max_size:
+                    break
+                evicted.append((key,))
+                total -= size
+            conn.executemany("DELETE FROM results WHERE key = ?", evicted)
+            LOGGER.debug("Evicted %d results from cache", len(evicted))
+
+    def invalidate(
+        self,
+        tool: str | None = None,
+        version: str | None = None,
+    ) -> int:
+        """Remove results from the cache.
+
+        :param tool: Name of a tool, as reported in the tool info of the
+            results. If given, only the results produced with this tool
+            are removed. Otherwise all results are removed.
+        :param version: Current version of the tool. If given, only the
+            results produced with another version of the tool are removed.
+        :returns: Number of removed results
+        """
+        with self._connect() as conn, conn:
+            if tool is None:
+                cursor = conn.execute("DELETE FROM results")
+            elif version is None:
+                cursor = conn.execute(
+                    "DELETE FROM results WHERE key IN "
+                    "(SELECT key FROM tools WHERE name = ?)", (tool,)
+                )
+            else:
+                cursor = conn.execute(
+                    "DELETE FROM results WHERE key IN "
+                    "(SELECT key FROM tools WHERE name = ? "
+                    "AND version IS NOT ?)", (tool, version)
+                )
+            return cursor.rowcount
+
+
+def _param_file_digests(params: dict[str, Any]) -> dict[str, list]:
+    """Return the digests of the files given in the scraper parameters.
+
+    :param params: Extra parameters given to the Scraper
+    :returns: SHA-256 digests of the files by the parameter names. The
+        digest is None for a file that can not be read.
+    """
+    digests = {}
+    for name in FILE_PARAMS:
+        value = params.get(name)
+        if not value:
+            continue
+        paths = str(value).split(":") if name == "catalog_path" else [value]
+        digests[name] = [_file_digest(path) for path in paths]
+    return digests
+
+
+def _file_digest(path: str | os.PathLike) -> str | None:
+    """Return the SHA-256 digest of a file.
+
+    :param path: Path to the file
+    :returns: Digest, or None if the file can not be read
+    """
+    try:
+        return hexdigest(path, "sha256")
+    except OSError:
+        return None
+
+
+def _iter_tools(info: dict[int, dict]) -> Iterator[tuple[str, str | None]]:
+    """Iterate names and versions of the tools in the scraper info.
+
+    :param info: Info dict of scraper results
+    :returns: Iterator of (name, version) tuples
+    """
+    for item in info.values():
+        yield from _iter_versions(item.get("tools", {}))
+
+
+def _iter_versions(
+    tools: dict[str, dict],
+) -> Iterator[tuple[str, str | None]]:
+    """Iterate names and versions of tools.
+
+    :param tools: Tools as returned by the tools() of a detector or
+        extractor
+    :returns: Iterator of (name, version) tuples
+    """
+    for name, details in tools.items():
+        version = details.get("version")
+        yield name, None if version is None else str(version)
+
+
+def _outdated_tool(
+    info: dict[int, dict],
+) -> tuple[str, str | None, str | None] | None:
+    """Find a tool whose version differs from the current version.
+
+    The current versions are resolved with the tools() class method of
+    the detector or extractor named in each info item, i.e. from the
+    per-process registry of :mod:`file_scraper.tool_versions`. A tool or a
+    class that is not known any more is reported as outdated.
+
+    :param info: Info dict of cached scraper results
+    :returns: Tuple (name, cached version, current version) of the first
+        outdated tool, or None if all the tools are up to date
+    :raises Exception: Errors raised by resolving the current versions,
+        e.g. if a tool can not be run
+    """
+    for item in info.values():
+        cached = dict(_iter_versions(item.get("tools", {})))
+        if not cached:
+            continue
+        try:
+            cls = _apparatus_classes()[item["class"]]
+        except KeyError:
+            LOGGER.info("Cached results were produced with %s, which is "
+                        "not used any more", item["class"])
+            current = {}
+        else:
+            current = dict(_iter_versions(cls.tools()))
+        for name, version in cached.items():
+            if name not in current or current[name] != version:
+                return name, version, current.get(name)
+    return None
+
+
+def _apparatus_classes() -> dict[str, type[BaseApparatus]]:
+    """Return the detector and extractor classes by their names.
+
+    :returns: Dictionary of classes
+    """
+    # Importing the scraper imports all the detectors and extractors
+    # pylint: disable=import-outside-toplevel,unused-import
+    import file_scraper.scraper  # noqa: F401
+
+    classes = {}
+    pending: list[type[BaseApparatus]] = [BaseApparatus]
+    while pending:
+        cls = pending.pop()
+        classes.setdefault(cls.__name__, cls)
+        pending.extend(cls.__subclasses__())
+    return classes
+
+
+def _decode_results(encoded: str) -> dict[str, Any]:
+    """Decode results stored in the cache.
+
+    JSON does not support integer keys, so the stream and info indexes
+    are converted back to integers.
+
+    :param encoded: Results encoded as JSON
+    :returns: Results as a dict with the members of ScraperResults
+    """
+    results = json.loads(encoded)
+    for member in ("streams", "info"):
+        results[member] = {
+            int(index): value for index, value in results[member].items()
+        }
+    return results
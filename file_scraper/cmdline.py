@@ -4,17 +4,19 @@ Command line interface for file-scraper
 
 import json
 import logging
+from typing import NoReturn
+
 import click
 
 from file_scraper.logger import LOGGER, enable_logging
 from file_scraper.schematron.schematron_scraper import SchematronScraper
-from file_scraper.scraper import Scraper
-from file_scraper.exceptions import (
-    FileIsNotScrapable,
-    DirectoryIsNotScrapable,
-    FileNotFoundIsNotScrapable,
-    InvalidMimetype,
-    InvalidVersionForMimetype,
+from file_scraper.server import (
+    DEFAULT_WORKERS,
+    RequestError,
+    ScraperClient,
+    ScraperServer,
+    detect_file_results,
+    scrape_file_results,
 )
 from file_scraper.utils import ensure_text
 
@@ -34,6 +36,16 @@ _verbose_option = click.option(
     )
 )
 
+_server_option = click.option(
+    "--server",
+    type=click.Path(dir_okay=False),
+    default=None,
+    help=(
+        "Send the request to a scraper server listening to the given Unix "
+        "socket instead of scraping the file in this process."
+    )
+)
+
 
 @click.group()
 @click.version_option(prog_name="file-scraper")
@@ -65,14 +77,25 @@ def cli():
 @click.option("--separator",
               help="Specify the separator (line terminator) in CSV files.")
 @click.option("--quotechar", help="Specify the quote character in CSV files.")
+@click.option("--csv-workers", type=int,
+              help="Parse CSV files using the given number of worker "
+                   "processes.")
 @click.option("--schema", help="Specify the schema file for XML files.")
 @click.option("--catalog-path",
               help="Specify the catalog environment for XML files.")
+@click.option("--xml-in-process", default=None, flag_value=True,
+              help="Validate XML files against their schemas in-process "
+                   "instead of running xmllint.")
+@click.option("--text-encoding-workers", type=int,
+              help="Validate the encoding of the whole text file using the "
+                   "given number of worker processes.")
+@_server_option
 @_verbose_option
 def scrape_file(
         filename, check_wellformed, tool_info, mimetype, version,
-        verbose, charset, delimiter, fields, separator, quotechar, schema,
-        catalog_path):
+        verbose, charset, delimiter, fields, separator, quotechar,
+        csv_workers, schema, catalog_path, xml_in_process,
+        text_encoding_workers, server):
     """
     Identify file type, collect metadata, and optionally check well-formedness.
     \f
@@ -83,6 +106,7 @@ def scrape_file(
                 party tools
     :mimetype: Specified mimetype for the scraped file
     :version: Specified version for the scraped file
+    :server: Socket of a scraper server used for scraping the file
     """
 
     # Enable logging. If flag is provided an additional number of times,
@@ -92,87 +116,85 @@ def scrape_file(
     option_args = {"charset": charset, "delimiter": delimiter,
                    "fields": fields,
                    "separator": separator, "quotechar": quotechar,
-                   "schema": schema, "catalog_path": catalog_path}
+                   "csv_workers": csv_workers,
+                   "schema": schema, "catalog_path": catalog_path,
+                   "xml_in_process": xml_in_process,
+                   "text_encoding_workers": text_encoding_workers}
 
     option_args = {k: v for k, v in option_args.items() if v is not None}
 
     LOGGER.info("Additional scraper args provided: %s", option_args)
     try:
-        scraper = Scraper(filename, mimetype=mimetype, version=version,
-                          **option_args)
-
-    except (FileIsNotScrapable,
-            DirectoryIsNotScrapable,
-            FileNotFoundIsNotScrapable) as error:
-        raise click.BadParameter(error, param_hint="FILENAME")
-    except InvalidMimetype as error:
-        raise click.BadOptionUsage("--mimetype", error)
-    except InvalidVersionForMimetype as error:
-        raise click.BadOptionUsage("--version", error)
-    except ValueError:
-        LOGGER.error("Unhandled ValueError encountered")
-        raise
-
-    scraper.scrape(check_wellformed=check_wellformed)
-    results = _collect_scraper_results(
-        scraper,
-        check_wellformed,
-        tool_info
-    )
+        if server:
+            with _connect(server) as client:
+                results = client.scrape(
+                    filename, check_wellformed=check_wellformed,
+                    tool_info=tool_info, mimetype=mimetype, version=version,
+                    params=option_args
+                )
+        else:
+            results = scrape_file_results(
+                filename, check_wellformed=check_wellformed,
+                tool_info=tool_info, mimetype=mimetype, version=version,
+                params=option_args
+            )
+    except RequestError as error:
+        _raise_click_error(error)
     click.echo(json.dumps(results, indent=4))
 
 
-def _collect_scraper_results(
-    scraper: Scraper,
-    check_wellformed: bool,
-    tool_info: bool
-):
-    results = {
-        "path": str(scraper.input_path),
-        "MIME type": ensure_text(scraper.mimetype),
-        "version": ensure_text(scraper.version),
-        "metadata": scraper.streams,
-        "grade": scraper.grade()
-    }
-    if check_wellformed:
-        results["well-formed"] = scraper.well_formed
-    if tool_info:
-        results["tool_info"] = scraper.info
+def _connect(server: str) -> ScraperClient:
+    """Connect to a scraper server.
 
-    errors = {}
+    :param server: Path of the Unix socket of the server
+    :returns: Client connected to the server
+    """
+    try:
+        return ScraperClient(server)
+    except OSError as error:
+        raise click.ClickException(
+            f"Could not connect to the scraper server at {server}: {error}"
+        )
 
-    for item in scraper.info.values():
-        if "ExtractorNotFound" in item["class"]:
-            raise click.ClickException(
-                f"None of the extractors supported the detected (or inputted) "
-                f"mimetype: {scraper.mimetype}. "
-                f"The file was not analyzed."
-            )
-        if item["errors"]:
-            errors[item["class"]] = item["errors"]
-    if errors:
-        results["errors"] = errors
-    return results
+
+def _raise_click_error(error: RequestError) -> NoReturn:
+    """Raise the click exception corresponding to a failed request.
+
+    :param error: Error raised by the request
+    """
+    if error.param == "FILENAME":
+        raise click.BadParameter(str(error), param_hint="FILENAME")
+    if error.param is not None:
+        raise click.BadOptionUsage(error.param, str(error))
+    raise click.ClickException(str(error))
 
 
 @cli.command("check-xml-schematron-features")
-@click.argument("filename", type=click.Path(exists=True))
+@click.argument("filenames", nargs=-1, required=True,
+                type=click.Path(exists=True))
 @click.option("--schema", help="Specify the schema file for XML files.")
-@click.option("--schematron", required=True,
-              help="Specify the schematron file for XML schematron checks.")
+@click.option("--schematron", "schematrons", required=True, multiple=True,
+              help="Specify the schematron file for XML schematron checks. "
+                   "Can be given several times.")
 @click.option("--schematron-verbose", type=click.BOOL,
               help="Specify the verboseness for XML schematron checks")
 @click.option("--cache", type=click.BOOL,
               help="Specify caching for XML schematron checks.")
+@click.option("--cache-dir", type=click.Path(file_okay=False),
+              help="Directory of the compiled schematron files.")
 @click.option("--catalog-path",
               help="Specify the catalog environment for XML files.")
 @click.option("--extra-hash",
               help="Hash of related abstract patterns for XML schematron "
                    "checks.")
+@click.option("--xml-in-process", default=None, flag_value=True,
+              help="Compile and apply the schematron in-process instead of "
+                   "running xsltproc.")
 @_verbose_option
-def check_xml_schematron_features(filename, schema, schematron,
-                                  schematron_verbose, cache, catalog_path,
-                                  extra_hash, verbose):
+def check_xml_schematron_features(filenames, schema, schematrons,
+                                  schematron_verbose, cache, cache_dir,
+                                  catalog_path, extra_hash, xml_in_process,
+                                  verbose):
 
     # Enable logging. If flag is provided an additional number of times,
     # default to the highest possible verbosity.
@@ -180,24 +202,42 @@ def check_xml_schematron_features(filename, schema, schematron,
 
     option_args = {
         "schema": schema,
-        "schematron": schematron,
         "verbose": schematron_verbose,
         "cache": cache,
+        "cache_dir": cache_dir,
         "catalog_path": catalog_path,
         "extra_hash": extra_hash,
+        "xml_in_process": xml_in_process,
     }
+    option_args = {k: v for k, v in option_args.items() if v is not None}
 
     LOGGER.info("Additional scraper args provided: %s", option_args)
 
-    schematron_scraper = SchematronScraper(filename, "text/xml",
-                                           params=option_args)
-    schematron_scraper.scrape_file()
+    # A single check prints the result as before, several checks print one
+    # result per line as soon as it is ready
+    batch = len(filenames) > 1 or len(schematrons) > 1
+    for schematron_scraper in SchematronScraper.scrape_many(
+            filenames, schematrons, params=option_args):
+        results = _schematron_results(schematron_scraper)
+        if batch:
+            click.echo(json.dumps(results))
+        else:
+            click.echo(json.dumps(results, indent=4))
+
 
+def _schematron_results(schematron_scraper: SchematronScraper) -> dict:
+    """
+    Return the results of a schematron check for printing.
+
+    :param schematron_scraper: Scraped schematron extractor
+    :returns: Results of the check
+    """
     schematron_meta = schematron_scraper.streams[0]
     metadata = schematron_meta.to_dict()
 
     results = {
         "path": str(schematron_scraper.filename),
+        "schematron": schematron_scraper.schematron,
         "MIME type": ensure_text(schematron_meta.mimetype()),
         "version": ensure_text(schematron_meta.version()),
         "metadata": metadata,
@@ -213,29 +253,58 @@ def check_xml_schematron_features(filename, schema, schematron,
     if errors:
         results["errors"] = errors
 
-    click.echo(json.dumps(results, indent=4))
+    return results
 
 
 @cli.command("detect-file")
 @click.argument("filename", type=click.Path())
+@_server_option
 @_verbose_option
-def detect_file(filename, verbose):
+def detect_file(filename, server, verbose):
 
     # Enable logging. If flag is provided an additional number of times,
     # default to the highest possible verbosity.
     enable_logging(NUM_TO_LOG_LEVEL.get(verbose, logging.DEBUG))
 
-    detect_scraper = Scraper(filename=filename)
-    mimetype, version = detect_scraper.detect_filetype()
-
-    results = {
-        "path": str(detect_scraper.input_path),
-        "MIME type": str(mimetype),
-        "version": str(version)
-    }
+    if server:
+        with _connect(server) as client:
+            try:
+                results = client.detect(filename)
+            except RequestError as error:
+                _raise_click_error(error)
+    else:
+        results = detect_file_results(filename)
 
     click.echo(json.dumps(results, indent=4))
 
 
+@cli.command("serve")
+@click.option("--socket", "socket_path", required=True,
+              type=click.Path(dir_okay=False),
+              help="Path of the Unix socket to listen to.")
+@click.option("--workers", default=DEFAULT_WORKERS, show_default=True,
+              type=click.IntRange(min=1),
+              help="Maximum number of files scraped concurrently.")
+@_verbose_option
+def serve(socket_path, workers, verbose):
+    """
+    Run a scraper server, which keeps the scrapers loaded and scrapes files
+    requested by clients over a Unix socket.
+    \f
+
+    :socket_path: Path of the Unix socket
+    :workers: Maximum number of files scraped concurrently
+    """
+    enable_logging(NUM_TO_LOG_LEVEL.get(verbose, logging.DEBUG))
+
+    with ScraperServer(socket_path, workers=workers) as server:
+        server.warm_up()
+        LOGGER.warning("Listening to %s", socket_path)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            LOGGER.warning("Stopping the server")
+
+
 if __name__ == "__main__":
     cli()
@@ -1,31 +1,117 @@
 """Extractor for CSV file formats."""
 from __future__ import annotations
 
+import codecs
 import csv
-from io import TextIOWrapper, open as io_open
+import itertools
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from io import BytesIO, StringIO, TextIOWrapper
+from pathlib import Path
+from typing import BinaryIO, NamedTuple
 
 from file_scraper.base import BaseExtractor
 from file_scraper.csv_extractor.csv_model import CsvMeta
 from file_scraper.logger import LOGGER
+from file_scraper.streaming import ThreadedConsumer, consume_file
+
+
+class _CsvFormat(NamedTuple):
+    """Format and the first line of a CSV file, None if not resolved."""
+    delimiter: str | None
+    separator: str | None
+    quotechar: str | None
+    first_line: list[str] | None
+
+
+class _CsvChunk(NamedTuple):
+    """Result of parsing a chunk of a CSV file in a worker process."""
+    lines: int
+    rows: int
+    field_counts: tuple[int, int] | None
+    first_row: list[str] | None
+    error: Exception | None
+
+
+# Encodings in which the quote character and the line feed are single
+# bytes, which are not part of any other character
+_BYTE_BOUNDARY_CHARSETS = {"ascii", "utf-8", "iso8859-15"}
 
 
 class CsvExtractor(BaseExtractor[CsvMeta]):
-    """Extractor for CSV files."""
+    """Extractor for CSV files.
+
+    If the ``csv_workers`` parameter is given, the file is split into
+    chunks at record boundaries, which are parsed in parallel using the
+    given number of worker processes. The number of records and fields is
+    then collected as well.
+    """
 
     _supported_metadata = [CsvMeta]
 
     _allow_unap_version = True
 
+    # Approximate size of the chunks parsed in the worker processes
+    _parallel_chunksize = 32*1024**2
+
+    _consumer: ThreadedConsumer[_CsvFormat] | None = None
+    _row_count: int | None = None
+    _field_counts: tuple[int, int] | None = None
+
     # Raise csv field size limit to 1 MB
     csv.field_size_limit(1048576)
     # pylint: disable=too-many-branches
 
+    @property
+    def _workers(self) -> int | None:
+        """Number of worker processes parsing the file, if any."""
+        return self._params.get("csv_workers", None)
+
+    def stream_consumer(self) -> ThreadedConsumer[_CsvFormat] | None:
+        """
+        Return a consumer parsing the streamed file.
+
+        :returns: Consumer of the file contents, or None if the file is
+            parsed in worker processes
+        """
+        if self._workers:
+            return None
+        if self._consumer is None:
+            self._consumer = ThreadedConsumer(self._parse_csv)
+        return self._consumer
+
     def _extract(self) -> None:
         """Scrape CSV file."""
         fields = self._params.get("fields", [])
+        if self._workers:
+            csv_format = self._parse_csv_in_parallel(self._workers)
+        else:
+            csv_format = consume_file(self.filename, self.stream_consumer())
+        delimiter, separator, quotechar, first_line = csv_format
+
+        self.streams = list(self.iterate_models(
+            well_formed=self.well_formed, params={
+                "delimiter": delimiter,
+                "separator": separator,
+                "quotechar": quotechar,
+                "fields": fields,
+                "first_line": first_line,
+                "row_count": self._row_count,
+                "field_counts": self._field_counts}))
+
+    def _parse_csv(self, infile: BinaryIO) -> _CsvFormat:
+        """
+        Parse the whole CSV file and record the errors found.
+
+        The file is read only once: the sample used for sniffing the CSV
+        format is parsed first, followed by the rest of the file.
 
+        :param infile: CSV file opened in binary mode
+        :returns: Format and the first line of the file
+        """
         # These are read later if the scraping process is successful
-        csvfile = None
         first_line = None
         delimiter = None
         separator = None
@@ -33,29 +119,23 @@ class CsvExtractor(BaseExtractor[CsvMeta]):
         reader = None
 
         try:
-            csvfile = self._open_csv_file(self._predefined_charset)
+            csvfile = TextIOWrapper(infile, encoding=self._predefined_charset)
 
-            delimiter, separator, quotechar = self._resolve_csv_format(csvfile)
+            sample = csvfile.read(100 * 1024)
+            delimiter, separator, quotechar = self._resolve_csv_format(sample)
 
-            csv.register_dialect(
-                "new_dialect",
-                delimiter=delimiter,
-                lineterminator=separator,
-                quotechar=quotechar,
-                strict=True,
-                doublequote=True)
+            dialect = _csv_dialect(delimiter, separator, quotechar)
 
-            csvfile.seek(0)
-            reader = csv.reader(csvfile, dialect="new_dialect")
+            # Complete the last line of the sample, so that the lines of
+            # the sample and the rest of the file are not mixed up.
+            sample += csvfile.readline()
+            reader = csv.reader(itertools.chain(StringIO(sample), csvfile),
+                                dialect=dialect)
 
             first_row = next(reader)
             first_line = first_row
 
-            if fields and len(fields) != len(first_line):
-                self._errors.append(
-                    "CSV not well-formed: field counts in the given "
-                    "header parameter and the CSV header don't match."
-                )
+            self._check_header(first_line)
 
             for _ in reader:
                 # Read the whole file in case it contains errors. If there
@@ -63,40 +143,147 @@ class CsvExtractor(BaseExtractor[CsvMeta]):
                 # recording an error
                 pass
 
-        except OSError as err:
-            self._errors.append("Error when reading the file: " +
-                                str(err))
-        except csv.Error as exception:
-            if reader is not None:
-                self._errors.append(
-                    f"CSV error on line {reader.line_num}: {exception}")
-            else:
-                self._errors.append(f"CSV error: {exception}")
-        except (UnicodeError,
+        except (OSError,
+                csv.Error,
+                UnicodeError,
                 StopIteration,
                 LookupError) as exception:
-            self._errors.append(f"Error reading file as CSV: {exception}")
+            self._errors.append(_csv_error_message(
+                exception, reader.line_num if reader is not None else None))
         else:
             self._messages.append("CSV file was checked successfully.")
-        finally:
-            if csvfile:
-                csvfile.close()
 
-        self.streams = list(self.iterate_models(
-            well_formed=self.well_formed, params={"delimiter": delimiter,
-                                                  "separator": separator,
-                                                  "quotechar": quotechar,
-                                                  "fields": fields,
-                                                  "first_line": first_line}))
+        return _CsvFormat(delimiter, separator, quotechar, first_line)
+
+    def _check_header(self, first_line: list[str]) -> None:
+        """
+        Check the first line against the header given as a parameter.
+
+        :param first_line: First line of the file
+        """
+        fields = self._params.get("fields", [])
+        if fields and len(fields) != len(first_line):
+            self._errors.append(
+                "CSV not well-formed: field counts in the given "
+                "header parameter and the CSV header don't match."
+            )
+
+    def _parse_csv_in_parallel(self, workers: int) -> _CsvFormat:
+        """
+        Parse the CSV file in chunks using worker processes.
+
+        The chunks end at line feeds outside quoted fields. If a chunk is
+        parsed without errors, it ended at a record boundary and the next
+        chunk starts at one. If a chunk other than the last one has an
+        error, the boundary may have been misplaced by a quote character
+        in an unquoted field, so the rest of the file is parsed from the
+        beginning of the chunk in this process. The results are therefore
+        the same as when parsing the file in one pass, with the line
+        numbers of the errors in the whole file.
+
+        If the encoding or the quote character does not allow splitting
+        the file, it is parsed in one pass.
+
+        :param workers: Number of worker processes
+        :returns: Format and the first line of the file
+        """
+        try:
+            with open(self.filename, "rb") as infile:
+                sample = TextIOWrapper(
+                    infile, encoding=self._predefined_charset
+                ).read(100 * 1024)
+            delimiter, separator, quotechar = self._resolve_csv_format(sample)
+            charset = None
+            if self._predefined_charset:
+                charset = codecs.lookup(self._predefined_charset).name
+        except (OSError,
+                csv.Error,
+                UnicodeError,
+                LookupError) as exception:
+            self._errors.append(_csv_error_message(exception, None))
+            return _CsvFormat(None, None, None, None)
+
+        if (charset not in _BYTE_BOUNDARY_CHARSETS
+                or len(quotechar) != 1 or not quotechar.isascii()):
+            LOGGER.debug("Parsing %s in one pass, since it can not be split "
+                         "with charset %s and quotechar %s",
+                         self.filename, charset, quotechar)
+            with open(self.filename, "rb") as infile:
+                return self._parse_csv(infile)
+
+        csv_format = (delimiter, separator, quotechar)
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            boundaries = _record_boundaries(
+                executor, self.filename, quotechar.encode("ascii"),
+                self._parallel_chunksize)
+            LOGGER.debug("Parsing %d chunks of %s in %d processes",
+                         len(boundaries) - 1, self.filename, workers)
+            futures = [
+                executor.submit(_parse_csv_chunk, self.filename,
+                                self._predefined_charset, csv_format,
+                                start, end, start == 0)
+                for start, end in zip(boundaries, boundaries[1:])
+            ]
+            try:
+                chunks = []
+                for index, future in enumerate(futures):
+                    chunk = future.result()
+                    if chunk.error is not None and index < len(futures) - 1:
+                        # Parse the rest of the file in one pass
+                        for other in futures[index:]:
+                            other.cancel()
+                        chunks.append(_parse_csv_chunk(
+                            self.filename, self._predefined_charset,
+                            csv_format, boundaries[index], None, index == 0))
+                        break
+                    chunks.append(chunk)
+                    if chunk.error is not None:
+                        break
+            finally:
+                for future in futures:
+                    future.cancel()
+
+        return self._combine_chunks(chunks, _CsvFormat(*csv_format, None))
+
+    def _combine_chunks(
+        self, chunks: list[_CsvChunk], csv_format: _CsvFormat
+    ) -> _CsvFormat:
+        """
+        Record the results of the parsed chunks of the file.
+
+        :param chunks: Parsed chunks, in the order of the file
+        :param csv_format: Format of the file
+        :returns: Format and the first line of the file
+        """
+        first_line = chunks[0].first_row if chunks else None
+        if first_line is not None:
+            self._check_header(first_line)
+
+        line_num = 0
+        for chunk in chunks:
+            if chunk.error is not None:
+                self._errors.append(_csv_error_message(
+                    chunk.error, line_num + chunk.lines))
+                return csv_format._replace(first_line=first_line)
+            line_num += chunk.lines
+
+        counts = [chunk.field_counts for chunk in chunks
+                  if chunk.field_counts is not None]
+        self._row_count = sum(chunk.rows for chunk in chunks)
+        if counts:
+            self._field_counts = (min(count[0] for count in counts),
+                                  max(count[1] for count in counts))
+        self._messages.append("CSV file was checked successfully.")
+        return csv_format._replace(first_line=first_line)
 
     def _resolve_csv_format(
-        self, csvfile: TextIOWrapper
+        self, sample: str
     ) -> tuple[str, str, str]:
         """
         Resolve CSV formatting parameters (delimiter, separator, quotechar),
         either from user provided values or by auto-detecting using a sniffer.
 
-        :param csvfile: Opened CSV file handle.
+        :param sample: Beginning of the CSV file used for sniffing
         :returns: (delimiter, separator, quotechar) tuple.
         """
         delimiter = self._params.get("delimiter", None)
@@ -108,14 +295,7 @@ class CsvExtractor(BaseExtractor[CsvMeta]):
             # with the default dialect. This will raise an exception.
             # Therefore, sniffing should be skipped totally, if the
             # characters are given as a parameter.
-            dialect = csv.Sniffer().sniff(csvfile.read(100 * 1024))
-            LOGGER.debug(
-                "csv.Sniffer detected dialect with "
-                "delimiter: %s, line terminator: %s, quotechar: %s",
-                dialect.delimiter,
-                dialect.lineterminator,
-                dialect.quotechar,
-            )
+            dialect = _sniff_dialect(sample)
             if delimiter is None:
                 LOGGER.debug(
                     "Using auto-detected delimiter: %s", dialect.delimiter
@@ -138,15 +318,249 @@ class CsvExtractor(BaseExtractor[CsvMeta]):
 
         return delimiter, separator, quotechar
 
-    def _open_csv_file(self, charset: str | None) -> TextIOWrapper:
-        """
-        Open the file in mode dependent on the python version.
+    @classmethod
+    def tools(cls) -> dict:
+        return {}
 
-        :param charset: File encoding
-        :param returns: handle to the newly-opened file
-        :raises: IOError if the file cannot be read
-        """
-        return io_open(self.filename, "rt", encoding=charset)
 
-    def tools(self) -> dict:
-        return {}
+def sniff_csv_format(
+    filename: str | os.PathLike,
+    charset: str | None = None,
+) -> dict[str, str]:
+    """
+    Detect the format of a CSV file.
+
+    The format can be given as the parameters for scraping a batch of CSV
+    files in the same format, so that the format is not detected again
+    for each file::
+
+        params = sniff_csv_format(paths[0], charset="UTF-8")
+        scrape_many(paths, mimetype="text/csv", charset="UTF-8", **params)
+
+    :param filename: Path to the file
+    :param charset: Character encoding of the file
+    :returns: Dict of delimiter, separator and quotechar parameters
+    :raises csv.Error: If the format could not be detected
+    """
+    with open(filename, encoding=charset) as csvfile:
+        dialect = _sniff_dialect(csvfile.read(100 * 1024))
+    return {"delimiter": dialect.delimiter,
+            "separator": dialect.lineterminator,
+            "quotechar": dialect.quotechar}
+
+
+def _sniff_dialect(sample: str) -> type[csv.Dialect]:
+    """
+    Detect the dialect of a CSV file using a sniffer.
+
+    :param sample: Beginning of the CSV file
+    :returns: Detected dialect
+    :raises csv.Error: If the dialect could not be detected
+    """
+    dialect = csv.Sniffer().sniff(sample)
+    LOGGER.debug(
+        "csv.Sniffer detected dialect with "
+        "delimiter: %s, line terminator: %s, quotechar: %s",
+        dialect.delimiter,
+        dialect.lineterminator,
+        dialect.quotechar,
+    )
+    return dialect
+
+
+@lru_cache(maxsize=128)
+def _csv_dialect(
+    delimiter: str, separator: str, quotechar: str
+) -> type[csv.Dialect]:
+    """
+    Return the dialect for parsing a CSV file with the given format.
+
+    The dialect is passed to csv.reader directly instead of registering
+    it by name, so that files in different formats can be parsed
+    concurrently. The dialects are cached, so that a batch of files with
+    the same format share the dialect.
+
+    :param delimiter: Delimiter between fields
+    :param separator: Record separator (line terminator)
+    :param quotechar: Quote character
+    :returns: Dialect of the csv module
+    """
+    return type("CsvExtractorDialect", (csv.Dialect,), {
+        "delimiter": delimiter,
+        "lineterminator": separator,
+        "quotechar": quotechar,
+        "quoting": csv.QUOTE_MINIMAL,
+        "escapechar": None,
+        "skipinitialspace": False,
+        "strict": True,
+        "doublequote": True,
+    })
+
+
+def _csv_error_message(exception: Exception, line_num: int | None) -> str:
+    """
+    Return the error message for an error parsing a CSV file.
+
+    :param exception: Raised exception
+    :param line_num: Number of the line where a CSV error occurred, or
+        None if the error occurred before parsing the file
+    :returns: Error message
+    """
+    if isinstance(exception, OSError):
+        return f"Error when reading the file: {exception}"
+    if isinstance(exception, csv.Error):
+        if line_num is not None:
+            return f"CSV error on line {line_num}: {exception}"
+        return f"CSV error: {exception}"
+    return f"Error reading file as CSV: {exception}"
+
+
+def _count_byte(filename: Path, byte: bytes, start: int, end: int) -> int:
+    """
+    Count the occurrences of a byte in a part of a file.
+
+    :param filename: Path to the file
+    :param byte: Byte to count
+    :param start: Start position of the part
+    :param end: End position of the part
+    :returns: Number of occurrences
+    """
+    count = 0
+    with open(filename, "rb") as infile:
+        infile.seek(start)
+        while start < end:
+            block = infile.read(min(end - start, 8 * 1024**2))
+            if not block:
+                break
+            count += block.count(byte)
+            start += len(block)
+    return count
+
+
+def _record_boundaries(
+    executor: ProcessPoolExecutor,
+    filename: Path,
+    quotechar: bytes,
+    chunksize: int,
+) -> list[int]:
+    """
+    Find the positions splitting a CSV file into chunks of whole records.
+
+    The file is split at the first line feed after every ``chunksize``
+    bytes, which is preceded by an even number of quote characters in
+    the file. The quote characters are counted in the worker processes.
+
+    :param executor: Worker processes
+    :param filename: Path to the file
+    :param quotechar: Quote character
+    :param chunksize: Approximate size of the chunks
+    :returns: Start positions of the chunks, and the size of the file
+    """
+    with open(filename, "rb") as infile:
+        size = infile.seek(0, 2)
+        starts = range(0, size, chunksize)
+        quote_counts = executor.map(
+            _count_byte, itertools.repeat(filename),
+            itertools.repeat(quotechar), starts,
+            [min(start + chunksize, size) for start in starts])
+
+        boundaries = [0]
+        pattern = re.compile(re.escape(quotechar) + b"|\n")
+        quotes = 0
+        for start, count in zip(starts, quote_counts):
+            if start > boundaries[-1]:
+                infile.seek(start)
+                boundaries.append(
+                    _next_boundary(infile, pattern, quotechar, quotes % 2))
+            quotes += count
+            if boundaries[-1] >= size:
+                break
+
+    if len(boundaries) == 1 or boundaries[-1] < size:
+        boundaries.append(size)
+    return boundaries
+
+
+def _next_boundary(
+    infile: BinaryIO,
+    pattern: re.Pattern[bytes],
+    quotechar: bytes,
+    parity: int,
+) -> int:
+    """
+    Return the position after the next line feed outside quotes.
+
+    :param infile: File positioned to start the search
+    :param pattern: Pattern matching the quote character or a line feed
+    :param quotechar: Quote character
+    :param parity: Parity of the number of quote characters before the
+        current position in the file
+    :returns: Position after the line feed, or the end of the file
+    """
+    position = infile.tell()
+    while block := infile.read(64 * 1024):
+        for match in pattern.finditer(block):
+            if match.group() == quotechar:
+                parity ^= 1
+            elif parity == 0:
+                return position + match.end()
+        position += len(block)
+    return position
+
+
+def _parse_csv_chunk(
+    filename: Path,
+    charset: str,
+    csv_format: tuple[str, str, str],
+    start: int,
+    end: int | None,
+    first: bool,
+) -> _CsvChunk:
+    """
+    Parse a chunk of a CSV file, in a worker process.
+
+    :param filename: Path to the file
+    :param charset: Character encoding of the file
+    :param csv_format: Delimiter, separator and quotechar of the file
+    :param start: Start position of the chunk
+    :param end: End position of the chunk, or None to parse until the end
+        of the file
+    :param first: True if the chunk is at the beginning of the file
+    :returns: Number of lines, records and fields in the chunk, and the
+        error which stopped the parsing
+    """
+    rows = 0
+    field_counts = None
+    first_row = None
+    reader = None
+    try:
+        with open(filename, "rb") as infile:
+            infile.seek(start)
+            chunk_file = infile if end is None else BytesIO(
+                infile.read(end - start))
+            reader = csv.reader(TextIOWrapper(chunk_file, encoding=charset),
+                                dialect=_csv_dialect(*csv_format))
+            rows_iter = reader
+            if first:
+                first_row = next(reader)
+                rows_iter = itertools.chain([first_row], reader)
+            for row in rows_iter:
+                if not row:
+                    # Blank lines are not records
+                    continue
+                rows += 1
+                if field_counts is None:
+                    field_counts = (len(row), len(row))
+                elif not field_counts[0] <= len(row) <= field_counts[1]:
+                    field_counts = (min(field_counts[0], len(row)),
+                                    max(field_counts[1], len(row)))
+    except (OSError,
+            csv.Error,
+            UnicodeError,
+            StopIteration,
+            LookupError) as exception:
+        error = exception
+    else:
+        error = None
+    lines = reader.line_num if reader is not None else 0
+    return _CsvChunk(lines, rows, field_counts, first_row, error)
@@ -3,6 +3,7 @@
 
 from file_scraper.base import BaseMeta
 from file_scraper.defaults import UNAP, UNAV
+from file_scraper.exceptions import SkipElementException
 
 
 class CsvMeta(BaseMeta):
@@ -21,6 +22,10 @@ class CsvMeta(BaseMeta):
                  separator:  the line separator
                  fields:     list of columns
                  first_line: contents of the first line
+                 and optionally:
+                 row_count:  number of records, if counted
+                 field_counts: smallest and largest number of fields
+                               in a record, if counted
         """
         # Check that a proper parameter dict was supplied
         if any(key not in params for key in ["delimiter", "separator",
@@ -35,6 +40,8 @@ class CsvMeta(BaseMeta):
         self._csv_quotechar = params["quotechar"]
         self._csv_fields = params["fields"]
         self._csv_first_line = params["first_line"]
+        self._csv_row_count = params.get("row_count", None)
+        self._csv_field_counts = params.get("field_counts", None)
 
     @BaseMeta.metadata()
     def mimetype(self):
@@ -76,6 +83,33 @@ class CsvMeta(BaseMeta):
         """Return first line."""
         return self._csv_first_line
 
+    @BaseMeta.metadata()
+    def row_count(self):
+        """
+        Return the number of records, not counting blank lines.
+
+        The records are counted only when the file is parsed in parallel.
+        """
+        if self._csv_row_count is None:
+            raise SkipElementException()
+        return str(self._csv_row_count)
+
+    @BaseMeta.metadata()
+    def field_count(self):
+        """
+        Return the number of fields in a record.
+
+        The fields are counted only when the file is parsed in parallel.
+        If there are no records or the records have different numbers of
+        fields, the number is not available.
+        """
+        if self._csv_row_count is None:
+            raise SkipElementException()
+        if self._csv_field_counts is None:
+            return UNAV
+        smallest, largest = self._csv_field_counts
+        return str(smallest) if smallest == largest else UNAV
+
     @BaseMeta.metadata()
     def stream_type(self):
         """
@@ -11,10 +11,41 @@ import re
 from file_scraper.base import BaseExtractor
 from file_scraper.shell import Shell
 from file_scraper.logger import LOGGER
+from file_scraper.tool_versions import tool_version
 from file_scraper.defaults import UNAV
 from file_scraper.dbptk.dbptk_model import DbptkMeta
 
 
+@tool_version("DBPTK Developer")
+def _dbptk_version(path: str) -> str:
+    """Return the version of DBPTK Developer.
+
+    :param path: Value of $PATH used for running the dbptk command
+    :returns: DBPTK Developer version, or (:unav) if it can not be parsed
+    """
+    # command without arguments prints default output,
+    # which includes the version
+    tool_shell = Shell(["dbptk"], env={"PATH": path})
+
+    # Regex for finding the version of dbptk
+
+    # Find string "DBPTK Developer (version"
+    # optionally capture group of words, numbers, dashes and dots
+    # until a closing parenthesis.
+
+    try:
+        return next(
+            re.finditer(r"DBPTK Developer \(version ([\w\-.]*)\)$",
+                        tool_shell.stdout, re.MULTILINE)
+        ).groups()[0]
+    except StopIteration:
+        LOGGER.warning(
+            "Could not find version for dbptk from stdout: %s",
+            tool_shell.stdout
+        )
+        return UNAV
+
+
 class DbptkExtractor(BaseExtractor[DbptkMeta]):
     """DBPTK (Database Prevervation Toolkit) extractor.
     Supports only SIARD files."""
@@ -45,9 +76,14 @@ class DbptkExtractor(BaseExtractor[DbptkMeta]):
             self._errors.append(report)
             self._errors.append(shell.stderr)
 
+        if _dbptk_version(self._path) == UNAV:
+            self._errors.append("Could not parse version number from CLI "
+                                "output")
+
         self.streams = list(self.iterate_models())
 
-    def tools(self) -> dict:
+    @classmethod
+    def tools(cls) -> dict:
         """Return information about the software used by the extractor or
         detector.
 
@@ -56,27 +92,4 @@ class DbptkExtractor(BaseExtractor[DbptkMeta]):
             tool (e.g. version). If no tools are available, an empty
             dictionary is returned instead.
         """
-        # command without arguments prints default output,
-        # which includes the version
-        tool_shell = Shell(["dbptk"], env={"PATH": self._path})
-
-        # Regex for finding the version of dbptk
-
-        # Find string "DBPTK Developer (version"
-        # optionally capture group of words, numbers, dashes and dots
-        # until a closing parenthesis.
-
-        try:
-            version = next(
-                re.finditer(r"DBPTK Developer \(version ([\w\-.]*)\)$",
-                            tool_shell.stdout, re.MULTILINE)
-            ).groups()[0]
-            return {"DBPTK Developer": {"version":  version}}
-        except StopIteration:
-            LOGGER.warning(
-                "Could not find version for dbptk from stdout: %s",
-                tool_shell.stdout
-            )
-            self._errors.append("Could not parse version number from CLI "
-                                "output")
-            return {"DBPTK Developer": {"version": UNAV}}
+        return {"DBPTK Developer": {"version": _dbptk_version(cls._path)}}
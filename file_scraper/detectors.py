@@ -4,9 +4,11 @@ from __future__ import annotations
 import errno
 import gzip
 import os
-import zipfile
+import re
+import sys
+import threading
 from pathlib import Path
-from typing import Literal
+from typing import TYPE_CHECKING, BinaryIO, Literal
 
 import exiftool
 import lxml.etree
@@ -23,82 +25,70 @@ from file_scraper.defaults import (
     UNKN,
     VERSION_DICT,
 )
+from file_scraper.exiftool.exiftool_process import (
+    exiftool_metadata,
+    exiftool_version,
+)
 from file_scraper.logger import LOGGER
-from file_scraper.magiclib import magic_analyze, magiclib, magiclib_version
-from file_scraper.utils import is_zipfile, parse_exif_version
+from file_scraper.magiclib import (
+    magic_analyze,
+    magic_analyze_buffer,
+    magiclib,
+    magiclib_version,
+)
+from file_scraper.utils import parse_exif_version
 
+if TYPE_CHECKING:
+    import magic
 
-class _FidoCachedFormats(Fido):
-    """Class whose sole purpose is to override one of the default function
-    provided by Fido by caching the fido XML data.
+    from file_scraper.probe import FileProbe
 
-    This is made to optimize the usage of Fido via the use of
-    cache-pattern. Fido has an issue that for one file at a time, it needs
-    to read format XML file. This will cause slowness when detecting batches
-    of files, because Fido needs to re-read the same XML and assign values
-    to specific attributes. Thus this class strives to minimize the need to
-    re-read the same format XML.
-    """
 
-    _use_cached = False
-    _cached_formats = None
-    _cached_puid_format_map = None
-    _cached_puid_has_priority_over_map = None
+def _magic_analyze_probe(
+    magic_lib: type[magic], magic_type: int, probe: FileProbe
+) -> str | None:
+    """Analyze a file with the magic library.
 
-    def load_fido_xml(
-        self, file: str | os.PathLike
-    ) -> list[lxml.etree._Element]:
-        """Overloads the default load_fido_xml so that it has an option to
-        prevent being called again.
+    If the whole file is contained in the probe, the contents in the probe
+    are analyzed. Otherwise the file is analyzed by the magic library,
+    because it may read more data than the probe contains. Empty files are
+    always analyzed by path, because the magic library reports them
+    differently from empty buffers.
 
-        If data has been cached, will use that data instead.
-
-        :param file: File that will be loaded.
-        """
-        if _FidoCachedFormats._use_cached:
-            self.formats = _FidoCachedFormats._cached_formats
-            self.puid_format_map = _FidoCachedFormats._cached_puid_format_map
-            self.puid_has_priority_over_map = \
-                _FidoCachedFormats._cached_puid_has_priority_over_map
-        else:
-            Fido.load_fido_xml(self, file=file)
+    :param magic_lib: Magic module
+    :param magic_type: Magic type to open magic library
+    :param probe: Head and tail of the file
+    :returns: Result from the magic module
+    """
+    if probe.size > 0 and probe.complete:
+        return magic_analyze_buffer(magic_lib, magic_type, probe.head)
+    return magic_analyze(magic_lib, magic_type, probe.path)
 
-        return self.formats
 
-    def setup_format_cache(self) -> None:
-        """Function to explicitly cache the current formats. If cache has
-        already been set, this function will not do anything.
-        """
-        if not _FidoCachedFormats._use_cached:
-            _FidoCachedFormats._cached_formats = self.formats
-            _FidoCachedFormats._cached_puid_format_map = self.puid_format_map
-            _FidoCachedFormats._cached_puid_has_priority_over_map = \
-                self.puid_has_priority_over_map
-            _FidoCachedFormats._use_cached = True
+# Position and compiled regular expression of a signature pattern
+_FidoPattern = tuple[str, re.Pattern]
 
 
-class _FidoReader(_FidoCachedFormats):
-    """Fido wrapper to get pronom code, mimetype and version."""
+class _FidoEngine(Fido):
+    """Fido identification engine shared by all Fido detectors.
 
-    def __init__(self, filename: str | os.PathLike) -> None:
-        """
-        Initialize the reader.
+    Creating a Fido instance loads the PRONOM signature files, and Fido
+    compiles the regular expressions of the signature patterns again when
+    they fall out of the regular expression cache. The engine loads the
+    signatures and compiles the patterns once per process, see
+    :func:`_fido_engine`, and then identifies any number of files using
+    the same state.
 
-        Fido is done with old-style python and does not inherit object,
-        so super() is not available.
+    Fido keeps the state of the current identification in the instance, so
+    the identifications are serialized with a lock. Matching the patterns
+    holds the GIL anyway, so the lock does not limit concurrency.
 
-        :param filename: File path
-        """
-        self.filename = filename  # File path
-        self.puid = None  # Identified pronom code
-        self.mimetype = None  # Identified mime type
-        self.version = None  # Identified file format version
-        _FidoCachedFormats.__init__(self, quiet=True, format_files=[
-            "formats-v95.xml", "format_extensions.xml"])
-        self.setup_format_cache()
+    Fido is done with old-style python and does not inherit object,
+    so super() is not available.
+    """
 
-    def identify(self) -> None:
-        """Identify file format with using pronom registry."""
+    def __init__(self) -> None:
+        """Load the signatures and compile the signature patterns."""
         versions = get_local_pronom_versions()
         defaults["xml_pronomSignature"] = versions.pronom_signature
         defaults["containersignature_file"] = \
@@ -108,10 +98,171 @@ class _FidoReader(_FidoCachedFormats):
         defaults["format_files"] = [defaults["xml_pronomSignature"]]
         defaults["format_files"].append(
             defaults["xml_fidoExtensionSignature"])
-        self.identify_file(
+
+        self._lock = threading.Lock()
+        self._filename: str | None = None
+        self._probe: FileProbe | None = None
+        self._result: tuple[str | None, str | None, str | None] = \
+            (None, None, None)
+        self._container_signatures: dict[str, dict] = {}
+        Fido.__init__(self, quiet=True, format_files=[
+            "formats-v95.xml", "format_extensions.xml"])
+        self._compiled_formats = [
+            (fmt, self.get_puid(fmt), self._compile_signatures(fmt))
+            for fmt in self.formats
+        ]
+
+    def _compile_signatures(
+        self, fmt: lxml.etree._Element
+    ) -> list[tuple[str, list[_FidoPattern], str | None]]:
+        """Compile the signature patterns of a format.
+
+        A pattern which can not be compiled ends its signature. The error
+        is reported when the patterns before it match, like Fido does.
+
+        :param fmt: Format element
+        :returns: List of (signature name, compiled patterns, error) tuples
+        """
+        signatures = []
+        for sig in self.get_signatures(fmt):
+            patterns = []
+            error = None
+            for pat in self.get_patterns(sig):
+                try:
+                    patterns.append(
+                        (self.get_pos(pat), re.compile(self.get_regex(pat)))
+                    )
+                except Exception as exception:  # pylint: disable=broad-except
+                    error = str(exception)
+                    break
+            signatures.append((sig.findtext("name"), patterns, error))
+        return signatures
+
+    def identify(
+        self,
+        filename: str | os.PathLike,
+        probe: FileProbe | None = None,
+    ) -> tuple[str | None, str | None, str | None]:
+        """Identify a file.
+
+        :param filename: File path
+        :param probe: Head and tail of the file. If given, the signatures
+            are matched against the probe instead of reading the file.
+        :returns: Tuple (pronom code, mimetype, version)
+        """
+        with self._lock:
             # FIDO does not work well with pathlib paths
-            filename=str(self.filename), extension=False
-        )
+            self._filename = str(filename)
+            self._probe = probe
+            self._result = (None, None, None)
+            try:
+                self.identify_file(filename=self._filename, extension=False)
+                return self._result
+            finally:
+                self._filename = None
+                self._probe = None
+
+    def identify_buffer(
+        self, buffer: bytes
+    ) -> tuple[str | None, str | None, str | None]:
+        """Identify the contents of a file from a byte buffer.
+
+        Only the signatures of the buffer are matched; the members of
+        containers, such as ZIP archives, are not examined.
+
+        :param buffer: Contents of the file
+        :returns: Tuple (pronom code, mimetype, version)
+        """
+        bufsize = min(len(buffer), self.bufsize)
+        with self._lock:
+            matches = self.match_formats(buffer[:bufsize],
+                                         buffer[len(buffer) - bufsize:])
+        if not matches or not buffer:
+            return (None, None, None)
+        return _select_fido_match(matches)
+
+    def match_formats(
+        self, bofbuffer: bytes, eofbuffer: bytes
+    ) -> list[tuple[lxml.etree._Element, str]]:
+        """Apply the compiled patterns of the formats to the buffers.
+
+        Overrides the default match_formats, which looks up the patterns
+        from the format elements and compiles them for every file.
+
+        :param bofbuffer: Beginning of the file
+        :param eofbuffer: End of the file
+        :returns: Matches as (format, signature name) tuples, without
+            inferior matches
+        """
+        self.current_count += 1
+        result = []
+        matched_puids: list[str] = []
+        for fmt, puid, signatures in self._compiled_formats:
+            if any(puid in self.puid_has_priority_over_map[matched_puid]
+                   for matched_puid in matched_puids):
+                continue
+            for name, patterns, error in signatures:
+                if not _fido_patterns_match(patterns, bofbuffer, eofbuffer):
+                    continue
+                if error is not None:
+                    sys.stderr.write(error + "\n")
+                    break
+                result.append((fmt, name))
+                matched_puids.append(puid)
+
+        return [match for match in result
+                if self.as_good_as_any(match[0], result)]
+
+    def extract_signatures(
+        self,
+        doc: lxml.etree._ElementTree,
+        signature_type: str = "ZIP",
+    ) -> dict:
+        """Return the container signatures of a container type.
+
+        Overrides the default extract_signatures so that the signatures
+        are extracted only once for each container type.
+
+        :param doc: Container signature file
+        :param signature_type: Container type, "ZIP" or "OLE2"
+        :returns: Container signatures by the path in the container
+        """
+        if signature_type not in self._container_signatures:
+            self._container_signatures[signature_type] = \
+                Fido.extract_signatures(self, doc, signature_type)
+        return self._container_signatures[signature_type]
+
+    def get_buffers(
+        self,
+        stream: BinaryIO,
+        length: int | None = None,
+        seekable: bool = False,
+    ) -> tuple[bytes, bytes, int]:
+        """Return buffers from the beginning and the end of the stream.
+
+        Overrides the default get_buffers so that the buffers of the
+        identified file are taken from the probe, if the probe contains
+        enough data. Other streams, e.g. members of containers, are read
+        by Fido.
+
+        :param stream: Stream to read
+        :param length: Length of the stream, if known
+        :param seekable: True if the stream supports seeking
+        :returns: Beginning of the stream, end of the stream and the
+            number of bytes read from the beginning
+        """
+        probe = self._probe
+        if (
+            probe is not None
+            and getattr(stream, "name", None) == self._filename
+            and length == probe.size
+            and self.bufsize <= min(probe.head_size, probe.tail_size)
+        ):
+            bytes_to_read = min(length, self.bufsize)
+            return (probe.head[:bytes_to_read], probe.tail[-bytes_to_read:],
+                    bytes_to_read)
+        return Fido.get_buffers(self, stream, length=length,
+                                seekable=seekable)
 
     def print_matches(
         self,
@@ -121,47 +272,101 @@ class _FidoReader(_FidoCachedFormats):
         matchtype: str = "",
     ) -> None:
         """
-        Get puid, mimetype and version.
+        Store the result of the current identification.
 
         :param fullname: File path
         :param matches: Matches tuples in Fido
         :param delta_t: Not needed here, but originates from Fido
         :param matchtype: Not needed here, but originates from Fido
         """
-        for (item, _) in matches:
-            self.puid = self.get_puid(item)
-            if self.puid in PRONOM_DICT:
-                (self.mimetype, self.version) = PRONOM_DICT[self.puid]
-                return
+        self._result = _select_fido_match(matches)
 
-        for (item, _) in matches:
-            self.puid = self.get_puid(item)
-            if self.puid in PRIORITY_PRONOM:
-                self._find_mime(item)
-                return
 
-        for (item, _) in matches:
-            if self.mimetype is None:
-                self.puid = self.get_puid(item)
-                self._find_mime(item)
+def _fido_patterns_match(
+    patterns: list[_FidoPattern],
+    bofbuffer: bytes,
+    eofbuffer: bytes,
+) -> bool:
+    """Return True if all the patterns of a signature match the buffers.
 
-    def _find_mime(self, item: lxml.etree._Element) -> None:
-        """
-        Find mimetype and version in Fido.
+    :param patterns: Positions and compiled regular expressions
+    :param bofbuffer: Beginning of the file
+    :param eofbuffer: End of the file
+    :returns: True if all patterns match
+    """
+    for pos, regex in patterns:
+        if pos == "BOF":
+            if not regex.match(bofbuffer):
+                return False
+        elif pos == "EOF":
+            if not regex.search(eofbuffer):
+                return False
+        elif pos in ("VAR", "IFB"):
+            if not regex.search(bofbuffer):
+                return False
+    return True
+
+
+def _select_fido_match(
+    matches: list[tuple[lxml.etree._Element, str]]
+) -> tuple[str | None, str | None, str | None]:
+    """
+    Get puid, mimetype and version of the best match.
+
+    :param matches: Matches tuples in Fido
+    :returns: Tuple (pronom code, mimetype, version)
+    """
+    puid = None
+    for (item, _) in matches:
+        puid = item.find("puid").text
+        if puid in PRONOM_DICT:
+            return (puid, *PRONOM_DICT[puid])
+
+    for (item, _) in matches:
+        puid = item.find("puid").text
+        if puid in PRIORITY_PRONOM:
+            return (puid, *_find_fido_mime(item))
+
+    mimetype = version = None
+    for (item, _) in matches:
+        if mimetype is None:
+            puid = item.find("puid").text
+            mimetype, version = _find_fido_mime(item)
+    return (puid, mimetype, version)
+
+
+def _find_fido_mime(
+    item: lxml.etree._Element
+) -> tuple[str | None, str | None]:
+    """
+    Find mimetype and version in Fido.
+
+    :param item: Fido result
+    :returns: Tuple (mimetype, version)
+    """
+    mime = item.find("mime")
+    mimetype = mime.text if mime is not None else None
+    version_element = item.find("version")
+    version = version_element.text if version_element is not None else None
+    if mimetype in MIMETYPE_DICT:
+        mimetype = MIMETYPE_DICT[mimetype]
+    if mimetype in VERSION_DICT and version in VERSION_DICT[mimetype]:
+        version = VERSION_DICT[mimetype][version]
+    return mimetype, version
 
-        :param item: Fido result
-        """
-        mime = item.find("mime")
-        self.mimetype = mime.text if mime is not None else None
-        version = item.find("version")
-        self.version = version.text if version is not None else None
-        if self.mimetype in MIMETYPE_DICT:
-            self.mimetype = MIMETYPE_DICT[self.mimetype]
-        if (
-            self.mimetype in VERSION_DICT
-            and self.version in VERSION_DICT[self.mimetype]
-        ):
-            self.version = VERSION_DICT[self.mimetype][self.version]
+
+_FIDO_ENGINE: _FidoEngine | None = None
+_FIDO_ENGINE_LOCK = threading.Lock()
+
+
+def _fido_engine() -> _FidoEngine:
+    """Return the Fido engine of the process, creating it on first use."""
+    global _FIDO_ENGINE  # pylint: disable=global-statement
+    if _FIDO_ENGINE is None:
+        with _FIDO_ENGINE_LOCK:
+            if _FIDO_ENGINE is None:
+                _FIDO_ENGINE = _FidoEngine()
+    return _FIDO_ENGINE
 
 
 class FidoDetector(BaseDetector):
@@ -170,21 +375,21 @@ class FidoDetector(BaseDetector):
     def __init__(
         self,
         filename: Path,
+        probe: FileProbe | None = None,
     ) -> None:
         """
         Initialize detector.
 
         :param filename: File name of file to detect
+        :param probe: Head and tail of the file shared by the detectors
         """
-        super().__init__(filename)
+        super().__init__(filename, probe)
         self._puid = None
 
     def detect(self) -> None:
         """Detect file format and version."""
-        fido = _FidoReader(self.filename)
-        fido.identify()
-        self.mimetype = fido.mimetype
-        self.version = fido.version
+        _, self.mimetype, self.version = _fido_engine().identify(
+            self.filename, self.probe)
 
         # FIDO detects at least some video/mp4 audio/mp4 files as
         # application/mp4 which is not currently supported
@@ -198,7 +403,8 @@ class FidoDetector(BaseDetector):
             "application/warc",
         }:
             self.version = self.read_warc_version(
-                self.filename, self.mimetype == "application/gzip"
+                self.filename, self.mimetype == "application/gzip",
+                self.probe
             )
             if self.version is not None:
                 self.mimetype = "application/warc"
@@ -224,7 +430,8 @@ class FidoDetector(BaseDetector):
 
         return arc_or_formula or nonstandard_mimetype
 
-    def tools(self) -> dict:
+    @classmethod
+    def tools(cls) -> dict:
         """Return information about the software used by the extractor or
         detector.
 
@@ -238,22 +445,35 @@ class FidoDetector(BaseDetector):
         }
 
     @staticmethod
-    def read_warc_version(file_path: str | Path, gz: bool) -> str | None:
+    def read_warc_version(
+        file_path: str | Path,
+        gz: bool,
+        probe: FileProbe | None = None,
+    ) -> str | None:
         """Read the version of a WARC file.
 
         :param file_path: Path to WARC file.
         :param gz: Is the WARC gzipped.
+        :param probe: Head and tail of the file. If given and the first
+            line is contained in the head of an uncompressed WARC, the file
+            is not read again.
         :returns: WARC version or `None` if version could not be read.
         """
-        func = gzip.open if gz else open
-        with func(file_path, "rb") as file:
-            # WARC file could contain almost anything, therefore the
-            # file is read as bytes. But the first line should be ASCII
-            # text.
-            line = file.readline().decode("ascii").strip()
-            if not line.startswith("WARC/"):
-                return None
-            return line.split("/")[1]
+        raw_line = None
+        if probe is not None and not gz:
+            raw_line = probe.first_line()
+        if raw_line is None:
+            func = gzip.open if gz else open
+            with func(file_path, "rb") as file:
+                raw_line = file.readline()
+
+        # WARC file could contain almost anything, therefore the
+        # file is read as bytes. But the first line should be ASCII
+        # text.
+        line = raw_line.decode("ascii").strip()
+        if not line.startswith("WARC/"):
+            return None
+        return line.split("/")[1]
 
 
 class MagicDetector(BaseDetector):
@@ -262,8 +482,9 @@ class MagicDetector(BaseDetector):
     def detect(self) -> None:
         """Detect mimetype."""
         magic_lib = magiclib()
-        mimetype = magic_analyze(magic_lib, magic_lib.MAGIC_MIME_TYPE,
-                                 self.filename)
+        mimetype = _magic_analyze_probe(
+            magic_lib, magic_lib.MAGIC_MIME_TYPE, self.probe
+        )
         if mimetype in MIMETYPE_DICT:
             self.mimetype = MIMETYPE_DICT[mimetype]
         else:
@@ -273,10 +494,10 @@ class MagicDetector(BaseDetector):
         mime_check = mimetype == "application/octet-stream"
         file_extension_check = self.filename.suffix == ".dv"
         if mime_check and file_extension_check:
-            analyze = magic_analyze(
+            analyze = _magic_analyze_probe(
                 magic_lib,
                 magic_lib.MAGIC_NONE,
-                self.filename
+                self.probe
             )
             if analyze == "DIF (DV) movie file (PAL)":
                 LOGGER.info(
@@ -284,7 +505,8 @@ class MagicDetector(BaseDetector):
                 )
                 self.mimetype = "video/dv"
 
-    def tools(self) -> dict[str, dict[str, str]]:
+    @classmethod
+    def tools(cls) -> dict[str, dict[str, str]]:
         """Return information about the software used by the extractor or
         detector.
 
@@ -309,10 +531,11 @@ class MagicCharset(BaseDetector):
     def __init__(
         self,
         filename: Path,
+        probe: FileProbe | None = None,
     ) -> None:
         """Initialize detector."""
         self.charset = None
-        super().__init__(filename)
+        super().__init__(filename, probe)
 
     @classmethod
     def is_supported(cls, mimetype: str | None) -> bool:
@@ -330,10 +553,11 @@ class MagicCharset(BaseDetector):
         A charset is detected from up to 1 megabytes of data from the
         beginning of file.
         """
-        raw_charset = magic_analyze(
-            magiclib(),
-            magiclib().MAGIC_MIME_ENCODING,
-            self.filename
+        magic_lib = magiclib()
+        raw_charset = _magic_analyze_probe(
+            magic_lib,
+            magic_lib.MAGIC_MIME_ENCODING,
+            self.probe
         )
 
         # Normalize charset to one the charsets that supported by DPS.
@@ -356,7 +580,8 @@ class MagicCharset(BaseDetector):
                 f"Character encoding detected as {self.charset}"
             )
 
-    def tools(self) -> dict[str, dict[str, str]]:
+    @classmethod
+    def tools(cls) -> dict[str, dict[str, str]]:
         """Return information about the software used by the extractor or
         detector.
 
@@ -397,11 +622,10 @@ class ExifToolDetector(BaseDetector):
         # but the file is not valid and therefore, the metadata can't be
         # fetched by ExifTool.
         try:
-            with exiftool.ExifToolHelper() as et:
-                metadata = et.get_metadata(self.filename)
-                self.mimetype = metadata[0].get("File:MIMEType", None)
-                self._detect_pdf_a(metadata[0])
-                self._detect_exif_version(metadata[0])
+            metadata = exiftool_metadata(self.filename)
+            self.mimetype = metadata.get("File:MIMEType", None)
+            self._detect_pdf_a(metadata)
+            self._detect_exif_version(metadata)
         except exiftool.exceptions.ExifToolExecuteError:
             LOGGER.info("ExifTool could not process file", exc_info=True)
             self._set_info_exiftool_not_supported()
@@ -466,7 +690,8 @@ class ExifToolDetector(BaseDetector):
         return bool(self.version)  \
             and self.mimetype in ["application/pdf", "image/jpeg"]
 
-    def tools(self) -> dict[str, dict[str, str]]:
+    @classmethod
+    def tools(cls) -> dict[str, dict[str, str]]:
         """Return information about the software used by the extractor or
         detector.
 
@@ -476,8 +701,7 @@ class ExifToolDetector(BaseDetector):
             dictionary is returned instead.
         """
         try:
-            with exiftool.ExifToolHelper() as et:
-                return {"exiftool": {"version": et.version}}
+            return {"exiftool": {"version": exiftool_version()}}
         except exiftool.exceptions.ExifToolExecuteError:
             LOGGER.warning(
                 "Could not retrieve ExifTool version", exc_info=True
@@ -546,8 +770,7 @@ class SegYDetector(BaseDetector):
         """
         Run detection to find MIME type and version.
         """
-        with open(self.filename, "rb") as fhandler:
-            byte_content = fhandler.read(3200)
+        byte_content = self.probe.head[:3200]
         try:
             # The first character has to be "C", with ASCII or EBCDIC encoding
             if byte_content[0] == 0x43:
@@ -620,7 +843,8 @@ class SegYDetector(BaseDetector):
         """
         return bool(self.mimetype)
 
-    def tools(self) -> dict:
+    @classmethod
+    def tools(cls) -> dict:
         """Return information about the software used by the extractor or
         detector.
 
@@ -647,7 +871,10 @@ class AtlasTiDetector(BaseDetector):
             2) The file must be a ZIP archive file
 
         """
-        if self.filename.suffix == ".atlproj" and is_zipfile(self.filename):
+        if (
+            self.filename.suffix == ".atlproj"
+            and self.probe.zip_index is not None
+        ):
             self.mimetype = "application/x.fi-dpres.atlproj"
             self.version = UNAP
 
@@ -671,7 +898,8 @@ class AtlasTiDetector(BaseDetector):
         """
         return bool(self.version)
 
-    def tools(self) -> dict:
+    @classmethod
+    def tools(cls) -> dict:
         """Return information about the software used by the extractor or
         detector.
 
@@ -703,10 +931,10 @@ class SiardDetector(BaseDetector):
         a valid SIARD file: "header/siardversion/<version>/"
         """
         version_folders = []
-        if self.filename.suffix == ".siard" and is_zipfile(self.filename):
-            with zipfile.ZipFile(self.filename) as zipf:
-                version_folders = [
-                    x for x in zipf.namelist() if "header/siardversion" in x]
+        zip_index = self.probe.zip_index
+        if self.filename.suffix == ".siard" and zip_index is not None:
+            version_folders = [
+                x for x in zip_index.names if "header/siardversion" in x]
 
         if version_folders:
             self.mimetype = "application/x-siard"
@@ -740,7 +968,8 @@ class SiardDetector(BaseDetector):
         """
         return bool(self.version)
 
-    def tools(self) -> dict:
+    @classmethod
+    def tools(cls) -> dict:
         """Return information about the software used by the extractor or
         detector.
 
@@ -772,24 +1001,24 @@ class ODFDetector(BaseDetector):
             3) Valid format version is defined in "meta.xml" file
         """
         # Try to read "mimetype" and "meta.xml" files from zip
-        if not is_zipfile(self.filename):
+        zip_index = self.probe.zip_index
+        if zip_index is None:
             # The file is not ZIP, so it is not ODF
             return
-        with zipfile.ZipFile(self.filename) as zipf:
-            if {'mimetype', 'meta.xml'} <= set(zipf.namelist()):
-                try:
-                    mimetype_file = zipf.read('mimetype')
-                    meta_xml_file = zipf.read('meta.xml')
-                except OSError as exception:
-                    if exception.errno == errno.EINVAL:
-                        self._errors.append('Corrupted ZIP archive')
-                        return
-                    # Unknown error
-                    raise
-            else:
-                # ZIP does not contains required files, so it is not
-                # ODF
-                return
+        if 'mimetype' in zip_index and 'meta.xml' in zip_index:
+            try:
+                mimetype_file = zip_index.read('mimetype')
+                meta_xml_file = zip_index.read('meta.xml')
+            except OSError as exception:
+                if exception.errno == errno.EINVAL:
+                    self._errors.append('Corrupted ZIP archive')
+                    return
+                # Unknown error
+                raise
+        else:
+            # ZIP does not contains required files, so it is not
+            # ODF
+            return
 
         # Detect mimetype from "mimetype" file.
         mimetype = mimetype_file.decode().strip()
@@ -845,7 +1074,8 @@ class ODFDetector(BaseDetector):
         """
         return bool(self.version)
 
-    def tools(self) -> dict[str, dict[str, str]]:
+    @classmethod
+    def tools(cls) -> dict[str, dict[str, str]]:
         """Return information about the software used by the extractor or
         detector.
 
@@ -886,22 +1116,22 @@ class EpubDetector(BaseDetector):
         """
         version = None
 
-        if is_zipfile(self.filename):
-            with zipfile.ZipFile(self.filename) as zipf:
-                for filepath in zipf.namelist():
-                    if os.path.splitext(filepath)[1] != ".opf":
-                        continue
-                    with zipf.open(filepath) as opf:
-                        try:
-                            root = lxml.etree.parse(opf).getroot()
-                            if root.tag == (
-                                    '{http://www.idpf.org/2007/opf}package'):
-                                version = root.get('version')
-                        except lxml.etree.XMLSyntaxError:
-                            LOGGER.info(
-                                "Ignoring unparseable XML file '%s' in '%s'",
-                                filepath, self.filename
-                            )
+        zip_index = self.probe.zip_index
+        if zip_index is not None:
+            for filepath in zip_index.names:
+                if os.path.splitext(filepath)[1] != ".opf":
+                    continue
+                with zip_index.open(filepath) as opf:
+                    try:
+                        root = lxml.etree.parse(opf).getroot()
+                        if root.tag == (
+                                '{http://www.idpf.org/2007/opf}package'):
+                            version = root.get('version')
+                    except lxml.etree.XMLSyntaxError:
+                        LOGGER.info(
+                            "Ignoring unparseable XML file '%s' in '%s'",
+                            filepath, self.filename
+                        )
 
         # Map the valid attribute values to supported versions
         if version == "2.0":
@@ -931,7 +1161,8 @@ class EpubDetector(BaseDetector):
         """
         return self.mimetype in ["application/epub+zip"]
 
-    def tools(self) -> dict[str, dict[str, str]]:
+    @classmethod
+    def tools(cls) -> dict[str, dict[str, str]]:
         """Return information about the software used by the extractor or
         detector.
 
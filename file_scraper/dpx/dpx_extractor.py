@@ -46,7 +46,8 @@ class DpxExtractor(BaseExtractor[DpxMeta]):
         self.streams = list(self.iterate_models(
             well_formed=valid, output=output, filename=self.filename))
 
-    def tools(self):
+    @classmethod
+    def tools(cls):
         """Return information about the software used by the extractor or
         detector.
 
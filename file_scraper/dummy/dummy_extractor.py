@@ -36,7 +36,8 @@ class ExtractorNotFound(BaseExtractor):
         """
         return False
 
-    def tools(self):
+    @classmethod
+    def tools(cls):
         return {}
 
 
@@ -72,7 +73,8 @@ class DetectedMimeVersionExtractor(BaseExtractor):
             return None
         return False
 
-    def tools(self):
+    @classmethod
+    def tools(cls):
         return {}
 
     _supported_metadata = [
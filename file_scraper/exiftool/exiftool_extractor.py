@@ -3,10 +3,13 @@ from __future__ import annotations
 
 import json
 from typing import Literal, TypeVar
-import exiftool
 from exiftool.exceptions import ExifToolExecuteError
 
 from file_scraper.base import BaseExtractor
+from file_scraper.exiftool.exiftool_process import (
+    exiftool_metadata,
+    exiftool_version,
+)
 from file_scraper.exiftool.exiftool_model import (
     ExifToolBaseMeta,
     ExifToolDngMeta,
@@ -44,17 +47,12 @@ class ExifToolExtractorBase(BaseExtractor[ExifToolMetaT]):
         """
 
         try:
-            with exiftool.ExifTool() as et:
-                metadata = et.get_metadata(self.filename)
+            metadata = exiftool_metadata(self.filename)
             if EXIF_ERROR in metadata:
                 self._errors.append(metadata[EXIF_ERROR])
-        except AttributeError:
-            with exiftool.ExifToolHelper() as et:
-                try:
-                    metadata = et.get_metadata(str(self.filename))[0]
-                except ExifToolExecuteError as eee:
-                    metadata = json.loads(eee.stdout)[0]
-                    self._errors.append(metadata[EXIF_ERROR])
+        except ExifToolExecuteError as eee:
+            metadata = json.loads(eee.stdout)[0]
+            self._errors.append(metadata[EXIF_ERROR])
 
         if exif_version := metadata.get("EXIF:ExifVersion"):
             # Check ExifVersion
@@ -72,7 +70,8 @@ class ExifToolExtractorBase(BaseExtractor[ExifToolMetaT]):
         if not exif_version.isdigit():
             self._errors.append(f"ExifVersion '{exif_version}' is not numeric")
 
-    def tools(self) -> dict:
+    @classmethod
+    def tools(cls) -> dict:
         """Return information about the software used by the extractor or
         detector.
 
@@ -81,8 +80,7 @@ class ExifToolExtractorBase(BaseExtractor[ExifToolMetaT]):
             tool (e.g. version). If no tools are available, an empty
             dictionary is returned instead.
         """
-        with exiftool.ExifTool() as et:
-            return {"ExifTool": {"version": et.version}}
+        return {"ExifTool": {"version": exiftool_version()}}
 
 
 class ExifToolDngExtractor(ExifToolExtractorBase[ExifToolDngMeta]):
@@ -0,0 +1,192 @@
+"""Long-lived ExifTool process shared by the ExifTool detector and extractors.
+
+Starting ExifTool launches a Perl interpreter, which takes longer than
+reading the metadata of a typical file. Therefore a single ExifTool process
+is kept running in ``-stay_open`` mode and shared by all the threads of
+the scraper process. A worker process forked from a process using
+ExifTool starts its own ExifTool process.
+
+The metadata of the latest files is memoized, so that the ExifTool
+extractor reuses the metadata read by the ExifTool detector for the same
+file.
+"""
+from __future__ import annotations
+
+import atexit
+import os
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+from typing import TypeVar
+
+import exiftool
+from exiftool.exceptions import (
+    ExifToolExecuteError,
+    ExifToolProcessStateError,
+    ExifToolVersionError,
+)
+
+from file_scraper.logger import LOGGER
+from file_scraper.tool_versions import tool_version
+
+T = TypeVar("T")
+
+# Number of files whose metadata is memoized
+METADATA_MEMO_SIZE = 8
+
+# Errors of the ExifTool process itself, after which the process is
+# restarted. Errors in processing a file are raised as
+# ExifToolExecuteError and the process is kept running.
+_PROCESS_ERRORS = (OSError, ExifToolProcessStateError, ExifToolVersionError)
+
+
+class _SharedExifTool:
+    """ExifTool process shared by the threads of a process."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._helper: exiftool.ExifToolHelper | None = None
+        self._memo: OrderedDict[
+            tuple, tuple[dict | None, ExifToolExecuteError | None]
+        ] = OrderedDict()
+
+    def get_metadata(self, filename: str | os.PathLike) -> dict:
+        """
+        Return the metadata of a file.
+
+        The metadata is memoized by the path and the status of the file,
+        so a file changed after reading its metadata is read again.
+
+        :param filename: Path to the file
+        :returns: Metadata of the file. The dictionary is shared with the
+            other callers and must not be modified.
+        :raises ExifToolExecuteError: If ExifTool can not process the file
+        """
+        stat = os.stat(filename)
+        key = (os.path.realpath(filename), stat.st_dev, stat.st_ino,
+               stat.st_size, stat.st_mtime_ns)
+        with self._lock:
+            try:
+                metadata, error = self._memo[key]
+                self._memo.move_to_end(key)
+            except KeyError:
+                metadata, error = None, None
+                try:
+                    metadata = self._execute(
+                        lambda helper: helper.get_metadata(
+                            os.fspath(filename))[0])
+                except ExifToolExecuteError as exception:
+                    error = exception
+                self._memo[key] = (metadata, error)
+                while len(self._memo) > METADATA_MEMO_SIZE:
+                    self._memo.popitem(last=False)
+        if error is not None:
+            raise error
+        return metadata
+
+    def version(self) -> str:
+        """
+        Return the version of ExifTool.
+
+        :returns: ExifTool version
+        """
+        with self._lock:
+            return self._execute(lambda helper: helper.version)
+
+    def _execute(self, func: Callable[[exiftool.ExifToolHelper], T]) -> T:
+        """
+        Run a function with the running ExifTool process.
+
+        The process is started if it is not running, e.g. because it has
+        crashed. If the process fails during the function, it is restarted
+        and the function is tried once more.
+
+        :param func: Function to run with the ExifTool helper
+        :returns: Return value of the function
+        """
+        try:
+            return func(self._running_helper())
+        except _PROCESS_ERRORS:
+            LOGGER.warning("ExifTool process failed, restarting",
+                           exc_info=True)
+            self._terminate()
+        return func(self._running_helper())
+
+    def _running_helper(self) -> exiftool.ExifToolHelper:
+        """
+        Return the helper of the running ExifTool process.
+
+        :returns: ExifTool helper, started if it was not running
+        """
+        if self._helper is None or not self._helper.running:
+            self._terminate()
+            helper = exiftool.ExifToolHelper()
+            helper.run()
+            self._helper = helper
+        return self._helper
+
+    def _terminate(self) -> None:
+        """Stop the ExifTool process, if there is one."""
+        helper, self._helper = self._helper, None
+        if helper is None:
+            return
+        try:
+            helper.terminate()
+        except _PROCESS_ERRORS:
+            LOGGER.debug("ExifTool process could not be terminated",
+                         exc_info=True)
+
+    def close(self) -> None:
+        """Stop the ExifTool process and forget the memoized metadata."""
+        with self._lock:
+            self._terminate()
+            self._memo.clear()
+
+    def _reset_after_fork(self) -> None:
+        """Forget the process of the parent in a forked child process.
+
+        The parent keeps using its process, so the child must not
+        terminate it.
+        """
+        self._lock = threading.Lock()
+        self._helper = None
+        self._memo.clear()
+
+
+_EXIFTOOL = _SharedExifTool()
+atexit.register(_EXIFTOOL.close)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_EXIFTOOL._reset_after_fork)
+
+
+def exiftool_metadata(filename: str | os.PathLike) -> dict:
+    """
+    Return the metadata of a file read with the shared ExifTool process.
+
+    :param filename: Path to the file
+    :returns: Metadata of the file with the tag names prefixed by their
+        groups. The dictionary must not be modified.
+    :raises ExifToolExecuteError: If ExifTool can not process the file
+    """
+    return _EXIFTOOL.get_metadata(filename)
+
+
+@tool_version("ExifTool")
+def exiftool_version() -> str:
+    """
+    Return the version of the shared ExifTool process.
+
+    The version is resolved once per process and used by both the
+    ExifTool detector and the ExifTool extractors.
+
+    :returns: ExifTool version
+    """
+    return _EXIFTOOL.version()
+
+
+def close_exiftool() -> None:
+    """Stop the shared ExifTool process.
+
+    A new process is started when ExifTool is used next time.
+    """
+    _EXIFTOOL.close()
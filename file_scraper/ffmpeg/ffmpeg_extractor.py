@@ -11,15 +11,17 @@ done with FFMpegExtractor, using FFMpegMeta as the metadata model.
 """
 from __future__ import annotations
 
+import json
 import re
 from collections.abc import Iterator
 
 from file_scraper.base import BaseExtractor
-from file_scraper.shell import Shell
+from file_scraper.shell import AsyncShell, Shell
 from file_scraper.ffmpeg.ffmpeg_model import FFMpegSimpleMeta, FFMpegMeta
 from file_scraper.utils import ensure_text
 from file_scraper.defaults import UNAV
 from file_scraper.logger import LOGGER
+from file_scraper.tool_versions import tool_version
 
 try:
     import ffmpeg
@@ -27,6 +29,30 @@ except ImportError:
     pass
 
 
+@tool_version("ffmpeg")
+def _ffmpeg_version() -> str:
+    """Return the version of FFmpeg.
+
+    :returns: FFmpeg version, or (:unav) if it can not be parsed
+    """
+    tool_shell = Shell(["ffmpeg", "-version"])
+
+    # Find version with capture group to capture integers and dots
+    # until any other character appears.
+    regex = r"[vV]ersion ([\d\.]+)"
+    try:
+        version = next(
+            re.finditer(regex, tool_shell.stdout, re.MULTILINE)
+            ).groups()[0]
+    except StopIteration:
+        LOGGER.warning(
+            "Could not retrieve ffmpeg version from stdout: %s",
+            tool_shell.stdout
+        )
+        version = UNAV
+    return version
+
+
 class FFMpegMetaExtractor(BaseExtractor[FFMpegMeta]):
     """
     Extractor using FFMpeg to gather metadata without well-formed check.
@@ -78,49 +104,79 @@ class FFMpegMetaExtractor(BaseExtractor[FFMpegMeta]):
         """
         try:
             probe_results = ffmpeg.probe(self.filename)
-            probe_results["format"]["index"] = 0
-            for stream in probe_results["streams"]:
-                if "index" not in stream:
-                    stream["index"] = 0
-                else:
-                    stream["index"] = stream["index"] + 1
-
-            if probe_results["format"].get("format_name", UNAV) != "aiff":
-                self._verify_pcm_format(probe_results)
-
-            container = False
-            for index in range(len(probe_results["streams"]) + 1):
-                # FFMpeg has separate "format" (relevant for containers) and
-                # "streams" (relevant for all files) elements in its output.
-                # We know whether we'll have streams + container or just
-                # streams only after scraping the first stream, so there's a
-                # risk of trying to add one too many streams. This check
-                # prevents constructing more metadata models than there are
-                # streams.
-                if not container and index == len(probe_results["streams"]):
-                    break
-
-                self.streams += list(self.iterate_models(
-                    probe_results=probe_results, index=index))
-
-                for stream in self.streams:
-                    container = stream.hascontainer()
-
-            # Some audio and video files need a bit of a special treatment.
-            # They only have one stream, but because ffmpeg reports the format
-            # and the stream's codec separately, file-scraper would print two
-            # streams (one with the real info and one empty) for them without
-            # this check.
-            if probe_results["format"].get("format_long_name", UNAV) in [
-                                "Audio IFF",
-                                "MP2/3 (MPEG audio layer 2/3)",
-                                "raw MPEG video",
-                                "WAV / WAVE (Waveform Audio)"]:
-                self.streams = self.streams[:1]
-
         except ffmpeg.Error as err:
-            self._errors.append("Error in analyzing file with FFProbe.")
-            self._errors.append(ensure_text(err.stderr))
+            self._probe_failed(err.stderr)
+            return
+        self._use_probe_results(probe_results)
+
+    async def _aextract(self) -> None:
+        """
+        Scrape A/V files, running FFProbe asynchronously.
+
+        FFProbe is run with the same command as by :func:`ffmpeg.probe`.
+        """
+        shell = AsyncShell(["ffprobe", "-show_format", "-show_streams",
+                            "-of", "json", self.filename])
+        await shell.apopen()
+        if shell.returncode != 0:
+            self._probe_failed(shell.stderr_raw)
+            return
+        self._use_probe_results(json.loads(shell.stdout))
+
+    def _probe_failed(self, stderr: bytes) -> None:
+        """
+        Report an error in running FFProbe.
+
+        :param stderr: Standard error output of FFProbe
+        """
+        self._errors.append("Error in analyzing file with FFProbe.")
+        self._errors.append(ensure_text(stderr))
+
+    def _use_probe_results(self, probe_results: dict) -> None:
+        """
+        Gather video and audio stream metadata from FFProbe results.
+
+        :param probe_results: FFProbe output as a dictionary
+        """
+        probe_results["format"]["index"] = 0
+        for stream in probe_results["streams"]:
+            if "index" not in stream:
+                stream["index"] = 0
+            else:
+                stream["index"] = stream["index"] + 1
+
+        if probe_results["format"].get("format_name", UNAV) != "aiff":
+            self._verify_pcm_format(probe_results)
+
+        container = False
+        for index in range(len(probe_results["streams"]) + 1):
+            # FFMpeg has separate "format" (relevant for containers) and
+            # "streams" (relevant for all files) elements in its output.
+            # We know whether we'll have streams + container or just
+            # streams only after scraping the first stream, so there's a
+            # risk of trying to add one too many streams. This check
+            # prevents constructing more metadata models than there are
+            # streams.
+            if not container and index == len(probe_results["streams"]):
+                break
+
+            self.streams += list(self.iterate_models(
+                probe_results=probe_results, index=index))
+
+            for stream in self.streams:
+                container = stream.hascontainer()
+
+        # Some audio and video files need a bit of a special treatment.
+        # They only have one stream, but because ffmpeg reports the format
+        # and the stream's codec separately, file-scraper would print two
+        # streams (one with the real info and one empty) for them without
+        # this check.
+        if probe_results["format"].get("format_long_name", UNAV) in [
+                            "Audio IFF",
+                            "MP2/3 (MPEG audio layer 2/3)",
+                            "raw MPEG video",
+                            "WAV / WAVE (Waveform Audio)"]:
+            self.streams = self.streams[:1]
 
     def _verify_pcm_format(self, probe_results: dict) -> None:
         # We deny e.g. A-law PCM, mu-law PCM, DPCM and ADPCM and allow
@@ -155,7 +211,8 @@ class FFMpegMetaExtractor(BaseExtractor[FFMpegMeta]):
                 if md_object.av_format_supported() is not None:
                     yield md_object
 
-    def tools(self) -> dict:
+    @classmethod
+    def tools(cls) -> dict:
         """Return information about the software used by the extractor or
         detector.
 
@@ -164,22 +221,7 @@ class FFMpegMetaExtractor(BaseExtractor[FFMpegMeta]):
             tool (e.g. version). If no tools are available, an empty
             dictionary is returned instead.
         """
-        tool_shell = Shell(["ffmpeg", "-version"])
-
-        # Find version with capture group to capture integers and dots
-        # until any other character appears.
-        regex = r"[vV]ersion ([\d\.]+)"
-        try:
-            version = next(
-                re.finditer(regex, tool_shell.stdout, re.MULTILINE)
-                ).groups()[0]
-        except StopIteration:
-            LOGGER.warning(
-                "Could not retrieve ffmpeg version from stdout: %s",
-                tool_shell.stdout
-            )
-            version = UNAV
-        return {"ffmpeg": {"version": version}}
+        return {"ffmpeg": {"version": _ffmpeg_version()}}
 
 
 class FFMpegExtractor(FFMpegMetaExtractor):
@@ -193,6 +235,9 @@ class FFMpegExtractor(FFMpegMetaExtractor):
     # the case without checking. The proper metadata is still gathered.
     _only_wellformed = True
 
+    # FFMpeg command already run by _aextract
+    _validation_shell: Shell | None = None
+
     @classmethod
     def is_supported(
         cls,
@@ -244,14 +289,32 @@ class FFMpegExtractor(FFMpegMetaExtractor):
         """
         super()._extract()
 
+    async def _aextract(self) -> None:
+        """
+        Scrape A/V files, running FFProbe and FFMpeg asynchronously.
+
+        The results of FFMpeg are used in the validation, see
+        :meth:`_pre_validate_file`.
+        """
+        await super()._aextract()
+        shell = AsyncShell(self._validation_command())
+        await shell.apopen()
+        self._validation_shell = shell
+
     def _validate(self) -> None:
         self._pre_validate_file()
         super()._validate()
 
+    def _validation_command(self) -> list:
+        """Return the FFMpeg command checking the file."""
+        return ["ffmpeg", "-v", "error", "-max_muxing_queue_size", "1024",
+                "-f", "null", "-", "-i", self.filename]
+
     def _pre_validate_file(self) -> None:
         """Validate A/V file"""
-        shell = Shell(["ffmpeg", "-v", "error", "-max_muxing_queue_size",
-                       "1024", "-f", "null", "-", "-i", self.filename])
+        shell = self._validation_shell
+        if shell is None:
+            shell = Shell(self._validation_command())
 
         if shell.returncode != 0:
             self._errors.append(
@@ -7,12 +7,34 @@ import re
 
 from file_scraper.base import BaseExtractor
 from file_scraper.ghostscript.ghostscript_model import GhostscriptMeta
-from file_scraper.shell import Shell
+from file_scraper.shell import AsyncShell, Shell
 from file_scraper.logger import LOGGER
+from file_scraper.tool_versions import tool_version
 from file_scraper.utils import ensure_text
 from file_scraper.defaults import UNAV
 
 
+@tool_version("Ghostscript")
+def _ghostscript_version() -> str:
+    """Return the version of Ghostscript.
+
+    :returns: Ghostscript version, or (:unav) if it can not be parsed
+    """
+    version_shell = Shell(["gs", "-version"])
+    regex = r"Ghostscript ([\d\.]+)"
+    try:
+        version = next(
+            re.finditer(regex, version_shell.stdout, re.MULTILINE)
+            ).groups()[0]
+    except StopIteration:
+        LOGGER.warning(
+            "Could not retrieve GhostScript version from stdout: %s",
+            version_shell.stdout
+        )
+        version = UNAV
+    return version
+
+
 class GhostscriptExtractor(BaseExtractor[GhostscriptMeta]):
     """Ghostscript pdf extractor."""
 
@@ -23,11 +45,26 @@ class GhostscriptExtractor(BaseExtractor[GhostscriptMeta]):
     _allow_unav_mime = True
     _allow_unav_version = True
 
+    def _command(self) -> list:
+        """Return the Ghostscript command checking the file."""
+        return ["gs", "-o", "/dev/null", "-sDEVICE=nullpage", self.filename]
+
     def _extract(self):
         """Scrape file."""
-        shell = Shell(["gs", "-o", "/dev/null", "-sDEVICE=nullpage",
-                       self.filename])
+        self._use_results(Shell(self._command()))
+
+    async def _aextract(self):
+        """Scrape file, running Ghostscript asynchronously."""
+        shell = AsyncShell(self._command())
+        await shell.apopen()
+        self._use_results(shell)
 
+    def _use_results(self, shell):
+        """
+        Scrape file from the results of Ghostscript.
+
+        :param shell: Ghostscript command
+        """
         if shell.returncode != 0:
             self._errors.append(
                 f"Ghostscript returned invalid return code: "
@@ -70,7 +107,8 @@ class GhostscriptExtractor(BaseExtractor[GhostscriptMeta]):
                 return False
         return super().well_formed
 
-    def tools(self):
+    @classmethod
+    def tools(cls):
         """Return information about the software used by the extractor or
         detector.
 
@@ -79,20 +117,7 @@ class GhostscriptExtractor(BaseExtractor[GhostscriptMeta]):
             tool (e.g. version). If no tools are available, an empty
             dictionary is returned instead.
         """
-        version_shell = Shell(["gs", "-version"])
-        regex = r"Ghostscript ([\d\.]+)"
-        try:
-            version = next(
-                re.finditer(regex, version_shell.stdout, re.MULTILINE)
-                ).groups()[0]
-        except StopIteration:
-            LOGGER.warning(
-                "Could not retrieve GhostScript version from stdout: %s",
-                version_shell.stdout
-            )
-            version = UNAV
-
         return {"Ghostscript": {
-            "version": version
+            "version": _ghostscript_version()
             }
         }
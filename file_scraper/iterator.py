@@ -2,6 +2,7 @@
 # flake8: noqa
 from __future__ import annotations
 
+from functools import lru_cache
 from typing import Iterator, TYPE_CHECKING
 from file_scraper.base import BaseDetector, BaseExtractor
 from file_scraper.csv_extractor.csv_extractor import CsvExtractor
@@ -30,6 +31,7 @@ from file_scraper.jhove.jhove_extractor import (JHoveAiffExtractor,
                                                 JHoveWavExtractor)
 from file_scraper.json.json_extractor import JsonExtractor
 from file_scraper.logger import LOGGER
+from file_scraper.probe import FileProbe
 from file_scraper.lxml_extractor.lxml_extractor import LxmlExtractor
 from file_scraper.magic_extractor.magic_extractor import (MagicBinaryExtractor,
                                                           MagicTextExtractor)
@@ -56,15 +58,22 @@ if TYPE_CHECKING:
     from pathlib import Path
 
 
-def iter_detectors(path) -> Iterator[BaseDetector]:
+def iter_detectors(
+    path, probe: FileProbe | None = None
+) -> Iterator[BaseDetector]:
     """
     Iterate detectors.
 
-    We want to keep the detectors in ordered list.
+    We want to keep the detectors in ordered list. All detectors share the
+    same probe, so the beginning and the end of the file are read only
+    once.
 
 
     :param path: Path to file to be detected
+    :param probe: Head and tail of the file. Created if not given.
     """
+    if probe is None:
+        probe = FileProbe(path)
     for detector in [
         EpubDetector,
         FidoDetector,
@@ -74,7 +83,103 @@ def iter_detectors(path) -> Iterator[BaseDetector]:
         SegYDetector,
         ODFDetector,
     ]:
-        yield detector(filename=path)
+        yield detector(filename=path, probe=probe)
+
+
+_EXTRACTORS: list[type[BaseExtractor]] = [
+    CsvExtractor,
+    DbptkExtractor,
+    DetectedMimeVersionMetadataExtractor,
+    DetectedMimeVersionExtractor,
+    DpxExtractor,
+    ExifToolDngExtractor,
+    ExifToolExifExtractor,
+    FFMpegMetaExtractor,
+    FFMpegExtractor,
+    GhostscriptExtractor,
+    JHoveAiffExtractor,
+    JHoveDngExtractor,
+    JHoveEpubExtractor,
+    JHoveGifExtractor,
+    JHoveHtmlExtractor,
+    JHoveJpegExtractor,
+    JHovePdfExtractor,
+    JHoveTiffExtractor,
+    JHoveWavExtractor,
+    JsonExtractor,
+    JpylyzerExtractor,
+    LxmlExtractor,
+    MagicBinaryExtractor,
+    MagicTextExtractor,
+    MediainfoExtractor,
+    OfficeExtractor,
+    PilExtractor,
+    PngcheckExtractor,
+    PsppExtractor,
+    TextEncodingMetaExtractor,
+    TextEncodingExtractor,
+    TextfileExtractor,
+    VerapdfExtractor,
+    VnuExtractor,
+    WandExtractor,
+    WarchaeologyExtractor,
+    WarctoolsFullExtractor,
+    WarctoolsExtractor,
+    XmllintExtractor,
+]
+
+
+@lru_cache(maxsize=1024)
+def _dispatch_index(
+    mimetype: str | None,
+    version: str | None,
+    check_wellformed: bool,
+) -> tuple[type[BaseExtractor], ...]:
+    """
+    Return the extractor candidates for the given file format.
+
+    The result is cached, so the support of each extractor is resolved
+    only once per file format. Extractors whose support depends on the
+    extra parameters are always included, and they must be checked
+    separately for each file.
+
+    :param mimetype: Identified mimetype of the file
+    :param version: Identified file format version
+    :param check_wellformed: True for the full well-formed check, False for
+        just identification and metadata scraping
+    :returns: Tuple of extractor classes in the order they should be run
+    """
+    return tuple(
+        extractor for extractor in _EXTRACTORS
+        if extractor._support_depends_on_params
+        or extractor.is_supported(mimetype, version, check_wellformed)
+    )
+
+
+def extractor_plan(
+    mimetype: str | None,
+    version: str | None,
+    check_wellformed: bool = True,
+    params: dict | None = None,
+) -> list[type[BaseExtractor]]:
+    """
+    Return the extractor classes that support the given file format.
+
+    :param mimetype: Identified mimetype of the file
+    :param version: Identified file format version
+    :param check_wellformed: True for the full well-formed check, False for
+        just identification and metadata scraping
+    :param params: Extra parameters needed for the extractor
+    :returns: List of extractor classes in the order they should be run.
+        The list is empty if none of the extractors supports the file
+        format.
+    """
+    return [
+        extractor
+        for extractor in _dispatch_index(mimetype, version, check_wellformed)
+        if not extractor._support_depends_on_params
+        or extractor.is_supported(mimetype, version, check_wellformed, params)
+    ]
 
 
 def iter_extractors(
@@ -96,66 +201,22 @@ def iter_extractors(
         identification and metadata scraping
     :param params: Extra parameters needed for the extractor
     """
-    extractor_found = False
-
-    extractors: list[type[BaseExtractor]] = [
-        CsvExtractor,
-        DbptkExtractor,
-        DetectedMimeVersionMetadataExtractor,
-        DetectedMimeVersionExtractor,
-        DpxExtractor,
-        ExifToolDngExtractor,
-        ExifToolExifExtractor,
-        FFMpegMetaExtractor,
-        FFMpegExtractor,
-        GhostscriptExtractor,
-        JHoveAiffExtractor,
-        JHoveDngExtractor,
-        JHoveEpubExtractor,
-        JHoveGifExtractor,
-        JHoveHtmlExtractor,
-        JHoveJpegExtractor,
-        JHovePdfExtractor,
-        JHoveTiffExtractor,
-        JHoveWavExtractor,
-        JsonExtractor,
-        JpylyzerExtractor,
-        LxmlExtractor,
-        MagicBinaryExtractor,
-        MagicTextExtractor,
-        MediainfoExtractor,
-        OfficeExtractor,
-        PilExtractor,
-        PngcheckExtractor,
-        PsppExtractor,
-        TextEncodingMetaExtractor,
-        TextEncodingExtractor,
-        TextfileExtractor,
-        VerapdfExtractor,
-        VnuExtractor,
-        WandExtractor,
-        WarchaeologyExtractor,
-        WarctoolsFullExtractor,
-        WarctoolsExtractor,
-        XmllintExtractor,
-    ]
+    extractors = extractor_plan(mimetype, version, check_wellformed, params)
+    LOGGER.debug(
+        "Extractors supporting mimetype %s and version %s: %s",
+        mimetype, version, [extractor.__name__ for extractor in extractors]
+    )
 
     for extractor in extractors:
-        if extractor.is_supported(mimetype, version, check_wellformed, params):
-            extractor_found = True
-            yield extractor(
-                filename=path,
-                mimetype=mimetype,
-                version=version,
-                charset=charset,
-                params=params,
-            )
-        else:
-            LOGGER.debug(
-                "Skipping unsupported extractor %s", extractor.__name__
-            )
-
-    if not extractor_found:
+        yield extractor(
+            filename=path,
+            mimetype=mimetype,
+            version=version,
+            charset=charset,
+            params=params,
+        )
+
+    if not extractors:
         yield ExtractorNotFound (
             filename=path,
             mimetype=mimetype,
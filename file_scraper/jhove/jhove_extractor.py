@@ -9,9 +9,10 @@ except ImportError:
 import re
 
 from file_scraper.base import BaseExtractor
-from file_scraper.shell import Shell
+from file_scraper.shell import AsyncShell, Shell
 from file_scraper.defaults import UNAV
 from file_scraper.logger import LOGGER
+from file_scraper.tool_versions import tool_version
 from file_scraper.jhove.jhove_model import (
     JHoveAiffMeta,
     JHoveBaseMeta,
@@ -31,6 +32,28 @@ from file_scraper.jhove.jhove_model import (
 JHoveMetaT = TypeVar("JHoveMetaT", bound=JHoveBaseMeta)
 
 
+@tool_version("JHOVE")
+def _jhove_version() -> str:
+    """Return the version of JHOVE.
+
+    :returns: JHOVE version, or (:unav) if it can not be parsed
+    """
+    version_shell = Shell(["jhove"])
+
+    regex_jhove = r"App:[\n ]+API: ([\d\.]+)"
+    try:
+        version = next(
+            re.finditer(regex_jhove, version_shell.stdout, re.MULTILINE)
+            ).groups()[0]
+    except StopIteration:
+        LOGGER.warning(
+            "Could not retrieve JHOVE version from stdout: %s",
+            version_shell.stdout
+        )
+        version = UNAV
+    return version
+
+
 class JHoveExtractorBase(BaseExtractor[JHoveMetaT]):
     """Scraping methods for all specific JHove extractors."""
 
@@ -40,10 +63,14 @@ class JHoveExtractorBase(BaseExtractor[JHoveMetaT]):
     _allow_unav_version = True
     _allow_unap_version = True
 
+    # JHove command already run by _aextract
+    _jhove_shell: Shell | None = None
+
     def _base_extract(self) -> lxml.etree._Element:
         """Run JHove command and return XML output."""
-        shell = Shell(["jhove", "-h",
-                       "XML", "-m", self._jhove_module, self.filename])
+        shell = self._jhove_shell
+        if shell is None:
+            shell = Shell(self._jhove_command())
 
         if shell.returncode != 0:
             self._errors.append(
@@ -66,10 +93,27 @@ class JHoveExtractorBase(BaseExtractor[JHoveMetaT]):
         )
         return report
 
+    def _jhove_command(self) -> list:
+        """Return the JHove command checking the file."""
+        return ["jhove", "-h", "XML", "-m", self._jhove_module, self.filename]
+
     def _extract(self) -> None:
         self._base_extract()
 
-    def tools(self) -> dict[str, dict[str, str]]:
+    async def _aextract(self) -> None:
+        """
+        Run JHove asynchronously, and scrape the file from its output.
+
+        The output is handled by :meth:`_extract` of the extractor, which
+        uses the command already run instead of running JHove again.
+        """
+        shell = AsyncShell(self._jhove_command())
+        await shell.apopen()
+        self._jhove_shell = shell
+        self._extract()
+
+    @classmethod
+    def tools(cls) -> dict[str, dict[str, str]]:
         """Return information about the software used by the extractor or
         detector.
 
@@ -78,22 +122,8 @@ class JHoveExtractorBase(BaseExtractor[JHoveMetaT]):
             tool (e.g. version). If no tools are available, an empty
             dictionary is returned instead.
         """
-        version_shell = Shell(["jhove"])
-
-        regex_jhove = r"App:[\n ]+API: ([\d\.]+)"
-        try:
-            version = next(
-                re.finditer(regex_jhove, version_shell.stdout, re.MULTILINE)
-                ).groups()[0]
-        except StopIteration:
-            LOGGER.warning(
-                "Could not retrieve JHOVE version from stdout: %s",
-                version_shell.stdout
-            )
-            version = UNAV
-
         return {"JHOVE": {
-            "version": version
+            "version": _jhove_version()
             }
         }
 
@@ -35,7 +35,8 @@ class JpylyzerExtractor(BaseExtractor[JpylyzerMeta]):
 
         self.streams = list(self.iterate_models())
 
-    def tools(self):
+    @classmethod
+    def tools(cls):
         """Return information about the software used by the extractor or
         detector.
 
@@ -1,5 +1,11 @@
+from __future__ import annotations
+
 from file_scraper.base import BaseExtractor
 from file_scraper.json.json_model import JsonMeta
+from file_scraper.json.json_stream import JsonStatistics, validate_json_stream
+from file_scraper.streaming import ThreadedConsumer, consume_file
+from io import TextIOWrapper
+from typing import BinaryIO
 import json
 
 
@@ -11,17 +17,43 @@ class JsonExtractor(BaseExtractor):
 
     _allow_unap_version = True
 
+    # Documents of at most this many characters are parsed with json.loads,
+    # larger ones are validated in bounded memory
+    _streaming_threshold = 64 * 1024 ** 2
+
+    _consumer = None
+    _statistics: JsonStatistics | None = None
+
+    def stream_consumer(self) -> ThreadedConsumer:
+        """Return a consumer parsing the streamed file."""
+        if self._consumer is None:
+            self._consumer = ThreadedConsumer(self._parse_json)
+        return self._consumer
+
     def _extract(self):
-        with open(self.filename, "rt") as file:
-            try:
-                json.loads(file.read())
-                self._messages.append("The file is a valid JSON document")
-            except (json.JSONDecodeError, UnicodeDecodeError) as e:
-                self._errors.append(
-                    f"{self.__class__.__name__} produced an error: {e}"
-                )
-
-        self.streams = list(self.iterate_models())
-
-    def tools(self) -> dict:
+        consume_file(self.filename, self.stream_consumer())
+        self.streams = list(self.iterate_models(statistics=self._statistics))
+
+    def _parse_json(self, infile: BinaryIO) -> None:
+        """Parse the file and record whether it is valid JSON.
+
+        Small documents are parsed with :func:`json.loads`. Larger ones are
+        validated in chunks without building the objects, collecting also
+        the statistics of the document.
+        """
+        try:
+            textfile = TextIOWrapper(infile)
+            text = textfile.read(self._streaming_threshold + 1)
+            if len(text) <= self._streaming_threshold:
+                json.loads(text)
+            else:
+                self._statistics = validate_json_stream(textfile, prefix=text)
+            self._messages.append("The file is a valid JSON document")
+        except (json.JSONDecodeError, UnicodeDecodeError) as e:
+            self._errors.append(
+                f"{self.__class__.__name__} produced an error: {e}"
+            )
+
+    @classmethod
+    def tools(cls) -> dict:
         return {}
@@ -1,4 +1,8 @@
+from __future__ import annotations
+
 from file_scraper.base import BaseMeta
+from file_scraper.exceptions import SkipElementException
+from file_scraper.json.json_stream import JsonStatistics
 
 from dpres_file_formats.defaults import UnknownValue
 
@@ -20,6 +24,15 @@ class JsonMeta(BaseMeta):
     }
     _allow_any_version = False
 
+    def __init__(self, statistics: JsonStatistics | None = None) -> None:
+        """
+        Initialize the metadata model.
+
+        :param statistics: Statistics of the document, if it was validated
+            in chunks
+        """
+        self._statistics = statistics
+
     @BaseMeta.metadata()
     def stream_type(self):
         """
@@ -39,3 +52,27 @@ class JsonMeta(BaseMeta):
         :returns: "(:unap)"
         """
         return UnknownValue.UNAP
+
+    @BaseMeta.metadata()
+    def top_level_type(self) -> str:
+        """
+        Return the type of the top-level value of the document.
+
+        The statistics are collected only when the document is validated
+        in chunks.
+        """
+        if self._statistics is None:
+            raise SkipElementException()
+        return self._statistics.top_level_type
+
+    @BaseMeta.metadata()
+    def max_depth(self) -> str:
+        """
+        Return the maximum nesting depth of objects and arrays.
+
+        The statistics are collected only when the document is validated
+        in chunks.
+        """
+        if self._statistics is None:
+            raise SkipElementException()
+        return str(self._statistics.max_depth)
@@ -0,0 +1,302 @@
+"""Validate the syntax of a JSON document in bounded memory.
+
+:func:`json.loads` builds the whole document in memory, which needs
+several times the size of the file. :func:`validate_json_stream` reads the
+document in chunks and checks its syntax without building the objects and
+arrays. Only the current chunk and the stack of the open objects and
+arrays are kept in memory.
+
+Strings, numbers and literals are parsed with the scanner of the json
+module, and the errors are reported as :class:`json.JSONDecodeError` with
+the same messages and positions as :func:`json.loads` would report.
+"""
+from __future__ import annotations
+
+import json
+import re
+from typing import NamedTuple, TextIO
+
+# Number of characters read at a time
+JSON_CHUNK_SIZE = 1024 * 1024
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+# Scanner of the json module for strings, numbers and literals
+_SCAN_ONCE = json.JSONDecoder().scan_once
+
+# Numbers and literals are scanned with at least this many characters
+# available, unless the document ends. The longest literal is -Infinity.
+_LOOKAHEAD = 32
+
+# Runs of scalar members of an array or an object following a member,
+# skipped with a single match. Each scalar must be followed by a delimiter
+# in the buffer, so that a number continuing in the next chunk is not
+# matched. Anything else, including every error, is left to the scanner.
+_STRING = (
+    r'"[^"\\\x00-\x1f]*'
+    r'(?:\\(?:["\\/bfnrt]|u[0-9a-fA-F]{4})[^"\\\x00-\x1f]*)*"'
+)
+_SCALAR = (
+    rf"(?:{_STRING}|-?(?:0|[1-9][0-9]*)(?:\.[0-9]+)?(?:[eE][-+]?[0-9]+)?"
+    r"|true|false|null|NaN|-?Infinity)(?=[ \t\n\r,\]}])"
+)
+_WS = r"[ \t\n\r]*"
+_MEMBER_RUNS = {
+    "]": re.compile(rf"(?:{_WS},{_WS}{_SCALAR})*"),
+    "}": re.compile(rf"(?:{_WS},{_WS}{_STRING}{_WS}:{_WS}{_SCALAR})*"),
+}
+
+_TOP_LEVEL_TYPES = {
+    "{": "object",
+    "[": "array",
+    '"': "string",
+    "t": "boolean",
+    "f": "boolean",
+    "n": "null",
+}
+
+
+def _trailing_comma_message(document: str) -> str | None:
+    """Return the error message of json for a trailing comma.
+
+    Newer Python versions report a trailing comma in an object or an array
+    with a separate message at the position of the comma.
+
+    :param document: Document ending with a trailing comma
+    :returns: Error message, or None if the trailing comma is reported as
+        a missing value or property name
+    """
+    try:
+        json.loads(document)
+    except json.JSONDecodeError as error:
+        if error.pos == document.rindex(","):
+            return error.msg
+    return None
+
+
+_TRAILING_COMMA_MESSAGES = {
+    "}": _trailing_comma_message('{"a": 0,}'),
+    "]": _trailing_comma_message("[0,]"),
+}
+
+
+class JsonStatistics(NamedTuple):
+    """Statistics of a valid JSON document."""
+    top_level_type: str
+    max_depth: int
+
+
+class _StreamDecodeError(json.JSONDecodeError):
+    """JSONDecodeError for a position in a document read in chunks."""
+
+    # pylint: disable=super-init-not-called
+    def __init__(self, msg: str, pos: int, lineno: int, colno: int) -> None:
+        ValueError.__init__(
+            self, f"{msg}: line {lineno} column {colno} (char {pos})")
+        self.msg = msg
+        self.doc = None
+        self.pos = pos
+        self.lineno = lineno
+        self.colno = colno
+
+
+class _JsonStream:
+    """Buffer of a JSON document read in chunks.
+
+    The characters before :attr:`pos` are discarded when more of the
+    document is read, except from :attr:`mark` on, if it is set. The lines
+    of the discarded characters are counted for the error positions.
+    """
+
+    def __init__(self, textfile: TextIO, prefix: str) -> None:
+        self._textfile = textfile
+        self.buffer = prefix
+        self.pos = 0
+        self.mark: int | None = None
+        self.eof = False
+        self._offset = 0
+        self._lines = 0
+        self._last_newline = -1
+
+    def fill(self, size: int = JSON_CHUNK_SIZE) -> None:
+        """Read more of the document to the buffer.
+
+        :param size: Minimum number of characters to read
+        """
+        start = self.pos if self.mark is None else min(self.pos, self.mark)
+        consumed = self.buffer[:start]
+        newlines = consumed.count("\n")
+        if newlines:
+            self._lines += newlines
+            self._last_newline = self._offset + consumed.rindex("\n")
+        self._offset += start
+
+        chunk = self._textfile.read(max(size, JSON_CHUNK_SIZE))
+        self.eof = not chunk
+        self.buffer = self.buffer[start:] + chunk
+        self.pos -= start
+        if self.mark is not None:
+            self.mark -= start
+
+    def peek(self) -> str:
+        """Return the current character, or "" at the end."""
+        while self.pos >= len(self.buffer) and not self.eof:
+            self.fill()
+        return self.buffer[self.pos:self.pos + 1]
+
+    def skip_whitespace(self) -> None:
+        """Skip the whitespace at the current position."""
+        self.pos = _WHITESPACE.match(self.buffer, self.pos).end()
+        while self.pos == len(self.buffer) and not self.eof:
+            self.fill()
+            self.pos = _WHITESPACE.match(self.buffer, self.pos).end()
+
+    def error(self, msg: str, pos: int | None = None) -> _StreamDecodeError:
+        """Return an error at a position of the buffer.
+
+        :param msg: Error message
+        :param pos: Position in the buffer, by default the current
+            position
+        :returns: Error with the position in the whole document
+        """
+        if pos is None:
+            pos = self.pos
+        lineno = self._lines + self.buffer.count("\n", 0, pos) + 1
+        last_newline = self.buffer.rfind("\n", 0, pos)
+        if last_newline == -1:
+            colno = self._offset + pos - self._last_newline
+        else:
+            colno = pos - last_newline
+        return _StreamDecodeError(msg, self._offset + pos, lineno, colno)
+
+    def scan_value(self) -> None:
+        """Scan a string, a number or a literal at the current position.
+
+        More of the document is read until the whole value is in the
+        buffer.
+
+        :raises json.JSONDecodeError: If there is no valid value
+        """
+        if self.peek() == '"':
+            self._scan_string()
+            return
+
+        while len(self.buffer) - self.pos < _LOOKAHEAD and not self.eof:
+            self.fill()
+        while True:
+            try:
+                _, end = _SCAN_ONCE(self.buffer, self.pos)
+            except StopIteration:
+                raise self.error("Expecting value") from None
+            # A number may continue in the next chunk
+            if end < len(self.buffer) - 2 or self.eof:
+                self.pos = end
+                return
+            self.fill()
+
+    def _scan_string(self) -> None:
+        """Scan a string at the current position."""
+        while True:
+            try:
+                _, end = _SCAN_ONCE(self.buffer, self.pos)
+            except json.JSONDecodeError as error:
+                truncated = (error.msg.startswith("Unterminated string")
+                             or error.pos >= len(self.buffer) - 6)
+                if not truncated or self.eof:
+                    raise self.error(error.msg, error.pos) from None
+                # Read at least as much as there is in the buffer, so that
+                # a long string is not scanned again for every chunk
+                self.fill(len(self.buffer))
+            else:
+                self.pos = end
+                return
+
+
+def validate_json_stream(
+    textfile: TextIO, prefix: str = ""
+) -> JsonStatistics:
+    """Check the syntax of a JSON document read in chunks.
+
+    The document is valid if :func:`json.loads` would accept it. The
+    objects and arrays are not built, so only the longest string or
+    number of the document needs to fit in memory at once.
+
+    :param textfile: Text file of the document
+    :param prefix: Beginning of the document already read from the file
+    :returns: Type of the top-level value and the maximum nesting depth
+        of objects and arrays
+    :raises json.JSONDecodeError: If the document is not valid JSON
+    """
+    stream = _JsonStream(textfile, prefix)
+    if stream.peek() == "\ufeff":
+        raise stream.error("Unexpected UTF-8 BOM (decode using utf-8-sig)")
+
+    # Closing characters of the open objects and arrays
+    stack: list[str] = []
+    max_depth = 0
+    stream.skip_whitespace()
+    top_level_type = _TOP_LEVEL_TYPES.get(stream.peek(), "number")
+
+    expecting_value = True
+    while True:
+        if expecting_value:
+            char = stream.peek()
+            if char and char in "{[":
+                stack.append("}" if char == "{" else "]")
+                max_depth = max(max_depth, len(stack))
+                stream.pos += 1
+                stream.skip_whitespace()
+                if stream.peek() == stack[-1]:
+                    stream.pos += 1
+                    stack.pop()
+                    expecting_value = False
+                elif char == "{":
+                    _scan_key(stream)
+                continue
+            stream.scan_value()
+            expecting_value = False
+
+        if stack:
+            stream.pos = _MEMBER_RUNS[stack[-1]].match(
+                stream.buffer, stream.pos).end()
+        stream.skip_whitespace()
+        if not stack:
+            if stream.peek():
+                raise stream.error("Extra data")
+            return JsonStatistics(top_level_type, max_depth)
+
+        char = stream.peek()
+        if char == stack[-1]:
+            stream.pos += 1
+            stack.pop()
+            continue
+        if char != ",":
+            raise stream.error("Expecting ',' delimiter")
+        stream.mark = stream.pos
+        stream.pos += 1
+        stream.skip_whitespace()
+        trailing_comma_message = _TRAILING_COMMA_MESSAGES[stack[-1]]
+        if trailing_comma_message and stream.peek() == stack[-1]:
+            raise stream.error(trailing_comma_message, stream.mark)
+        stream.mark = None
+        if stack[-1] == "}":
+            _scan_key(stream)
+        expecting_value = True
+
+
+def _scan_key(stream: _JsonStream) -> None:
+    """Scan a property name and the following colon of an object.
+
+    :param stream: Document positioned to the property name
+    :raises json.JSONDecodeError: If there is no valid property name
+        followed by a colon
+    """
+    if stream.peek() != '"':
+        raise stream.error(
+            "Expecting property name enclosed in double quotes")
+    stream.scan_value()
+    stream.skip_whitespace()
+    if stream.peek() != ":":
+        raise stream.error("Expecting ':' delimiter")
+    stream.pos += 1
+    stream.skip_whitespace()
@@ -2,6 +2,7 @@
 
 from lxml import etree
 
+from file_scraper.artifacts import XML_TREE, parse_xml
 from file_scraper.base import BaseExtractor
 from file_scraper.defaults import COMPATIBLE_ENCODINGS
 from file_scraper.lxml_extractor.lxml_model import LxmlMeta
@@ -15,6 +16,7 @@ class LxmlExtractor(BaseExtractor[LxmlMeta]):
     _only_wellformed = True  # Only well-formed check
     _allow_unav_mime = True
     _allow_unav_version = True
+    _artifacts = (XML_TREE,)
 
     @classmethod
     def is_supported(cls, mimetype, version=None,
@@ -47,35 +49,29 @@ class LxmlExtractor(BaseExtractor[LxmlMeta]):
         # that SyntaxError is raised for example when unsupported
         # encoding is used in XML header
         tree = None
-        parser = etree.XMLParser(
-            dtd_validation=False,
-            no_network=True,
-            resolve_entities=False,
-            recover=False,
-        )
-        with self.filename.open("rb") as file_:
-            try:
-                # Try to parse with `recover=False` first to catch
-                # errors that prevent reading encoding from the header
-                tree = etree.parse(file_, parser)
-            except OSError:
-                # OSError could be caused for example by invalid
-                # bytes in character encoding, in which case parsing the
-                # file with 'recover' option could work.
-                pass
-            except etree.XMLSyntaxError as exception:
-                if exception.code in (4, 32):
-                    # https://gitlab.gnome.org/GNOME/libxml2/-/blob/master/include/libxml/xmlerror.h
-                    # 4: XML_ERR_DOCUMENT_EMPTY
-                    # This error would lead to uninitialized
-                    # ElementTree, so character encoding could not be
-                    # extracted
-                    # 32: XML_ERR_UNSUPPORTED_ENCODING
-                    # This error would be omitted if `recover=true` was
-                    # used, and lxml would report UTF-8 as a fallback
-                    # value
-                    self._errors.append(str(exception))
-                    return
+        try:
+            # Try to parse with `recover=False` first to catch
+            # errors that prevent reading encoding from the header.
+            # The tree is shared with the other extractors of the file.
+            tree = self._artifact(XML_TREE, lambda: parse_xml(self.filename))
+        except OSError:
+            # OSError could be caused for example by invalid
+            # bytes in character encoding, in which case parsing the
+            # file with 'recover' option could work.
+            pass
+        except etree.XMLSyntaxError as exception:
+            if exception.code in (4, 32):
+                # https://gitlab.gnome.org/GNOME/libxml2/-/blob/master/include/libxml/xmlerror.h
+                # 4: XML_ERR_DOCUMENT_EMPTY
+                # This error would lead to uninitialized
+                # ElementTree, so character encoding could not be
+                # extracted
+                # 32: XML_ERR_UNSUPPORTED_ENCODING
+                # This error would be omitted if `recover=true` was
+                # used, and lxml would report UTF-8 as a fallback
+                # value
+                self._errors.append(str(exception))
+                return
 
         # Parsing with `recover=False` might raise XMLSyntaxErrors at
         # least for some valid HTML files, so we have to parse with
@@ -125,7 +121,8 @@ class LxmlExtractor(BaseExtractor[LxmlMeta]):
                 f"{self._predefined_charset}"
             )
 
-    def tools(self):
+    @classmethod
+    def tools(cls):
         """Return information about the software used by the extractor or
         detector.
 
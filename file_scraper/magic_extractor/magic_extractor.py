@@ -75,7 +75,8 @@ class MagicBaseExtractor(BaseExtractor[MagicMetaT]):
             predefined_mimetype=self._predefined_mimetype,
         ))
 
-    def tools(self) -> dict[str, dict[str, str]]:
+    @classmethod
+    def tools(cls) -> dict[str, dict[str, str]]:
         """Return information about the software used by the extractor or
         detector.
 
@@ -6,14 +6,132 @@
 """
 from __future__ import annotations
 import ctypes
+import os
+import threading
+from contextlib import contextmanager
 from pathlib import Path
 from typing import TYPE_CHECKING
 from file_scraper.paths import resolve_path_from_config
+from file_scraper.tool_versions import tool_version
 
 if TYPE_CHECKING:
+    from collections.abc import Iterator
+
     import magic
 
 
+class _MagicCookiePool:
+    """Loaded magic cookies shared by the threads of the process.
+
+    Loading the magic database is expensive, so the loaded cookies are
+    reused for all files analyzed in the process, also by short-lived
+    threads such as the extractor threads of a scraping or the request
+    threads of the scraper server. A cookie can not be used by multiple
+    threads at the same time, so each analysis checks a cookie out of the
+    pool and returns it afterwards. A new cookie is loaded only if all
+    the cookies for the flags are in use.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._idle: dict[int, list[magic.Magic]] = {}
+        self._generation = 0
+
+    @contextmanager
+    def checkout(
+        self, magic_lib: type[magic], magic_type: int
+    ) -> Iterator[magic.Magic | None]:
+        """Check out a loaded cookie for the given flags.
+
+        :param magic_lib: Magic module
+        :param magic_type: Magic type (flags) to open magic library
+        :returns: Context manager of a loaded magic cookie, or None if the
+            cookie could not be opened
+        """
+        with self._lock:
+            idle = self._idle.get(magic_type)
+            cookie = idle.pop() if idle else None
+            generation = self._generation
+
+        if cookie is None:
+            cookie = magic_lib.open(magic_type)
+            if cookie is None:
+                yield None
+                return
+            cookie.load()
+
+        try:
+            yield cookie
+        finally:
+            with self._lock:
+                if generation == self._generation:
+                    self._idle.setdefault(magic_type, []).append(cookie)
+                    cookie = None
+            # Closed while the cookie was checked out
+            if cookie is not None:
+                cookie.close()
+
+    def close(self) -> None:
+        """Close all cookies not in use.
+
+        The cookies in use are closed when they are returned.
+        """
+        with self._lock:
+            idle, self._idle = self._idle, {}
+            self._generation += 1
+        for cookies in idle.values():
+            for cookie in cookies:
+                cookie.close()
+
+    def _reset_after_fork(self) -> None:
+        """Start with an empty pool in a forked child process.
+
+        The lock may have been held by another thread of the parent, and
+        the cookies checked out by the other threads are never returned
+        in the child.
+        """
+        self._lock = threading.Lock()
+        idle, self._idle = self._idle, {}
+        self._generation += 1
+        for cookies in idle.values():
+            for cookie in cookies:
+                cookie.close()
+
+
+_COOKIES = _MagicCookiePool()
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_COOKIES._reset_after_fork)
+
+# Latest errors of the magic analyses of each thread by the flags
+_THREAD_ERRORS = threading.local()
+
+
+def close_magic_cookies() -> None:
+    """Close the loaded magic cookies.
+
+    The cookies are opened again when needed. Closing is needed only if the
+    magic database is changed while the process is running.
+    """
+    _COOKIES.close()
+
+
+def _record_error(
+    magic_type: int, cookie: magic.Magic, result: str | None
+) -> str | None:
+    """Record the error of a failed analysis for :func:`magic_error`.
+
+    :param magic_type: Magic type used in the analysis
+    :param cookie: Cookie used in the analysis
+    :param result: Result of the analysis
+    :returns: The result
+    """
+    errors = getattr(_THREAD_ERRORS, "errors", None)
+    if errors is None:
+        errors = _THREAD_ERRORS.errors = {}
+    errors[magic_type] = cookie.error() if result is None else None
+    return result
+
+
 def magic_analyze(
     magic_lib: type[magic], magic_type: int, path: str | Path
 ) -> str | None:
@@ -24,12 +142,37 @@ def magic_analyze(
     :param path: File path to analyze
     :returns: Result from the magic module
     """
-    magic_ = magic_lib.open(magic_type)
-    if magic_ is not None:
-        magic_.load()
-        magic_result = magic_.file(path)
-        magic_.close()
-        return magic_result
+    with _COOKIES.checkout(magic_lib, magic_type) as magic_:
+        if magic_ is not None:
+            return _record_error(magic_type, magic_, magic_.file(path))
+    return None
+
+
+def magic_error(magic_lib: type[magic], magic_type: int) -> str | None:
+    """Return the error of the latest magic analysis of the current thread.
+
+    :param magic_lib: Magic module
+    :param magic_type: Magic type used in the failed analysis
+    :returns: Error message from the magic module, or None if there was
+        no error or the magic library could not be opened
+    """
+    # pylint: disable=unused-argument
+    return getattr(_THREAD_ERRORS, "errors", {}).get(magic_type)
+
+
+def magic_analyze_buffer(
+    magic_lib: type[magic], magic_type: int, buffer: bytes
+) -> str | None:
+    """Analyze a buffer with given magic module.
+
+    :param magic_lib: Magic module
+    :param magic_type: Magic type to open magic library
+    :param buffer: Contents of a file to analyze
+    :returns: Result from the magic module
+    """
+    with _COOKIES.checkout(magic_lib, magic_type) as magic_:
+        if magic_ is not None:
+            return _record_error(magic_type, magic_, magic_.buffer(buffer))
     return None
 
 
@@ -48,6 +191,7 @@ def magiclib() -> type[magic]:
     return magic
 
 
+@tool_version("libmagic")
 def magiclib_version() -> str:
     """
     Define missing version function for the magic library
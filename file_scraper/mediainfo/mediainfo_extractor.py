@@ -161,7 +161,8 @@ class MediainfoExtractor(BaseExtractor[BaseMediainfoMeta]):
 
         return not truncated and track_found
 
-    def tools(self):
+    @classmethod
+    def tools(cls):
         """Return information about the software used by the extractor or
         detector.
 
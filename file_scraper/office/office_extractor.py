@@ -5,10 +5,21 @@ import tempfile
 
 from file_scraper.base import BaseExtractor
 from file_scraper.logger import LOGGER
+from file_scraper.tool_versions import tool_version
 from file_scraper.office.office_model import OfficeMeta
 from file_scraper.shell import Shell
 
 
+@tool_version("libreoffice")
+def _libreoffice_version() -> str:
+    """Return the version of LibreOffice.
+
+    :returns: LibreOffice version
+    """
+    version_shell = Shell(["soffice", "--version"])
+    return version_shell.stdout.split(" ")[1]
+
+
 class OfficeExtractor(BaseExtractor[OfficeMeta]):
     """Office file format extractor."""
 
@@ -45,7 +56,8 @@ class OfficeExtractor(BaseExtractor[OfficeMeta]):
             shutil.rmtree(temp_dir)
             self.streams = list(self.iterate_models())
 
-    def tools(self):
+    @classmethod
+    def tools(cls):
         """Return information about the software used by the extractor or
         detector.
 
@@ -54,9 +66,8 @@ class OfficeExtractor(BaseExtractor[OfficeMeta]):
             tool (e.g. version). If no tools are available, an empty
             dictionary is returned instead.
         """
-        version_shell = Shell(["soffice", "--version"])
         return {
             "libreoffice": {
-                "version": version_shell.stdout.split(" ")[1]
+                "version": _libreoffice_version()
             }
         }
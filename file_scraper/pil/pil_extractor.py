@@ -123,7 +123,8 @@ class PilExtractor(BaseExtractor[BasePilMeta]):
                         self.iterate_models(pil=pil, index=pil_index)
                     )
 
-    def tools(self) -> dict[str, dict[str, str]]:
+    @classmethod
+    def tools(cls) -> dict[str, dict[str, str]]:
         """Return information about the software used by the extractor or
         detector.
 
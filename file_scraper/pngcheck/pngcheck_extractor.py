@@ -4,10 +4,34 @@ import re
 from file_scraper.base import BaseExtractor
 from file_scraper.shell import Shell
 from file_scraper.logger import LOGGER
+from file_scraper.tool_versions import tool_version
 from file_scraper.pngcheck.pngcheck_model import PngcheckMeta
 from file_scraper.defaults import UNAV
 
 
+@tool_version("PNGcheck")
+def _pngcheck_version() -> str:
+    """Return the version of pngcheck.
+
+    :returns: pngcheck version, or (:unav) if it can not be parsed
+    """
+    tool_shell = Shell(["pngcheck"], use_pty=True)
+    # Find version with capture group to capture integers and dots
+    # until any other character appears.
+    regex = r"[vV]ersion ([\d\.]+)"
+    try:
+        version = next(
+            re.finditer(regex, tool_shell.stdout, re.MULTILINE)
+            ).groups()[0]
+    except StopIteration:
+        LOGGER.warning(
+            "Could not find pngcheck version from stdout: %s",
+            tool_shell.stdout
+        )
+        version = UNAV
+    return version
+
+
 class PngcheckExtractor(BaseExtractor[PngcheckMeta]):
     """
     Pngcheck extractor.
@@ -36,7 +60,8 @@ class PngcheckExtractor(BaseExtractor[PngcheckMeta]):
         # so checking is not useful. Just add metadata models.
         self.streams = list(self.iterate_models())
 
-    def tools(self):
+    @classmethod
+    def tools(cls):
         """Return information about the software used by the extractor or
         detector.
 
@@ -45,19 +70,4 @@ class PngcheckExtractor(BaseExtractor[PngcheckMeta]):
             tool (e.g. version). If no tools are available, an empty
             dictionary is returned instead.
         """
-
-        tool_shell = Shell(["pngcheck"], use_pty=True)
-        # Find version with capture group to capture integers and dots
-        # until any other character appears.
-        regex = r"[vV]ersion ([\d\.]+)"
-        try:
-            version = next(
-                re.finditer(regex, tool_shell.stdout, re.MULTILINE)
-                ).groups()[0]
-        except StopIteration:
-            LOGGER.warning(
-                "Could not find pngcheck version from stdout: %s",
-                tool_shell.stdout
-            )
-            version = UNAV
-        return {"PNGcheck": {"version": version}}
+        return {"PNGcheck": {"version": _pngcheck_version()}}
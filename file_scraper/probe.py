@@ -0,0 +1,209 @@
+"""Shared view to the beginning and the end of a file.
+
+Most detectors identify a file from a few bytes at the beginning or the
+end of the file. Instead of each detector opening and reading the file,
+the head and the tail of the file are read once into a FileProbe, which is
+shared by all detectors of a file. The central directory of a ZIP archive
+is likewise parsed once into a ZipIndex shared by the detectors.
+"""
+from __future__ import annotations
+
+import os
+import zipfile
+from pathlib import Path
+from typing import IO, Any
+
+PROBE_SIZE = 128 * 1024
+
+# Signature of the end of central directory record of a ZIP archive. The
+# record is within the last 22 + 65535 bytes of the archive.
+_ZIP_END_SIGNATURE = b"PK\x05\x06"
+_ZIP_END_MAX_DISTANCE = 22 + 65535
+
+
+class ZipIndex:
+    """Central directory of a ZIP archive, parsed once.
+
+    The archive is kept open, so that the members can be read without
+    parsing the central directory again. The index must be closed when it
+    is no longer needed.
+    """
+
+    def __init__(self, zipf: zipfile.ZipFile) -> None:
+        """Initialize the index.
+
+        :param zipf: Opened ZIP archive
+        """
+        self._zipfile = zipf
+        self.infolist: list[zipfile.ZipInfo] = zipf.infolist()
+        self.names: list[str] = [info.filename for info in self.infolist]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._zipfile.NameToInfo
+
+    def getinfo(self, name: str) -> zipfile.ZipInfo:
+        """Return the info (sizes, offset etc.) of a member.
+
+        :param name: Name of the member
+        :returns: Info of the member
+        :raises KeyError: If the member is not found
+        """
+        return self._zipfile.getinfo(name)
+
+    def open(self, name: str) -> IO[bytes]:
+        """Open a member of the archive.
+
+        :param name: Name of the member
+        :returns: File object of the member
+        """
+        return self._zipfile.open(name)
+
+    def read(self, name: str) -> bytes:
+        """Read a member of the archive.
+
+        :param name: Name of the member
+        :returns: Contents of the member
+        """
+        return self._zipfile.read(name)
+
+    def close(self) -> None:
+        """Close the archive."""
+        self._zipfile.close()
+
+
+class FileProbe:
+    """Head and tail of a file, read once and shared by the detectors.
+
+    The file is read when the probe is used for the first time, so
+    creating a probe is cheap. At most ``head_size`` bytes from the
+    beginning and ``tail_size`` bytes from the end of the file are read
+    using a single open file.
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike,
+        head_size: int = PROBE_SIZE,
+        tail_size: int = PROBE_SIZE,
+    ) -> None:
+        """Initialize the probe.
+
+        :param path: Path to the file
+        :param head_size: Number of bytes read from the beginning of the
+            file
+        :param tail_size: Number of bytes read from the end of the file
+        """
+        self.path = Path(path)
+        self.head_size = head_size
+        self.tail_size = tail_size
+        self._size: int | None = None
+        self._head = b""
+        self._tail = b""
+        self._zip_index: ZipIndex | None = None
+        self._zip_checked = False
+
+    def __enter__(self) -> FileProbe:
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close the ZIP archive opened by :attr:`zip_index`.
+
+        The probe can still be used after closing; the archive is opened
+        again if needed.
+        """
+        if self._zip_index is not None:
+            self._zip_index.close()
+        self._zip_index = None
+        self._zip_checked = False
+
+    def _read(self) -> None:
+        """Read the head and the tail of the file, if not read already."""
+        if self._size is not None:
+            return
+
+        with open(self.path, "rb") as infile:
+            size = os.fstat(infile.fileno()).st_size
+            head = infile.read(self.head_size)
+            if len(head) >= size:
+                tail = head[-self.tail_size:]
+            else:
+                start = max(size - self.tail_size, len(head))
+                infile.seek(start)
+                tail = infile.read()
+                if start > size - self.tail_size:
+                    # The head and the tail overlap
+                    tail = (head + tail)[-self.tail_size:]
+
+        self._head = head
+        self._tail = tail
+        self._size = size
+
+    @property
+    def size(self) -> int:
+        """Size of the file in bytes."""
+        self._read()
+        return self._size
+
+    @property
+    def head(self) -> bytes:
+        """Beginning of the file, at most ``head_size`` bytes."""
+        self._read()
+        return self._head
+
+    @property
+    def tail(self) -> bytes:
+        """End of the file, at most ``tail_size`` bytes."""
+        self._read()
+        return self._tail
+
+    @property
+    def complete(self) -> bool:
+        """True if the whole file is contained in the head."""
+        return len(self.head) >= self.size
+
+    def first_line(self) -> bytes | None:
+        """Return the first line of the file.
+
+        :returns: First line including the line terminator, or None if the
+            line does not fit in the head.
+        """
+        end = self.head.find(b"\n")
+        if end != -1:
+            return self.head[:end + 1]
+        if self.complete:
+            return self.head
+        return None
+
+    @property
+    def zip_index(self) -> ZipIndex | None:
+        """Central directory of the file if it is a ZIP archive.
+
+        The tail of the file is first checked for the end of central
+        directory record, so that files which are not ZIP archives are not
+        opened again. A file is regarded as a ZIP archive if it can be
+        opened with :class:`zipfile.ZipFile`, as in
+        :func:`file_scraper.utils.is_zipfile`.
+
+        :returns: Index of the ZIP archive, or None if the file is not a
+            ZIP archive
+        """
+        if self._zip_checked:
+            return self._zip_index
+        self._zip_checked = True
+
+        tail_covers_end_record = (
+            self.tail_size >= _ZIP_END_MAX_DISTANCE or self.complete
+        )
+        if (
+            tail_covers_end_record
+            and _ZIP_END_SIGNATURE not in self.tail[-_ZIP_END_MAX_DISTANCE:]
+        ):
+            return None
+        try:
+            self._zip_index = ZipIndex(zipfile.ZipFile(self.path))
+        except (OSError, zipfile.BadZipFile):
+            return None
+        return self._zip_index
@@ -10,11 +10,34 @@ from file_scraper.base import BaseExtractor
 from file_scraper.shell import Shell
 from file_scraper.defaults import UNAV
 from file_scraper.logger import LOGGER
+from file_scraper.tool_versions import tool_version
 from file_scraper.pspp.pspp_model import PsppMeta
 
 SPSS_PORTABLE_HEADER = b"SPSS PORT FILE"
 
 
+@tool_version("GNU PSPP")
+def _pspp_version() -> str:
+    """Return the version of GNU PSPP.
+
+    :returns: GNU PSPP version, or (:unav) if it can not be parsed
+    """
+    tool_shell = Shell(["pspp-convert", "--version"])
+
+    regex = r"\(GNU PSPP\) ([\d\.]+)"
+    try:
+        version = next(
+            re.finditer(regex, tool_shell.stdout, re.MULTILINE)
+            ).groups()[0]
+    except StopIteration:
+        LOGGER.debug(
+            "Could not parse PSPP version from stdout: %s",
+            tool_shell.stdout
+        )
+        version = UNAV
+    return version
+
+
 class PsppExtractor(BaseExtractor[PsppMeta]):
     """PSPP extractor."""
 
@@ -59,7 +82,8 @@ class PsppExtractor(BaseExtractor[PsppMeta]):
 
         self.streams = list(self.iterate_models(well_formed=self.well_formed))
 
-    def tools(self):
+    @classmethod
+    def tools(cls):
         """Return information about the software used by the extractor or
         detector.
 
@@ -68,17 +92,4 @@ class PsppExtractor(BaseExtractor[PsppMeta]):
             tool (e.g. version). If no tools are available, an empty
             dictionary is returned instead.
         """
-        tool_shell = Shell(["pspp-convert", "--version"])
-
-        regex = r"\(GNU PSPP\) ([\d\.]+)"
-        try:
-            version = next(
-                re.finditer(regex, tool_shell.stdout, re.MULTILINE)
-                ).groups()[0]
-        except StopIteration:
-            LOGGER.debug(
-                "Could not parse PSPP version from stdout: %s",
-                tool_shell.stdout
-            )
-            version = UNAV
-        return {"GNU PSPP": {"version": version}}
+        return {"GNU PSPP": {"version": _pspp_version()}}
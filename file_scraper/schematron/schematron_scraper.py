@@ -1,22 +1,114 @@
 """Schematron extractor."""
 from __future__ import annotations
 
+import asyncio
+import fcntl
 import os
 import shutil
 import tempfile
 import re
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from contextlib import contextmanager
+from functools import lru_cache
+from collections.abc import Iterable, Iterator
 from pathlib import Path
+from typing import NamedTuple
 
 from lxml import etree
 
 from file_scraper.base import BaseExtractor
-from file_scraper.shell import Shell
+from file_scraper.shell import AsyncShell, Shell
 from file_scraper.paths import resolve_path_from_config
 from file_scraper.defaults import UNAV
 from file_scraper.logger import LOGGER
+from file_scraper.tool_versions import tool_version
 from file_scraper.schematron.schematron_model import SchematronMeta
 from file_scraper.utils import hexdigest, ensure_text
 
+# Stylesheets compiling a schematron file into a validator stylesheet, in
+# the order they are applied
+COMPILE_STYLESHEETS = (
+    "iso_dsdl_include.xsl",
+    "iso_abstract_expand.xsl",
+    "optimize_schematron.xsl",
+    "iso_svrl_for_xslt1.xsl",
+)
+
+# Maximum template recursion depth, as given to xsltproc
+XSLT_MAX_DEPTH = 20000
+
+# Number of compiled validator stylesheets kept in memory by the
+# in-process validation
+VALIDATOR_CACHE_SIZE = 32
+
+DEFAULT_CACHE_DIR = "~/.file-scraper/schematron-cache"
+
+# Number of lock files in the cache directory. The validator files are
+# spread over a fixed set of lock files, so that the lock files need not
+# be removed with the evicted validators.
+CACHE_LOCK_STRIPES = 64
+
+# Age in seconds after which leftover temporary files and directories in
+# the cache directory are removed
+CACHE_STALE_AGE = 3600
+
+# Prefix of the temporary files and directories in the cache directory.
+# Only the leftovers with this prefix are removed, as the cache directory
+# may be shared with other programs.
+CACHE_TEMP_PREFIX = "file-scraper-schematron-"
+
+# Compiled validator stylesheets by the names of their cache files, which
+# contain the digest of the schematron file and the compile options
+_VALIDATORS: OrderedDict[str, _Stylesheet] = OrderedDict()
+_VALIDATORS_LOCK = threading.Lock()
+
+
+@tool_version("xsltproc")
+def _xsltproc_versions() -> tuple[str, ...]:
+    """Return the versions of the libraries used by xsltproc.
+
+    :returns: Tuple of libxml2, libxslt and libexslt versions. A version
+        that can not be parsed is (:unav).
+    """
+    tool_shell = Shell(["xsltproc",
+                        "--version"])
+    regexes = [r"libxml ", r"libxslt ", r"libexslt "]
+    versions = []
+    for regex in regexes:
+        try:
+            reslt = next(
+                re.finditer(regex + r"([\d\.]+)", tool_shell.stdout,
+                            re.MULTILINE)
+                ).groups()[0]
+            # preprocessing
+            reslt = str(reslt).zfill(5)
+            versions.append(
+                ".".join(
+                    (str(int(reslt[:-4])), str(int(reslt[-4:-2])),
+                     str(int(reslt[-2:])))
+                )
+            )
+        except StopIteration:
+            LOGGER.warning(
+                "Could not retrieve Schematron version from stdout: %s",
+                tool_shell.stdout
+            )
+            versions.append(UNAV)
+    return tuple(versions)
+
+
+class _Stylesheet(NamedTuple):
+    """XSLT stylesheet compiled for the in-process validation.
+
+    The error log of an XSLT object is replaced on every transformation,
+    so the transformations are done under the lock.
+    """
+    xslt: etree.XSLT
+    lock: threading.Lock
+
 
 class SchematronScraper(BaseExtractor[SchematronMeta]):
     """Schematron extractor."""
@@ -27,6 +119,13 @@ class SchematronScraper(BaseExtractor[SchematronMeta]):
     _allow_unav_mime = True
     _allow_unav_version = True
 
+    # Supported only when a schematron file is given
+    _support_depends_on_params = True
+
+    # Total size of the validator files in the cache directory, after which
+    # the least recently used files are removed
+    _cache_max_size = 256 * 1024 ** 2
+
     def __init__(
         self,
         filename: Path,
@@ -44,10 +143,15 @@ class SchematronScraper(BaseExtractor[SchematronMeta]):
                  verbose: Verbose output, False by default
                  cache: Use a Cache of compiled schematron files, True by
                         default
+                 cache_dir: Directory of the compiled schematron files,
+                            ~/.file-scraper/schematron-cache by default
                  schematron: Schematron file name
                  extra_hash: Extra hash to determine if recompilation is
                              required. This can be a hash of files which are
                              called by the schematron file.
+                 xml_in_process: Compile and apply the schematron with
+                                 lxml in this process instead of running
+                                 xsltproc, False by default
         """
         super().__init__(
             filename=filename, mimetype=mimetype, version=version,
@@ -57,10 +161,14 @@ class SchematronScraper(BaseExtractor[SchematronMeta]):
         self._verbose = params.get("verbose", False)
         self._cache = params.get("cache", True)
         self._cachepath = os.path.expanduser(
-            "~/.file-scraper/schematron-cache")
+            params.get("cache_dir", DEFAULT_CACHE_DIR))
         self._returncode = None
         self._schematron_file = params.get("schematron", None)
         self._extra_hash = params.get("extra_hash", None)
+        self._in_process = params.get("xml_in_process", False)
+        # Compiled schematron, the validator file for xsltproc or the
+        # validator stylesheet for the in-process validation
+        self._compiled: str | _Stylesheet | None = None
 
     @classmethod
     def is_supported(
@@ -89,6 +197,47 @@ class SchematronScraper(BaseExtractor[SchematronMeta]):
         return super().is_supported(
             mimetype, version, check_wellformed, params)
 
+    @classmethod
+    def scrape_many(
+        cls,
+        filenames: Iterable[str | Path],
+        schematrons: Iterable[str],
+        mimetype: str = "text/xml",
+        params: dict | None = None,
+    ) -> Iterator[SchematronScraper]:
+        """
+        Check several files against several schematron files.
+
+        Each schematron file is compiled once, when it is needed for the
+        first time, and the compiled schematron is used for all the files.
+        The files are checked in the given order, each against all the
+        schematron files in the given order.
+
+        :param filenames: Paths of the files to check
+        :param schematrons: Paths of the schematron files
+        :param mimetype: Predefined mimetype of the files
+        :param params: Extra parameters for the extractors, except for
+            the schematron file
+        :returns: Scraped extractor of each file and schematron pair
+        """
+        schematrons = list(schematrons)
+        compiled: dict[str, str | _Stylesheet] = {}
+        for filename in filenames:
+            for schematron in schematrons:
+                extractor = cls(
+                    filename=Path(filename), mimetype=mimetype,
+                    params={**(params or {}), "schematron": schematron})
+                if schematron not in compiled:
+                    compiled[schematron] = extractor._compile()
+                extractor._compiled = compiled[schematron]
+                extractor.scrape_file()
+                yield extractor
+
+    @property
+    def schematron(self) -> str | None:
+        """Schematron file of the check."""
+        return self._schematron_file
+
     @property
     def well_formed(self) -> bool:
         """Check if document resulted errors."""
@@ -110,21 +259,62 @@ class SchematronScraper(BaseExtractor[SchematronMeta]):
             self._errors.append("Schematron file missing from parameters.")
             return
 
-        xslt_filename = self._compile_schematron()
+        if self._compiled is None:
+            self._compiled = self._compile()
+
+        if self._in_process:
+            returncode, stdout, stderr = self._validate_in_process(
+                self._compiled)
+        else:
+            shell = self._compile_phase(
+                stylesheet=self._compiled,
+                inputfile=self.filename, allowed_codes=[0, 6])
+            returncode, stdout, stderr = (
+                shell.returncode, shell.stdout_raw, shell.stderr)
+        self._use_validation(returncode, stdout, stderr)
+
+    async def _aextract(self) -> None:
+        """
+        Asynchronous version of :meth:`_extract`.
+
+        The schematron is compiled in a separate thread, as the compilation
+        may wait for another process compiling the same schematron. The
+        compiled schematron is applied to the file with xsltproc run
+        asynchronously. The in-process check is run in a separate thread
+        as a whole.
+        """
+        if self._schematron_file is None or self._in_process:
+            await asyncio.to_thread(self._extract)
+            return
+
+        if self._compiled is None:
+            self._compiled = await asyncio.to_thread(self._compile)
 
-        shell = self._compile_phase(
-            stylesheet=xslt_filename,
-            inputfile=self.filename, allowed_codes=[0, 6])
+        shell = AsyncShell(self._phase_command(
+            stylesheet=self._compiled, inputfile=self.filename))
+        await shell.apopen()
+        self._check_phase(shell, allowed_codes=[0, 6])
+        self._use_validation(shell.returncode, shell.stdout_raw, shell.stderr)
+
+    def _use_validation(
+        self, returncode: int, stdout: str | bytes, stderr: str
+    ) -> None:
+        """
+        Scrape the file from the results of the schematron check.
 
-        self._returncode = shell.returncode
-        if shell.stderr:
-            self._errors.append(shell.stderr)
+        :param returncode: Return code of the check
+        :param stdout: Validation report
+        :param stderr: Messages of the check
+        """
+        self._returncode = returncode
+        if stderr:
+            self._errors.append(stderr)
 
-        if not self._verbose and shell.returncode == 0:
+        if not self._verbose and returncode == 0:
             self._messages.append(ensure_text(
-                self._filter_duplicate_elements(shell.stdout_raw)))
+                self._filter_duplicate_elements(stdout)))
         else:
-            self._messages.append(shell.stdout)
+            self._messages.append(ensure_text(stdout))
 
         self.streams = list(self.iterate_models(well_formed=self.well_formed))
 
@@ -173,64 +363,255 @@ class SchematronScraper(BaseExtractor[SchematronMeta]):
             messages
         :return: Shell instance
         """
+        shell = Shell(self._phase_command(
+            stylesheet, inputfile, outputfile, outputfilter))
+        self._check_phase(shell, allowed_codes)
+        return shell
+
+    def _phase_command(
+        self,
+        stylesheet: str | Path,
+        inputfile: str | Path,
+        outputfile: str | None = None,
+        outputfilter: bool = False,
+    ) -> list:
+        """
+        Return the xsltproc command of one phase.
+
+        :param stylesheet: XSLT file to used in the conversion
+        :param inputfile: Input document filename
+        :param outputfile: Filename of the resulted document, stdout if None
+        :param outputfilter: Use outputfilter parameter with value only
+            messages
+        :return: Command
+        """
         dir_path = resolve_path_from_config("schematron_dir")
         cmd = ["xsltproc", "--maxdepth", "20000"]
         if outputfile:
             cmd = cmd + ["-o", outputfile]
         if outputfilter and not self._verbose:
             cmd = cmd + ["--stringparam", "outputfilter", "only_messages"]
-        cmd = cmd + [os.path.join(dir_path, stylesheet),
-                     os.fsencode(inputfile)]
-        shell = Shell(cmd)
+        return cmd + [os.path.join(dir_path, stylesheet),
+                      os.fsencode(inputfile)]
+
+    @staticmethod
+    def _check_phase(shell: Shell, allowed_codes: list[int]) -> None:
+        """
+        Check the return code of a phase.
+
+        :param shell: Command of the phase, already run
+        :param allowed_codes: Allowed return codes
+        :raises SchematronValidatorError: If the return code is not allowed
+        """
         if shell.returncode not in allowed_codes:
             raise SchematronValidatorError(
                 f"Schematron returned invalid return code {shell.returncode}\n"
                 f"stdout:\n{shell.stdout}\nstderr:\n{shell.stderr}"
             )
-        return shell
+
+    def _compile(self) -> str | _Stylesheet:
+        """
+        Compile the schematron file for the validation.
+
+        :returns: Validator file name for xsltproc, or the compiled
+            validator stylesheet for the in-process validation
+        """
+        if self._in_process:
+            etree.XSLT.set_global_max_depth(XSLT_MAX_DEPTH)
+            return self._validator()
+        return self._compile_schematron()
 
     def _compile_schematron(self) -> str:
         """
         Compile a schematron file.
 
+        The schematron is compiled once across the processes sharing the
+        cache directory: the other processes wait for the compilation and
+        use the result.
+
         :returns: XSLT file name
         """
         xslt_filename = self._generate_xslt_filename()
-        tempdir = tempfile.mkdtemp(dir=self._cachepath)
-
-        if self._cache and os.path.isfile(xslt_filename):
+        if self._cache and _touch(xslt_filename):
             return xslt_filename
 
+        with _compile_lock(xslt_filename):
+            # Compiled by another process while waiting for the lock
+            if self._cache and _touch(xslt_filename):
+                return xslt_filename
+
+            tempdir = tempfile.mkdtemp(prefix=CACHE_TEMP_PREFIX,
+                                       dir=self._cachepath)
+            try:
+                self._compile_phase(
+                    stylesheet="iso_dsdl_include.xsl",
+                    inputfile=self._schematron_file,
+                    outputfile=os.path.join(tempdir, "step1.xsl"),
+                    allowed_codes=[0])
+                self._compile_phase(
+                    stylesheet="iso_abstract_expand.xsl",
+                    inputfile=os.path.join(tempdir, "step1.xsl"),
+                    outputfile=os.path.join(tempdir, "step2.xsl"),
+                    allowed_codes=[0])
+                self._compile_phase(
+                    stylesheet="optimize_schematron.xsl",
+                    inputfile=os.path.join(tempdir, "step2.xsl"),
+                    outputfile=os.path.join(tempdir, "step3.xsl"),
+                    allowed_codes=[0])
+                self._compile_phase(
+                    stylesheet="iso_svrl_for_xslt1.xsl",
+                    inputfile=os.path.join(tempdir, "step3.xsl"),
+                    outputfile=os.path.join(tempdir, "validator.xsl"),
+                    outputfilter=not (self._verbose),
+                    allowed_codes=[0])
+
+                os.replace(os.path.join(tempdir, "validator.xsl"),
+                           xslt_filename)
+
+            finally:
+                shutil.rmtree(tempdir)
+
+        self._evict_cache(keep=xslt_filename)
+        return xslt_filename
+
+    def _validate_in_process(
+        self, validator: _Stylesheet
+    ) -> tuple[int, bytes, str]:
+        """
+        Apply the compiled schematron to the file with lxml.
+
+        The results correspond to running the validator stylesheet with
+        xsltproc: a file which can not be parsed gives the return code 6,
+        and the messages of the stylesheet are reported as the standard
+        error.
+
+        :param validator: Compiled validator stylesheet
+        :returns: Return code, the validation report and the messages
+        :raises SchematronValidatorError: If the schematron can not be
+            applied
+        """
+        # Parse the file as xsltproc does, loading the DTD for the default
+        # attributes and the entities
+        parser = etree.XMLParser(load_dtd=True, attribute_defaults=True,
+                                 resolve_entities=True)
         try:
-            self._compile_phase(
-                stylesheet="iso_dsdl_include.xsl",
-                inputfile=self._schematron_file,
-                outputfile=os.path.join(tempdir, "step1.xsl"),
-                allowed_codes=[0])
-            self._compile_phase(
-                stylesheet="iso_abstract_expand.xsl",
-                inputfile=os.path.join(tempdir, "step1.xsl"),
-                outputfile=os.path.join(tempdir, "step2.xsl"),
-                allowed_codes=[0])
-            self._compile_phase(
-                stylesheet="optimize_schematron.xsl",
-                inputfile=os.path.join(tempdir, "step2.xsl"),
-                outputfile=os.path.join(tempdir, "step3.xsl"),
-                allowed_codes=[0])
-            self._compile_phase(
-                stylesheet="iso_svrl_for_xslt1.xsl",
-                inputfile=os.path.join(tempdir, "step3.xsl"),
-                outputfile=os.path.join(tempdir, "validator.xsl"),
-                outputfilter=not (self._verbose),
-                allowed_codes=[0])
-
-            shutil.move(os.path.join(tempdir, "validator.xsl"),
-                        xslt_filename)
+            document = etree.parse(os.fsencode(self.filename), parser)
+        except (etree.XMLSyntaxError, OSError) as exception:
+            return 6, b"", str(exception)
 
-        finally:
-            shutil.rmtree(tempdir)
+        with validator.lock:
+            try:
+                result = validator.xslt(document)
+            except etree.XSLTApplyError as exception:
+                raise SchematronValidatorError(
+                    f"Schematron validation failed: {exception}\n"
+                    f"{_format_xslt_log(validator.xslt.error_log)}"
+                ) from exception
+            stderr = _format_xslt_log(validator.xslt.error_log)
+        return 0, bytes(result), stderr
+
+    def _validator(self) -> _Stylesheet:
+        """
+        Return the validator stylesheet of the schematron file.
 
-        return xslt_filename
+        With the cache in use, the validator is looked up first from the
+        memory of the process, then from the cache directory, and only
+        compiled if neither has it. The compiled validator is also written
+        to the cache directory for the other processes.
+
+        :returns: Compiled validator stylesheet
+        """
+        xslt_filename = self._generate_xslt_filename()
+        if not self._cache:
+            return self._compile_validator(xslt_filename)
+
+        with _VALIDATORS_LOCK:
+            validator = _VALIDATORS.get(xslt_filename)
+            if validator is not None:
+                _VALIDATORS.move_to_end(xslt_filename)
+                return validator
+
+        validator = self._compile_validator(xslt_filename)
+        with _VALIDATORS_LOCK:
+            _VALIDATORS[xslt_filename] = validator
+            while len(_VALIDATORS) > VALIDATOR_CACHE_SIZE:
+                _VALIDATORS.popitem(last=False)
+        return validator
+
+    def _compile_validator(self, xslt_filename: str) -> _Stylesheet:
+        """
+        Compile the schematron file into a validator stylesheet in-process.
+
+        The validator is compiled once across the processes sharing the
+        cache directory, as in :meth:`_compile_schematron`.
+
+        :param xslt_filename: Cache file of the validator stylesheet
+        :returns: Compiled validator stylesheet
+        """
+        if self._cache and _touch(xslt_filename):
+            return _compile_xslt(_parse_stylesheet(xslt_filename))
+
+        with _compile_lock(xslt_filename):
+            # Compiled by another process while waiting for the lock
+            if self._cache and _touch(xslt_filename):
+                return _compile_xslt(_parse_stylesheet(xslt_filename))
+
+            document = self._transform_schematron()
+            fd, tempname = tempfile.mkstemp(prefix=CACHE_TEMP_PREFIX,
+                                            dir=self._cachepath)
+            try:
+                with os.fdopen(fd, "wb") as outfile:
+                    outfile.write(bytes(document))
+                os.replace(tempname, xslt_filename)
+            except BaseException:
+                os.remove(tempname)
+                raise
+
+        self._evict_cache(keep=xslt_filename)
+        return _compile_xslt(document)
+
+    def _transform_schematron(self) -> etree._XSLTResultTree:
+        """
+        Apply the compile phase stylesheets to the schematron file.
+
+        :returns: Validator stylesheet document
+        :raises SchematronValidatorError: If a phase fails
+        """
+        dir_path = resolve_path_from_config("schematron_dir")
+        document = _parse_stylesheet(self._schematron_file)
+
+        for name in COMPILE_STYLESHEETS:
+            params = {}
+            if name == "iso_svrl_for_xslt1.xsl" and not self._verbose:
+                params["outputfilter"] = etree.XSLT.strparam(
+                    "only_messages")
+            stylesheet = _load_stylesheet(os.path.join(dir_path, name))
+            with stylesheet.lock:
+                try:
+                    document = stylesheet.xslt(document, **params)
+                except etree.XSLTApplyError as exception:
+                    raise SchematronValidatorError(
+                        f"Schematron compilation with {name} failed: "
+                        f"{exception}\n"
+                        f"{_format_xslt_log(stylesheet.xslt.error_log)}"
+                    ) from exception
+        return document
+
+    def _evict_cache(self, keep: str) -> None:
+        """
+        Remove the least recently used validator files from the cache.
+
+        The oldest files are removed until the validator files fit in
+        the maximum cache size. Leftover temporary files and directories
+        of interrupted compilations are removed as well. Only one process
+        at a time evicts the files, the others skip the eviction.
+
+        :param keep: Validator file which is not removed
+        """
+        with _cache_lock(self._cachepath, "evict",
+                         blocking=False) as locked:
+            if locked:
+                _evict(self._cachepath, self._cache_max_size, keep)
 
     def _generate_xslt_filename(self) -> str:
         """
@@ -254,7 +635,8 @@ class SchematronScraper(BaseExtractor[SchematronMeta]):
         return os.path.join(self._cachepath,
                             f"{schema_basename}.{schema_digest}.validator.xsl")
 
-    def tools(self) -> dict[str, dict[str, str]]:
+    @classmethod
+    def tools(cls) -> dict[str, dict[str, str]]:
         """Return information about the software used by the extractor or
         detector.
 
@@ -263,35 +645,174 @@ class SchematronScraper(BaseExtractor[SchematronMeta]):
             tool (e.g. version). If no tools are available, an empty
             dictionary is returned instead.
         """
-        tool_shell = Shell(["xsltproc",
-                            "--version"])
-        regexes = [r"libxml ", r"libxslt ", r"libexslt "]
-        versions = []
-        for regex in regexes:
-            try:
-                reslt = next(
-                    re.finditer(regex + r"([\d\.]+)", tool_shell.stdout,
-                                re.MULTILINE)
-                    ).groups()[0]
-                # preprocessing
-                reslt = str(reslt).zfill(5)
-                versions.append(
-                    ".".join(
-                        (str(int(reslt[:-4])), str(int(reslt[-4:-2])),
-                         str(int(reslt[-2:])))
-                    )
-                )
-            except StopIteration:
-                LOGGER.warning(
-                    "Could not retrieve Schematron version from stdout: %s",
-                    tool_shell.stdout
-                )
-                versions.append(UNAV)
+        versions = _xsltproc_versions()
         return {"libxml2": {"version": versions[0]},
                 "libxslt": {"version": versions[1]},
                 "libexslt": {"version": versions[2]}
                 }
 
 
+@contextmanager
+def _cache_lock(
+    cachepath: str, name: str, blocking: bool = True
+) -> Iterator[bool]:
+    """
+    Hold an exclusive lock of the cache directory.
+
+    The lock is shared with the other processes and threads using the same
+    cache directory.
+
+    :param cachepath: Cache directory
+    :param name: Name of the lock
+    :param blocking: Wait for the lock if another process holds it
+    :returns: True if the lock was acquired, False if not blocking and the
+        lock is held by another process
+    """
+    lock_dir = os.path.join(cachepath, "locks")
+    os.makedirs(lock_dir, exist_ok=True)
+    with open(os.path.join(lock_dir, f"{name}.lock"), "ab") as lockfile:
+        operation = fcntl.LOCK_EX if blocking else \
+            fcntl.LOCK_EX | fcntl.LOCK_NB
+        try:
+            fcntl.flock(lockfile, operation)
+        except BlockingIOError:
+            yield False
+            return
+        try:
+            yield True
+        finally:
+            fcntl.flock(lockfile, fcntl.LOCK_UN)
+
+
+@contextmanager
+def _compile_lock(xslt_filename: str) -> Iterator[None]:
+    """
+    Hold the lock for compiling a validator file.
+
+    :param xslt_filename: Validator file in the cache directory
+    """
+    stripe = zlib.crc32(
+        os.path.basename(xslt_filename).encode()) % CACHE_LOCK_STRIPES
+    with _cache_lock(os.path.dirname(xslt_filename), str(stripe)):
+        yield
+
+
+def _touch(xslt_filename: str) -> bool:
+    """
+    Mark a validator file in the cache used.
+
+    :param xslt_filename: Validator file
+    :returns: True if the file exists, False otherwise
+    """
+    try:
+        os.utime(xslt_filename)
+    except FileNotFoundError:
+        return False
+    return True
+
+
+def _evict(cachepath: str, max_size: int, keep: str) -> None:
+    """
+    Remove the least recently used validator files from the cache.
+
+    :param cachepath: Cache directory
+    :param max_size: Maximum total size of the validator files
+    :param keep: Validator file which is not removed
+    """
+    now = time.time()
+    validators = []
+    with os.scandir(cachepath) as entries:
+        for entry in entries:
+            try:
+                stat = entry.stat(follow_symlinks=False)
+            except FileNotFoundError:
+                continue
+            if entry.name.endswith(".validator.xsl") and entry.is_file():
+                validators.append((stat.st_mtime, stat.st_size, entry.path))
+            elif entry.name.startswith(CACHE_TEMP_PREFIX) and \
+                    now - stat.st_mtime > CACHE_STALE_AGE:
+                if entry.is_dir(follow_symlinks=False):
+                    shutil.rmtree(entry.path, ignore_errors=True)
+                else:
+                    _remove(entry.path)
+
+    total = sum(size for _, size, _ in validators)
+    for _, size, path in sorted(validators):
+        if total <= max_size:
+            break
+        if path != keep:
+            _remove(path)
+            total -= size
+
+
+def _remove(path: str) -> None:
+    """
+    Remove a file removed possibly by another process already.
+
+    :param path: Path to the file
+    """
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+@lru_cache(maxsize=None)
+def _load_stylesheet(path: str) -> _Stylesheet:
+    """
+    Load and compile an XSLT stylesheet once per process.
+
+    :param path: Path to the stylesheet
+    :returns: Compiled stylesheet
+    :raises SchematronValidatorError: If the stylesheet can not be
+        compiled
+    """
+    return _compile_xslt(_parse_stylesheet(path))
+
+
+def _parse_stylesheet(path: str | Path) -> etree._ElementTree:
+    """
+    Parse a stylesheet or a schematron file.
+
+    :param path: Path to the file
+    :returns: Parsed document
+    :raises SchematronValidatorError: If the file can not be parsed
+    """
+    try:
+        return etree.parse(os.fsencode(path))
+    except (etree.XMLSyntaxError, OSError) as exception:
+        raise SchematronValidatorError(
+            f"{path} could not be parsed: {exception}") from exception
+
+
+def _compile_xslt(document: etree._ElementTree) -> _Stylesheet:
+    """
+    Compile an XSLT stylesheet.
+
+    :param document: Stylesheet document
+    :returns: Compiled stylesheet
+    :raises SchematronValidatorError: If the stylesheet can not be
+        compiled
+    """
+    try:
+        xslt = etree.XSLT(document)
+    except etree.XSLTParseError as exception:
+        raise SchematronValidatorError(
+            f"Stylesheet could not be compiled: {exception}\n"
+            f"{_format_xslt_log(exception.error_log)}"
+        ) from exception
+    return _Stylesheet(xslt, threading.Lock())
+
+
+def _format_xslt_log(error_log) -> str:
+    """
+    Format the messages of an XSLT transformation as xsltproc prints them.
+
+    :param error_log: Error log of the transformation
+    :returns: Messages separated by newlines
+    """
+    return "".join(f"{entry.message}\n" for entry in error_log)
+
+
 class SchematronValidatorError(Exception):
     """Throw error in case of a compilation failure."""
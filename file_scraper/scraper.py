@@ -1,13 +1,17 @@
 """File metadata scraper."""
 from __future__ import annotations
 
+import asyncio
 import os
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Any, NamedTuple, TYPE_CHECKING
 
 from dpres_file_formats.graders import file_formats
 from dpres_file_formats.graders import grade as file_formats_grade
 
+from file_scraper.artifacts import ArtifactStore
 from file_scraper.metadata import generate_metadata_dict
 from file_scraper.defaults import UNAV
 from file_scraper.detectors import ExifToolDetector, MagicCharset
@@ -19,15 +23,19 @@ from file_scraper.exceptions import (
     InvalidVersionForMimetype,
 )
 from file_scraper.iterator import iter_detectors, iter_extractors
+from file_scraper.probe import FileProbe
+from file_scraper.streaming import ChecksumConsumer, stream_file
 from file_scraper.jhove.jhove_extractor import JHoveUtf8Extractor
 from file_scraper.logger import LOGGER
 from file_scraper.textfile.textfile_extractor import TextfileExtractor
 from file_scraper.utils import (
     hexdigest,
+    hexdigests,
 )
 
 if TYPE_CHECKING:
     from file_scraper.base import BaseDetector, BaseExtractor
+    from file_scraper.cache import ResultCache
 
 
 class ScraperResults(NamedTuple):
@@ -39,6 +47,7 @@ class ScraperResults(NamedTuple):
     grade: str
     info: dict[str, Any]
     errors: list[str]
+    checksums: dict[str, str] | None = None
 
 
 class Scraper:
@@ -152,18 +161,23 @@ class Scraper:
             raise RuntimeError("File is already detected")
         detected_mimetype = None
         detected_version = None
-        for detector in iter_detectors(path=self.path):
-            LOGGER.info(
-                "Detecting file type using %s", detector.__class__.__name__
-            )
-            detected_mimetype, detected_version = _update_filetype(
-                detector,
-                detected_mimetype,
-                detected_version,
-            )
-            if detector.well_formed is False:
-                self.well_formed = False
-            self.info[len(self.info)] = detector.info()
+        probe = FileProbe(self.path)
+        # The ZIP archive opened by the detectors is closed after the
+        # detectors, the head and the tail of the file are kept
+        with probe:
+            for detector in iter_detectors(path=self.path, probe=probe):
+                LOGGER.info(
+                    "Detecting file type using %s",
+                    detector.__class__.__name__
+                )
+                detected_mimetype, detected_version = _update_filetype(
+                    detector,
+                    detected_mimetype,
+                    detected_version,
+                )
+                if detector.well_formed is False:
+                    self.well_formed = False
+                self.info[len(self.info)] = detector.info()
 
         # PDF files should always be scrutinized further to determine if
         # they are PDF/A
@@ -225,7 +239,7 @@ class Scraper:
             MagicCharset.is_supported(self.mimetype)
             and self._charset is None
         ):
-            charset_detector = MagicCharset(self.path)
+            charset_detector = MagicCharset(self.path, probe)
             charset_detector.detect()
             self.streams[0]["charset"] = charset_detector.charset
 
@@ -233,6 +247,18 @@ class Scraper:
         # detect-file command
         return (self.mimetype, self.version)
 
+    async def adetect_filetype(self) -> tuple[str | None, str | None]:
+        """
+        Asynchronous version of :meth:`detect_filetype`.
+
+        The detectors check the file in Python, or with the ExifTool
+        process shared by the threads, so they are run in a separate
+        thread to avoid blocking the event loop.
+
+        :returns: Detected mimetype and version
+        """
+        return await asyncio.to_thread(self.detect_filetype)
+
     def _use_extractor(self, extractor: BaseExtractor) -> None:
         """
         Use the given extractor, collect metadata and update well-formedness.
@@ -240,6 +266,15 @@ class Scraper:
         :param extractor: Extractor instance
         """
         extractor.extract()
+        self._merge_extractor_results(extractor)
+
+    def _merge_extractor_results(self, extractor: BaseExtractor) -> None:
+        """
+        Collect metadata and update well-formedness from an extractor that
+        has already been run.
+
+        :param extractor: Extractor instance
+        """
         self.info[len(self.info)] = extractor.info()
         if self.well_formed is None \
                 or extractor.well_formed is False:
@@ -273,6 +308,87 @@ class Scraper:
             }
             self.well_formed = False
 
+    def _use_extractors_concurrently(
+        self,
+        extractors: list[BaseExtractor],
+        workers: int,
+    ) -> None:
+        """
+        Run the given extractors in a thread pool and merge their results.
+
+        The extractors are independent of each other, so they can be run
+        in any order. The results are merged in the order of the given
+        list, so that conflicts between the extractors are resolved in
+        the same way as in sequential scraping.
+
+        :param extractors: Extractor instances
+        :param workers: Maximum number of threads
+        """
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = []
+            for extractor in extractors:
+                LOGGER.info(
+                    "Scraping with %s", extractor.__class__.__name__
+                )
+                futures.append(executor.submit(extractor.extract))
+
+            for extractor, future in zip(extractors, futures):
+                future.result()
+                self._merge_extractor_results(extractor)
+
+    async def _ause_extractors(
+        self,
+        extractors: list[BaseExtractor],
+        workers: int,
+    ) -> None:
+        """
+        Run the given extractors asynchronously and merge their results.
+
+        The results are merged in the order of the given list, as in
+        :meth:`_use_extractors_concurrently`.
+
+        :param extractors: Extractor instances
+        :param workers: Maximum number of extractors run at the same time
+        """
+        semaphore = asyncio.Semaphore(workers)
+
+        async def _aextract(extractor: BaseExtractor) -> None:
+            async with semaphore:
+                LOGGER.info(
+                    "Scraping with %s", extractor.__class__.__name__
+                )
+                await extractor.aextract()
+
+        await asyncio.gather(
+            *(_aextract(extractor) for extractor in extractors))
+        for extractor in extractors:
+            self._merge_extractor_results(extractor)
+
+    def _stream_file(
+        self,
+        extractors: list[BaseExtractor],
+        checksum_consumer: ChecksumConsumer | None = None,
+    ) -> None:
+        """
+        Read the file once for all extractors reading it in Python.
+
+        The file is streamed to the consumers of the extractors and the
+        checksum calculation, so that each of them does not read the file
+        separately.
+
+        :param extractors: Extractor instances
+        :param checksum_consumer: Consumer calculating the checksums
+        """
+        consumers = [
+            consumer for consumer in (
+                extractor.stream_consumer() for extractor in extractors
+            ) if consumer is not None
+        ]
+        if checksum_consumer is not None:
+            consumers.append(checksum_consumer)
+        if consumers:
+            stream_file(self.path, consumers)
+
     def _check_utf8(self) -> None:
         """UTF-8 check only for UTF-8.
 
@@ -282,11 +398,37 @@ class Scraper:
             scraper = JHoveUtf8Extractor(filename=self.path, mimetype=UNAV)
             self._use_extractor(scraper)
 
-    def scrape(self, check_wellformed: bool = True) -> ScraperResults:
+    async def _acheck_utf8(self) -> None:
+        """Asynchronous version of :meth:`_check_utf8`."""
+        if self._charset == "UTF-8":
+            scraper = JHoveUtf8Extractor(filename=self.path, mimetype=UNAV)
+            await scraper.aextract()
+            self._merge_extractor_results(scraper)
+
+    def scrape(
+        self,
+        check_wellformed: bool = True,
+        workers: int = 1,
+        cache: ResultCache | None = None,
+        checksums: Iterable[str] | None = None,
+    ) -> ScraperResults:
         """Scrape file and collect metadata.
 
         :param check_wellformed: True, full scraping; False, skip well-formed
             check.
+        :param workers: Number of threads used to run the extractors. By
+            default, the extractors are run one after another. If more than
+            one worker is given, the extractors are run concurrently, but
+            their results are still merged in the same order as in
+            sequential scraping, so the results do not change.
+        :param cache: Cache of scraper results. If the same file has
+            already been scraped with the same parameters, the cached
+            results are returned without running any detectors or
+            extractors. Otherwise, the results are stored to the cache.
+        :param checksums: Checksum algorithms, e.g. ("MD5", "SHA-256"). If
+            given, the checksums are calculated in the same pass over the
+            file as the checks of the extractors reading the file in
+            Python.
         :returns:
             A NamedTuple which contains the following members
             - path::string the input path given to the Scraper
@@ -304,33 +446,116 @@ class Scraper:
               Each tool info contains at least the class, messages, errors and
               tools
             - errors::list collects errors from extractors to a list.
+            - checksums::dict the checksums by the given algorithms, or
+              None if no checksums were requested.
         """
         LOGGER.info("Scraping %s", self.path)
 
+        checksum_consumer = None
+        if checksums is not None:
+            checksum_consumer = ChecksumConsumer(checksums)
+
+        cache_key = None
+        if cache is not None:
+            cache_key, results = self._cached_results(
+                cache, check_wellformed, checksum_consumer)
+            if results is not None:
+                return results
+
         if not self.info:
             # File detection has not been done yet
             self.detect_filetype()
 
+        extractors = self._extractors(check_wellformed)
+        self._stream_file(extractors, checksum_consumer)
+        if workers > 1:
+            self._use_extractors_concurrently(extractors, workers)
+        else:
+            for extractor in extractors:
+                LOGGER.info(
+                    "Scraping with %s", extractor.__class__.__name__
+                )
+                self._use_extractor(extractor)
+
+        # TODO: UTF-8 extractor should not be used if
+        # check_wellformed=False. See PAS-1.
+        self._check_utf8()
+
+        return self._results(
+            check_wellformed, cache, cache_key, checksum_consumer)
+
+    def _cached_results(
+        self,
+        cache: ResultCache,
+        check_wellformed: bool,
+        checksum_consumer: ChecksumConsumer | None,
+    ) -> tuple[str, ScraperResults | None]:
+        """Return the cache key and the cached results of the file.
+
+        :param cache: Cache of scraper results
+        :param check_wellformed: True, full scraping; False, skip
+            well-formed check.
+        :param checksum_consumer: Consumer calculating the checksums
+        :returns: Cache key, and the cached results or None if the file
+            has not been scraped with the same parameters
+        """
+        cache_key = cache.key(self.path, check_wellformed, self._kwargs)
+        cached = cache.get(cache_key)
+        if cached is None:
+            return cache_key, None
+
+        LOGGER.info("Using cached results for %s", self.path)
+        results = self._restore_results(cached)
+        if checksum_consumer is not None:
+            stream_file(self.path, [checksum_consumer])
+            results = results._replace(
+                checksums=checksum_consumer.hexdigests())
+        return cache_key, results
+
+    def _extractors(self, check_wellformed: bool) -> list[BaseExtractor]:
+        """Return the extractors of the detected file format.
+
+        :param check_wellformed: True, full scraping; False, skip
+            well-formed check.
+        :returns: Extractor instances sharing the artifacts of the file
+        """
         LOGGER.debug(
             "Mimetype after detectors: %s and version: %s",
             self.mimetype,
             self.version,
         )
-        for extractor in iter_extractors(
+        extractors = iter_extractors(
             path=self.path,
             mimetype=self.mimetype,
             version=self.version,
             charset=self._charset,
             check_wellformed=check_wellformed,
             params=self._kwargs,
-        ):
-            LOGGER.info("Scraping with %s", extractor.__class__.__name__)
-            self._use_extractor(extractor)
-
-        # TODO: UTF-8 extractor should not be used if
-        # check_wellformed=False. See PAS-1.
-        self._check_utf8()
-
+        )
+        extractors = list(extractors)
+        # Artifacts such as the parsed XML tree are shared by the
+        # extractors, and dropped after the last extractor using them
+        artifacts = ArtifactStore()
+        for extractor in extractors:
+            extractor.use_artifacts(artifacts)
+        return extractors
+
+    def _results(
+        self,
+        check_wellformed: bool,
+        cache: ResultCache | None,
+        cache_key: str | None,
+        checksum_consumer: ChecksumConsumer | None,
+    ) -> ScraperResults:
+        """Collect the results after the extractors have been run.
+
+        :param check_wellformed: True, full scraping; False, skip
+            well-formed check.
+        :param cache: Cache where the results are stored, or None
+        :param cache_key: Key of the results in the cache
+        :param checksum_consumer: Consumer calculating the checksums
+        :returns: Scraper results, see :meth:`scrape`
+        """
         # Add error if detected format is not supported
         # TODO: Error should be added also when file is supported
         # according to DPS specification, but it is not yet supported by
@@ -355,7 +580,7 @@ class Scraper:
         for item in self.info.values():
             for error in item["errors"]:
                 errors.append(item["class"] + " :: " + error)
-        return ScraperResults(
+        results = ScraperResults(
             path=str(self.input_path),
             mimetype=self.mimetype,
             version=self.version,
@@ -365,6 +590,83 @@ class Scraper:
             info=self.info,
             errors=errors
         )
+        if cache is not None:
+            cache.put(cache_key, results)
+        if checksum_consumer is not None:
+            results = results._replace(
+                checksums=checksum_consumer.hexdigests())
+        return results
+
+    def _restore_results(self, cached: dict[str, Any]) -> ScraperResults:
+        """Restore the state of the scraper from cached results.
+
+        :param cached: Cached results, see ResultCache.get
+        :returns: Scraper results
+        """
+        self.streams = cached["streams"]
+        self.info = cached["info"]
+        self._well_formed = cached["well_formed"]
+        cached["path"] = str(self.input_path)
+        cached.pop("checksums", None)
+        return ScraperResults(**cached)
+
+    async def ascrape(
+        self,
+        check_wellformed: bool = True,
+        workers: int = 1,
+        cache: ResultCache | None = None,
+        checksums: Iterable[str] | None = None,
+    ) -> ScraperResults:
+        """
+        Asynchronous version of :meth:`scrape`.
+
+        The extractors running 3rd party tools run them as asyncio
+        subprocesses, see :meth:`BaseExtractor.aextract`, so that no
+        thread is blocked while waiting for the tools. Only the checks
+        run in Python, such as the detectors and the extractors reading
+        the file in-process, are run in separate threads. Therefore,
+        multiple files can be scraped concurrently in the same event
+        loop, for example using :func:`asyncio.gather`.
+
+        :param check_wellformed: True, full scraping; False, skip well-formed
+            check.
+        :param workers: Number of extractors run concurrently. By default,
+            the extractors are run one after another. The results are
+            merged in the same order in both cases.
+        :param cache: Cache of scraper results, see :meth:`scrape`
+        :param checksums: Checksum algorithms, see :meth:`scrape`
+        :returns: Scraper results, see :meth:`scrape`
+        """
+        LOGGER.info("Scraping %s", self.path)
+
+        checksum_consumer = None
+        if checksums is not None:
+            checksum_consumer = ChecksumConsumer(checksums)
+
+        cache_key = None
+        if cache is not None:
+            cache_key, results = await asyncio.to_thread(
+                self._cached_results, cache, check_wellformed,
+                checksum_consumer)
+            if results is not None:
+                return results
+
+        if not self.info:
+            # File detection has not been done yet
+            await self.adetect_filetype()
+
+        extractors = self._extractors(check_wellformed)
+        await asyncio.to_thread(
+            self._stream_file, extractors, checksum_consumer)
+        await self._ause_extractors(extractors, workers)
+
+        # TODO: UTF-8 extractor should not be used if
+        # check_wellformed=False. See PAS-1.
+        await self._acheck_utf8()
+
+        return await asyncio.to_thread(
+            self._results, check_wellformed, cache, cache_key,
+            checksum_consumer)
 
     def is_textfile(self) -> bool:
         """
@@ -389,6 +691,20 @@ class Scraper:
         """
         return hexdigest(self.path, algorithm)
 
+    def checksums(
+        self,
+        algorithms: Iterable[str] = ("MD5", "SHA-1", "SHA-256"),
+    ) -> dict[str, str]:
+        """
+        Return the checksums of the file with given algorithms.
+
+        The file is read only once for all algorithms.
+
+        :param algorithms: MD5 or SHA variants
+        :returns: Calculated checksums by the algorithm names as given
+        """
+        return hexdigests(self.path, algorithms)
+
     def grade(self) -> str:
         """Return digital preservation grade."""
         return file_formats_grade(self.mimetype, self.version, self.streams)
@@ -0,0 +1,374 @@
+"""Long-running scraper server and its client.
+
+Starting file-scraper for each file is expensive: the 3rd party modules
+are imported, Fido loads its signature files and the versions of the tools
+are resolved. The server keeps this state in memory and scrapes files on
+request over a local Unix socket.
+
+The protocol is line-based JSON. Each request is a JSON object on a single
+line, e.g.::
+
+    {"command": "scrape", "path": "/data/file.pdf", "tool_info": true}
+    {"command": "detect", "path": "/data/file.pdf"}
+
+and each response is a JSON object on a single line, either
+``{"status": "ok", "results": {...}}`` where the results are the same as
+printed by the command line interface, or
+``{"status": "error", "error": <message>, "param": <parameter>}``. Multiple
+requests can be sent using the same connection.
+"""
+from __future__ import annotations
+
+import json
+import os
+import socket
+import socketserver
+import tempfile
+import threading
+from typing import Any
+
+from file_scraper.exceptions import (
+    DirectoryIsNotScrapable,
+    FileIsNotScrapable,
+    FileNotFoundIsNotScrapable,
+    InvalidMimetype,
+    InvalidVersionForMimetype,
+)
+from file_scraper.logger import LOGGER
+from file_scraper.scraper import Scraper
+from file_scraper.utils import ensure_text
+
+DEFAULT_WORKERS = 4
+
+
+class RequestError(Exception):
+    """
+    Exception to tell that a scrape or detect request could not be
+    fulfilled.
+    """
+
+    def __init__(self, message: str, param: str | None = None) -> None:
+        """Initialize the error.
+
+        :param message: Error message
+        :param param: Name of the invalid parameter (e.g. "FILENAME" or
+            "--mimetype"), if the error was caused by a parameter
+        """
+        super().__init__(message)
+        self.param = param
+
+
+def scrape_file_results(
+    filename: str | os.PathLike,
+    check_wellformed: bool = True,
+    tool_info: bool = False,
+    mimetype: str | None = None,
+    version: str | None = None,
+    params: dict[str, Any] | None = None,
+) -> dict[str, Any]:
+    """Scrape a file and return the results printed by the command line
+    interface.
+
+    :param filename: Path to the file
+    :param check_wellformed: True for the full well-formed check, False
+        for just identification and metadata scraping
+    :param tool_info: True to include the info of the 3rd party tools
+    :param mimetype: Specified MIME type of the file
+    :param version: Specified version of the file
+    :param params: Extra parameters for the Scraper
+    :returns: Results as a dict
+    :raises RequestError: If the file can not be scraped with the given
+        parameters
+    """
+    try:
+        scraper = Scraper(filename, mimetype=mimetype, version=version,
+                          **(params or {}))
+    except (FileIsNotScrapable,
+            DirectoryIsNotScrapable,
+            FileNotFoundIsNotScrapable) as error:
+        raise RequestError(str(error), "FILENAME") from error
+    except InvalidMimetype as error:
+        raise RequestError(str(error), "--mimetype") from error
+    except InvalidVersionForMimetype as error:
+        raise RequestError(str(error), "--version") from error
+    except ValueError:
+        LOGGER.error("Unhandled ValueError encountered")
+        raise
+
+    scraper.scrape(check_wellformed=check_wellformed)
+    return _collect_scraper_results(scraper, check_wellformed, tool_info)
+
+
+def _collect_scraper_results(
+    scraper: Scraper,
+    check_wellformed: bool,
+    tool_info: bool
+) -> dict[str, Any]:
+    """Collect the results of a scraped file.
+
+    :param scraper: Scraper which has scraped the file
+    :param check_wellformed: True if the well-formed check was done
+    :param tool_info: True to include the info of the 3rd party tools
+    :returns: Results as a dict
+    :raises RequestError: If none of the extractors supported the file
+    """
+    results = {
+        "path": str(scraper.input_path),
+        "MIME type": ensure_text(scraper.mimetype),
+        "version": ensure_text(scraper.version),
+        "metadata": scraper.streams,
+        "grade": scraper.grade()
+    }
+    if check_wellformed:
+        results["well-formed"] = scraper.well_formed
+    if tool_info:
+        results["tool_info"] = scraper.info
+
+    errors = {}
+
+    for item in scraper.info.values():
+        if "ExtractorNotFound" in item["class"]:
+            raise RequestError(
+                f"None of the extractors supported the detected (or inputted) "
+                f"mimetype: {scraper.mimetype}. "
+                f"The file was not analyzed."
+            )
+        if item["errors"]:
+            errors[item["class"]] = item["errors"]
+    if errors:
+        results["errors"] = errors
+    return results
+
+
+def detect_file_results(filename: str | os.PathLike) -> dict[str, str]:
+    """Detect the file format of a file and return the results printed by
+    the command line interface.
+
+    :param filename: Path to the file
+    :returns: Results as a dict
+    """
+    detect_scraper = Scraper(filename=filename)
+    mimetype, version = detect_scraper.detect_filetype()
+
+    return {
+        "path": str(detect_scraper.input_path),
+        "MIME type": str(mimetype),
+        "version": str(version)
+    }
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    """Handle the requests of a single client connection."""
+
+    server: ScraperServer
+
+    def handle(self) -> None:
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            response = self.server.handle_request(line)
+            self.wfile.write(json.dumps(response).encode("utf-8") + b"\n")
+            self.wfile.flush()
+
+
+class ScraperServer(socketserver.ThreadingUnixStreamServer):
+    """Scraper server listening to a Unix socket.
+
+    Each client connection is handled in its own thread, but at most
+    ``workers`` files are scraped at the same time. The server can be
+    used as a context manager, which closes the socket and removes the
+    socket file on exit::
+
+        with ScraperServer("/run/file-scraper.sock", workers=8) as server:
+            server.warm_up()
+            server.serve_forever()
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        socket_path: str | os.PathLike,
+        workers: int = DEFAULT_WORKERS,
+    ) -> None:
+        """Initialize the server and bind to the socket.
+
+        :param socket_path: Path of the Unix socket. A stale socket file
+            left behind by a stopped server is replaced.
+        :param workers: Maximum number of files scraped concurrently
+        :raises OSError: If another server is listening to the socket
+        """
+        self.socket_path = os.fspath(socket_path)
+        self.workers = workers
+        self._semaphore = threading.BoundedSemaphore(workers)
+        _remove_stale_socket(self.socket_path)
+        super().__init__(self.socket_path, _RequestHandler)
+
+    def server_close(self) -> None:
+        super().server_close()
+        try:
+            os.unlink(self.socket_path)
+        except FileNotFoundError:
+            pass
+
+    def warm_up(self) -> None:
+        """Load the detectors and extractors before serving requests.
+
+        A small text file is scraped, so that Fido signatures, the magic
+        library and the versions of the commonly used tools are loaded
+        before the first request.
+        """
+        LOGGER.info("Warming up the scraper")
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "warm-up.txt")
+            with open(path, "w", encoding="utf-8") as warm_up_file:
+                warm_up_file.write("file-scraper\n")
+            Scraper(path).scrape()
+
+    def handle_request(self, line: bytes) -> dict[str, Any]:
+        """Handle a single request.
+
+        :param line: Request encoded as JSON
+        :returns: Response as a dict
+        """
+        try:
+            request = json.loads(line)
+            command = request.pop("command")
+            path = request.pop("path")
+        except (ValueError, AttributeError, KeyError) as error:
+            return {"status": "error", "error": f"Invalid request: {error}",
+                    "param": None}
+
+        LOGGER.info("Received %s request for %s", command, path)
+        try:
+            with self._semaphore:
+                if command == "scrape":
+                    results = scrape_file_results(path, **request)
+                elif command == "detect":
+                    results = detect_file_results(path)
+                else:
+                    raise RequestError(f"Unknown command: {command}")
+        except RequestError as error:
+            return {"status": "error", "error": str(error),
+                    "param": error.param}
+        except Exception as error:  # pylint: disable=broad-exception-caught
+            LOGGER.exception("Request for %s failed", path)
+            return {"status": "error",
+                    "error": f"{type(error).__name__}: {error}",
+                    "param": None}
+
+        return {"status": "ok", "results": results}
+
+
+def _remove_stale_socket(socket_path: str) -> None:
+    """Remove a socket file if no server is listening to it.
+
+    :param socket_path: Path of the Unix socket
+    :raises OSError: If a server is listening to the socket
+    """
+    if not os.path.exists(socket_path):
+        return
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(socket_path)
+        except ConnectionRefusedError:
+            LOGGER.info("Removing stale socket %s", socket_path)
+            os.unlink(socket_path)
+            return
+    raise OSError(f"A server is already listening to {socket_path}")
+
+
+class ScraperClient:
+    """Client of :class:`ScraperServer`.
+
+    The client keeps the connection open between the requests, and can be
+    used as a context manager to close it::
+
+        with ScraperClient("/run/file-scraper.sock") as client:
+            results = client.scrape("file.pdf", check_wellformed=False)
+    """
+
+    def __init__(self, socket_path: str | os.PathLike) -> None:
+        """Connect to a server.
+
+        :param socket_path: Path of the Unix socket of the server
+        """
+        self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._socket.connect(os.fspath(socket_path))
+        self._file = self._socket.makefile("rwb")
+
+    def __enter__(self) -> ScraperClient:
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close the connection."""
+        self._file.close()
+        self._socket.close()
+
+    def _request(
+        self,
+        command: str,
+        path: str | os.PathLike,
+        **kwargs: Any,
+    ) -> dict[str, Any]:
+        """Send a request and return the results.
+
+        The path is sent as an absolute path, because the working directory
+        of the server may differ from the client. The path in the results
+        is the path given by the caller.
+
+        :param command: "scrape" or "detect"
+        :param path: Path to the file
+        :param kwargs: Other members of the request
+        :returns: Results as a dict
+        :raises RequestError: If the server could not fulfill the request
+        """
+        request = {"command": command, "path": os.path.abspath(path),
+                   **kwargs}
+        self._file.write(json.dumps(request).encode("utf-8") + b"\n")
+        self._file.flush()
+
+        line = self._file.readline()
+        if not line:
+            raise ConnectionError("Server closed the connection")
+        response = json.loads(line)
+        if response["status"] != "ok":
+            raise RequestError(response["error"], response.get("param"))
+
+        results = response["results"]
+        results["path"] = str(path)
+        return results
+
+    def scrape(
+        self,
+        path: str | os.PathLike,
+        check_wellformed: bool = True,
+        tool_info: bool = False,
+        mimetype: str | None = None,
+        version: str | None = None,
+        params: dict[str, Any] | None = None,
+    ) -> dict[str, Any]:
+        """Scrape a file in the server.
+
+        See :func:`scrape_file_results` for the parameters.
+
+        :returns: Results as a dict
+        :raises RequestError: If the file can not be scraped
+        """
+        return self._request(
+            "scrape", path, check_wellformed=check_wellformed,
+            tool_info=tool_info, mimetype=mimetype, version=version,
+            params=params or {}
+        )
+
+    def detect(self, path: str | os.PathLike) -> dict[str, str]:
+        """Detect the file format of a file in the server.
+
+        :param path: Path to the file
+        :returns: Results as a dict
+        :raises RequestError: If the file format can not be detected
+        """
+        return self._request("detect", path)
@@ -1,6 +1,7 @@
 """Wrapper for calling external commands"""
 from __future__ import annotations
 
+import asyncio
 from collections.abc import Sequence
 import os
 from pathlib import Path
@@ -144,19 +145,90 @@ class Shell:
                 os.close(pty_master)
                 os.close(pty_slave)
 
-            LOGGER.info(
-                "Command '%s' finished with exit code %d",
-                self.command, self._returncode
+            self._log_results()
+        return {
+            "returncode": self._returncode,
+            "stderr": self._stderr,
+            "stdout": self._stdout,
+        }
+
+    def _log_results(self) -> None:
+        """Log the exit code and the output of a failed command."""
+        LOGGER.info(
+            "Command '%s' finished with exit code %d",
+            self.command, self._returncode
+        )
+
+        if self._returncode != 0:
+            LOGGER.debug(
+                "Command failed with stdout: %s, stderr: %s",
+                self._stdout[0:8192],
+                self._stderr[0:8192]
             )
 
-            if self._returncode != 0:
-                LOGGER.debug(
-                    "Command failed with stdout: %s, stderr: %s",
-                    self._stdout[0:8192],
-                    self._stderr[0:8192]
-                )
+
+class AsyncShell(Shell):
+    """Shell command handler for asyncio applications.
+
+    The command is run using asyncio subprocesses, so that waiting for the
+    command does not block the event loop. The command must be run with
+    ``await shell.apopen()`` before the results can be read using the
+    properties inherited from Shell::
+
+        shell = AsyncShell(["file", "--version"])
+        await shell.apopen()
+        print(shell.stdout)
+    """
+
+    def popen(self) -> Shell._POpenResults:
+        """
+        Return the cached results of the command.
+
+        :returns: Returncode, stdout, stderr as dictionary
+        :raises RuntimeError: If the command has not been run yet.
+        """
+        if self._returncode is None:
+            raise RuntimeError(
+                "The command must be run with apopen() before reading "
+                "the results."
+            )
         return {
             "returncode": self._returncode,
             "stderr": self._stderr,
             "stdout": self._stdout,
         }
+
+    async def apopen(self) -> Shell._POpenResults:
+        """
+        Run the command and store results to class attributes for caching.
+
+        :returns: Returncode, stdout, stderr as dictionary
+        """
+        if self._returncode is None:
+            LOGGER.debug("Executing '%s' asynchronously...", self.command)
+
+            # See Shell.popen for the reasoning behind the pseudo-terminal
+            stdin = None
+            if self._use_pty:
+                pty_master, pty_slave = pty.openpty()
+                stdin = pty_master
+
+            try:
+                proc = await asyncio.create_subprocess_exec(
+                    *self.command,
+                    stdout=self.stdout_file,
+                    stderr=self.stderr_file,
+                    stdin=stdin,
+                    env=self._env)
+                (stdout, stderr) = await proc.communicate()
+            finally:
+                if self._use_pty:
+                    os.close(pty_master)
+                    os.close(pty_slave)
+
+            self._stdout = stdout or b""
+            self._stderr = stderr or b""
+            self._returncode = proc.returncode
+
+            self._log_results()
+        return self.popen()
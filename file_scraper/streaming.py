@@ -0,0 +1,264 @@
+"""Read a file once and pass its contents to several consumers.
+
+Some extractors check the whole file in Python, e.g. decode it or parse
+it. Instead of each of them reading the file separately,
+:func:`stream_file` reads the file once in chunks and feeds each chunk to
+every registered :class:`StreamConsumer`.
+
+An extractor supporting the shared pass returns a consumer from
+:meth:`file_scraper.base.BaseExtractor.stream_consumer`. Usually the
+consumer is a :class:`ThreadedConsumer`, which runs the existing checks of
+the extractor in a background thread, reading the file contents from the
+fed chunks instead of the file.
+"""
+from __future__ import annotations
+
+import abc
+import hashlib
+import io
+import os
+import queue
+import threading
+from collections.abc import Callable, Iterable
+from pathlib import Path
+from typing import BinaryIO, Generic, TypeVar
+
+from file_scraper.logger import LOGGER
+
+STREAM_CHUNK_SIZE = 1024 * 1024
+
+T = TypeVar("T")
+
+
+class StreamConsumer(metaclass=abc.ABCMeta):
+    """Consumer of the chunks of a file read by :func:`stream_file`."""
+
+    @property
+    def done(self) -> bool:
+        """True if the consumer does not need more data."""
+        return False
+
+    @abc.abstractmethod
+    def feed(self, chunk: bytes) -> None:
+        """Process the next chunk of the file.
+
+        :param chunk: Chunk of the file
+        """
+
+    @abc.abstractmethod
+    def finish(self, error: OSError | None = None) -> None:
+        """Finish processing the file.
+
+        Called once, when the whole file has been read, every consumer is
+        done, or reading the file failed.
+
+        :param error: Error raised when opening or reading the file
+        """
+
+
+class ChecksumConsumer(StreamConsumer):
+    """Calculate checksums of the file with several algorithms.
+
+    The consumer is also used by :func:`file_scraper.utils.hexdigests`,
+    so the checksums of the shared pass and of a separate read are
+    calculated the same way.
+    """
+
+    def __init__(self, algorithms: Iterable[str]) -> None:
+        """Initialize the consumer.
+
+        :param algorithms: Hash algorithms. MD5 or SHA variants.
+        :raises ValueError: If an algorithm is not supported
+        """
+        self._algorithms = list(algorithms)
+        self._checksums = [
+            hashlib.new(algorithm.replace("-", "").lower().strip())
+            for algorithm in self._algorithms
+        ]
+        self._error: OSError | None = None
+
+    def feed(self, chunk: bytes) -> None:
+        for checksum in self._checksums:
+            checksum.update(chunk)
+
+    def finish(self, error: OSError | None = None) -> None:
+        self._error = error
+
+    def hexdigests(self) -> dict[str, str]:
+        """Return the checksums.
+
+        :returns: Calculated checksums by the algorithm names as given
+        :raises OSError: If the file could not be read
+        """
+        if self._error is not None:
+            raise self._error
+        return {
+            algorithm: checksum.hexdigest()
+            for algorithm, checksum in zip(self._algorithms, self._checksums)
+        }
+
+
+class _End:
+    """End of the fed chunks, possibly because of an error."""
+
+    def __init__(self, error: OSError | None) -> None:
+        self.error = error
+
+
+class _QueueReader(io.RawIOBase):
+    """Binary file object reading the chunks fed to a ThreadedConsumer."""
+
+    def __init__(self, chunks: queue.Queue[bytes | _End]) -> None:
+        super().__init__()
+        self._chunks = chunks
+        self._buffer = memoryview(b"")
+        self.ended = False
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: bytearray | memoryview) -> int:
+        while not self._buffer:
+            if self.ended:
+                return 0
+            item = self._chunks.get()
+            if isinstance(item, _End):
+                self.ended = True
+                if item.error is not None:
+                    raise item.error
+                return 0
+            self._buffer = memoryview(item)
+
+        size = min(len(buffer), len(self._buffer))
+        buffer[:size] = self._buffer[:size]
+        self._buffer = self._buffer[size:]
+        return size
+
+    def drain(self) -> None:
+        """Discard the remaining chunks until the end."""
+        self._buffer = memoryview(b"")
+        while not self.ended:
+            self.ended = isinstance(self._chunks.get(), _End)
+
+
+class ThreadedConsumer(StreamConsumer, Generic[T]):
+    """Run a function reading a file object in a background thread.
+
+    The function reads the fed chunks as if it was reading the file, so
+    the same function can be used for reading the file directly. If
+    reading the file fails, the function gets the OSError from the read
+    call. The return value of the function, or the exception raised by
+    it, is available from :meth:`result` after the consumer is finished.
+    """
+
+    def __init__(
+        self,
+        func: Callable[[BinaryIO], T],
+        maxsize: int = 4,
+    ) -> None:
+        """Initialize the consumer.
+
+        :param func: Function reading the file from the given file object
+        :param maxsize: Maximum number of chunks waiting to be read by
+            the function
+        """
+        self._func = func
+        self._chunks: queue.Queue[bytes | _End] = queue.Queue(maxsize)
+        self._reader = _QueueReader(self._chunks)
+        self._thread: threading.Thread | None = None
+        self._result: T | None = None
+        self._exception: BaseException | None = None
+        self._returned = False
+        self.finished = False
+
+    @property
+    def done(self) -> bool:
+        return self._returned
+
+    def _start(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        try:
+            self._result = self._func(
+                io.BufferedReader(self._reader, STREAM_CHUNK_SIZE)
+            )
+        except BaseException as exception:  # pylint: disable=broad-except
+            self._exception = exception
+        finally:
+            self._returned = True
+            self._reader.drain()
+
+    def feed(self, chunk: bytes) -> None:
+        self._start()
+        self._chunks.put(chunk)
+
+    def finish(self, error: OSError | None = None) -> None:
+        self._start()
+        self._chunks.put(_End(error))
+        self._thread.join()
+        self.finished = True
+
+    def result(self) -> T:
+        """Return the return value of the function.
+
+        :returns: Return value of the function
+        :raises: The exception raised by the function
+        :raises RuntimeError: If the consumer has not been finished
+        """
+        if not self.finished:
+            raise RuntimeError("The consumer has not been finished.")
+        if self._exception is not None:
+            raise self._exception
+        return self._result
+
+
+def stream_file(
+    path: str | os.PathLike,
+    consumers: Iterable[StreamConsumer],
+    chunk_size: int = STREAM_CHUNK_SIZE,
+) -> None:
+    """Read a file once and feed its contents to the consumers.
+
+    The file is read until its end or until every consumer is done. Each
+    consumer is finished after reading, also if reading the file fails.
+
+    :param path: Path to the file
+    :param consumers: Consumers of the file contents
+    :param chunk_size: Size of the chunks read from the file
+    """
+    consumers = list(consumers)
+    LOGGER.debug("Streaming %s to %d consumers", path, len(consumers))
+    error = None
+    try:
+        with open(path, "rb") as infile:
+            while active := [
+                consumer for consumer in consumers if not consumer.done
+            ]:
+                chunk = infile.read(chunk_size)
+                if not chunk:
+                    break
+                for consumer in active:
+                    consumer.feed(chunk)
+    except OSError as exception:
+        error = exception
+    finally:
+        for consumer in consumers:
+            consumer.finish(error)
+
+
+def consume_file(path: str | Path, consumer: ThreadedConsumer[T]) -> T:
+    """Return the result of a consumer, reading the file if necessary.
+
+    If the consumer has not been finished in a pass shared with other
+    consumers, the file is streamed to the consumer alone.
+
+    :param path: Path to the file
+    :param consumer: Consumer of the file contents
+    :returns: Result of the consumer
+    """
+    if not consumer.finished:
+        stream_file(path, [consumer])
+    return consumer.result()
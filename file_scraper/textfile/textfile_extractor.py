@@ -1,24 +1,52 @@
 """Module for checking if the file is suitable as text file or not."""
 from __future__ import annotations
-from io import BufferedReader
-from typing import Literal
+import re
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import BinaryIO, Literal
 
 from file_scraper.base import BaseExtractor
 from file_scraper.exceptions import (ForbiddenCharacterError,
                                      UnknownEncodingError)
-from file_scraper.shell import Shell
 from file_scraper.logger import LOGGER
-from file_scraper.utils import iter_utf_bytes
+from file_scraper.magiclib import (magic_analyze, magic_error, magiclib,
+                                   magiclib_version)
+from file_scraper.streaming import ThreadedConsumer, consume_file
+from file_scraper.utils import iter_utf_bytes, iter_utf_ranges
 from file_scraper.textfile.textfile_model import (TextFileMeta,
                                                   TextEncodingMeta)
 
 
+# ASCII control characters, in exception of horizontal tab, carriage
+# return, and line feed
+_FORBIDDEN = [
+    "\x00", "\x01", "\x02", "\x03", "\x04", "\x05", "\x06", "\x07",
+    "\x08", "\x0B", "\x0C", "\x0E", "\x0F", "\x10", "\x11", "\x12",
+    "\x13", "\x14", "\x15", "\x16", "\x17", "\x18", "\x19", "\x1A",
+    "\x1B", "\x1C", "\x1D", "\x1E", "\x1F", "\x7F"
+]
+# ISO-8859-15 control characters are also forbidden in ISO-8859-15 files
+_FORBIDDEN_ISO_8859_15 = _FORBIDDEN + [
+    "\x80", "\x81", "\x82", "\x83", "\x84", "\x85", "\x86", "\x87",
+    "\x88", "\x89", "\x8A", "\x8B", "\x8C", "\x8D", "\x8E", "\x8F",
+    "\x90", "\x91", "\x92", "\x93", "\x94", "\x95", "\x96", "\x97",
+    "\x98", "\x99", "\x9A", "\x9B", "\x9C", "\x9D", "\x9E", "\x9F"
+]
+# Forbidden characters as bytes, for deleting them with bytes.translate
+_FORBIDDEN_BYTES = "".join(_FORBIDDEN).encode("latin-1")
+_FORBIDDEN_ISO_8859_15_BYTES = \
+    "".join(_FORBIDDEN_ISO_8859_15).encode("latin-1")
+# Encodings in which the forbidden characters are encoded as single bytes
+# of the same value, and no other character contains such bytes
+_BYTE_SCAN_CHARSETS = {"ASCII", "UTF-8", "ISO-8859-15"}
+
+
 class TextfileExtractor(BaseExtractor[TextFileMeta]):
     """
     Text file detection extractor.
 
-    file (libmagick) checks mime-type and that if it is a text
-    file with the soft option that excludes libmagick.
+    libmagic checks mime-type and that if it is a text file, excluding the
+    soft magic tests of the magic database.
 
     The tool is not able to detect UTF-16 files without BOM or UTF-32 files.
     """
@@ -28,24 +56,44 @@ class TextfileExtractor(BaseExtractor[TextFileMeta]):
     _allow_unav_mime = True
     _allow_unav_version = True
 
+    _magic_mimetype: str | None = None
+
     def _file_mimetype(self) -> str:
         """
         Detect MIME type by only running `soft` check and returning
         `text/plain` (if it's one of the results)
         or the first result (if `text/plain` was not in the results)
 
+        The MIME type is detected only once.
+
         :returns: file mimetype
         """
-        shell = Shell([
-            "file", "--keep-going", "-be", "soft", "--mime-type",
-            self.filename
-        ])
-        if shell.stderr:
-            self._errors.append(shell.stderr)
+        if self._magic_mimetype is None:
+            self._magic_mimetype = self._detect_mimetype()
+        return self._magic_mimetype
 
-        matches = shell.stdout.strip()
-        # 'file' separates multiple matches with '\012- ' per documentation
-        matches = matches.split("\\012- ")
+    def _detect_mimetype(self) -> str:
+        """
+        Detect MIME type with libmagic.
+
+        The magic flags are the same as used by the command
+        `file --keep-going --exclude soft --mime-type`.
+
+        :returns: file mimetype
+        """
+        magic_lib = magiclib()
+        magic_type = (magic_lib.MAGIC_MIME_TYPE | magic_lib.MAGIC_CONTINUE
+                      | magic_lib.MAGIC_NO_CHECK_SOFT)
+        matches = magic_analyze(magic_lib, magic_type, self.filename)
+        if matches is None:
+            # The error of the file, or None if libmagic was not loaded
+            self._errors.append(magic_error(magic_lib, magic_type)
+                                or "Magic library could not be opened.")
+            return ""
+
+        # libmagic separates multiple matches with '\012- ', or with
+        # '\n- ' if the output is not escaped
+        matches = re.split(r"\\012- |\n- ", matches.strip())
 
         try:
             # Check if 'text/plain' was detected as a secondary file format
@@ -85,7 +133,8 @@ class TextfileExtractor(BaseExtractor[TextFileMeta]):
         self.streams = list(self.iterate_models(
             well_formed=self.well_formed))
 
-    def tools(self) -> dict[str, dict[str, str]]:
+    @classmethod
+    def tools(cls) -> dict[str, dict[str, str]]:
         """Return information about the software used by the extractor or
         detector.
 
@@ -94,10 +143,9 @@ class TextfileExtractor(BaseExtractor[TextFileMeta]):
             tool (e.g. version). If no tools are available, an empty
             dictionary is returned instead.
         """
-        file_output = Shell(["file", "--version"])
         return {
-            "file": {
-                "version": file_output.stdout.split("\n", maxsplit=1)[0][5:]
+            "libmagic": {
+                "version": magiclib_version()
             }
         }
 
@@ -161,7 +209,8 @@ class TextEncodingMetaExtractor(BaseExtractor[TextEncodingMeta]):
             predefined_mimetype=self._predefined_mimetype,
         ))
 
-    def tools(self) -> dict:
+    @classmethod
+    def tools(cls) -> dict:
         return {}
 
 
@@ -185,6 +234,11 @@ class TextEncodingExtractor(BaseExtractor[TextEncodingMeta]):
       we also need to try ASCII. If ASCII succeeds, it is also ISO-8859-15
       file. If ASCII fails, we also need to try UTF-8. If that fails, the
       file is ISO-8859-15, otherwise UTF-8.
+
+    By default, only the first ``_limit`` bytes of the file are validated.
+    If the ``text_encoding_workers`` parameter is given, the whole file is
+    validated instead, decoding the chunks in parallel using the given
+    number of worker processes.
     """
     _supported_metadata = [TextEncodingMeta]
     _only_wellformed = True
@@ -195,6 +249,8 @@ class TextEncodingExtractor(BaseExtractor[TextEncodingMeta]):
     _allow_unav_mime = True
     _allow_unav_version = True
 
+    _consumer: ThreadedConsumer[None] | None = None
+
     @property
     def well_formed(self) -> Literal[False] | None:
         """Return well-formedness status of the scraped file.
@@ -211,6 +267,25 @@ class TextEncodingExtractor(BaseExtractor[TextEncodingMeta]):
 
         return None
 
+    @property
+    def _workers(self) -> int | None:
+        """Number of worker processes validating the whole file, if any."""
+        return self._params.get("text_encoding_workers", None)
+
+    def stream_consumer(self) -> ThreadedConsumer[None] | None:
+        """
+        Return a consumer validating the encoding of the streamed file.
+
+        :returns: Consumer of the file contents, or None if the character
+            encoding is not defined or the file is validated in worker
+            processes
+        """
+        if not self._predefined_charset or self._workers:
+            return None
+        if self._consumer is None:
+            self._consumer = ThreadedConsumer(self._validate_encoding)
+        return self._consumer
+
     def _extract(self) -> None:
         """
         Validate the file with decoding it with given character encoding.
@@ -224,42 +299,10 @@ class TextEncodingExtractor(BaseExtractor[TextEncodingMeta]):
             self._errors.append("Character encoding not defined.")
             return
         try:
-            with open(self.filename, "rb") as infile:
-                position = 0
-                probably_utf8 = None  # Not suggesting UTF-8 if empty file
-
-                charset = self._predetect_charset(infile)
-                for chunk in iter_utf_bytes(infile, self._chunksize,
-                                            self._predefined_charset):
-
-                    self._decode_chunk(chunk, charset, position)
-
-                    # If all of the chucks result True here, we most
-                    # likely have UTF-8. Or in other words, if any of the
-                    # chuncks result False, then we don't have UTF-8.
-                    if probably_utf8 in [True, None]:
-                        # Will remain False, if once got such value
-                        probably_utf8 = self._utf8_contradiction(
-                            chunk, position)
-
-                    position = position + len(chunk)
-                    if position >= self._limit and self._limit > 0:
-                        self._messages.append(
-                            f"First {self._limit} bytes read, "
-                            f"we skip the remainder.")
-                        break
-
-                if probably_utf8:
-                    self._errors.append(
-                        f"Character decoding error: The character "
-                        f"encoding passed with UTF-8 and it contains "
-                        f"characters colliding with the given encoding "
-                        f"{self._predefined_charset}. Most likely "
-                        f"the file is UTF-8 file.")
-                else:
-                    self._messages.append(
-                        "Character encoding validated successfully.")
-
+            if self._workers:
+                self._validate_in_parallel(self._workers)
+            else:
+                consume_file(self.filename, self.stream_consumer())
         except OSError as err:
             self._errors.append("Error when reading the file: " +
                                 str(err))
@@ -272,19 +315,117 @@ class TextEncodingExtractor(BaseExtractor[TextEncodingMeta]):
             predefined_mimetype=self._predefined_mimetype
         ))
 
-    def _predetect_charset(self, infile: BufferedReader) -> str:
+    def _validate_encoding(self, infile: BinaryIO) -> None:
+        """
+        Decode the file in chunks with the given character encoding.
+
+        :param infile: File to validate
+        :raises ForbiddenCharacterError: When a forbidden character was
+            found.
+        :raises UnknownEncodingError: When the decoding was unsuccessful
+        """
+        position = 0
+        probably_utf8 = None  # Not suggesting UTF-8 if empty file
+
+        head = infile.read(1024)
+        charset = self._predetect_charset(head)
+        for chunk in iter_utf_bytes(infile, self._chunksize,
+                                    self._predefined_charset, prefix=head):
+
+            self._decode_chunk(chunk, charset, position)
+
+            # If all of the chucks result True here, we most
+            # likely have UTF-8. Or in other words, if any of the
+            # chuncks result False, then we don't have UTF-8.
+            if probably_utf8 in [True, None]:
+                # Will remain False, if once got such value
+                probably_utf8 = self._utf8_contradiction(
+                    chunk, position)
+
+            position = position + len(chunk)
+            if position >= self._limit and self._limit > 0:
+                self._messages.append(
+                    f"First {self._limit} bytes read, "
+                    f"we skip the remainder.")
+                break
+
+        self._report_utf8_contradiction(probably_utf8)
+
+    def _validate_in_parallel(self, workers: int) -> None:
+        """
+        Decode the whole file in chunks using worker processes.
+
+        The file is split into the same chunks as in
+        :meth:`_validate_encoding`, and each worker reads and decodes its
+        chunks from the file. The positions in the errors are positions in
+        the whole file. If several chunks have errors, the error of the
+        first one is raised.
+
+        :param workers: Number of worker processes
+        :raises ForbiddenCharacterError: When a forbidden character was
+            found.
+        :raises UnknownEncodingError: When the decoding was unsuccessful
+        """
+        with open(self.filename, "rb") as infile:
+            head = infile.read(1024)
+            charset = self._predetect_charset(head)
+            ranges = list(iter_utf_ranges(
+                infile, self._chunksize, self._predefined_charset,
+                prefix_size=len(head)))
+
+        LOGGER.debug("Validating %d chunks of %s in %d processes",
+                     len(ranges), self.filename, workers)
+        probably_utf8 = None  # Not suggesting UTF-8 if empty file
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(_validate_chunk, self.filename,
+                                self._predefined_charset, charset,
+                                start, end)
+                for start, end in ranges
+            ]
+            try:
+                for future in futures:
+                    contradiction = future.result()
+                    if probably_utf8 in [True, None]:
+                        probably_utf8 = contradiction
+            finally:
+                for future in futures:
+                    future.cancel()
+
+        self._report_utf8_contradiction(probably_utf8)
+
+    def _report_utf8_contradiction(self, probably_utf8: bool | None) -> None:
+        """
+        Report the result of a successful decoding.
+
+        :param probably_utf8: True if every chunk of the file could be
+            decoded as UTF-8 as well
+        """
+        if probably_utf8:
+            self._errors.append(
+                f"Character decoding error: The character "
+                f"encoding passed with UTF-8 and it contains "
+                f"characters colliding with the given encoding "
+                f"{self._predefined_charset}. Most likely "
+                f"the file is UTF-8 file.")
+        else:
+            self._messages.append(
+                "Character encoding validated successfully.")
+
+    def _predetect_charset(self, head: bytes) -> str:
         """
         Predetect charset.
 
         In some cases, more accurate encoding information may be needed
         to do the decoding. Currently, this applies to UTF-32, which
         does not work, if the file is UTF-32BE and does not have BOM.
+
+        :param head: First 1024 bytes of the file
+        :returns: Charset used for decoding
         """
-        chunk = infile.read(1024)
-        infile.seek(0)
         if self._predefined_charset == "UTF-32":
             try:
-                self._decode_chunk(chunk, "UTF-32BE", 0)
+                self._decode_chunk(head, "UTF-32BE", 0)
                 return "UTF-32BE"
             except (ForbiddenCharacterError, UnknownEncodingError):
                 pass
@@ -312,15 +453,14 @@ class TextEncodingExtractor(BaseExtractor[TextEncodingMeta]):
             return False
 
         if self._predefined_charset == "ISO-8859-15":
-            try:
-                # If ASCII works, then also ISO-8859-15 is OK
-                self._decode_chunk(chunk, "ASCII", position)
+            # If ASCII works, then also ISO-8859-15 is OK. The chunk has
+            # already been decoded as ISO-8859-15 without forbidden
+            # characters, so an ASCII chunk has no forbidden characters
+            # either and it does not need to be decoded again.
+            if chunk.isascii():
                 return False
-            except (ForbiddenCharacterError, UnknownEncodingError):
-                # If ASCII did not work, then charset can be (almost) anything
-                LOGGER.debug(
-                    "Test chunk could not be parsed as ASCII", exc_info=True
-                )
+            # If ASCII did not work, then charset can be (almost) anything
+            LOGGER.debug("Test chunk could not be parsed as ASCII")
 
         # If ASCII did not work, but UTF-8 works, then we quite probably have
         # UTF-8.
@@ -351,25 +491,32 @@ class TextEncodingExtractor(BaseExtractor[TextEncodingMeta]):
         """
         try:
             decoded_chunk = chunk.decode(charset)
+        except UnicodeDecodeError as err:
+            raise UnknownEncodingError(
+                _decoding_error_message(err, position)) from err
         except (UnicodeError, LookupError) as err:
             raise UnknownEncodingError(err) from err
 
-        forbidden = ["\x00", "\x01", "\x02", "\x03", "\x04", "\x05", "\x06",
-                     "\x07", "\x08", "\x0B", "\x0C", "\x0E", "\x0F", "\x10",
-                     "\x11", "\x12", "\x13", "\x14", "\x15", "\x16", "\x17",
-                     "\x18", "\x19", "\x1A", "\x1B", "\x1C", "\x1D", "\x1E",
-                     "\x1F", "\x7F"]
-
         if charset == 'ISO-8859-15':
-            # Add ISO-8859-15 control characters to the list of forbidden
-            # characters
-            forbidden += ["\x80", "\x81", "\x82", "\x83", "\x84", "\x85",
-                          "\x86", "\x87", "\x88", "\x89", "\x8A", "\x8B",
-                          "\x8C", "\x8D", "\x8E", "\x8F", "\x90", "\x91",
-                          "\x92", "\x93", "\x94", "\x95", "\x96", "\x97",
-                          "\x98", "\x99", "\x9A", "\x9B", "\x9C", "\x9D",
-                          "\x9E", "\x9F"]
+            forbidden = _FORBIDDEN_ISO_8859_15
+            forbidden_bytes = _FORBIDDEN_ISO_8859_15_BYTES
+        else:
+            forbidden = _FORBIDDEN
+            forbidden_bytes = _FORBIDDEN_BYTES
+
+        # Scan the chunk once for any forbidden character by deleting
+        # them. Other encodings are scanned as UTF-8, because all of the
+        # forbidden characters in them are ASCII characters.
+        if charset in _BYTE_SCAN_CHARSETS:
+            encoded_chunk = chunk
+        else:
+            encoded_chunk = decoded_chunk.encode("UTF-8", "surrogatepass")
+        if len(encoded_chunk.translate(None, forbidden_bytes)) \
+                == len(encoded_chunk):
+            return
 
+        # The error reports the forbidden character which is first in the
+        # list of forbidden characters, not the first one in the chunk.
         for forb_char in forbidden:
             index = decoded_chunk.find(forb_char)
             if index > -1:
@@ -377,5 +524,54 @@ class TextEncodingExtractor(BaseExtractor[TextEncodingMeta]):
                     f"Illegal character '{repr(forb_char)[1:-1]}' in "
                     f"position {(position + index)}")
 
-    def tools(self) -> dict:
+    @classmethod
+    def tools(cls) -> dict:
         return {}
+
+
+def _decoding_error_message(err: UnicodeDecodeError, position: int) -> str:
+    """
+    Return the message of a decoding error of a chunk, with the position
+    of the invalid bytes in the whole file.
+
+    :param err: Decoding error of the chunk
+    :param position: Chunk position in the file
+    :returns: Error message as given by UnicodeDecodeError
+    """
+    start = position + err.start
+    if err.end - err.start == 1:
+        return (f"'{err.encoding}' codec can't decode byte "
+                f"0x{err.object[err.start]:02x} in position {start}: "
+                f"{err.reason}")
+    return (f"'{err.encoding}' codec can't decode bytes in position "
+            f"{start}-{position + err.end - 1}: {err.reason}")
+
+
+def _validate_chunk(
+    filename: Path,
+    predefined_charset: str,
+    charset: str,
+    start: int,
+    end: int,
+) -> bool:
+    """
+    Decode a chunk of a file in a worker process.
+
+    :param filename: Path to the file
+    :param predefined_charset: Character encoding given to the extractor
+    :param charset: Decoding charset
+    :param start: Start position of the chunk in the file
+    :param end: End position of the chunk in the file
+    :returns: True if there is UTF-8 contradiction, otherwise False
+    :raises ForbiddenCharacterError: When a forbidden character was
+        found.
+    :raises UnknownEncodingError: When the decoding was unsuccessful
+    """
+    extractor = TextEncodingExtractor(
+        filename=filename, mimetype=None, charset=predefined_charset)
+    with open(filename, "rb") as infile:
+        infile.seek(start)
+        chunk = infile.read(end - start)
+    # pylint: disable=protected-access
+    extractor._decode_chunk(chunk, charset, start)
+    return extractor._utf8_contradiction(chunk, start)
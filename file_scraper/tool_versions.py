@@ -0,0 +1,153 @@
+"""Per-process registry of 3rd party tool versions.
+
+Resolving the version of a tool often requires running the tool in a
+subprocess. The versions do not change while the files are scraped, so
+each version is resolved once per process and shared by all detectors and
+extractors.
+
+By default, the resolved versions are kept for the lifetime of the process.
+A long-running process can limit the lifetime of the versions by setting
+the time-to-live in seconds with :func:`set_ttl` or with the environment
+variable ``FILE_SCRAPER_TOOL_VERSION_TTL``.
+"""
+from __future__ import annotations
+
+import functools
+import os
+import threading
+import time
+from collections.abc import Callable
+from typing import Any, TypeVar
+
+from file_scraper.logger import LOGGER
+
+T = TypeVar("T")
+
+
+class ToolVersionRegistry:
+    """Thread-safe memo of tool versions.
+
+    The versions are stored by a key, which is usually the name of the
+    tool. A version is resolved by calling the given resolver, when the key
+    is requested for the first time or the previous version has expired.
+    Exceptions raised by the resolver are not stored, so the version is
+    resolved again on the next request.
+    """
+
+    def __init__(self, ttl: float | None = None) -> None:
+        """Initialize the registry.
+
+        :param ttl: Time-to-live of the versions in seconds, or None to
+            keep the versions until :meth:`clear` is called.
+        """
+        self.ttl = ttl
+        self._versions: dict[Any, tuple[float, Any]] = {}
+        self._locks: dict[Any, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def _key_lock(self, key: Any) -> threading.Lock:
+        """Return the lock used for resolving the given key."""
+        with self._lock:
+            return self._locks.setdefault(key, threading.Lock())
+
+    def _lookup(self, key: Any) -> tuple[bool, Any]:
+        """Return the stored version of the key if it has not expired.
+
+        :param key: Key of the version
+        :returns: Tuple (found, version)
+        """
+        try:
+            resolved, version = self._versions[key]
+        except KeyError:
+            return False, None
+        if self.ttl is not None and time.monotonic() - resolved > self.ttl:
+            return False, None
+        return True, version
+
+    def get(self, key: Any, resolver: Callable[[], T]) -> T:
+        """Return the version of a tool, resolving it if necessary.
+
+        Concurrent requests of the same key wait for the first resolver
+        to finish, so the resolver is called only once.
+
+        :param key: Key of the version, e.g. name of the tool
+        :param resolver: Function returning the version
+        :returns: Version returned by the resolver
+        """
+        found, version = self._lookup(key)
+        if found:
+            return version
+
+        with self._key_lock(key):
+            found, version = self._lookup(key)
+            if found:
+                return version
+            LOGGER.debug("Resolving version of %s", key)
+            version = resolver()
+            self._versions[key] = (time.monotonic(), version)
+            return version
+
+    def clear(self, key: Any = None) -> None:
+        """Forget resolved versions.
+
+        :param key: Key of the version to forget. If not given, all
+            versions are forgotten.
+        """
+        with self._lock:
+            if key is None:
+                self._versions.clear()
+            else:
+                self._versions.pop(key, None)
+
+
+def _ttl_from_environment() -> float | None:
+    """Return the time-to-live given in the environment, if any."""
+    ttl = os.getenv("FILE_SCRAPER_TOOL_VERSION_TTL")
+    if not ttl:
+        return None
+    try:
+        return float(ttl)
+    except ValueError:
+        LOGGER.warning("Invalid FILE_SCRAPER_TOOL_VERSION_TTL: %s", ttl)
+        return None
+
+
+REGISTRY = ToolVersionRegistry(ttl=_ttl_from_environment())
+
+
+def set_ttl(ttl: float | None) -> None:
+    """Set the time-to-live of the tool versions.
+
+    :param ttl: Time-to-live in seconds, or None to keep the versions for
+        the lifetime of the process
+    """
+    REGISTRY.ttl = ttl
+
+
+def clear() -> None:
+    """Forget all resolved tool versions."""
+    REGISTRY.clear()
+
+
+def tool_version(name: str) -> Callable[[Callable[..., T]], Callable[..., T]]:
+    """Decorate a function resolving the version of a tool.
+
+    The decorated function is called once per process (or once per
+    time-to-live) for each combination of arguments, and the stored result
+    is returned on subsequent calls::
+
+        @tool_version("ffmpeg")
+        def ffmpeg_version() -> str:
+            return parse(Shell(["ffmpeg", "-version"]).stdout)
+
+    :param name: Name of the tool
+    :returns: Decorator
+    """
+    def _decorator(resolver: Callable[..., T]) -> Callable[..., T]:
+        @functools.wraps(resolver)
+        def _wrapper(*args: Any) -> T:
+            return REGISTRY.get(
+                (name, *args), functools.partial(resolver, *args)
+            )
+        return _wrapper
+    return _decorator
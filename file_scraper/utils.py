@@ -1,15 +1,23 @@
 """Utilities for scrapers."""
 from __future__ import annotations
 
-from collections.abc import Iterator, Iterable
+from collections.abc import Callable, Iterator, Iterable
 from pathlib import Path
 from typing import TypedDict
 
 import hashlib
+import os
+import queue
 import re
+import threading
 import zipfile
 from io import BufferedReader
 
+from file_scraper.streaming import ChecksumConsumer
+
+# Size of the chunks read when calculating checksums of a file
+HASH_CHUNK_SIZE = 8 * 1024 * 1024
+
 
 def hexdigest(
     filename: str | Path,
@@ -36,6 +44,94 @@ def hexdigest(
     return checksum.hexdigest()
 
 
+def file_stamp(filename: str | os.PathLike) -> tuple[int, int] | None:
+    """
+    Return the modification time and size of a file.
+
+    Files loaded once per process are cached by their stamps, so that a
+    changed file is loaded again.
+
+    :param filename: File path
+    :returns: Tuple (modification time in nanoseconds, size), or None if
+        the file does not exist
+    """
+    try:
+        stat = os.stat(filename)
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def hexdigests(
+    filename: str | Path,
+    algorithms: Iterable[str] = ("md5", "sha1", "sha256"),
+    chunk_size: int = HASH_CHUNK_SIZE,
+    threaded: bool = True,
+) -> dict[str, str]:
+    """
+    Calculate several hashes of given file reading the file once.
+
+    The hashes are updated in a background thread while the next chunk
+    is read, so that reading the file and hashing overlap. The thread is
+    used only if the file is larger than a single chunk.
+
+    :param filename: File path
+    :param algorithms: Hash algorithms. MD5 or SHA variants.
+    :param chunk_size: Size of the chunks read from the file
+    :param threaded: False to update the hashes in the calling thread
+    :returns: Calculated hashes by the algorithm names as given
+    :raises ValueError: If an algorithm is not supported
+    """
+    consumer = ChecksumConsumer(algorithms)
+    with open(filename, "rb") as input_file:
+        chunk = input_file.read(chunk_size)
+        if len(chunk) < chunk_size or not threaded:
+            while chunk:
+                consumer.feed(chunk)
+                chunk = input_file.read(chunk_size)
+        else:
+            _update_in_background(
+                input_file, chunk, chunk_size, consumer.feed)
+    consumer.finish()
+
+    return consumer.hexdigests()
+
+
+def _update_in_background(
+    input_file: BufferedReader,
+    chunk: bytes,
+    chunk_size: int,
+    update: Callable[[bytes], None],
+) -> None:
+    """
+    Read the rest of a file and pass the chunks to a background thread.
+
+    Hashlib releases the GIL while hashing large chunks, so the next
+    chunk is read while the previous one is hashed. At most two chunks
+    are waiting in the queue.
+
+    :param input_file: File being read
+    :param chunk: First chunk of the file, already read
+    :param chunk_size: Size of the chunks read from the file
+    :param update: Function updating the hashes with a chunk
+    """
+    chunks: queue.Queue[bytes] = queue.Queue(maxsize=2)
+
+    def _consume() -> None:
+        for queued in iter(chunks.get, b""):
+            update(queued)
+
+    thread = threading.Thread(target=_consume, daemon=True)
+    thread.start()
+    try:
+        while chunk:
+            chunks.put(chunk)
+            chunk = input_file.read(chunk_size)
+    finally:
+        chunks.put(b"")
+        thread.join()
+
+
 def iso8601_duration(time: float | int) -> str:
     """Convert seconds into ISO 8601 duration.
 
@@ -139,7 +235,10 @@ def concat(lines: Iterable[str], prefix: str = "") -> str:
 
 
 def iter_utf_bytes(
-    file_handle: BufferedReader, chunksize: int, charset: str
+    file_handle: BufferedReader,
+    chunksize: int,
+    charset: str,
+    prefix: bytes = b"",
 ) -> Iterator[bytes]:
     """
     Iterate given file with matching the bytes with variable length UTF
@@ -149,30 +248,88 @@ def iter_utf_bytes(
     :param file_handle: File handle to read
     :param chunksize: Size of the chunk to read
     :param charset: Character encoding of the file
+    :param prefix: Bytes already read from the beginning of the file
     :returns: Sequence from the file
     """
-    utf_buffer = b""
+    utf_buffer = prefix
     chunksize += 4 - chunksize % 4  # needs to be divisible by 4
 
     while True:
         chunk = utf_buffer + file_handle.read(chunksize)
+        utf_buffer = b""
 
         if not chunk:
             return
 
-        if charset == "UTF-8":
-            chunk, utf_buffer = utf_sequence(chunk, [
-                {"smallest": 0xc0, "largest": 0xdf, "indexes": [1]},
-                {"smallest": 0xe0, "largest": 0xef, "indexes": [1, 2]},
-                {"smallest": 0xf0, "largest": 0xf7, "indexes": [1, 2, 3]}])
-        elif charset == "UTF-16":
-            chunk, utf_buffer = utf_sequence(
-                chunk, [{"smallest": 0xd8, "largest": 0xdb,
-                         "indexes": [1, 2]}], True)
+        chunk, utf_buffer = split_utf_chunk(chunk, charset)
 
         yield chunk
 
 
+def iter_utf_ranges(
+    file_handle: BufferedReader,
+    chunksize: int,
+    charset: str,
+    prefix_size: int = 0,
+) -> Iterator[tuple[int, int]]:
+    """
+    Iterate the byte ranges of the chunks given by :func:`iter_utf_bytes`.
+
+    Only the last bytes of each chunk are read from the file, so that the
+    chunks can be read and decoded separately, e.g. in parallel.
+
+    :param file_handle: File handle to read
+    :param chunksize: Size of the chunk to read
+    :param charset: Character encoding of the file
+    :param prefix_size: Number of bytes given as the prefix to
+        :func:`iter_utf_bytes`
+    :returns: Tuples (start, end) of the chunks in the file
+    """
+    size = os.fstat(file_handle.fileno()).st_size
+    chunksize += 4 - chunksize % 4  # needs to be divisible by 4
+
+    start = 0
+    read_end = min(prefix_size, size)
+    while True:
+        read_end = min(read_end + chunksize, size)
+        if start == read_end:
+            return
+
+        # The chunk is split according to its last four bytes at most
+        tail_start = max(start, read_end - 4)
+        file_handle.seek(tail_start)
+        tail = file_handle.read(read_end - tail_start)
+        if read_end - start >= 4:
+            remainder = len(split_utf_chunk(tail, charset)[1])
+        else:
+            remainder = 0
+
+        yield start, read_end - remainder
+        start = read_end - remainder
+
+
+def split_utf_chunk(chunk: bytes, charset: str) -> tuple[bytes, bytes]:
+    """
+    Split a chunk in UTF-8 or UTF-16 before an incomplete character in
+    the end.
+
+    :param chunk: Chunk to split
+    :param charset: Character encoding of the chunk
+    :returns: Tuple (x, y) where x is UTF sequence and y is remainder.
+        Chunks in other encodings are not split.
+    """
+    if charset == "UTF-8":
+        return utf_sequence(chunk, [
+            {"smallest": 0xc0, "largest": 0xdf, "indexes": [1]},
+            {"smallest": 0xe0, "largest": 0xef, "indexes": [1, 2]},
+            {"smallest": 0xf0, "largest": 0xf7, "indexes": [1, 2, 3]}])
+    if charset == "UTF-16":
+        return utf_sequence(
+            chunk, [{"smallest": 0xd8, "largest": 0xdb,
+                     "indexes": [1, 2]}], True)
+    return chunk, b""
+
+
 class _SequenceParams(TypedDict):
     smallest: int
     largest: int
@@ -6,7 +6,8 @@ import re
 
 from file_scraper.base import BaseExtractor
 from file_scraper.logger import LOGGER
-from file_scraper.shell import Shell
+from file_scraper.tool_versions import tool_version
+from file_scraper.shell import AsyncShell, Shell
 from file_scraper.defaults import UNAV
 from file_scraper.verapdf.verapdf_model import VerapdfMeta
 
@@ -20,6 +21,32 @@ from file_scraper.verapdf.verapdf_model import VerapdfMeta
 OK_CODES = [0, 1, 7]
 
 
+@tool_version("veraPDF")
+def _verapdf_version() -> str:
+    """Return the version of veraPDF.
+
+    :returns: veraPDF version, or (:unav) if it can not be parsed
+    """
+    tool_shell = Shell(["verapdf", "--version"])
+
+    # Find verPDF string and capture a group after it containing
+    # integers and dots until any other character appears.
+
+    regex = r"veraPDF ([\d\.]+)"
+    try:
+        version = next(
+            re.finditer(regex, tool_shell.stdout, re.MULTILINE)
+            ).groups()[0]
+    except StopIteration:
+        LOGGER.warning(
+            "Could not find VeraPDF version. stdout: %s, stderr: %s",
+            tool_shell.stdout, tool_shell.stderr,
+            exc_info=True,
+        )
+        version = UNAV
+    return version
+
+
 class VerapdfExtractor(BaseExtractor[VerapdfMeta]):
     """PDF/A extractor."""
 
@@ -27,16 +54,31 @@ class VerapdfExtractor(BaseExtractor[VerapdfMeta]):
     _supported_metadata = [VerapdfMeta]
     _only_wellformed = True  # Only well-formed check
 
+    def _command(self) -> list:
+        """Return the veraPDF command checking the file."""
+        # --nonpdfext flag allows also files without the .pdf extension
+        return ["verapdf", self.filename, "--nonpdfext"]
+
     def _extract(self):
         """
         Scrape file.
 
         :raises: VeraPDFError
         """
-        # --nonpdfext flag allows also files without the .pdf extension
-        shell = Shell(["verapdf",
-                      self.filename, "--nonpdfext"])
+        self._use_results(Shell(self._command()))
 
+    async def _aextract(self):
+        """Scrape file, running veraPDF asynchronously."""
+        shell = AsyncShell(self._command())
+        await shell.apopen()
+        self._use_results(shell)
+
+    def _use_results(self, shell):
+        """
+        Scrape file from the results of veraPDF.
+
+        :param shell: veraPDF command
+        """
         if shell.returncode not in OK_CODES:
             self._errors.append(
                 f"VeraPDF returned invalid return code: {shell.returncode}")
@@ -77,7 +119,8 @@ class VerapdfExtractor(BaseExtractor[VerapdfMeta]):
         self.streams = list(self.iterate_models(
             well_formed=self.well_formed, profile=profile))
 
-    def tools(self):
+    @classmethod
+    def tools(cls):
         """Return information about the software used by the extractor or
         detector.
 
@@ -86,21 +129,4 @@ class VerapdfExtractor(BaseExtractor[VerapdfMeta]):
             tool (e.g. version). If no tools are available, an empty
             dictionary is returned instead.
         """
-        tool_shell = Shell(["verapdf", "--version"])
-
-        # Find verPDF string and capture a group after it containing
-        # integers and dots until any other character appears.
-
-        regex = r"veraPDF ([\d\.]+)"
-        try:
-            version = next(
-                re.finditer(regex, tool_shell.stdout, re.MULTILINE)
-                ).groups()[0]
-        except StopIteration:
-            LOGGER.warning(
-                "Could not find VeraPDF version. stdout: %s, stderr: %s",
-                tool_shell.stdout, tool_shell.stderr,
-                exc_info=True,
-            )
-            version = UNAV
-        return {"veraPDF": {"version": version}}
+        return {"veraPDF": {"version": _verapdf_version()}}
@@ -6,10 +6,34 @@ import re
 from file_scraper.base import BaseExtractor
 from file_scraper.shell import Shell
 from file_scraper.logger import LOGGER
+from file_scraper.tool_versions import tool_version
 from file_scraper.vnu.vnu_model import VnuMeta
 from file_scraper.defaults import UNAV
 
 
+@tool_version("Validator.nu")
+def _vnu_version() -> str:
+    """Return the version of Validator.nu.
+
+    :returns: Validator.nu version, or (:unav) if it can not be parsed
+    """
+    tool_shell = Shell(["vnu", "--version"])
+    regex = r"([\d\.]+)"
+    try:
+        if tool_shell.returncode != 0:
+            raise StopIteration
+        version = next(
+            re.finditer(regex, tool_shell.stdout, re.MULTILINE)
+            ).groups()[0]
+    except StopIteration:
+        LOGGER.warning(
+            "Could not retrieve VNU version from stdout: %s",
+            tool_shell.stdout
+        )
+        version = UNAV
+    return version
+
+
 class VnuExtractor(BaseExtractor[VnuMeta]):
     """Vnu extractor. Supports only HTML version 5."""
 
@@ -36,7 +60,8 @@ class VnuExtractor(BaseExtractor[VnuMeta]):
             self.streams = list(self.iterate_models(
                 well_formed=self.well_formed))
 
-    def tools(self):
+    @classmethod
+    def tools(cls):
         """Return information about the software used by the extractor or
         detector.
 
@@ -45,23 +70,8 @@ class VnuExtractor(BaseExtractor[VnuMeta]):
             tool (e.g. version). If no tools are available, an empty
             dictionary is returned instead.
         """
-        tool_shell = Shell(["vnu", "--version"])
-        regex = r"([\d\.]+)"
-        try:
-            if tool_shell.returncode != 0:
-                raise StopIteration
-            version = next(
-                re.finditer(regex, tool_shell.stdout, re.MULTILINE)
-                ).groups()[0]
-        except StopIteration:
-            LOGGER.warning(
-                "Could not retrieve VNU version from stdout: %s",
-                tool_shell.stdout
-            )
-            version = UNAV
-
         return {
             "Validator.nu": {
-                "version": version
+                "version": _vnu_version()
             }
         }
@@ -140,7 +140,8 @@ class WandExtractor(BaseExtractor[WandImageMeta]):
                     if md_class.is_supported(image.container.mimetype):
                         self.streams.append(md_class(image=image))
 
-    def tools(self):
+    @classmethod
+    def tools(cls):
         """Return information about the software used by the extractor or
         detector.
 
@@ -6,9 +6,20 @@ import json
 
 from file_scraper.base import BaseExtractor
 from file_scraper.shell import Shell
+from file_scraper.tool_versions import tool_version
 from file_scraper.warchaeology.warchaeology_model import WarchaeologyMeta
 
 
+@tool_version("Warchaeology")
+def _warchaeology_version() -> str:
+    """Return the version of Warchaeology.
+
+    :returns: Warchaeology version
+    """
+    shell = Shell(["warc", "--version"])
+    return shell.stdout.strip()
+
+
 class WarchaeologyExtractor(BaseExtractor[WarchaeologyMeta]):
     """Warchaeology WARC file extractor.
 
@@ -84,7 +95,8 @@ class WarchaeologyExtractor(BaseExtractor[WarchaeologyMeta]):
 
         return errors, messages, files, records
 
-    def tools(self):
+    @classmethod
+    def tools(cls):
         """Return information about the software used by the extractor or
         detector.
 
@@ -93,6 +105,4 @@ class WarchaeologyExtractor(BaseExtractor[WarchaeologyMeta]):
             tool (e.g. version). If no tools are available, an empty
             dictionary is returned instead.
         """
-        shell = Shell(["warc", "--version"])
-        version = shell.stdout.strip()
-        return {"Warchaeology": {"version": version}}
+        return {"Warchaeology": {"version": _warchaeology_version()}}
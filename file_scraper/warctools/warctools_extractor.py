@@ -63,7 +63,8 @@ class WarctoolsExtractor(BaseExtractor[WarctoolsMeta]):
         self.streams = list(self.iterate_models(
             well_formed=self.well_formed, line=line))
 
-    def tools(self):
+    @classmethod
+    def tools(cls):
         return {}
 
 
@@ -120,7 +121,8 @@ class WarctoolsFullExtractor(WarctoolsExtractor):
 
         super()._extract()
 
-    def tools(self):
+    @classmethod
+    def tools(cls):
         """Return information about the software used by the extractor or
         detector.
 
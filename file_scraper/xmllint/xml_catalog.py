@@ -0,0 +1,422 @@
+"""Resolve the external resources of XML documents with XML catalogs.
+
+xmllint resolves schema and DTD locations with the OASIS XML catalogs
+given in ``SGML_CATALOG_FILES``. Within the process, the catalogs of
+libxml2 are global and loaded only once, so :class:`CatalogResolver`
+resolves the locations with the catalogs of each scraping instead. The
+catalog entries are looked up in the same order as libxml2 does: system
+identifiers and URIs first from the catalog itself, then from the
+delegated catalogs and finally from the next catalogs.
+"""
+from __future__ import annotations
+
+import os
+from collections.abc import Iterator
+from functools import lru_cache
+from pathlib import Path
+from urllib.parse import urljoin, urlparse
+from urllib.request import url2pathname
+
+from lxml import etree
+
+from file_scraper.utils import file_stamp
+
+CATALOG_NS = "{urn:oasis:names:tc:entity:xmlns:xml:catalog}"
+XML_BASE = "{http://www.w3.org/XML/1998/namespace}base"
+
+DEFAULT_CATALOG = "/etc/xml/catalog"
+
+
+class XmlCatalog:
+    """Entries of a single XML catalog file."""
+
+    def __init__(self, uri: str) -> None:
+        """
+        Load the catalog.
+
+        A catalog which can not be read or parsed has no entries, as in
+        libxml2.
+
+        :param uri: URI of the catalog file
+        """
+        self.uri = uri
+        self._exact: dict[str, dict[str, str]] = {
+            "system": {}, "public": {}, "uri": {}}
+        self._prefer_public: dict[str, bool] = {}
+        self._rewrites: dict[str, list[tuple[str, str]]] = {
+            "system": [], "uri": []}
+        self._suffixes: dict[str, list[tuple[str, str]]] = {
+            "system": [], "uri": []}
+        self._delegates: dict[str, list[tuple[str, str]]] = {
+            "system": [], "public": [], "uri": []}
+        self._next_catalogs: list[str] = []
+
+        parser = etree.XMLParser(no_network=True, resolve_entities=False,
+                                 load_dtd=False)
+        try:
+            root = etree.parse(_uri_to_path(uri), parser).getroot()
+        except (OSError, etree.XMLSyntaxError):
+            return
+        if root.tag == f"{CATALOG_NS}catalog":
+            self._add_entries(root, uri, root.get("prefer", "public"))
+
+    def _add_entries(
+        self, parent: etree._Element, base: str, prefer: str
+    ) -> None:
+        """
+        Add the entries of a catalog or a group element.
+
+        :param parent: Catalog or group element
+        :param base: Base URI of the element
+        :param prefer: Value of the prefer attribute in effect
+        """
+        base = urljoin(base, parent.get(XML_BASE, ""))
+        for element in parent:
+            if not isinstance(element.tag, str) or \
+                    not element.tag.startswith(CATALOG_NS):
+                continue
+            name = element.tag[len(CATALOG_NS):]
+            entry_base = urljoin(base, element.get(XML_BASE, ""))
+
+            if name == "group":
+                self._add_entries(element, base,
+                                  element.get("prefer", prefer))
+            elif name in ("system", "uri"):
+                key = element.get(f"{name}Id" if name == "system" else "name")
+                self._exact[name].setdefault(
+                    key, urljoin(entry_base, element.get("uri", "")))
+            elif name == "public":
+                key = _normalize_public_id(element.get("publicId", ""))
+                self._exact["public"].setdefault(
+                    key, urljoin(entry_base, element.get("uri", "")))
+                self._prefer_public.setdefault(key, prefer == "public")
+            elif name in ("rewriteSystem", "rewriteURI"):
+                kind = "system" if name == "rewriteSystem" else "uri"
+                attribute = ("systemIdStartString" if kind == "system"
+                             else "uriStartString")
+                self._rewrites[kind].append((
+                    element.get(attribute, ""),
+                    urljoin(entry_base, element.get("rewritePrefix", ""))
+                ))
+            elif name in ("systemSuffix", "uriSuffix"):
+                kind = "system" if name == "systemSuffix" else "uri"
+                attribute = ("systemIdSuffix" if kind == "system"
+                             else "uriSuffix")
+                self._suffixes[kind].append((
+                    element.get(attribute, ""),
+                    urljoin(entry_base, element.get("uri", ""))
+                ))
+            elif name.startswith("delegate"):
+                kind = name[len("delegate"):].lower()
+                if kind in self._delegates:
+                    attribute = ("uriStartString" if kind == "uri"
+                                 else f"{kind}IdStartString")
+                    self._delegates[kind].append((
+                        element.get(attribute, ""),
+                        urljoin(entry_base, element.get("catalog", ""))
+                    ))
+            elif name == "nextCatalog":
+                self._next_catalogs.append(
+                    urljoin(entry_base, element.get("catalog", "")))
+
+    def resolve(
+        self,
+        public_id: str | None,
+        system_id: str | None,
+        visited: set[str] | None = None,
+    ) -> str | None:
+        """
+        Resolve an external identifier.
+
+        :param public_id: Public identifier, or None
+        :param system_id: System identifier, or None
+        :param visited: URIs of the catalogs already searched
+        :returns: Resolved URI, or None if the catalogs have no entry for
+            the identifier
+        """
+        visited = _visit(self, visited)
+        if system_id is not None:
+            resolved = self._lookup("system", system_id)
+            if resolved is not None:
+                return resolved
+            resolved = self._resolve_delegated("system", system_id, visited)
+            if resolved is not False:
+                return resolved
+
+        if public_id is not None:
+            public_id = _normalize_public_id(public_id)
+            resolved = self._exact["public"].get(public_id)
+            if resolved is not None and (
+                    system_id is None or self._prefer_public[public_id]):
+                return resolved
+            resolved = self._resolve_delegated("public", public_id, visited)
+            if resolved is not False:
+                return resolved
+
+        for catalog in _unvisited(self._next_catalogs, visited):
+            resolved = catalog.resolve(public_id, system_id, visited)
+            if resolved is not None:
+                return resolved
+        return None
+
+    def resolve_uri(
+        self, uri: str, visited: set[str] | None = None
+    ) -> str | None:
+        """
+        Resolve a URI reference.
+
+        :param uri: URI to resolve
+        :param visited: URIs of the catalogs already searched
+        :returns: Resolved URI, or None if the catalogs have no entry for
+            the URI
+        """
+        visited = _visit(self, visited)
+        resolved = self._lookup("uri", uri)
+        if resolved is not None:
+            return resolved
+
+        resolved = self._resolve_delegated("uri", uri, visited)
+        if resolved is not False:
+            return resolved
+
+        for catalog in _unvisited(self._next_catalogs, visited):
+            resolved = catalog.resolve_uri(uri, visited)
+            if resolved is not None:
+                return resolved
+        return None
+
+    def _lookup(self, kind: str, identifier: str) -> str | None:
+        """
+        Look up an identifier from the entries of this catalog.
+
+        The exact match comes first, then the longest rewrite prefix and
+        then the longest suffix.
+
+        :param kind: "system" or "uri"
+        :param identifier: System identifier or URI
+        :returns: Resolved URI, or None if there is no matching entry
+        """
+        if identifier in self._exact[kind]:
+            return self._exact[kind][identifier]
+
+        rewrites = [(prefix, target)
+                    for prefix, target in self._rewrites[kind]
+                    if prefix and identifier.startswith(prefix)]
+        if rewrites:
+            prefix, target = max(rewrites, key=lambda item: len(item[0]))
+            return target + identifier[len(prefix):]
+
+        suffixes = [(suffix, target)
+                    for suffix, target in self._suffixes[kind]
+                    if suffix and identifier.endswith(suffix)]
+        if suffixes:
+            return max(suffixes, key=lambda item: len(item[0]))[1]
+        return None
+
+    def _resolve_delegated(
+        self, kind: str, identifier: str, visited: set[str]
+    ) -> str | None | bool:
+        """
+        Resolve an identifier in the delegated catalogs.
+
+        The delegated catalogs are consulted the longest matching prefix
+        first. If any delegation matches, the search ends with the
+        delegated catalogs.
+
+        :param kind: "system", "public" or "uri"
+        :param identifier: Identifier to resolve
+        :param visited: URIs of the catalogs already searched
+        :returns: Resolved URI, None if the delegated catalogs have no
+            entry for the identifier, or False if no delegation matches
+        """
+        delegates = sorted(
+            ((prefix, catalog_uri)
+             for prefix, catalog_uri in self._delegates[kind]
+             if prefix and identifier.startswith(prefix)),
+            key=lambda item: -len(item[0])
+        )
+        if not delegates:
+            return False
+        for catalog in _unvisited([uri for _, uri in delegates], visited):
+            if kind == "uri":
+                resolved = catalog.resolve_uri(identifier, visited)
+            elif kind == "system":
+                resolved = catalog.resolve(None, identifier, visited)
+            else:
+                resolved = catalog.resolve(identifier, None, visited)
+            if resolved is not None:
+                return resolved
+        return None
+
+
+class CatalogResolver(etree.Resolver):
+    """Resolver of lxml parsers using the given XML catalogs.
+
+    Locations not found in the catalogs are left to libxml2. As xmllint
+    is run with ``--nonet``, the parsers using the resolver should not
+    access the network either.
+    """
+
+    def __init__(self, catalog_path: str | None = None) -> None:
+        """
+        Initialize the resolver.
+
+        :param catalog_path: Catalog files separated by colons, as in
+            ``SGML_CATALOG_FILES``. By default, /etc/xml/catalog.
+        """
+        super().__init__()
+        self.catalogs = catalog_list(catalog_path)
+
+    def resolve(self, system_url, public_id, context):
+        """Return the catalog entry for the resource, if there is one."""
+        resolved = None
+        for catalog in self.catalogs:
+            resolved = catalog.resolve(public_id, system_url)
+            if resolved is not None:
+                break
+        if resolved is None and system_url and \
+                not os.path.exists(_uri_to_path(system_url)):
+            for catalog in self.catalogs:
+                resolved = catalog.resolve_uri(system_url)
+                if resolved is not None:
+                    break
+        if resolved is None:
+            return None
+        return self.resolve_filename(_uri_to_path(resolved), context)
+
+
+def catalog_list(catalog_path: str | None) -> tuple[XmlCatalog, ...]:
+    """
+    Return the loaded catalogs of a catalog path.
+
+    Each catalog file is loaded once per process, and again when the
+    file has changed.
+
+    :param catalog_path: Catalog files separated by colons, or None for
+        /etc/xml/catalog
+    :returns: Catalogs in the given order
+    """
+    return tuple(_load_catalog(uri) for uri in _catalog_uris(catalog_path))
+
+
+def catalog_stamps(
+    catalog_path: str | None,
+) -> tuple[tuple[int, int] | None, ...]:
+    """
+    Return the stamps of the catalog files of a catalog path.
+
+    :param catalog_path: Catalog files separated by colons, or None for
+        /etc/xml/catalog
+    :returns: Modification times and sizes of the catalog files, see
+        :func:`file_scraper.utils.file_stamp`
+    """
+    return tuple(
+        file_stamp(_uri_to_path(uri)) for uri in _catalog_uris(catalog_path)
+    )
+
+
+def clear_catalog_cache() -> None:
+    """Forget the loaded catalogs.
+
+    The catalogs are loaded again when needed. Changed catalog files are
+    loaded again also without clearing the cache, but this can be used
+    to release the memory of the catalogs.
+    """
+    _load_catalog_file.cache_clear()
+
+
+def _catalog_uris(catalog_path: str | None) -> list[str]:
+    """
+    Return the URIs of the catalog files of a catalog path.
+
+    :param catalog_path: Catalog files separated by colons, or None for
+        /etc/xml/catalog
+    :returns: URIs of the catalog files in the given order
+    """
+    if catalog_path is None:
+        catalog_path = DEFAULT_CATALOG
+    return [
+        Path(path.strip()).absolute().as_uri()
+        for path in catalog_path.split(":") if path.strip()
+    ]
+
+
+def _load_catalog(uri: str) -> XmlCatalog:
+    """
+    Load a catalog once per process, and again if the file has changed.
+
+    :param uri: URI of the catalog file
+    :returns: Loaded catalog
+    """
+    return _load_catalog_file(uri, file_stamp(_uri_to_path(uri)))
+
+
+@lru_cache(maxsize=None)
+def _load_catalog_file(
+    uri: str, stamp: tuple[int, int] | None
+) -> XmlCatalog:
+    """
+    Load a catalog once per version of the catalog file.
+
+    :param uri: URI of the catalog file
+    :param stamp: Modification time and size of the catalog file, only
+        used as the key of the cache
+    :returns: Loaded catalog
+    """
+    # pylint: disable=unused-argument
+    return XmlCatalog(uri)
+
+
+def _visit(catalog: XmlCatalog, visited: set[str] | None) -> set[str]:
+    """
+    Mark a catalog searched.
+
+    :param catalog: Catalog to search
+    :param visited: URIs of the catalogs already searched, or None when
+        starting a search
+    :returns: URIs of the searched catalogs including the catalog
+    """
+    if visited is None:
+        visited = set()
+    visited.add(catalog.uri)
+    return visited
+
+
+def _unvisited(
+    uris: list[str], visited: set[str]
+) -> Iterator[XmlCatalog]:
+    """
+    Iterate the delegated or next catalogs not searched yet.
+
+    Catalogs referring to each other are thus searched only once.
+
+    :param uris: URIs of the catalogs in the search order
+    :param visited: URIs of the catalogs already searched
+    :returns: Catalogs to search
+    """
+    for uri in uris:
+        if uri not in visited:
+            yield _load_catalog(uri)
+
+
+def _normalize_public_id(public_id: str) -> str:
+    """
+    Normalize the whitespace of a public identifier.
+
+    :param public_id: Public identifier
+    :returns: Identifier with whitespace collapsed into single spaces
+    """
+    return " ".join(public_id.split())
+
+
+def _uri_to_path(uri: str) -> str:
+    """
+    Return the local path of a file URI.
+
+    :param uri: URI or a path
+    :returns: Local path for file URIs, other URIs and paths as is
+    """
+    parsed = urlparse(uri)
+    if parsed.scheme == "file":
+        return url2pathname(parsed.path)
+    return uri
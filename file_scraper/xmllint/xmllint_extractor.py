@@ -1,21 +1,29 @@
 """Class for XML file well-formed check with Xmllint."""
 from __future__ import annotations
 
+import asyncio
 import os
+import re
 import tempfile
+import threading
+from functools import lru_cache
 from io import open as io_open
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, NamedTuple
 
 from lxml import etree
-from xml_helpers.utils import iter_elements
 
+from file_scraper.artifacts import XML_TREE, parse_xml
 from file_scraper.base import BaseExtractor
 from file_scraper.logger import LOGGER
-from file_scraper.shell import Shell
-from file_scraper.utils import ensure_text
+from file_scraper.shell import AsyncShell, Shell
+from file_scraper.utils import ensure_text, file_stamp
+from file_scraper.xmllint.xml_catalog import (CatalogResolver,
+                                              catalog_stamps,
+                                              clear_catalog_cache)
 from file_scraper.xmllint.xmllint_model import XmllintMeta
 
 if TYPE_CHECKING:
+    from collections.abc import Iterator
     from pathlib import Path
 
 
@@ -35,6 +43,32 @@ elementFormDefault="qualified"
 attributeFormDefault="unqualified">
 </xs:schema>"""
 
+# Number of compiled schemas kept in memory by the in-process validation
+SCHEMA_CACHE_SIZE = 64
+
+# Domains of libxml2 errors as reported by xmllint
+_LOG_DOMAINS = {
+    "PARSER": "parser",
+    "NAMESPACE": "namespace",
+    "DTD": "validity",
+    "VALID": "validity",
+    "IO": "I/O",
+    "SCHEMASP": "Schemas parser",
+    "SCHEMASV": "Schemas validity",
+    "CATALOG": "Catalog",
+    "I18N": "encoding",
+}
+
+_NETWORK_LOAD = re.compile(
+    r'failed to load (?:external entity )?"((?:https?|ftp)://[^"]*)"')
+
+
+class _CompiledSchema(NamedTuple):
+    """XSD schema compiled for the in-process validation."""
+    schema: etree.XMLSchema | None
+    log: tuple[str, ...]
+    lock: threading.Lock
+
 
 class XmllintExtractor(BaseExtractor[XmllintMeta]):
     """
@@ -47,6 +81,7 @@ class XmllintExtractor(BaseExtractor[XmllintMeta]):
 
     _supported_metadata = [XmllintMeta]
     _only_wellformed = True  # Only well-formed check
+    _artifacts = (XML_TREE,)
 
     def __init__(
         self,
@@ -66,6 +101,9 @@ class XmllintExtractor(BaseExtractor[XmllintMeta]):
             The parameters are:
                  schema: Schema path, None by default
                  catalog_path: Path to XMLcatalog
+                 xml_in_process: Validate with lxml in this process
+                                 instead of running xmllint, False by
+                                 default
         """
         super().__init__(
             filename=filename,
@@ -79,6 +117,7 @@ class XmllintExtractor(BaseExtractor[XmllintMeta]):
         self._schema = params.get("schema", None)
         self._has_constructed_schema = False
         self._catalog_path = params.get("catalog_path", None)
+        self._in_process = params.get("xml_in_process", False)
         self._errors = []
 
     def _evaluate_xsd_location(self, location: str) -> str:
@@ -121,19 +160,55 @@ class XmllintExtractor(BaseExtractor[XmllintMeta]):
 
         .. seealso:: https://wiki.csc.fi/wiki/KDK/XMLTiedostomuotojenSkeemat
         """
-        # Try to check syntax by opening file in XML parser
+        tree = self._parse()
+        if tree is None:
+            return
+
+        if self._in_process:
+            validation = self._validate_in_process(tree)
+        else:
+            validation = self._validate_with_xmllint(tree)
+        self._use_validation(tree, validation)
+
+    async def _aextract(self) -> None:
+        """
+        Asynchronous version of :meth:`_extract`.
+
+        The file is parsed and the schema is constructed in a separate
+        thread, and xmllint is run asynchronously. The in-process
+        validation is run in a separate thread as a whole.
+        """
+        if self._in_process:
+            await asyncio.to_thread(self._extract)
+            return
+
+        tree = await asyncio.to_thread(self._parse)
+        if tree is None:
+            return
+
+        arguments = await asyncio.to_thread(self._xmllint_arguments, tree)
+        validation = None
+        if arguments is not None:
+            command, environment = self._xmllint_command(**arguments)
+            shell = AsyncShell(command, env=environment)
+            await shell.apopen()
+            self._remove_constructed_schema()
+            validation = (shell.returncode, shell.stdout, shell.stderr)
+        self._use_validation(tree, validation)
+
+    def _parse(self) -> etree._ElementTree | None:
+        """
+        Check syntax by opening file in XML parser.
+
+        The tree is shared with the other extractors of the file.
+
+        :returns: Parsed document, or None if the file can not be parsed
+        """
         try:
-            with io_open(self.filename, "rb") as file_:
-                parser = etree.XMLParser(
-                    dtd_validation=False,
-                    no_network=True,
-                    resolve_entities=False,
-                )
-                tree = etree.parse(file_, parser=parser)
+            return self._artifact(XML_TREE, lambda: parse_xml(self.filename))
         except etree.XMLSyntaxError as exception:
             self._errors.append("Failed: document is not well-formed.")
             self._errors.append(str(exception))
-            return
         except OSError as exception:
             # TODO: OSError can be raised also when when file has
             # invalid character encoding, for example:
@@ -143,31 +218,30 @@ class XmllintExtractor(BaseExtractor[XmllintMeta]):
             # See TPASPKT-1670.
             self._errors.append("Failed: missing file.")
             self._errors.append(str(exception))
-            return
-
-        # Try check against DTD
-        if tree.docinfo.doctype:
-            (exitcode, stdout, stderr) = self.exec_xmllint(dtd_check=True)
+        return None
 
-        # Try check againts XSD
-        else:
-            if not self._schema:
-                self._schema = self.construct_xsd()
-                if not self._schema:
-                    # No given schema and didn't find included schemas but XML
-                    # was well formed.
-                    self._messages.append("Success: Document is well-formed "
-                                          "but does not contain schema.")
-                    self.streams = list(self.iterate_models(
-                        well_formed=self.well_formed, tree=tree))
-                    return
-
-            (exitcode, stdout, stderr) = self.exec_xmllint(schema=self._schema)
+    def _use_validation(
+        self,
+        tree: etree._ElementTree,
+        validation: tuple[int, str | None, str | None] | None,
+    ) -> None:
+        """
+        Scrape the file from the results of the validation.
 
-        # Clean up constructed file before evaluating the exitcode.
-        if self._has_constructed_schema:
-            os.remove(self._schema)
+        :param tree: Parsed document
+        :param validation: Tuple (exitcode, stdout, stderr) of the
+            validation, or None if the file has no schema
+        """
+        if validation is None:
+            # No given schema and didn't find included schemas but XML
+            # was well formed.
+            self._messages.append("Success: Document is well-formed "
+                                  "but does not contain schema.")
+            self.streams = list(self.iterate_models(
+                well_formed=self.well_formed, tree=tree))
+            return
 
+        (exitcode, stdout, stderr) = validation
         if exitcode == 0:
             self._messages.append(
                 f"{self.filename} Success\n{stdout}"
@@ -179,44 +253,171 @@ class XmllintExtractor(BaseExtractor[XmllintMeta]):
         self.streams = list(self.iterate_models(
             well_formed=self.well_formed, tree=tree))
 
-    def construct_xsd(self) -> str | None:
+    def _validate_with_xmllint(
+        self, tree: etree._ElementTree
+    ) -> tuple[int, str | None, str | None] | None:
+        """
+        Validate the file against its DTD or XSD schemas with xmllint.
+
+        :param tree: Parsed document
+        :returns: Tuple (exitcode, stdout, stderr) of xmllint, or None if
+            the file has no schema
+        """
+        arguments = self._xmllint_arguments(tree)
+        if arguments is None:
+            return None
+
+        (exitcode, stdout, stderr) = self.exec_xmllint(**arguments)
+
+        # Clean up constructed file before evaluating the exitcode.
+        self._remove_constructed_schema()
+
+        return (exitcode, stdout, stderr)
+
+    def _xmllint_arguments(
+        self, tree: etree._ElementTree
+    ) -> dict | None:
+        """
+        Return the arguments of :meth:`exec_xmllint` validating the file.
+
+        A schema importing the schemas used in the file is constructed,
+        if the file has no DTD and no schema is given.
+
+        :param tree: Parsed document
+        :returns: Keyword arguments of :meth:`exec_xmllint`, or None if
+            the file has no schema
+        """
+        # Try check against DTD
+        if tree.docinfo.doctype:
+            return {"dtd_check": True}
+
+        # Try check againts XSD
+        if not self._schema:
+            self._schema = self.construct_xsd(tree)
+            if not self._schema:
+                return None
+
+        return {"schema": self._schema}
+
+    def _remove_constructed_schema(self) -> None:
+        """Remove the schema constructed by :meth:`construct_xsd`."""
+        if self._has_constructed_schema:
+            os.remove(self._schema)
+
+    def _validate_in_process(
+        self, tree: etree._ElementTree
+    ) -> tuple[int, str, str] | None:
+        """
+        Validate the file against its DTD or XSD schemas with lxml.
+
+        The schemas are resolved with the catalogs as by xmllint. Compiled
+        XSD schemas are cached by the imported schemas, so documents using
+        the same schemas compile them only once per process. A schema is
+        compiled again if the schema file, a local imported schema or a
+        catalog file has changed. The errors are reported in the format
+        of xmllint.
+
+        :param tree: Parsed document
+        :returns: Tuple (exitcode, stdout, stderr) as from xmllint, or None
+            if the file has no schema
+        """
+        if tree.docinfo.doctype:
+            return self._validate_dtd_in_process()
+
+        catalogs = catalog_stamps(self._catalog_path)
+        if self._schema:
+            schema = os.path.abspath(self._schema)
+            compiled = _compile_schema_file(
+                self._catalog_path, schema, (file_stamp(schema), *catalogs))
+        else:
+            imports = self._schema_imports(tree)
+            if not imports:
+                return None
+            stamps = tuple(file_stamp(location) for _, location in imports
+                           if os.path.isabs(location))
+            compiled = _compile_imports(
+                self._catalog_path, imports, (*stamps, *catalogs))
+
+        if compiled.schema is None:
+            return (5, "", "\n".join(compiled.log))
+        # A compiled schema keeps the log of its latest validation
+        with compiled.lock:
+            valid = compiled.schema.validate(tree)
+            log = _format_log(compiled.schema.error_log)
+        if valid:
+            return (0, "", "")
+        return (3, "", "\n".join(
+            [*compiled.log, *log, f"{self.filename} fails to validate"]))
+
+    def _validate_dtd_in_process(self) -> tuple[int, str, str]:
+        """
+        Parse the file again, validating it against its DTD.
+
+        :returns: Tuple (exitcode, stdout, stderr) as from xmllint
+        """
+        parser = etree.XMLParser(
+            dtd_validation=True,
+            no_network=True,
+            resolve_entities=False,
+            huge_tree=True,
+        )
+        parser.resolvers.add(CatalogResolver(self._catalog_path))
+        try:
+            with io_open(self.filename, "rb") as file_:
+                etree.parse(file_, parser=parser)
+        except etree.XMLSyntaxError:
+            return (3, "", "\n".join(_format_log(parser.error_log)))
+        return (0, "", "")
+
+    def _schema_imports(
+        self, tree: etree._ElementTree
+    ) -> tuple[tuple[str | None, str], ...]:
+        """
+        Return the schemas given in the schema location attributes.
+
+        The schemas with a namespace are returned first and the schemas
+        without a namespace last, otherwise in the document order.
+        libxml2 imports only the first schema of a namespace, so the order
+        decides which schema is used. Repeated pairs are returned once.
+
+        :param tree: Parsed document
+        :returns: Pairs of namespace and schema location. The namespace
+            is None for noNamespaceSchemaLocation.
+        """
+        imports = dict.fromkeys(
+            (namespace, self._evaluate_xsd_location(location))
+            for namespace, location in _iter_schema_locations(tree)
+        )
+        return tuple(sorted(imports, key=lambda item: item[0] is None))
+
+    def construct_xsd(
+        self, tree: etree._ElementTree | None = None
+    ) -> str | None:
         """
         Construct one schema file for the given document.
 
         The schema file will be placed temporarily in a temporary directory.
 
+        :param tree: Parsed document. By default, the shared tree of the
+            file is used.
         :returns: Path to the constructed XSD schema
         """
+        if tree is None:
+            tree = self._artifact(XML_TREE, lambda: parse_xml(self.filename))
         xsd_exists = False
 
         parser = etree.XMLParser(dtd_validation=False, no_network=True)
         schema_tree = etree.XML(SCHEMA_TEMPLATE, parser)
 
-        elements = iter_elements(str(self.filename))
-        for element in elements:
-            schema_location = element.attrib.get(XSI_SCHEMA_LOCATION)
-
-            if schema_location:
-                xsd_exists = True
-                namespaces_locations = schema_location.strip().split()
-                # Import all found namespace/schema location pairs
-                for namespace, location in zip(
-                        *[iter(namespaces_locations)] * 2):
-                    xs_import = etree.Element(XS + "import")
-                    xs_import.attrib["namespace"] = namespace
-                    xs_import.attrib["schemaLocation"] = (
-                        str(self._evaluate_xsd_location(location)))
-                    schema_tree.append(xs_import)
-
-        elements = iter_elements(str(self.filename))
-        for element in elements:
-            schema_location = element.attrib.get(XSI_NO_NS_SCHEMA_LOCATION)
-            if schema_location:
-                xsd_exists = True
-                xs_import = etree.Element(XS + "import")
-                xs_import.attrib["schemaLocation"] = str(
-                    self._evaluate_xsd_location(schema_location))
-                schema_tree.append(xs_import)
+        # Import all found namespace/schema location pairs, and then the
+        # schemas without a namespace
+        for namespace, location in self._schema_imports(tree):
+            xsd_exists = True
+            xs_import = etree.Element(XS + "import")
+            if namespace is not None:
+                xs_import.attrib["namespace"] = namespace
+            xs_import.attrib["schemaLocation"] = location
+            schema_tree.append(xs_import)
 
         if xsd_exists:
             # Construct the schema
@@ -240,6 +441,21 @@ class XmllintExtractor(BaseExtractor[XmllintMeta]):
         :param schema: Schema file
         :returns: tuple including: returncode, stdout, strderr
         """
+        command, environment = self._xmllint_command(dtd_check, schema)
+        shell = Shell(command, env=environment)
+
+        return (shell.returncode, shell.stdout, shell.stderr)
+
+    def _xmllint_command(
+        self, dtd_check: bool = False, schema: list | None = None
+    ) -> tuple[list, dict[str, str]]:
+        """
+        Return the xmllint command and its environment.
+
+        :param dtd_check: True, if check against DTD, false otherwise
+        :param schema: Schema file
+        :returns: Command and environment variables
+        """
         command = ["xmllint"]
         command += ["--valid"] if dtd_check else []
         command += ["--huge"]
@@ -258,9 +474,7 @@ class XmllintExtractor(BaseExtractor[XmllintMeta]):
                 "SGML_CATALOG_FILES": "/etc/xml/catalog"
             }
 
-        shell = Shell(command, env=environment)
-
-        return (shell.returncode, shell.stdout, shell.stderr)
+        return (command, environment)
 
     def errors(self) -> list[str]:
         """
@@ -288,7 +502,8 @@ class XmllintExtractor(BaseExtractor[XmllintMeta]):
 
         return super().errors()
 
-    def tools(self) -> dict[str, dict[str, str]]:
+    @classmethod
+    def tools(cls) -> dict[str, dict[str, str]]:
         """Return information about the software used by the extractor or
         detector.
 
@@ -302,3 +517,148 @@ class XmllintExtractor(BaseExtractor[XmllintMeta]):
         return {
             "lxml": {"version": f"{major}.{minor}.{patch}.{extra}"}
         }
+
+
+def _iter_schema_locations(
+    tree: etree._ElementTree
+) -> Iterator[tuple[str | None, str]]:
+    """
+    Iterate the schemas given in the schema location attributes.
+
+    :param tree: Parsed document
+    :returns: Pairs of namespace and schema location in the document
+        order. The namespace is None for noNamespaceSchemaLocation.
+    """
+    for element in tree.iter(etree.Element):
+        schema_location = element.get(XSI_SCHEMA_LOCATION)
+        if schema_location:
+            namespaces_locations = schema_location.strip().split()
+            yield from zip(*[iter(namespaces_locations)] * 2)
+        schema_location = element.get(XSI_NO_NS_SCHEMA_LOCATION)
+        if schema_location:
+            yield (None, schema_location)
+
+
+def _schema_parser(catalog_path: str | None) -> etree.XMLParser:
+    """
+    Return a parser for schemas, resolving them with the catalogs.
+
+    :param catalog_path: Path to XML catalog, or None for the default
+    :returns: Parser not accessing the network
+    """
+    parser = etree.XMLParser(no_network=True, huge_tree=True)
+    parser.resolvers.add(CatalogResolver(catalog_path))
+    return parser
+
+
+def _compile(schema_tree: etree._ElementTree) -> _CompiledSchema:
+    """
+    Compile an XSD schema, keeping the errors and warnings.
+
+    :param schema_tree: Parsed schema
+    :returns: Compiled schema, or None as the schema if compiling failed
+    """
+    try:
+        schema = etree.XMLSchema(schema_tree)
+    except etree.XMLSchemaParseError as exception:
+        return _CompiledSchema(
+            None,
+            (*_format_log(exception.error_log),
+             "WXS schema failed to compile"),
+            threading.Lock(),
+        )
+    return _CompiledSchema(
+        schema, tuple(_format_log(schema.error_log)), threading.Lock())
+
+
+def clear_schema_cache() -> None:
+    """Forget the schemas and catalogs loaded by the in-process validation.
+
+    The schemas are compiled again when needed. Schemas are compiled again
+    also if the schema file, a local schema imported by the document or a
+    catalog file has changed, but not if only a schema included or
+    imported by another schema has changed. A long-running process can
+    clear the cache after such a change.
+    """
+    _compile_schema_file.cache_clear()
+    _compile_imports.cache_clear()
+    clear_catalog_cache()
+
+
+@lru_cache(maxsize=SCHEMA_CACHE_SIZE)
+def _compile_schema_file(
+    catalog_path: str | None,
+    schema: str,
+    stamps: tuple[tuple[int, int] | None, ...],
+) -> _CompiledSchema:
+    """
+    Compile a given schema file once per process.
+
+    :param catalog_path: Path to XML catalog, or None for the default
+    :param schema: Absolute path to the schema
+    :param stamps: Modification times and sizes of the schema and catalog
+        files, only used as the key of the cache
+    :returns: Compiled schema
+    """
+    # pylint: disable=unused-argument
+    parser = _schema_parser(catalog_path)
+    try:
+        schema_tree = etree.parse(schema, parser)
+    except (OSError, etree.XMLSyntaxError):
+        return _CompiledSchema(
+            None,
+            (*_format_log(parser.error_log),
+             f"WXS schema {schema} failed to compile"),
+            threading.Lock(),
+        )
+    return _compile(schema_tree)
+
+
+@lru_cache(maxsize=SCHEMA_CACHE_SIZE)
+def _compile_imports(
+    catalog_path: str | None,
+    imports: tuple[tuple[str | None, str], ...],
+    stamps: tuple[tuple[int, int] | None, ...],
+) -> _CompiledSchema:
+    """
+    Compile a schema importing the given schemas once per process.
+
+    :param catalog_path: Path to XML catalog, or None for the default
+    :param imports: Pairs of namespace and schema location in the import
+        order. The namespace is None for a schema without a target
+        namespace.
+    :param stamps: Modification times and sizes of the local imported
+        schemas and the catalog files, only used as the key of the cache
+    :returns: Compiled schema
+    """
+    # pylint: disable=unused-argument
+    schema_tree = etree.XML(SCHEMA_TEMPLATE, _schema_parser(catalog_path))
+    for namespace, location in imports:
+        xs_import = etree.SubElement(schema_tree, XS + "import")
+        if namespace is not None:
+            xs_import.attrib["namespace"] = namespace
+        xs_import.attrib["schemaLocation"] = location
+    return _compile(schema_tree.getroottree())
+
+
+def _format_log(error_log) -> list[str]:
+    """
+    Format the errors of libxml2 as xmllint reports them.
+
+    :param error_log: Error log of lxml
+    :returns: Error lines
+    """
+    lines = []
+    for entry in error_log:
+        network_load = _NETWORK_LOAD.search(entry.message)
+        if entry.domain_name == "IO" and network_load:
+            lines.append("I/O error : Attempt to load network entity "
+                         f"{network_load.group(1)}")
+            continue
+        domain = _LOG_DOMAINS.get(entry.domain_name, entry.domain_name)
+        level = "warning" if entry.level_name == "WARNING" else "error"
+        location = ""
+        if entry.filename and not entry.filename.startswith("<"):
+            location = f"{entry.filename}:{entry.line}: "
+        lines.append(f"{location}{domain} {level} : {entry.message}")
+    return lines
@@ -0,0 +1,134 @@
+"""
+Tests for the artifacts shared by the extractors of a file.
+
+This module tests that:
+    - an artifact is created once, also when requested concurrently, and
+      it is dropped after the last extractor expecting it has finished.
+    - an exception raised when creating an artifact is raised to every
+      extractor requesting it.
+    - artifacts which no extractor expects are not stored.
+    - the XML extractors parse the file once when sharing an artifact
+      store, and give the same results as without the store.
+"""
+import threading
+from pathlib import Path
+
+import pytest
+from lxml import etree
+
+from file_scraper.artifacts import XML_TREE, ArtifactStore, parse_xml
+from file_scraper.lxml_extractor import lxml_extractor
+from file_scraper.lxml_extractor.lxml_extractor import LxmlExtractor
+from file_scraper.xmllint import xmllint_extractor
+from file_scraper.xmllint.xmllint_extractor import XmllintExtractor
+
+
+def test_artifact_lifetime():
+    """Test that an artifact is created once and dropped after the last
+    user has been released."""
+    store = ArtifactStore()
+    store.expect(["tree"])
+    store.expect(["tree", "other"])
+    calls = []
+
+    def _factory():
+        calls.append(None)
+        return object()
+
+    artifacts = []
+    threads = [
+        threading.Thread(
+            target=lambda: artifacts.append(store.get("tree", _factory)))
+        for _ in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(calls) == 1
+    assert all(artifact is artifacts[0] for artifact in artifacts)
+
+    store.release(["tree"])
+    assert "tree" in store
+    store.release(["tree", "other"])
+    assert "tree" not in store
+
+
+def test_artifact_exception():
+    """Test that the exception of the factory is raised to every user."""
+    store = ArtifactStore()
+    store.expect(["tree"])
+    calls = []
+
+    def _factory():
+        calls.append(None)
+        raise OSError("Invalid file")
+
+    for _ in range(2):
+        with pytest.raises(OSError, match="Invalid file"):
+            store.get("tree", _factory)
+    assert len(calls) == 1
+
+
+def test_unexpected_artifact():
+    """Test that an artifact no extractor expects is not stored."""
+    store = ArtifactStore()
+    assert store.get("tree", lambda: "value") == "value"
+    assert "tree" not in store
+
+
+@pytest.mark.parametrize(
+    "filename",
+    [
+        "tests/data/text_xml/valid_1.0_well_formed.xml",
+        "tests/data/text_xml/valid_1.0_addml.xml",
+        "tests/data/text_xml/invalid_1.0_addml.xml",
+        "tests/data/text_xml/invalid_1.0_no_closing_tag.xml",
+        "tests/data/text_xml/invalid__empty.xml",
+    ]
+)
+def test_shared_xml_tree(filename, monkeypatch):
+    """Test that the XML extractors parse the file once when sharing the
+    tree, and give the same results as when parsing it separately."""
+    def _extractors():
+        return [
+            LxmlExtractor(filename=Path(filename), mimetype="text/xml",
+                          charset="UTF-8"),
+            XmllintExtractor(filename=Path(filename), mimetype="text/xml"),
+        ]
+
+    separate = _extractors()
+    for extractor in separate:
+        extractor.extract()
+
+    parsed = []
+
+    def _parse_xml(path):
+        parsed.append(path)
+        return parse_xml(path)
+
+    monkeypatch.setattr(lxml_extractor, "parse_xml", _parse_xml)
+    monkeypatch.setattr(xmllint_extractor, "parse_xml", _parse_xml)
+
+    store = ArtifactStore()
+    shared = _extractors()
+    for extractor in shared:
+        extractor.use_artifacts(store)
+    for extractor in shared:
+        extractor.extract()
+
+    assert len(parsed) == 1
+    assert XML_TREE not in store
+    for extractor, expected in zip(shared, separate):
+        assert extractor.well_formed == expected.well_formed
+        assert extractor.errors() == expected.errors()
+        assert [stream.to_dict() for stream in extractor.streams] == \
+            [stream.to_dict() for stream in expected.streams]
+
+
+def test_parse_xml_errors(tmp_path):
+    """Test that parse_xml does not recover from errors."""
+    path = tmp_path / "invalid.xml"
+    path.write_bytes(b"<a><b></a>")
+    with pytest.raises(etree.XMLSyntaxError):
+        parse_xml(path)
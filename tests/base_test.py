@@ -8,9 +8,12 @@ This module tests:
     - That messages and errors are returned properly.
     - That extractor attributes and well_formed property are set and retrieved
       correctly
+    - That the asynchronous extraction runs the extractor and validates
+      the results
     - That _validate() method gives error messages properly
     - That initialization of detector works properly
 """
+import asyncio
 from pathlib import Path
 
 import pytest
@@ -54,7 +57,8 @@ class BaseExtractorBasic(BaseExtractor):
         self.streams.append(BaseMetaBasic())
         self._messages.append("Extraction ok")
 
-    def tools(self):
+    @classmethod
+    def tools(cls):
         pass
 
 
@@ -95,7 +99,8 @@ class BaseDetectorTest(BaseDetector):
         self.mimetype = "tEST/bASIC_mIMetYPE"
         self.version = "1.0"
 
-    def tools(self):
+    @classmethod
+    def tools(cls):
         pass
 
 
@@ -187,6 +192,23 @@ def test_not_well_formed():
     assert extractor.well_formed is False
 
 
+def test_aextract():
+    """Test that the asynchronous extraction runs the extractor and
+    validates the results, as the synchronous extraction does."""
+    extractor = BaseExtractorBasic(
+        filename=Path("testfilename"),
+        mimetype="test/mimetype",
+        version="0.1",
+    )
+
+    asyncio.run(extractor.aextract())
+    assert extractor.well_formed is True
+    assert extractor.messages() == [
+        "Extraction ok",
+        "The file was analyzed with BaseExtractorBasic."
+    ]
+
+
 class BaseMetaCustom(BaseMeta):
     """Metadata model that uses MIME type and version given to constructor."""
 
@@ -221,7 +243,8 @@ class BaseExtractorSupported(BaseExtractor):
 
     _supported_metadata = [BaseMetaCustom]
 
-    def tools(self):
+    @classmethod
+    def tools(cls):
         pass
 
 
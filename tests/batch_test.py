@@ -0,0 +1,76 @@
+"""
+Tests for batch scraping.
+
+This module tests that:
+    - scraping files in worker processes produces the same results as
+      scraping the files one by one.
+    - the worker processes are reused between batches.
+    - errors raised by Scraper are propagated to the caller.
+"""
+import pytest
+
+from file_scraper.batch import BatchScraper, scrape_many
+from file_scraper.exceptions import FileNotFoundIsNotScrapable
+from file_scraper.scraper import Scraper
+
+FILES = [
+    "tests/data/text_plain/valid__ascii.txt",
+    "tests/data/text_plain/valid__utf8_without_bom.txt",
+    "tests/data/text_plain/invalid__binary_data.txt",
+    "tests/data/image_png/valid_1.2.png",
+    "tests/data/text_csv/valid__ascii.csv",
+]
+
+
+@pytest.mark.parametrize("check_wellformed", [True, False])
+def test_scrape_many(check_wellformed):
+    """Test that batch scraping produces the same results as Scraper."""
+    results = {
+        result.path: result
+        for result in scrape_many(
+            FILES, workers=2, check_wellformed=check_wellformed
+        )
+    }
+
+    assert set(results) == set(FILES)
+    for path in FILES:
+        expected = Scraper(path).scrape(check_wellformed=check_wellformed)
+        assert results[path].mimetype == expected.mimetype
+        assert results[path].version == expected.version
+        assert results[path].well_formed == expected.well_formed
+        assert results[path].streams == expected.streams
+        assert results[path].grade == expected.grade
+
+
+def test_scrape_many_kwargs():
+    """Test that extra arguments are passed to the Scraper."""
+    results = list(scrape_many(
+        ["tests/data/text_plain/valid__utf8_without_bom.txt"],
+        workers=1,
+        mimetype="text/plain",
+        charset="UTF-8",
+    ))
+
+    assert len(results) == 1
+    assert results[0].mimetype == "text/plain"
+    assert results[0].streams[0]["charset"] == "UTF-8"
+
+
+def test_batch_scraper_reuses_workers():
+    """Test that the same process pool is used for consecutive batches."""
+    with BatchScraper(workers=2) as batch:
+        first = list(batch.scrape_many(FILES[:2]))
+        executor = batch.executor
+        second = list(batch.scrape_many(FILES[2:]))
+        assert batch.executor is executor
+
+    assert len(first) == 2
+    assert len(second) == len(FILES) - 2
+    # pylint: disable=protected-access
+    assert batch._executor is None
+
+
+def test_scrape_many_missing_file():
+    """Test that an error raised by Scraper is propagated."""
+    with pytest.raises(FileNotFoundIsNotScrapable):
+        list(scrape_many(["tests/data/foo/nonexistent.txt"], workers=1))
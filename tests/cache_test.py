@@ -0,0 +1,193 @@
+"""
+Tests for the persistent result cache.
+
+This module tests that:
+    - Scraper returns the cached results without running detectors or
+      extractors, when the same file is scraped again with the same
+      parameters, also in asynchronous scraping.
+    - The cache key depends on the file content, the parameters, the
+      content of the files given in the parameters and the
+      well-formedness check.
+    - The least recently used results are evicted when the cache is full.
+    - Results can be invalidated by tool and tool version.
+    - Results produced with a different tool version than the current one
+      are ignored, and errors in resolving the current versions are
+      raised.
+"""
+import asyncio
+import shutil
+
+import pytest
+
+import file_scraper.cache
+import file_scraper.scraper
+from file_scraper import tool_versions
+from file_scraper.cache import ResultCache
+from file_scraper.scraper import Scraper
+
+TEXT_FILE = "tests/data/text_plain/valid__ascii.txt"
+
+
+@pytest.fixture(scope="function")
+def cache(tmp_path):
+    """Return an empty result cache."""
+    return ResultCache(tmp_path / "cache")
+
+
+def _fail(*args, **kwargs):
+    """Fail the test if scraping is not skipped."""
+    raise AssertionError("The file should not be scraped")
+
+
+def test_cached_results(cache, monkeypatch):
+    """Test that the cached results are returned on the second run."""
+    expected = Scraper(TEXT_FILE).scrape(cache=cache)
+
+    monkeypatch.setattr(file_scraper.scraper, "iter_detectors", _fail)
+    monkeypatch.setattr(file_scraper.scraper, "iter_extractors", _fail)
+    scraper = Scraper(TEXT_FILE)
+    results = scraper.scrape(cache=cache)
+
+    assert results == expected
+    assert scraper.mimetype == expected.mimetype
+    assert scraper.version == expected.version
+    assert scraper.well_formed == expected.well_formed
+    assert scraper.info == expected.info
+    assert scraper.grade() == expected.grade
+
+
+def test_async_cached_results(cache, monkeypatch):
+    """Test that asynchronous scraping uses the same cache."""
+    expected = asyncio.run(Scraper(TEXT_FILE).ascrape(cache=cache))
+    assert Scraper(TEXT_FILE).scrape(cache=cache) == expected
+
+    monkeypatch.setattr(file_scraper.scraper, "iter_detectors", _fail)
+    monkeypatch.setattr(file_scraper.scraper, "iter_extractors", _fail)
+    results = asyncio.run(Scraper(TEXT_FILE).ascrape(cache=cache))
+    assert results == expected
+
+
+def test_cache_key(cache, tmp_path):
+    """Test that the cache key depends on content and parameters."""
+    copy = tmp_path / "copy.txt"
+    shutil.copy(TEXT_FILE, copy)
+
+    key = cache.key(TEXT_FILE, True, {})
+    assert cache.key(copy, True, {}) == key
+    assert cache.key(TEXT_FILE, False, {}) != key
+    assert cache.key(TEXT_FILE, True, {"charset": "UTF-8"}) != key
+
+    copy.write_text("changed")
+    assert cache.key(copy, True, {}) != key
+
+
+def test_cache_key_param_files(tmp_path):
+    """Test that the cache key depends on the content of the files given
+    in the parameters."""
+    schema = tmp_path / "schema.xsd"
+    schema.write_text("<schema/>")
+    params = {"schema": str(schema)}
+    key = ResultCache.key(TEXT_FILE, True, params)
+    assert ResultCache.key(TEXT_FILE, True, params) == key
+
+    schema.write_text("<schema></schema>")
+    assert ResultCache.key(TEXT_FILE, True, params) != key
+
+
+def test_cache_results_with_different_path(cache, tmp_path):
+    """Test that cached results report the path given to the Scraper."""
+    copy = tmp_path / "copy.txt"
+    shutil.copy(TEXT_FILE, copy)
+
+    Scraper(TEXT_FILE).scrape(cache=cache)
+    results = Scraper(copy).scrape(cache=cache)
+    assert results.path == str(copy)
+
+
+def test_eviction(tmp_path):
+    """Test that the least recently used results are evicted."""
+    cache = ResultCache(tmp_path / "cache", max_size=1)
+    results = Scraper(TEXT_FILE).scrape(cache=cache)
+    key = cache.key(TEXT_FILE, True, {})
+    assert cache.get(key) is None
+
+    cache.max_size = 10 * len(str(results))
+    cache.put(key, results)
+    assert cache.get(key) is not None
+
+
+def test_invalidate(cache):
+    """Test invalidating results by tool and version."""
+    results = Scraper(TEXT_FILE).scrape(cache=cache)
+    key = cache.key(TEXT_FILE, True, {})
+    tool, details = next(
+        (tool, details)
+        for item in results.info.values()
+        for tool, details in item["tools"].items()
+    )
+
+    assert cache.invalidate(tool, details["version"]) == 0
+    assert cache.get(key) is not None
+    assert cache.invalidate(tool, "0.0.0-foo") == 1
+    assert cache.get(key) is None
+
+    cache.put(key, results)
+    assert cache.invalidate() == 1
+    assert cache.get(key) is None
+
+
+@pytest.fixture(scope="function")
+def forget_tool_versions():
+    """Forget the tool versions resolved by the test."""
+    tool_versions.clear()
+    yield
+    tool_versions.clear()
+
+
+@pytest.mark.usefixtures("forget_tool_versions")
+def test_outdated_tool(cache):
+    """Test that results produced with another tool version are ignored,
+    also by a new cache instance."""
+    results = Scraper(TEXT_FILE).scrape(cache=cache)
+    key = cache.key(TEXT_FILE, True, {})
+    assert "libmagic" in {
+        tool for item in results.info.values() for tool in item["tools"]
+    }
+    assert ResultCache(cache.path).get(key) is not None
+
+    # Simulate an upgrade of libmagic
+    tool_versions.clear()
+    tool_versions.REGISTRY.get(("libmagic",), lambda: "0.0.0-foo")
+
+    assert ResultCache(cache.path).get(key) is None
+    assert cache.get(key) is None
+
+
+def test_unknown_tool(cache):
+    """Test that results produced with a tool that is not used any more
+    are ignored."""
+    results = Scraper(TEXT_FILE).scrape(cache=cache)
+    key = cache.key(TEXT_FILE, True, {})
+    item = next(item for item in results.info.values() if item["tools"])
+    item["tools"]["removed-tool"] = {"version": "1.0"}
+    cache.put(key, results)
+
+    assert ResultCache(cache.path).get(key) is None
+
+
+def test_tool_version_error(cache, monkeypatch):
+    """Test that an error in resolving the current tool versions is not
+    hidden as a cache miss."""
+    results = Scraper(TEXT_FILE).scrape(cache=cache)
+    key = cache.key(TEXT_FILE, True, {})
+    name = next(
+        item["class"] for item in results.info.values() if item["tools"])
+
+    def _fail(cls):
+        raise RuntimeError(f"{cls.__name__} failed")
+
+    # pylint: disable=protected-access
+    monkeypatch.setattr(file_scraper.cache._apparatus_classes()[name],
+                        "tools", classmethod(_fail))
+    with pytest.raises(RuntimeError):
+        cache.get(key)
@@ -253,6 +253,40 @@ def test_invalid_schematron_command():
     assert result_json["well-formed"] is False
 
 
+def test_batch_schematron_command(tmp_path):
+    """Test that several files and schematrons give one result per line
+    for each pair."""
+    schematron = tmp_path / "copy.sch"
+    schematron.write_bytes(
+        (DATA_PATH / "text_xml/supplementary/local.sch").read_bytes())
+    runner = get_cli_runner()
+    result = runner.invoke(
+            cli,
+            [
+                "check-xml-schematron-features",
+                "--schematron",
+                "tests/data/text_xml/supplementary/local.sch",
+                "--schematron",
+                str(schematron),
+                "tests/data/text_xml/valid_1.0_well_formed.xml",
+                "tests/data/text_xml/invalid_1.0_local_xsd.xml"
+            ]
+        )
+    assert result.exit_code == 0
+    results = [json.loads(line) for line in result.stdout.splitlines()]
+    assert [(item["path"], item["schematron"], item["well-formed"])
+            for item in results] == [
+        ("tests/data/text_xml/valid_1.0_well_formed.xml",
+         "tests/data/text_xml/supplementary/local.sch", True),
+        ("tests/data/text_xml/valid_1.0_well_formed.xml",
+         str(schematron), True),
+        ("tests/data/text_xml/invalid_1.0_local_xsd.xml",
+         "tests/data/text_xml/supplementary/local.sch", False),
+        ("tests/data/text_xml/invalid_1.0_local_xsd.xml",
+         str(schematron), False),
+    ]
+
+
 def test_sgml_catalog_files_env_var_gets_overridden():
     runner = get_cli_runner(
         env={"SGML_CATALOG_FILES": "/some/invalid/catalog"})
@@ -1,5 +1,6 @@
 """Common functions for tests."""
 
+import asyncio
 import os
 
 from file_scraper.defaults import UNAP, UNAV
@@ -179,3 +180,23 @@ def compare_results(scraper, results):
     assert scraper.grade() == results.grade
     assert scraper.info == results.info
     assert scraper.streams == results.streams
+
+
+def compare_async_extraction(create_extractor):
+    """
+    Check that asynchronous extraction gives the same results as the
+    synchronous extraction.
+
+    :create_extractor: Function returning a new extractor instance
+    :returns: Tuple of the synchronously and the asynchronously run
+        extractors
+    """
+    extractor = create_extractor()
+    extractor.extract()
+    async_extractor = create_extractor()
+    asyncio.run(async_extractor.aextract())
+
+    assert async_extractor.well_formed == extractor.well_formed
+    assert [stream.to_dict() for stream in async_extractor.streams] == \
+        [stream.to_dict() for stream in extractor.streams]
+    return extractor, async_extractor
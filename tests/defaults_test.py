@@ -23,7 +23,8 @@ def test_constants_syntax(constant_dict, expected_type):
 
 def test_mimetype_dict(monkeypatch):
     """
-    Test mapped mimetypes by mocking file_scraper.detectors.magic_analyze
+    Test mapped mimetypes by mocking the magic analysis of
+    file_scraper.detectors
     """
     TEST_MIMETYPE_DICT = {
         "application/csv": "text/csv",
@@ -37,9 +38,9 @@ def test_mimetype_dict(monkeypatch):
         "video/x-msvideo": "video/avi",
     }
     for key, value in TEST_MIMETYPE_DICT.items():
-        def mock_analyze(magic_lib, magic_type, path):
+        def mock_analyze(magic_lib, magic_type, probe):
             return key
-        monkeypatch.setattr('file_scraper.detectors.magic_analyze',
+        monkeypatch.setattr('file_scraper.detectors._magic_analyze_probe',
                             mock_analyze)
         detector = MagicDetector(
             Path("tests/data/text_plain/valid__utf8_without_bom.txt"))
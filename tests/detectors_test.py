@@ -12,13 +12,21 @@ This module tests that:
     - Separate detectors for SEG-Y, SIARD, ODF and EPUB files
       respectively, detect correctly
     - Each detectors tools functions return exact or somewhat valid versions
+    - Fido and magic give the same results using a shared file probe as
+      when reading the file themselves
+    - ZIP-based detectors share a single ZIP index
+    - The shared Fido engine matches the same formats as Fido, also from
+      a byte buffer and from multiple threads
 """
 import time
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import pytest
 from fido.fido import Fido
+from file_scraper import detectors
 from file_scraper.base import BaseDetector
-from file_scraper.detectors import (_FidoReader,
+from file_scraper.detectors import (_fido_engine,
                                     EpubDetector,
                                     FidoDetector,
                                     MagicCharset,
@@ -29,6 +37,8 @@ from file_scraper.detectors import (_FidoReader,
                                     AtlasTiDetector,
                                     ODFDetector)
 from file_scraper.defaults import UNKN, UNAP
+from file_scraper.magiclib import magic_analyze, magiclib
+from file_scraper.probe import FileProbe
 from tests.common import get_files, partial_message_included
 
 CHANGE_FIDO = {
@@ -126,25 +136,70 @@ CHANGE_MAGIC = {
 }
 
 
-def test_fido_format_caching():
-    """Tests that caching works as if no caching has been used."""
+def test_fido_engine_shared():
+    """Test that the Fido engine is created once and has loaded the same
+    formats as Fido."""
     fido_object = Fido(quiet=True, format_files=["formats-v95.xml",
                                                  "format_extensions.xml"])
-    start_time = time.time()
-    for _ in range(200):
-        reader = _FidoReader(Path('non_existing_file.xml'))
-        # If caching works, the time spent to initialize the _FidoReader should
-        # not take long so 30 seconds would be the absolute max.
-        elapsed_time = time.time() - start_time
-        assert elapsed_time < 30
-
-        # We're constraining to len for assert, because these three attributes
-        # contains large amount of lxml element-objects and thus would
-        # make comparison very slow.
-        assert len(reader.puid_format_map) == len(fido_object.puid_format_map)
-        assert len(reader.formats) == len(fido_object.formats)
-        assert len(reader.puid_has_priority_over_map) == len(
-            fido_object.puid_has_priority_over_map)
+    engine = _fido_engine()
+
+    assert _fido_engine() is engine
+    # We're constraining to len for assert, because these three attributes
+    # contains large amount of lxml element-objects and thus would
+    # make comparison very slow.
+    assert len(engine.puid_format_map) == len(fido_object.puid_format_map)
+    assert len(engine.formats) == len(fido_object.formats)
+    assert len(engine.puid_has_priority_over_map) == len(
+        fido_object.puid_has_priority_over_map)
+
+
+@pytest.mark.parametrize(
+    "path",
+    [
+        "tests/data/application_pdf/valid_1.4.pdf",
+        "tests/data/image_png/valid_1.2.png",
+        "tests/data/image_gif/valid_1989a.gif",
+        "tests/data/text_html/valid_5.html",
+        "tests/data/application_warc/valid_1.0_non_utf8.warc",
+    ]
+)
+def test_fido_engine_match_formats(path):
+    """Test that the compiled patterns of the Fido engine give the same
+    matches as Fido."""
+    fido_object = Fido(quiet=True, format_files=["formats-v95.xml",
+                                                 "format_extensions.xml"])
+    engine = _fido_engine()
+    size = Path(path).stat().st_size
+    with open(path, "rb") as stream:
+        bofbuffer, eofbuffer, _ = fido_object.get_buffers(
+            stream, size, seekable=True)
+
+    expected = fido_object.match_formats(bofbuffer, eofbuffer)
+    matches = engine.match_formats(bofbuffer, eofbuffer)
+    assert [(engine.get_puid(fmt), name) for (fmt, name) in matches] == \
+        [(fido_object.get_puid(fmt), name) for (fmt, name) in expected]
+
+
+def test_fido_engine_identify_buffer():
+    """Test identifying a file from a byte buffer."""
+    path = "tests/data/image_png/valid_1.2.png"
+    engine = _fido_engine()
+
+    result = engine.identify_buffer(Path(path).read_bytes())
+    assert result == engine.identify(path)
+    assert result[1] == "image/png"
+    assert engine.identify_buffer(b"") == (None, None, None)
+
+
+def test_fido_engine_threads():
+    """Test that concurrent identifications do not mix up the results."""
+    paths = ["tests/data/application_pdf/valid_1.4.pdf",
+             "tests/data/image_png/valid_1.2.png"] * 8
+    engine = _fido_engine()
+    expected = [engine.identify(path) for path in paths]
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        assert list(executor.map(engine.identify, paths)) == expected
 
 
 def test_fido_cache_halting_file(fido_cache_halting_file):
@@ -612,3 +667,85 @@ def test_non_utf8_warc():
     assert detector.mimetype == "application/warc"
     assert detector.version == "1.0"
     assert not detector.messages()
+
+
+@pytest.mark.parametrize(
+    "path",
+    [
+        "tests/data/text_plain/valid__ascii.txt",
+        "tests/data/application_pdf/valid_1.2.pdf",
+        "tests/data/application_warc/valid_1.0_non_utf8.warc",
+        "tests/data/image_png/valid_1.2.png",
+        "tests/data/video_mp4/valid__h264_aac.mp4",
+    ]
+)
+def test_fido_buffers_from_probe(path):
+    """Test that the Fido buffers taken from the probe are the same as
+    the buffers read by Fido."""
+    size = Path(path).stat().st_size
+    engine = _fido_engine()
+    with open(path, "rb") as stream:
+        expected = Fido.get_buffers(engine, stream, size, seekable=True)
+    # pylint: disable=protected-access
+    engine._filename, engine._probe = path, FileProbe(path)
+    try:
+        with open(path, "rb") as stream:
+            assert engine.get_buffers(stream, size, seekable=True) == expected
+    finally:
+        engine._filename, engine._probe = None, None
+
+
+@pytest.mark.parametrize(
+    "path",
+    [
+        "tests/data/text_plain/valid__ascii.txt",
+        "tests/data/text_plain/valid__utf16le_bom.txt",
+        "tests/data/image_png/valid_1.2.png",
+        "tests/data/application_pdf/valid_1.2.pdf",
+    ]
+)
+def test_magic_with_probe(path):
+    """Test that magic gives the same results for the probe as for the
+    file."""
+    # pylint: disable=protected-access
+    probe = FileProbe(path)
+    magic_lib = magiclib()
+    for magic_type in (magic_lib.MAGIC_MIME_TYPE,
+                       magic_lib.MAGIC_MIME_ENCODING,
+                       magic_lib.MAGIC_NONE):
+        assert detectors._magic_analyze_probe(
+            magic_lib, magic_type, probe
+        ) == magic_analyze(magic_lib, magic_type, path)
+
+
+@pytest.mark.parametrize(
+    ("path", "detector_class"),
+    [
+        ("tests/data/application_vnd.oasis.opendocument.text/valid_1.2.odt",
+         ODFDetector),
+        ("tests/data/application_x-siard/valid_2.1.1.siard", SiardDetector),
+    ]
+)
+def test_zip_detectors_share_index(monkeypatch, path, detector_class):
+    """Test that the ZIP archive is opened only once for all ZIP-based
+    detectors."""
+    opened = []
+    original_zipfile = zipfile.ZipFile
+
+    def _zipfile(*args, **kwargs):
+        opened.append(args)
+        return original_zipfile(*args, **kwargs)
+
+    monkeypatch.setattr(zipfile, "ZipFile", _zipfile)
+
+    with FileProbe(path) as probe:
+        detectors_ = [
+            detector(Path(path), probe) for detector in
+            (EpubDetector, AtlasTiDetector, SiardDetector, ODFDetector)
+        ]
+        for detector in detectors_:
+            detector.detect()
+
+    assert len(opened) == 1
+    matching = [detector for detector in detectors_ if detector.mimetype]
+    assert [type(detector) for detector in matching] == [detector_class]
@@ -25,15 +25,25 @@ This module tests that:
       parameter.
     - Non-existent files are not well-formed and the inability to read the
       file is logged as an error.
+    - Parsing the file in parallel chunks gives the same results as parsing
+      it in one pass, with the errors on the lines of the whole file, and
+      the records and fields are counted.
+    - Files in different formats can be scraped concurrently in threads.
+    - The format detected from a file can be used as the parameters for
+      other files.
 """
 
+import csv
 import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 import pytest
 
 from file_scraper.csv_extractor.csv_model import CsvMeta
-from file_scraper.csv_extractor.csv_extractor import CsvExtractor
+from file_scraper.csv_extractor.csv_extractor import (CsvExtractor,
+                                                      sniff_csv_format)
 from file_scraper.defaults import UNAP, UNAV
 from tests.common import parse_results, partial_message_included
 
@@ -390,6 +400,141 @@ def test_nonexistent_file():
     assert not extractor.well_formed
 
 
+@pytest.mark.parametrize(
+    ("filename", "charset"),
+    [
+        ("valid__ascii.csv", "UTF-8"),
+        ("valid__utf8_header.csv", "UTF-8"),
+        ("valid__iso8859-15.csv", "ISO-8859-15"),
+        ("valid__quotechar.csv", "UTF-8"),
+        ("invalid__missing_end_quote.csv", "UTF-8"),
+        ("invalid__empty.csv", "UTF-8"),
+        ("valid__utf8.csv", None),
+    ]
+)
+def test_parallel_parsing(monkeypatch, filename, charset):
+    """
+    Test that parsing the file in chunks in worker processes gives the
+    same results as parsing it in one pass.
+    """
+    monkeypatch.setattr(CsvExtractor, "_parallel_chunksize", 16)
+    path = Path(TEST_DATA_PATH) / filename
+
+    serial = CsvExtractor(path, mimetype=MIMETYPE, charset=charset)
+    serial.extract()
+    parallel = CsvExtractor(path, mimetype=MIMETYPE, charset=charset,
+                            params={"csv_workers": 2})
+    parallel.extract()
+
+    assert parallel.stream_consumer() is None
+    assert parallel.messages() == serial.messages()
+    assert parallel.errors() == serial.errors()
+    assert parallel.well_formed == serial.well_formed
+    serial_stream = serial.streams[0].to_dict()
+    parallel_stream = parallel.streams[0].to_dict()
+    for key in ["row_count", "field_count"]:
+        parallel_stream.pop(key, None)
+    assert parallel_stream == serial_stream
+
+
+@pytest.mark.parametrize(
+    ("content", "error", "row_count", "field_count"),
+    [
+        ('a,b\n1,"x\ny"\n\n2,"z"\n', None, "3", "2"),
+        ('a,b\n1,2,3\n4,5\n', None, "3", UNAV),
+        # The quote in an unquoted field misplaces the chunk boundaries
+        ('a,b"c\n1,2\n3,"4\n5"\n6,7\n', None, "4", "2"),
+        ('a,b\n1,2\n3,4\n5,"6\n7,8\n',
+         "CSV error on line 5: unexpected end of data", None, None),
+        ('a,b\n1,2\n3,"4"x\n5,6\n',
+         "CSV error on line 3: ',' expected after '\"'", None, None),
+    ]
+)
+def test_parallel_chunks(monkeypatch, tmp_path, content, error, row_count,
+                         field_count):
+    """
+    Test that the records and fields are counted and the errors are
+    reported on the lines of the whole file, when the file is parsed in
+    chunks.
+    """
+    monkeypatch.setattr(CsvExtractor, "_parallel_chunksize", 4)
+    path = tmp_path / "parallel.csv"
+    path.write_text(content, encoding="UTF-8")
+
+    extractor = CsvExtractor(
+        path, mimetype=MIMETYPE, charset="UTF-8",
+        params={"delimiter": ",", "separator": "\n", "csv_workers": 2})
+    extractor.extract()
+
+    if error is None:
+        assert extractor.well_formed is not False
+    else:
+        assert extractor.errors()[0] == error
+        assert not extractor.well_formed
+    stream = extractor.streams[0].to_dict()
+    assert stream.get("row_count") == row_count
+    assert stream.get("field_count") == field_count
+
+
+def test_concurrent_formats(tmp_path):
+    """
+    Test that CSV files in different formats can be scraped concurrently
+    in threads without mixing up their formats.
+    """
+    formats = {
+        ",": 'a,b,"c;d"\n1,2,3\n',
+        ";": "a;b;'c,d'\n1;2;3\n",
+    }
+    paths = {}
+    for delimiter, content in formats.items():
+        paths[delimiter] = tmp_path / f"format{len(paths)}.csv"
+        paths[delimiter].write_text(content, encoding="UTF-8")
+
+    def _scrape(delimiter):
+        quotechar = '"' if delimiter == "," else "'"
+        extractor = CsvExtractor(
+            paths[delimiter], mimetype=MIMETYPE, charset="UTF-8",
+            params={"delimiter": delimiter, "separator": "\n",
+                    "quotechar": quotechar})
+        extractor.extract()
+        return extractor.streams[0].to_dict()["first_line"]
+
+    dialects = csv.list_dialects()
+    delimiters = list(formats) * 500
+    switch_interval = sys.getswitchinterval()
+    # Switch between the threads often to interleave the extractors
+    sys.setswitchinterval(1e-6)
+    try:
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            first_lines = list(executor.map(_scrape, delimiters))
+    finally:
+        sys.setswitchinterval(switch_interval)
+
+    assert csv.list_dialects() == dialects
+    assert first_lines == [
+        ["a", "b", "c;d"] if delimiter == "," else ["a", "b", "c,d"]
+        for delimiter in delimiters
+    ]
+
+
+def test_sniff_csv_format():
+    """
+    Test that the format detected from a file gives the same results as
+    detecting it while scraping.
+    """
+    path = Path(TEST_DATA_PATH) / "valid__utf8.csv"
+    params = sniff_csv_format(path, charset="UTF-8")
+    assert params == {"delimiter": ",", "separator": "\r\n",
+                      "quotechar": '"'}
+
+    sniffed = CsvExtractor(path, mimetype=MIMETYPE, charset="UTF-8")
+    sniffed.extract()
+    given = CsvExtractor(path, mimetype=MIMETYPE, charset="UTF-8",
+                         params=params)
+    given.extract()
+    assert given.streams[0].to_dict() == sniffed.streams[0].to_dict()
+
+
 def test_is_supported():
     """
     Test is_supported method.
@@ -5,12 +5,19 @@ This module tests that:
     - MIME type and version of dng files is scraped correctly.
     - For valid files extractor messages contain "The file was analyzed".
     - For an empty file, extractor errors contain "File is empty".
+    - The ExifTool process is shared, and the metadata of a file is read
+      once for the detector and the extractor.
+    - The shared ExifTool process is restarted if it has died.
 
 """
+import os
+import shutil
+import signal
 from pathlib import Path
 
 import pytest
 
+from file_scraper.exiftool import exiftool_process
 from file_scraper.exiftool.exiftool_extractor import (ExifToolDngExtractor,
                                                       ExifToolExifExtractor)
 from tests.common import parse_results, partial_message_included
@@ -104,3 +111,50 @@ def test_tools():
                                    mimetype="image/x-adobe-dng")
     assert extractor.tools() is not None
     assert extractor.tools()["ExifTool"]["version"][0].isdigit()
+
+
+def test_shared_metadata(tmp_path):
+    """Test that the metadata of a file is read once by the shared ExifTool
+    process, and read again when the file changes."""
+    # pylint: disable=protected-access
+    path = tmp_path / "image.dng"
+    shutil.copy("tests/data/image_x-adobe-dng/valid_1.4.dng", path)
+    exiftool_process.close_exiftool()
+
+    metadata = exiftool_process.exiftool_metadata(path)
+    process = exiftool_process._EXIFTOOL._helper
+    extractor = ExifToolDngExtractor(filename=path,
+                                     mimetype="image/x-adobe-dng")
+    extractor.extract()
+    assert not extractor.errors()
+    assert exiftool_process.exiftool_metadata(path) is metadata
+    assert exiftool_process._EXIFTOOL._helper is process
+
+    with open(path, "ab") as outfile:
+        outfile.write(b"\0")
+    assert exiftool_process.exiftool_metadata(path) is not metadata
+
+    empty = tmp_path / "empty.dng"
+    empty.touch()
+    for _ in range(2):
+        extractor = ExifToolDngExtractor(filename=empty,
+                                         mimetype="image/x-adobe-dng")
+        extractor.extract()
+        assert partial_message_included("File is empty", extractor.errors())
+
+
+def test_exiftool_restart():
+    """Test that the shared ExifTool process is restarted after it has
+    died."""
+    # pylint: disable=protected-access
+    exiftool_process.close_exiftool()
+    exiftool_process.exiftool_metadata(
+        "tests/data/image_jpeg/valid_1.01.jpg")
+    process = exiftool_process._EXIFTOOL._helper
+    os.kill(process._process.pid, signal.SIGKILL)
+    process._process.wait()
+
+    metadata = exiftool_process.exiftool_metadata(
+        "tests/data/image_x-adobe-dng/valid_1.4.dng")
+    assert metadata["File:MIMEType"] == "image/x-adobe-dng"
+    assert exiftool_process._EXIFTOOL._helper is not process
@@ -56,6 +56,8 @@ This module tests that:
       None for well-formedness.
     - For unsupported formats, extractor doesn't return  True for
       well-formedness.
+    - Asynchronous extraction gives the same results as the synchronous
+      extraction.
 """
 from pathlib import Path
 
@@ -64,7 +66,7 @@ import pytest
 from file_scraper.defaults import UNAP, UNAV
 from file_scraper.ffmpeg.ffmpeg_extractor import (FFMpegExtractor,
                                                   FFMpegMetaExtractor)
-from tests.common import parse_results
+from tests.common import compare_async_extraction, parse_results
 from tests.extractors.stream_dicts import (
     MXF_CONTAINER,
     MXF_JPEG2000_VIDEO,
@@ -756,3 +758,26 @@ def test_tools():
     # validity or invalidity of the file doesn't matter for tools
     extractor = FFMpegExtractor(filename=Path(""), mimetype="")
     assert extractor.tools()["ffmpeg"]["version"] not in (UNAV, None)
+
+
+@pytest.mark.parametrize(
+    ["extractor_class", "filename", "mimetype"],
+    [
+        (FFMpegExtractor, "valid__h264_aac.mp4", "video/mp4"),
+        (FFMpegExtractor, "invalid__h264_aac_missing_data.mp4", "video/mp4"),
+        (FFMpegExtractor, "invalid__empty.mp4", "video/mp4"),
+        (FFMpegMetaExtractor, "valid__mpeg2_mp3.avi", "video/avi"),
+    ]
+)
+def test_async_extract(extractor_class, filename, mimetype):
+    """Test that asynchronous extraction gives the same results as the
+    synchronous extraction.
+
+    :extractor_class: Extractor class
+    :filename: Test file name
+    :mimetype: File MIME type
+    """
+    path = Path("tests/data", mimetype.replace("/", "_"), filename)
+    extractor, async_extractor = compare_async_extraction(
+        lambda: extractor_class(filename=path, mimetype=mimetype))
+    assert async_extractor.errors() == extractor.errors()
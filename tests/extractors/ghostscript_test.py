@@ -17,6 +17,8 @@ This module tests that:
       as not supported
     - Supported MIME type with made up version is reported as not supported
     - Made up MIME type with supported version is reported as not supported
+    - Asynchronous extraction gives the same results as the synchronous
+      extraction.
 """
 import os
 from pathlib import Path
@@ -25,7 +27,8 @@ import pytest
 from file_scraper.defaults import UNAV
 from file_scraper.ghostscript.ghostscript_extractor import GhostscriptExtractor
 
-from tests.common import parse_results, partial_message_included
+from tests.common import (compare_async_extraction, parse_results,
+                          partial_message_included)
 
 versions = ["1.7", "A-1a", "A-2b", "A-3b"]
 payload_altered_stdout = {
@@ -183,3 +186,21 @@ def test_tools():
     extractor = GhostscriptExtractor(filename=Path("None"), mimetype="None")
 
     assert extractor.tools()["Ghostscript"]["version"] not in (UNAV, None)
+
+
+@pytest.mark.parametrize(
+    "filename",
+    ["valid_1.7.pdf", "invalid_1.7_payload_altered.pdf"]
+)
+def test_async_extract(filename):
+    """Test that asynchronous extraction gives the same results as the
+    synchronous extraction.
+
+    :filename: Test file name
+    """
+    extractor, async_extractor = compare_async_extraction(
+        lambda: GhostscriptExtractor(
+            filename=Path("tests/data/application_pdf", filename),
+            mimetype="application/pdf"))
+    assert async_extractor.messages() == extractor.messages()
+    assert async_extractor.errors() == extractor.errors()
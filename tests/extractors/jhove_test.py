@@ -119,6 +119,8 @@ This module tests that:
           child element".
         - For EPUB 2 files created with LibreOffice's built-in export function,
           extractor errors contains "element "title" not allowed here".
+    - Asynchronous extraction gives the same results as the synchronous
+      extraction.
 """
 from pathlib import Path
 
@@ -139,7 +141,8 @@ from file_scraper.jhove.jhove_extractor import (
 from file_scraper.paths import resolve_command
 from file_scraper.shell import Shell
 
-from tests.common import parse_results, partial_message_included
+from tests.common import (compare_async_extraction, parse_results,
+                          partial_message_included)
 
 gif_test_cases = [
     (
@@ -922,3 +925,31 @@ def test_jhove_tools():
     """Test extractor tools return correctly something non nullable"""
     extractor = JHovePdfExtractor(filename=Path(""), mimetype="")
     assert extractor.tools()["JHOVE"]["version"][0].isdigit()
+
+
+@pytest.mark.parametrize(
+    ["extractor_class", "filename", "mimetype", "charset"],
+    [
+        (JHoveGifExtractor, "valid_1989a.gif", "image/gif", None),
+        (JHoveGifExtractor, "invalid_1989a_truncated.gif", "image/gif", None),
+        (JHovePdfExtractor, "valid_1.7.pdf", "application/pdf", None),
+        (JHoveWavExtractor, "valid__wav.wav", "audio/x-wav", None),
+        (JHoveHtmlExtractor, "valid_4.01.html", "text/html", "UTF-8"),
+    ]
+)
+def test_async_extract(extractor_class, filename, mimetype, charset):
+    """Test that asynchronous extraction gives the same results as the
+    synchronous extraction, including the checks of the extractors made
+    after running JHove.
+
+    :extractor_class: Extractor class
+    :filename: Test file name
+    :mimetype: File MIME type
+    :charset: File character encoding
+    """
+    path = Path("tests/data", mimetype.replace("/", "_"), filename)
+    extractor, async_extractor = compare_async_extraction(
+        lambda: extractor_class(
+            filename=path, mimetype=mimetype, charset=charset))
+    assert async_extractor.messages() == extractor.messages()
+    assert async_extractor.errors() == extractor.errors()
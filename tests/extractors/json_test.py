@@ -1,9 +1,14 @@
 """This module tests that JSON documents get extracted correctly."""
 
+import io
+import json
+
 import pytest
 
 from tests.common import parse_results
+from file_scraper.json import json_stream
 from file_scraper.json.json_extractor import JsonExtractor
+from file_scraper.json.json_stream import JsonStatistics, validate_json_stream
 from dpres_file_formats.defaults import UnknownValue
 
 
@@ -39,3 +44,113 @@ def test_json_extractor(filename):
     correct.streams[0]["stream_type"] = "text"
     correct.update_mimetype("application/json")
     correct.streams[0]["version"] = UnknownValue.UNAP
+
+
+@pytest.mark.parametrize(
+    "filename",
+    [
+        "invalid__empty.json",
+        "invalid__only_one_root_element.json",
+        "invalid__property_needs_doublequotes.json",
+        "invalid__single_quotes_are_not_allowed.json",
+        "invalid__utf16le_bom.json",
+        "valid__.json",
+        "valid__empty_object.json",
+        "valid__ugly.json",
+    ]
+)
+def test_streaming_validation(filename, monkeypatch):
+    """
+    Test that validating the document in chunks gives the same results
+    as parsing it with json.loads, and reports the statistics.
+
+    :filename: Test file name
+    """
+    path = f"tests/data/application_json/{filename}"
+    parsed = JsonExtractor(filename=path, mimetype="application/json")
+    parsed.extract()
+
+    monkeypatch.setattr(JsonExtractor, "_streaming_threshold", 0)
+    monkeypatch.setattr(json_stream, "JSON_CHUNK_SIZE", 3)
+    streamed = JsonExtractor(filename=path, mimetype="application/json")
+    streamed.extract()
+
+    assert streamed.messages() == parsed.messages()
+    assert streamed.errors() == parsed.errors()
+    metadata = streamed.streams[0].to_dict()
+    if "invalid_" in filename:
+        assert "top_level_type" not in metadata
+    else:
+        assert metadata["top_level_type"] == "object"
+        assert int(metadata["max_depth"]) >= 1
+    assert "top_level_type" not in parsed.streams[0].to_dict()
+
+
+@pytest.mark.parametrize(
+    "document",
+    [
+        "",
+        " \n ",
+        "\ufeff{}",
+        '{"a": [1, 2, {"b": null}], "c": "d\\u00e4"}',
+        '{"a": 1,\n "b": [1, 2,]}',
+        '{"a": 1,\n "b": 2,\n}',
+        '{"a" 1}',
+        "{'a': 1}",
+        "[1 2]",
+        "[1, 2] x",
+        '["abc\n"]',
+        '"unterminated',
+        '["\\u12"]',
+        "[-Infinity, NaN, 1.5e3, 01]",
+        "[[[[]]],\n\n  tru]",
+    ]
+)
+@pytest.mark.parametrize("chunk_size", [1, 4, 1024])
+def test_validate_json_stream(document, chunk_size, monkeypatch):
+    """
+    Test that the streaming validator reports the same errors as
+    json.loads, also when the error is after several chunks.
+
+    :document: JSON document
+    :chunk_size: Number of characters read at a time
+    """
+    monkeypatch.setattr(json_stream, "JSON_CHUNK_SIZE", chunk_size)
+    try:
+        json.loads(document)
+        expected_error = None
+    except json.JSONDecodeError as error:
+        expected_error = error
+
+    textfile = io.StringIO(document)
+    if expected_error is None:
+        validate_json_stream(textfile, prefix=textfile.read(2))
+        return
+    with pytest.raises(json.JSONDecodeError) as error:
+        validate_json_stream(textfile, prefix=textfile.read(2))
+    assert str(error.value) == str(expected_error)
+    assert (error.value.msg, error.value.pos, error.value.lineno,
+            error.value.colno) == (
+        expected_error.msg, expected_error.pos, expected_error.lineno,
+        expected_error.colno)
+
+
+@pytest.mark.parametrize(
+    ("document", "statistics"),
+    [
+        ("[]", JsonStatistics("array", 1)),
+        ('{"a": [[1], {"b": {}}]}', JsonStatistics("object", 4)),
+        (' "string" ', JsonStatistics("string", 0)),
+        ("-1.5", JsonStatistics("number", 0)),
+        ("false", JsonStatistics("boolean", 0)),
+        ("null", JsonStatistics("null", 0)),
+    ]
+)
+def test_json_statistics(document, statistics):
+    """
+    Test the statistics collected when validating a document.
+
+    :document: JSON document
+    :statistics: Expected statistics
+    """
+    assert validate_json_stream(io.StringIO(document)) == statistics
@@ -30,15 +30,37 @@ This module tests that:
 
     - Schematron removes extra copies of identical elements, but not if their
       attributes differ.
+
+    - The in-process validation gives the same results as xsltproc.
+    - Asynchronous extraction gives the same results as the synchronous
+      extraction.
+    - The compiled validator stylesheet is kept in memory by the digest of
+      the schematron file, and a validator compiled by another process is
+      read from the cache directory.
+    - No temporary directory is created when the compiled schematron is
+      found from the cache.
+    - scrape_many checks each file against each schematron, compiling each
+      schematron once.
+    - Concurrent compilations of a schematron with a cold cache compile it
+      once, and the cache location can be given as a parameter.
+    - The least recently used validator files and the stale temporary files
+      are evicted from the cache when it exceeds its maximum size.
 """
 
 import os
+import shutil
+import tempfile
+import threading
+import time
+from collections import OrderedDict
 from pathlib import Path
 import pytest
 
+from file_scraper.schematron import schematron_scraper
 from file_scraper.schematron.schematron_scraper import (SchematronScraper,
                                                         SchematronValidatorError)
-from tests.common import (parse_results, partial_message_included)
+from tests.common import (compare_async_extraction, parse_results,
+                          partial_message_included)
 
 ROOTPATH = os.path.abspath(os.path.join(
     os.path.dirname(__file__), "..", ".."))
@@ -170,6 +192,12 @@ def test_parameters():
     assert extractor._extra_hash == "abc"
     assert extractor._verbose
     assert not extractor._cache
+    assert extractor._cachepath == os.path.expanduser(
+        "~/.file-scraper/schematron-cache")
+
+    extractor = SchematronScraper(Path("testfile"), "text/xml",
+                                  params={"cache_dir": "~/cache"})
+    assert extractor._cachepath == os.path.expanduser("~/cache")
 
 
 def test_xslt_filename():
@@ -218,3 +246,230 @@ def test_tools():
     assert result["libxml2"]["version"][0].isdigit()
     assert result["libxslt"]["version"][0].isdigit()
     assert result["libexslt"]["version"][0].isdigit()
+
+
+@pytest.mark.parametrize(
+    ["filename", "verbose"],
+    [
+        ("valid_1.0_well_formed.xml", False),
+        ("valid_1.0_well_formed.xml", True),
+        ("invalid_1.0_local_xsd.xml", False),
+        ("invalid_1.0_local_xsd.xml", True),
+        ("invalid__empty.xml", False),
+    ]
+)
+def test_in_process(filename, verbose):
+    """Test that the in-process validation gives the same results as
+    xsltproc."""
+    results = []
+    for in_process in (False, True):
+        extractor = SchematronScraper(
+            filename=Path("tests/data/text_xml", filename),
+            mimetype="text/xml",
+            params={"schematron": "tests/data/text_xml/supplementary/"
+                                  "local.sch",
+                    "verbose": verbose,
+                    "xml_in_process": in_process}
+        )
+        extractor.extract()
+        results.append(extractor)
+
+    xsltproc, in_process = results
+    assert in_process.well_formed == xsltproc.well_formed
+    assert in_process.messages() == xsltproc.messages()
+    assert bool(in_process.errors()) == bool(xsltproc.errors())
+    if filename == "invalid__empty.xml":
+        assert partial_message_included("Document is empty",
+                                        in_process.errors())
+
+
+def test_validator_cache(tmp_path, monkeypatch):
+    """Test that the compiled validator is kept in memory by the digest of
+    the schematron file, and read from the cache directory by a new
+    process."""
+    # pylint: disable=protected-access
+    schematron = tmp_path / "test.sch"
+    shutil.copy("tests/data/text_xml/supplementary/local.sch", schematron)
+    compiled = []
+    compile_validator = SchematronScraper._compile_validator
+
+    def _compile_validator(self, xslt_filename):
+        compiled.append(os.path.isfile(xslt_filename))
+        return compile_validator(self, xslt_filename)
+
+    monkeypatch.setattr(SchematronScraper, "_compile_validator",
+                        _compile_validator)
+    monkeypatch.setattr(schematron_scraper, "_VALIDATORS", OrderedDict())
+
+    def _scrape():
+        extractor = SchematronScraper(
+            filename=Path("tests/data/text_xml/valid_1.0_well_formed.xml"),
+            mimetype="text/xml",
+            params={"schematron": str(schematron), "xml_in_process": True}
+        )
+        extractor._cachepath = str(tmp_path / "cache")
+        extractor.extract()
+        assert extractor.well_formed
+        return extractor._generate_xslt_filename()
+
+    xslt_filename = _scrape()
+    _scrape()
+    assert compiled == [False]
+    assert list(schematron_scraper._VALIDATORS) == [xslt_filename]
+    assert os.path.isfile(xslt_filename)
+
+    # A new process reads the validator from the cache directory
+    schematron_scraper._VALIDATORS.clear()
+    _scrape()
+    assert compiled == [False, True]
+
+    # A changed schematron file is compiled again
+    schematron.write_bytes(schematron.read_bytes() + b"\n")
+    assert _scrape() != xslt_filename
+    assert compiled == [False, True, False]
+    assert len(schematron_scraper._VALIDATORS) == 2
+
+
+def test_cached_xslt_no_tempdir(tmp_path, monkeypatch):
+    """Test that no temporary directory is created when the compiled
+    schematron is found from the cache."""
+    # pylint: disable=protected-access
+    extractor = SchematronScraper(
+        filename=Path("tests/data/text_xml/valid_1.0_well_formed.xml"),
+        mimetype="text/xml",
+        params={"schematron": "tests/data/text_xml/supplementary/local.sch"}
+    )
+    extractor._cachepath = str(tmp_path)
+    xslt_filename = extractor._generate_xslt_filename()
+    Path(xslt_filename).touch()
+
+    def _mkdtemp(*args, **kwargs):
+        raise AssertionError("Temporary directory created")
+
+    monkeypatch.setattr(tempfile, "mkdtemp", _mkdtemp)
+    assert extractor._compile_schematron() == xslt_filename
+
+
+@pytest.mark.parametrize("in_process", [False, True])
+def test_scrape_many(in_process, tmp_path, monkeypatch):
+    """Test that scrape_many checks each file against each schematron in
+    order, and compiles each schematron once."""
+    schematrons = ["tests/data/text_xml/supplementary/local.sch",
+                   str(tmp_path / "copy.sch")]
+    shutil.copy(schematrons[0], schematrons[1])
+    filenames = ["tests/data/text_xml/valid_1.0_well_formed.xml",
+                 "tests/data/text_xml/invalid_1.0_local_xsd.xml",
+                 "tests/data/text_xml/invalid__empty.xml"]
+    compiled = []
+    compile_ = SchematronScraper._compile
+
+    def _compile(self):
+        compiled.append(self.schematron)
+        return compile_(self)
+
+    monkeypatch.setattr(SchematronScraper, "_compile", _compile)
+
+    extractors = list(SchematronScraper.scrape_many(
+        filenames, schematrons,
+        params={"cache": False, "xml_in_process": in_process}))
+
+    assert compiled == schematrons
+    assert [(str(extractor.filename), extractor.schematron)
+            for extractor in extractors] == [
+        (filename, schematron)
+        for filename in filenames for schematron in schematrons]
+    assert [extractor.well_formed for extractor in extractors] == \
+        [True, True, False, False, False, False]
+
+
+def test_compile_once(tmp_path, monkeypatch):
+    """Test that concurrent compilations of a schematron with a cold cache
+    compile it once into the given cache directory."""
+    # pylint: disable=protected-access
+    phases = []
+    barrier = threading.Barrier(8)
+
+    def _compile_phase(self, stylesheet, inputfile, allowed_codes,
+                       outputfile=None, outputfilter=False):
+        phases.append(stylesheet)
+        time.sleep(0.01)
+        Path(outputfile).write_bytes(b"<xsl:stylesheet/>")
+
+    monkeypatch.setattr(SchematronScraper, "_compile_phase", _compile_phase)
+    cache_dir = tmp_path / "cache"
+
+    def _compile():
+        extractor = SchematronScraper(
+            Path("tests/data/text_xml/valid_1.0_well_formed.xml"),
+            "text/xml",
+            params={"schematron": "tests/data/text_xml/supplementary/"
+                                  "local.sch",
+                    "cache_dir": str(cache_dir)})
+        barrier.wait()
+        results.append(extractor._compile_schematron())
+
+    results = []
+    threads = [threading.Thread(target=_compile) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(phases) == 4
+    assert len(set(results)) == 1
+    assert Path(results[0]).parent == cache_dir
+    assert Path(results[0]).read_bytes() == b"<xsl:stylesheet/>"
+    assert sorted(path.name for path in cache_dir.iterdir()) == \
+        sorted(["locks", Path(results[0]).name])
+
+
+def test_cache_eviction(tmp_path):
+    """Test that the least recently used validator files and the stale
+    temporary files are evicted from the cache."""
+    # pylint: disable=protected-access
+    extractor = SchematronScraper(
+        Path("filename"), "text/xml",
+        params={"cache_dir": str(tmp_path)})
+    extractor._cache_max_size = 30
+    now = time.time()
+    for age, name in enumerate(["d", "c", "b", "a"]):
+        path = tmp_path / f"{name}.validator.xsl"
+        path.write_bytes(b"x" * 10)
+        os.utime(path, (now - age, now - age))
+    stale = tmp_path / f"{schematron_scraper.CACHE_TEMP_PREFIX}stale"
+    stale.mkdir()
+    os.utime(stale, (now - 7200, now - 7200))
+    (tmp_path / f"{schematron_scraper.CACHE_TEMP_PREFIX}active").mkdir()
+    # Temporary files of other programs in a shared directory
+    other = tmp_path / "tmpother"
+    other.mkdir()
+    os.utime(other, (now - 7200, now - 7200))
+
+    extractor._evict_cache(keep=str(tmp_path / "a.validator.xsl"))
+
+    assert sorted(path.name for path in tmp_path.iterdir()) == [
+        "a.validator.xsl", "c.validator.xsl", "d.validator.xsl",
+        f"{schematron_scraper.CACHE_TEMP_PREFIX}active", "locks", "tmpother"]
+
+
+@pytest.mark.parametrize(
+    ("filename", "in_process"),
+    [
+        ("valid_1.0_well_formed.xml", False),
+        ("invalid_1.0_local_xsd.xml", False),
+        ("invalid__empty.xml", False),
+        ("invalid_1.0_local_xsd.xml", True),
+    ]
+)
+def test_async_extract(filename, in_process):
+    """Test that asynchronous extraction gives the same results as the
+    synchronous extraction."""
+    extractor, async_extractor = compare_async_extraction(
+        lambda: SchematronScraper(
+            filename=Path("tests/data/text_xml", filename),
+            mimetype="text/xml",
+            params={"schematron": "tests/data/text_xml/supplementary/"
+                                  "local.sch",
+                    "xml_in_process": in_process}))
+    assert async_extractor.messages() == extractor.messages()
+    assert async_extractor.errors() == extractor.errors()
@@ -22,7 +22,7 @@ from pathlib import Path
 import pytest
 
 from file_scraper.defaults import UNAP, UNAV
-from file_scraper.shell import Shell
+from file_scraper.magiclib import magiclib_version
 from file_scraper.textfile.textfile_extractor import (TextfileExtractor,
                                                       TextEncodingExtractor,
                                                       TextEncodingMetaExtractor)
@@ -34,10 +34,9 @@ INVALID_MSG = "is not a text file"
 
 def _new_file_version(version):
     """
-    Check whether version of file command is given version or newer.
+    Check whether version of magic library is given version or newer.
     """
-    shell = Shell(["file", "--version"])
-    ver = float(shell.stdout.split("\n")[0][len("file-"):])
+    ver = float(magiclib_version())
     return True if ver >= version else False
 
 
@@ -71,8 +70,8 @@ def test_existing_files(filename, mimetype, is_textfile, special_handling,
     :is_textfile: Expected result whether a file is a text file or not
     :special_handling: True for UTF-32 encoded files, False for others
     """
-    # UTF32 support for "file" command has existed since version 5.36.
-    # With older version of "file" command, we can not handle UTF32 and
+    # UTF32 support for libmagic has existed since version 5.36.
+    # With older version of libmagic, we can not handle UTF32 and
     # therefore valid__utf32le_bom.txt needs special handling.
     special_handling = special_handling and not _new_file_version(5.36)
     correct = parse_results(filename, mimetype, {}, False)
@@ -104,6 +103,68 @@ def test_existing_files(filename, mimetype, is_textfile, special_handling,
         evaluate_extractor(extractor, correct)
 
 
+@pytest.mark.parametrize(
+    ["magic_result", "is_textfile"],
+    [
+        ("text/plain", True),
+        ("application/octet-stream\\012- text/plain", True),
+        ("application/octet-stream\n- text/plain", True),
+        ("application/octet-stream\\012- image/gif", False),
+    ]
+)
+def test_magic_matches(monkeypatch, magic_result, is_textfile):
+    """
+    Test that text/plain is found from multiple libmagic matches, and
+    that libmagic is called only once.
+    """
+    calls = []
+
+    def _magic_analyze(magic_lib, magic_type, path):
+        calls.append(path)
+        return magic_result
+
+    monkeypatch.setattr(
+        "file_scraper.textfile.textfile_extractor.magic_analyze",
+        _magic_analyze)
+    extractor = TextfileExtractor(
+        filename=Path("tests/data/text_plain/valid__ascii.txt"),
+        mimetype="text/plain",
+    )
+    extractor.extract()
+
+    assert len(calls) == 1
+    assert (extractor.well_formed is not False) == is_textfile
+
+
+@pytest.mark.parametrize(
+    ["error", "expected_error"],
+    [
+        ("cannot read `file' (Input/output error)",
+         "cannot read `file' (Input/output error)"),
+        (None, "Magic library could not be opened.")
+    ]
+)
+def test_magic_error(monkeypatch, error, expected_error):
+    """
+    Test that the libmagic error of the file is reported if the file can
+    not be analyzed.
+    """
+    monkeypatch.setattr(
+        "file_scraper.textfile.textfile_extractor.magic_analyze",
+        lambda magic_lib, magic_type, path: None)
+    monkeypatch.setattr(
+        "file_scraper.textfile.textfile_extractor.magic_error",
+        lambda magic_lib, magic_type: error)
+    extractor = TextfileExtractor(
+        filename=Path("tests/data/text_plain/valid__ascii.txt"),
+        mimetype="text/plain",
+    )
+    extractor.extract()
+
+    assert expected_error in extractor.errors()
+    assert extractor.well_formed is False
+
+
 @pytest.mark.parametrize(
     ["filename", "charset", "is_wellformed"],
     [
@@ -208,6 +269,42 @@ def test_decoding_limit(monkeypatch):
         "First 8 bytes read, we skip the remainder", extractor.messages())
 
 
+@pytest.mark.parametrize(
+    ("filename", "charset"),
+    [
+        ("valid__utf8_multibyte.txt", "UTF-8"),
+        ("valid__utf16le_multibyte.txt", "UTF-16"),
+        ("valid__iso8859.txt", "ISO-8859-15"),
+        ("valid__iso8859.txt", "UTF-8"),
+        ("invalid__control_character.txt", "UTF-8"),
+    ]
+)
+def test_parallel_decoding(monkeypatch, filename, charset):
+    """
+    Test that the whole file is validated in worker processes with the
+    same results as in a single process, with the positions of the errors
+    in the whole file.
+    """
+    monkeypatch.setattr(TextEncodingExtractor, "_chunksize", 8)
+    path = Path("tests/data/text_plain") / filename
+
+    monkeypatch.setattr(TextEncodingExtractor, "_limit", 0)
+    serial = TextEncodingExtractor(
+        filename=path, mimetype="text/plain", charset=charset)
+    serial.extract()
+
+    monkeypatch.setattr(TextEncodingExtractor, "_limit", 16)
+    parallel = TextEncodingExtractor(
+        filename=path, mimetype="text/plain", charset=charset,
+        params={"text_encoding_workers": 2})
+    parallel.extract()
+
+    assert parallel.stream_consumer() is None
+    assert parallel.messages() == serial.messages()
+    assert parallel.errors() == serial.errors()
+    assert parallel.well_formed == serial.well_formed
+
+
 def test_error_message_control_character():
     """
     Make sure that no actual illegal control characters are included
@@ -227,6 +324,29 @@ def test_error_message_control_character():
             "Illegal character %s in position 4" % character, extractor.errors())
 
 
+@pytest.mark.parametrize(
+    ("content", "charset", "character"),
+    [
+        (b"abc\x1fd\x00", "UTF-8", "'\\x00'"),
+        ("\u00e4\x08\x01".encode("UTF-16"), "UTF-16", "'\\x01'"),
+        (b"abc\x85\x1f", "ISO-8859-15", "'\\x1f'"),
+        (b"abc\x9f\x85", "ISO-8859-15", "'\\x85'"),
+    ]
+)
+def test_forbidden_character_order(tmp_path, content, charset, character):
+    """
+    Test that of several illegal characters in a file, the same one is
+    reported regardless of their order in the file.
+    """
+    path = tmp_path / "forbidden.txt"
+    path.write_bytes(content)
+    extractor = TextEncodingExtractor(
+        filename=path, mimetype="text/plain", charset=charset)
+    extractor.extract()
+    assert partial_message_included(
+        "Illegal character %s" % character, extractor.errors())
+
+
 def test_tools():
     """
     Test that tools return correct software
@@ -244,6 +364,6 @@ def test_tools():
         filename=Path(""),
         mimetype="",
     )
-    assert text_extractor.tools()["file"]["version"][0].isdigit()
+    assert text_extractor.tools()["libmagic"]["version"][0].isdigit()
     assert text_encoding_extractor.tools() == {}
     assert text_meta_extractor.tools() == {}
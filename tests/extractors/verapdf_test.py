@@ -16,6 +16,8 @@ This module tests that:
       version and streams are scraped correctly but they are reported as
       not well-formed.
     - Extractor can be run for files without PDF extension.
+    - Asynchronous extraction gives the same well-formedness and streams as
+      the synchronous extraction.
     - The extractor supports MIME type application/pdf with versions A-1b
       when well-formedness is checked, but does not support them when
       well-formedness is not checked. The extractor also does not support made
@@ -26,7 +28,8 @@ from pathlib import Path
 import pytest
 from file_scraper.verapdf.verapdf_extractor import VerapdfExtractor
 
-from tests.common import parse_results, partial_message_included
+from tests.common import (compare_async_extraction, parse_results,
+                          partial_message_included)
 
 MIMETYPE = "application/pdf"
 
@@ -177,3 +180,22 @@ def test_tools():
     """
     tool_extractor = VerapdfExtractor(filename=Path(""), mimetype="")
     assert tool_extractor.tools()["veraPDF"]["version"][0].isdigit()
+
+
+@pytest.mark.parametrize(
+    "filename",
+    ["valid_A-1a.pdf", "invalid_A-1a_payload_altered.pdf", "valid_1.7.pdf"]
+)
+def test_async_extract(filename):
+    """Test that asynchronous extraction gives the same well-formedness
+    and streams as the synchronous extraction.
+
+    The reports of veraPDF contain the processing time, so the messages
+    are not compared.
+
+    :filename: Test file name
+    """
+    compare_async_extraction(
+        lambda: VerapdfExtractor(
+            filename=Path("tests/data/application_pdf", filename),
+            mimetype="application/pdf"))
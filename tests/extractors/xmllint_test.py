@@ -28,6 +28,15 @@ This module tests that:
     - Schema and catalogs can be defined as parameters.
 
     - XMLlint is run with param that disables network usage.
+
+    - Validating in-process with lxml gives the same results as xmllint,
+      and the compiled schemas are cached.
+    - The first schema location of a namespace is used in-process, as by
+      xmllint.
+    - Changed schema and catalog files are loaded again.
+    - Schema locations are resolved with the given XML catalogs.
+    - Asynchronous extraction gives the same results as the synchronous
+      extraction.
 """
 
 import os
@@ -35,8 +44,11 @@ import subprocess
 from pathlib import Path
 import pytest
 
+from file_scraper.xmllint import xmllint_extractor
+from file_scraper.xmllint.xml_catalog import catalog_list
 from file_scraper.xmllint.xmllint_extractor import XmllintExtractor
-from tests.common import (parse_results, partial_message_included)
+from tests.common import (compare_async_extraction, parse_results,
+                          partial_message_included)
 
 ROOTPATH = os.path.abspath(os.path.join(
     os.path.dirname(__file__), "..", ".."))
@@ -237,6 +249,7 @@ def test_parameters():
     extractor = XmllintExtractor(Path("testsfile"), "test/mimetype")
     assert extractor._schema is None
     assert extractor._catalog_path is None
+    assert not extractor._in_process
 
     extractor = XmllintExtractor(
         filename=Path("testsfile"), mimetype="text/xml",
@@ -287,3 +300,236 @@ def test_no_network(monkeypatch):
         Path("tests/data/text_xml/valid_1.0_gpx_1.0.xml"), "text/xml")
     extractor.extract()
     assert extractor.well_formed
+
+
+SUPPLEMENTARY = "tests/data/text_xml/supplementary/"
+
+
+@pytest.mark.parametrize(
+    ["filename", "params", "well_formed", "error_part"],
+    [
+        ("valid_1.0_well_formed.xml", {}, True, None),
+        ("valid_1.0_dtd.xml", {}, True, None),
+        ("valid_1.0_addml.xml", {}, True, None),
+        ("valid_1.0_no_namespace_xsd.xml", {}, True, None),
+        ("valid_1.0_local_xsd.xml",
+         {"schema": SUPPLEMENTARY + "local.xsd"}, True, None),
+        ("valid_1.0_catalog.xml",
+         {"catalog_path": SUPPLEMENTARY + "catalog_with_catalogs.xml"},
+         True, None),
+        ("valid_1.0_no_namespace_catalog.xml",
+         {"catalog_path":
+          SUPPLEMENTARY + "catalog_to_local_no_namespace_xsd.xml"},
+         True, None),
+        ("invalid_1.0_dtd.xml", {}, False, "does not follow the DTD"),
+        ("invalid_1.0_addml.xml", {}, False, "Schemas validity error"),
+        ("invalid_1.0_local_xsd.xml",
+         {"schema": SUPPLEMENTARY + "local.xsd"}, False,
+         "Missing child element(s)"),
+        ("valid_1.0_local_xsd.xml",
+         {"schema": "tests/data/text_xml/invalid_local.xsd"}, False,
+         "parser error"),
+        ("invalid_1.0_catalog.xml",
+         {"catalog_path": SUPPLEMENTARY + "catalog_to_local_xsd.xml"},
+         False, "Missing child element(s)"),
+        ("valid_1.0_no_namespace_catalog.xml",
+         {"catalog_path": SUPPLEMENTARY + "catalog_with_catalogs.xml"},
+         False, "Schemas validity error"),
+        ("valid_1.0_catalog.xml", {}, False,
+         "Schema definition probably missing from XML catalog"),
+    ]
+)
+def test_in_process(filename, params, well_formed, error_part):
+    """
+    Test that validating in-process gives the same results as xmllint.
+
+    :filename: Test file name
+    :params: Extra parameters for Extractor
+    :well_formed: Expected well-formed status
+    :error_part: Part of the expected errors, if invalid
+    """
+    results = []
+    for in_process in (False, True):
+        extractor = XmllintExtractor(
+            filename=Path("tests/data/text_xml", filename),
+            mimetype="text/xml",
+            params={**params, "xml_in_process": in_process})
+        extractor.extract()
+        results.append(extractor)
+
+    for extractor in results:
+        assert extractor.well_formed == well_formed
+        if error_part:
+            assert partial_message_included(error_part, extractor.errors())
+    if well_formed:
+        assert [stream.to_dict() for stream in results[0].streams] == \
+            [stream.to_dict() for stream in results[1].streams]
+
+
+def test_schema_cache():
+    """Test that documents importing the same schemas compile them once,
+    and that the compiled schema is not affected by earlier documents."""
+    # pylint: disable=protected-access
+    xmllint_extractor._compile_imports.cache_clear()
+    for filename in ["valid_1.0_addml.xml", "invalid_1.0_addml.xml",
+                     "valid_1.0_addml.xml"]:
+        extractor = XmllintExtractor(
+            filename=Path("tests/data/text_xml", filename),
+            mimetype="text/xml",
+            params={"xml_in_process": True})
+        extractor.extract()
+        assert extractor.well_formed == filename.startswith("valid")
+
+    cache_info = xmllint_extractor._compile_imports.cache_info()
+    assert (cache_info.misses, cache_info.hits) == (1, 2)
+
+
+def test_catalog_resolution(tmp_path):
+    """Test the order in which the XML catalog entries are applied."""
+    (tmp_path / "next.xml").write_text(
+        '<catalog xmlns="urn:oasis:names:tc:entity:xmlns:xml:catalog">'
+        '<uri name="http://example.com/a.xsd" uri="next_a.xsd"/>'
+        '<uri name="http://example.com/b.xsd" uri="next_b.xsd"/>'
+        '<system systemId="http://example.com/a.dtd" uri="next_a.dtd"/>'
+        '</catalog>'
+    )
+    (tmp_path / "delegated.xml").write_text(
+        '<catalog xmlns="urn:oasis:names:tc:entity:xmlns:xml:catalog">'
+        '<public publicId="-//Example//DTD  C//EN" uri="c.dtd"/>'
+        '</catalog>'
+    )
+    (tmp_path / "catalog.xml").write_text(
+        '<catalog xmlns="urn:oasis:names:tc:entity:xmlns:xml:catalog">'
+        '<rewriteURI uriStartString="http://example.com/" '
+        'rewritePrefix="short/"/>'
+        '<group xml:base="schemas/">'
+        '<rewriteURI uriStartString="http://example.com/a" '
+        'rewritePrefix="long/a"/>'
+        '</group>'
+        '<delegatePublic publicIdStartString="-//Example//" '
+        'catalog="delegated.xml"/>'
+        '<nextCatalog catalog="next.xml"/>'
+        '<nextCatalog catalog="catalog.xml"/>'
+        '</catalog>'
+    )
+    catalog = catalog_list(str(tmp_path / "catalog.xml"))[0]
+    base = tmp_path.as_uri()
+
+    # The longest rewrite prefix wins over the next catalogs
+    assert catalog.resolve_uri("http://example.com/a.xsd") == \
+        f"{base}/schemas/long/a.xsd"
+    assert catalog.resolve_uri("http://example.com/b.xsd") == \
+        f"{base}/short/b.xsd"
+    # System identifiers are resolved from the next catalogs
+    assert catalog.resolve(None, "http://example.com/a.dtd") == \
+        f"{base}/next_a.dtd"
+    assert catalog.resolve("-//Example//DTD C//EN", None) == \
+        f"{base}/c.dtd"
+    # The catalog refers to itself, but is searched only once
+    assert catalog.resolve(None, "http://example.com/unknown.dtd") is None
+
+
+def _write_schema(path, element_type):
+    """Write a schema of a single element of the given type."""
+    path.write_text(
+        '<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema" '
+        'targetNamespace="http://example.com/ns" '
+        'elementFormDefault="qualified">'
+        f'<xs:element name="value" type="xs:{element_type}"/>'
+        '</xs:schema>'
+    )
+
+
+@pytest.mark.parametrize(
+    ["locations", "well_formed"],
+    [
+        ("int.xsd string.xsd", False),
+        ("string.xsd int.xsd", True),
+    ]
+)
+def test_in_process_import_order(tmp_path, locations, well_formed):
+    """
+    Test that the first schema location of a namespace is used both by
+    xmllint and in-process.
+
+    :locations: Schema locations of the namespace in the document order
+    :well_formed: Expected well-formed status
+    """
+    _write_schema(tmp_path / "int.xsd", "int")
+    _write_schema(tmp_path / "string.xsd", "string")
+    schema_location = " ".join(
+        f"http://example.com/ns {location}" for location in locations.split())
+    (tmp_path / "test.xml").write_text(
+        '<?xml version="1.0"?>'
+        '<value xmlns="http://example.com/ns" '
+        f'xmlns:xsi="{xmllint_extractor.XSI}" '
+        f'xsi:schemaLocation="{schema_location}">abc</value>'
+    )
+
+    for in_process in (False, True):
+        extractor = XmllintExtractor(
+            filename=tmp_path / "test.xml",
+            mimetype="text/xml",
+            params={"xml_in_process": in_process})
+        extractor.extract()
+        assert extractor.well_formed == well_formed
+
+
+def test_changed_schema(tmp_path):
+    """Test that a changed schema file is compiled again in-process."""
+    (tmp_path / "test.xml").write_text(
+        '<?xml version="1.0"?>'
+        '<value xmlns="http://example.com/ns">abc</value>'
+    )
+    schema = tmp_path / "schema.xsd"
+    for element_type, well_formed in [("int", False), ("string", True)]:
+        _write_schema(schema, element_type)
+        extractor = XmllintExtractor(
+            filename=tmp_path / "test.xml",
+            mimetype="text/xml",
+            params={"xml_in_process": True, "schema": str(schema)})
+        extractor.extract()
+        assert extractor.well_formed == well_formed
+
+
+def test_changed_catalog(tmp_path):
+    """Test that a changed catalog file is loaded again."""
+    catalog_path = tmp_path / "catalog.xml"
+    for target in ["a.xsd", "other_b.xsd"]:
+        catalog_path.write_text(
+            '<catalog xmlns="urn:oasis:names:tc:entity:xmlns:xml:catalog">'
+            f'<uri name="http://example.com/a.xsd" uri="{target}"/>'
+            '</catalog>'
+        )
+        catalog = catalog_list(str(catalog_path))[0]
+        assert catalog.resolve_uri("http://example.com/a.xsd") == \
+            f"{tmp_path.as_uri()}/{target}"
+
+
+@pytest.mark.parametrize(
+    ("filename", "params"),
+    [
+        ("valid_1.0_well_formed.xml", {}),
+        ("valid_1.0_dtd.xml", {}),
+        ("valid_1.0_local_xsd.xml", {"schema": SUPPLEMENTARY + "local.xsd"}),
+        ("valid_1.0_no_namespace_xsd.xml", {}),
+        ("invalid_1.0_dtd.xml", {}),
+        ("invalid_1.0_local_xsd.xml", {"schema": SUPPLEMENTARY + "local.xsd"}),
+        ("invalid_1.0_no_closing_tag.xml", {}),
+        ("valid_1.0_local_xsd.xml",
+         {"schema": SUPPLEMENTARY + "local.xsd", "xml_in_process": True}),
+    ]
+)
+def test_async_extract(filename, params):
+    """
+    Test that asynchronous extraction gives the same results as the
+    synchronous extraction.
+
+    :filename: Test file name
+    :params: Extra parameters for Extractor
+    """
+    extractor, async_extractor = compare_async_extraction(
+        lambda: XmllintExtractor(
+            filename=Path("tests/data/text_xml", filename),
+            mimetype="text/xml", params=params))
+    assert async_extractor.errors() == extractor.errors()
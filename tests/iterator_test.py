@@ -4,11 +4,18 @@ Test for file_scraper.extractor.
 This module tests that:
     - iter_extractors(mimetype, version) returns the correct extractors.
     - iter_detectors() returns the correct detectors.
+    - extractor_plan() returns the same extractors in the same order as
+      checking the support of each extractor separately.
+    - the extractor support is resolved only once per file format, except
+      for extractors whose support depends on the parameters.
 """
 
 import pytest
 
-from file_scraper.iterator import iter_extractors, iter_detectors
+from file_scraper import iterator
+from file_scraper.iterator import (extractor_plan, iter_extractors,
+                                   iter_detectors)
+from file_scraper.schematron.schematron_scraper import SchematronScraper
 
 
 WELLFORMED_EXTRACTORS = [
@@ -175,3 +182,55 @@ def test_iter_detectors():
         "SiardDetector",
         "ODFDetector",
     }
+
+
+@pytest.mark.parametrize("check_wellformed", [True, False])
+@pytest.mark.parametrize(
+    ["mimetype", "version"],
+    [
+        ("text/csv", None),
+        ("text/xml", "1.0"),
+        ("application/pdf", "A-1a"),
+        ("image/jpeg", None),
+        ("application/x-foo", None),
+        (None, None),
+    ]
+)
+def test_extractor_plan(mimetype, version, check_wellformed):
+    """Test that the dispatch index gives the same result as checking
+    each extractor separately."""
+    # pylint: disable=protected-access
+    expected = [
+        extractor for extractor in iterator._EXTRACTORS
+        if extractor.is_supported(mimetype, version, check_wellformed)
+    ]
+    assert extractor_plan(mimetype, version, check_wellformed) == expected
+
+
+def test_extractor_plan_cached(monkeypatch):
+    """Test that support is resolved once per file format, but extractors
+    depending on parameters are checked every time."""
+    # pylint: disable=protected-access
+    monkeypatch.setattr(iterator, "_EXTRACTORS",
+                        iterator._EXTRACTORS + [SchematronScraper])
+    iterator._dispatch_index.cache_clear()
+
+    calls = []
+    original = SchematronScraper.is_supported.__func__
+
+    def _is_supported(cls, *args, **kwargs):
+        calls.append(args)
+        return original(cls, *args, **kwargs)
+
+    monkeypatch.setattr(SchematronScraper, "is_supported",
+                        classmethod(_is_supported))
+
+    for _ in range(3):
+        assert SchematronScraper not in extractor_plan("text/xml", "1.0")
+    plan = extractor_plan("text/xml", "1.0",
+                          params={"schematron": "foo.sch"})
+    assert plan[-1] is SchematronScraper
+    assert iterator._dispatch_index.cache_info().misses == 1
+    assert len(calls) == 4
+
+    iterator._dispatch_index.cache_clear()
@@ -2,8 +2,15 @@
 Tests for magiclib module. This module tests that:
     - shell file command returns a mimetype
     - magic analysis function results a mimetype
+    - magic analysis of a buffer results a mimetype
+    - loaded magic cookies are reused by all threads, but not used by two
+      threads at the same time, and not used after a fork
+    - magic analysis gives the same results in concurrent threads
+    - the error of a failed magic analysis is returned
     - magic library is found.
 """
+from concurrent.futures import ThreadPoolExecutor
+
 import file_scraper.magiclib
 from file_scraper.shell import Shell
 
@@ -27,6 +34,79 @@ def test_analyze_magic():
     assert mimetype == "text/plain"
 
 
+def test_analyze_magic_buffer():
+    """Test that magic analysis of a buffer returns a mimetype"""
+    magic_lib = file_scraper.magiclib.magiclib()
+    with open("tests/data/image_png/valid_1.2.png", "rb") as infile:
+        buffer = infile.read()
+    mimetype = file_scraper.magiclib.magic_analyze_buffer(
+        magic_lib, magic_lib.MAGIC_MIME_TYPE, buffer)
+    assert mimetype == "image/png"
+
+
+def test_magic_cookies_reused():
+    """Test that the loaded cookies are reused by other threads, but not
+    used by two threads at the same time"""
+    # pylint: disable=protected-access
+    magic_lib = file_scraper.magiclib.magiclib()
+    pool = file_scraper.magiclib._COOKIES
+    file_scraper.magiclib.close_magic_cookies()
+
+    def _cookie():
+        with pool.checkout(magic_lib, magic_lib.MAGIC_MIME_TYPE) as cookie:
+            return cookie
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        with pool.checkout(magic_lib, magic_lib.MAGIC_MIME_TYPE) as cookie:
+            assert cookie is not None
+            other = executor.submit(_cookie).result()
+            assert other is not cookie
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        assert executor.submit(_cookie).result() in (cookie, other)
+    assert _cookie() in (cookie, other)
+
+
+def test_magic_cookies_after_fork():
+    """Test that a forked process does not use the cookies of the
+    parent"""
+    # pylint: disable=protected-access
+    magic_lib = file_scraper.magiclib.magiclib()
+    pool = file_scraper.magiclib._COOKIES
+    with pool.checkout(magic_lib, magic_lib.MAGIC_MIME_TYPE) as cookie:
+        pool._reset_after_fork()
+    with pool.checkout(magic_lib, magic_lib.MAGIC_MIME_TYPE) as new_cookie:
+        assert new_cookie is not cookie
+
+
+def test_analyze_magic_concurrent():
+    """Test that concurrent threads get correct results"""
+    magic_lib = file_scraper.magiclib.magiclib()
+    paths = [
+        "tests/data/text_plain/valid__utf8_without_bom.txt",
+        "tests/data/image_png/valid_1.2.png",
+    ] * 20
+
+    def _analyze(path):
+        return file_scraper.magiclib.magic_analyze(
+            magic_lib, magic_lib.MAGIC_MIME_TYPE, path)
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        results = list(executor.map(_analyze, paths))
+
+    assert results == ["text/plain", "image/png"] * 20
+
+
+def test_magic_error():
+    """Test that the error of a failed analysis is returned"""
+    magic_lib = file_scraper.magiclib.magiclib()
+    magic_type = magic_lib.MAGIC_MIME_TYPE | magic_lib.MAGIC_ERROR
+    assert file_scraper.magiclib.magic_analyze(
+        magic_lib, magic_type, "tests/data/nonexistent") is None
+    assert "No such file or directory" in file_scraper.magiclib.magic_error(
+        magic_lib, magic_type)
+
+
 def test_magiclib():
     """Test that magic library is found"""
     magic_lib = file_scraper.magiclib.magiclib()
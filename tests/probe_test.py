@@ -0,0 +1,108 @@
+"""
+Tests for the file probe.
+
+This module tests that:
+    - the head, tail and size of the file are read correctly for files
+      smaller and larger than the probe, also when the head and the tail
+      overlap.
+    - the file is not read before the probe is used.
+    - the first line of the file is returned if it is contained in the
+      head.
+    - the central directory of a ZIP archive is indexed once, and files
+      which are not ZIP archives are not indexed.
+    - the ZIP archive is opened again if the probe is used after closing.
+"""
+import zipfile
+
+import pytest
+
+from file_scraper.probe import FileProbe
+
+
+@pytest.mark.parametrize(
+    ("size", "head_size", "tail_size"),
+    [
+        (0, 10, 10),
+        (5, 10, 10),
+        (15, 10, 10),
+        (25, 10, 10),
+        (100, 10, 20),
+        (100, 200, 20),
+    ]
+)
+def test_head_and_tail(tmp_path, size, head_size, tail_size):
+    """Test that the head and the tail of the file are read."""
+    content = bytes(range(size))
+    path = tmp_path / "file"
+    path.write_bytes(content)
+
+    probe = FileProbe(path, head_size=head_size, tail_size=tail_size)
+
+    assert probe.size == size
+    assert probe.head == content[:head_size]
+    assert probe.tail == content[-tail_size:]
+    assert probe.complete == (size <= head_size)
+
+
+def test_lazy_read(tmp_path):
+    """Test that the file is read only when the probe is used."""
+    probe = FileProbe(tmp_path / "nonexistent")
+    with pytest.raises(FileNotFoundError):
+        assert probe.head
+
+
+@pytest.mark.parametrize(
+    ("content", "first_line"),
+    [
+        (b"WARC/1.1\r\nWARC-Type: warcinfo\r\n", b"WARC/1.1\r\n"),
+        (b"WARC/1.0", b"WARC/1.0"),
+        (b"", b""),
+        (b"a" * 20, None),
+    ]
+)
+def test_first_line(tmp_path, content, first_line):
+    """Test reading the first line of the file."""
+    path = tmp_path / "file"
+    path.write_bytes(content)
+
+    assert FileProbe(path, head_size=10).first_line() == first_line
+
+
+def test_zip_index(tmp_path):
+    """Test indexing a ZIP archive."""
+    path = tmp_path / "file.zip"
+    with zipfile.ZipFile(path, "w") as zipf:
+        zipf.writestr("mimetype", "application/epub+zip")
+        zipf.writestr("content/book.opf", "<package/>")
+
+    with FileProbe(path) as probe:
+        zip_index = probe.zip_index
+        assert probe.zip_index is zip_index
+        assert zip_index.names == ["mimetype", "content/book.opf"]
+        assert "mimetype" in zip_index
+        assert "foo" not in zip_index
+        assert zip_index.getinfo("mimetype").file_size == 20
+        assert zip_index.read("mimetype") == b"application/epub+zip"
+        with zip_index.open("content/book.opf") as member:
+            assert member.read() == b"<package/>"
+
+    assert probe.zip_index is not zip_index
+    assert probe.zip_index.read("mimetype") == b"application/epub+zip"
+    probe.close()
+
+
+@pytest.mark.parametrize(
+    "content",
+    [
+        b"",
+        b"not a zip archive",
+        # End of central directory signature, but not a valid archive
+        b"PK\x05\x06" + b"\x00" * 10,
+    ]
+)
+def test_no_zip_index(tmp_path, content):
+    """Test that files which are not ZIP archives are not indexed."""
+    path = tmp_path / "file.zip"
+    path.write_bytes(content)
+
+    assert FileProbe(path).zip_index is None
@@ -9,6 +9,8 @@ This module tests that:
     - checksum() method raises ValueError when illegal algorithm is given.
     - checksum() method raises IOError when checksum calculation is attempted
       for a file that does not exist.
+    - checksums() method and scrape() with checksums return the checksums
+      of multiple algorithms.
     - empty text files are not well-formed according to the scraper.
     - non-existent files are not well-formed according to the scraper.
     - giving None instead of a file name to the scraper results in successful
@@ -17,11 +19,16 @@ This module tests that:
       file type if provided.
     - Character encoding detection works and respects the predefined file type
       if provided.
+    - Running the extractors concurrently produces the same results as
+      running them sequentially.
+    - Asynchronous scraping and detection produce the same results as the
+      synchronous methods.
     - Grading works so that the correct digital preservation grade is returned.
     - Scraper works with undecodable filenames.
     - If a scraper has XML-incompatible characters in its messages or errors,
       they are filtered out correctly.
 """
+import asyncio
 import os
 from pathlib import Path
 
@@ -69,6 +76,23 @@ def test_checksum():
         assert scraper.checksum("foo")
 
 
+def test_checksums():
+    """Test that checksums of multiple algorithms are returned."""
+    scraper = Scraper("tests/data/text_plain/valid__utf8_without_bom.txt")
+    expected = {
+        "MD5": "b50b89c3fb5299713b7b272c1797a1e3",
+        "SHA-1": "92103972564bca86230dbfd311eec01f422cead7",
+    }
+    assert scraper.checksums(["MD5", "SHA-1"]) == expected
+    assert scraper.checksums()["SHA-256"] == \
+        scraper.checksum("SHA-256")
+
+    assert scraper.scrape().checksums is None
+    results = scraper.scrape(checksums=["MD5", "SHA-1"])
+    assert results.checksums == expected
+    assert results.mimetype == "text/plain"
+
+
 @pytest.mark.parametrize(
     (
         "filename",
@@ -151,13 +175,79 @@ def test_charset_parameter(charset):
 
     :charset: Given character encoding
     """
-    scraper = Scraper("tests/data/text_plain/valid__utf8_without_bom.txt",
+    scraper = Scraper("tests/data/text_plain/valid__utf8_multibyte.txt",
                       charset=charset)
     scraper.detect_filetype()
     # pylint: disable=protected-access
     assert scraper._kwargs["charset"] in [charset, "UTF-8"]
 
 
+@pytest.mark.parametrize(
+    "file_path",
+    [
+        "tests/data/application_pdf/valid_A-1a.pdf",
+        "tests/data/image_tiff/valid_6.0.tif",
+        "tests/data/text_csv/valid__ascii.csv",
+        "tests/data/video_x-matroska/valid_4_ffv1_flac.mkv",
+    ]
+)
+def test_concurrent_extractors(file_path):
+    """Test that concurrent scraping produces the same results as
+    sequential scraping.
+
+    The extractors should be reported in the same order, and the
+    merged streams should be identical.
+    """
+    sequential = Scraper(file_path).scrape()
+    concurrent = Scraper(file_path).scrape(workers=4)
+
+    assert concurrent.mimetype == sequential.mimetype
+    assert concurrent.version == sequential.version
+    assert concurrent.well_formed == sequential.well_formed
+    assert concurrent.streams == sequential.streams
+    assert [item["class"] for item in concurrent.info.values()] == \
+        [item["class"] for item in sequential.info.values()]
+    assert concurrent.errors == sequential.errors
+
+
+@pytest.mark.parametrize("workers", [1, 4])
+def test_async_scraping(workers):
+    """Test that multiple files can be scraped in the same event loop,
+    with the same results as in synchronous scraping."""
+    file_paths = [
+        "tests/data/text_plain/valid__ascii.txt",
+        "tests/data/text_plain/valid__utf8_multibyte.txt",
+        "tests/data/text_xml/valid_1.0_well_formed.xml",
+        "tests/data/image_png/valid_1.2.png",
+        "tests/data/application_pdf/valid_A-1a.pdf",
+    ]
+
+    async def _scrape_all():
+        scrapers = [Scraper(file_path) for file_path in file_paths]
+        detected = await asyncio.gather(
+            *(scraper.adetect_filetype() for scraper in scrapers)
+        )
+        results = await asyncio.gather(
+            *(scraper.ascrape(workers=workers) for scraper in scrapers)
+        )
+        return detected, results
+
+    detected, results = asyncio.run(_scrape_all())
+
+    for file_path, filetype, result in zip(file_paths, detected, results):
+        scraper = Scraper(file_path)
+        assert filetype == scraper.detect_filetype()
+        expected = scraper.scrape()
+        assert result.path == file_path
+        assert result.mimetype == expected.mimetype
+        assert result.version == expected.version
+        assert result.well_formed == expected.well_formed
+        assert result.streams == expected.streams
+        assert [item["class"] for item in result.info.values()] == \
+            [item["class"] for item in expected.info.values()]
+        assert result.errors == expected.errors
+
+
 @pytest.mark.parametrize(
     ("file_path", "expected_grade"),
     [
@@ -0,0 +1,146 @@
+"""
+Tests for the scraper server.
+
+This module tests that:
+    - the server returns the same results as the command line interface
+      for scrape and detect requests.
+    - multiple requests can be sent using the same connection.
+    - invalid parameters are reported with the name of the parameter.
+    - invalid requests are reported as errors without stopping the server.
+    - the command line interface can send requests to the server.
+    - a stale socket file is replaced, but a socket of a running server is
+      not.
+"""
+import json
+import socket
+import threading
+
+import pytest
+
+from file_scraper.cmdline import cli
+from file_scraper.server import (
+    RequestError,
+    ScraperClient,
+    ScraperServer,
+    detect_file_results,
+    scrape_file_results,
+)
+from tests.cmdline_test import get_cli_runner
+
+VALID_PDF = "tests/data/application_pdf/valid_1.2.pdf"
+VALID_TXT = "tests/data/text_plain/valid__ascii.txt"
+
+
+@pytest.fixture(name="server")
+def fixture_server(tmp_path):
+    """Run a scraper server in a background thread."""
+    with ScraperServer(tmp_path / "scraper.sock", workers=2) as server:
+        thread = threading.Thread(target=server.serve_forever)
+        thread.start()
+        yield server
+        server.shutdown()
+        thread.join()
+
+
+@pytest.mark.parametrize("check_wellformed", [True, False])
+def test_scrape(server, check_wellformed):
+    """Test that the server returns the same results as scraping locally."""
+    expected = json.loads(json.dumps(
+        scrape_file_results(VALID_PDF, check_wellformed=check_wellformed)
+    ))
+    with ScraperClient(server.socket_path) as client:
+        results = client.scrape(VALID_PDF, check_wellformed=check_wellformed)
+
+    assert results == expected
+    assert results["path"] == VALID_PDF
+
+
+def test_multiple_requests(server):
+    """Test sending multiple requests using the same connection."""
+    with ScraperClient(server.socket_path) as client:
+        detected = client.detect(VALID_TXT)
+        scraped = client.scrape(VALID_TXT, tool_info=True)
+
+    assert detected == detect_file_results(VALID_TXT)
+    assert scraped["MIME type"] == "text/plain"
+    assert "tool_info" in scraped
+
+
+@pytest.mark.parametrize(
+    ("path", "kwargs", "param"),
+    [
+        ("tests/data/foo/nonexistent.txt", {}, "FILENAME"),
+        (VALID_PDF, {"mimetype": "application/not_supported"}, "--mimetype"),
+        (VALID_PDF, {"mimetype": "application/pdf", "version": "9.99"},
+         "--version"),
+    ]
+)
+def test_scrape_error(server, path, kwargs, param):
+    """Test that invalid parameters are reported."""
+    with ScraperClient(server.socket_path) as client:
+        with pytest.raises(RequestError) as error:
+            client.scrape(path, **kwargs)
+
+    assert error.value.param == param
+
+
+def test_invalid_request(server):
+    """Test that an invalid request is answered with an error."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(server.socket_path)
+        stream = sock.makefile("rwb")
+        stream.write(b"not json\n")
+        stream.write(b'{"command": "foo", "path": "bar"}\n')
+        stream.flush()
+        responses = [json.loads(stream.readline()) for _ in range(2)]
+
+    assert [response["status"] for response in responses] == \
+        ["error", "error"]
+    assert "Unknown command: foo" in responses[1]["error"]
+
+
+@pytest.mark.parametrize(
+    ("args", "path"),
+    [
+        (["scrape-file"], VALID_PDF),
+        (["scrape-file", "--skip-wellformed-check"], VALID_PDF),
+        (["detect-file"], VALID_TXT),
+    ]
+)
+def test_cli_server_option(server, args, path):
+    """Test that the CLI prints the same results using the server."""
+    runner = get_cli_runner()
+    local = runner.invoke(cli, [*args, path])
+    remote = runner.invoke(
+        cli, [*args, "--server", server.socket_path, path]
+    )
+
+    assert remote.exit_code == 0
+    assert json.loads(remote.stdout) == json.loads(local.stdout)
+
+
+def test_cli_server_option_error(server):
+    """Test that the CLI reports errors of the server like local errors."""
+    runner = get_cli_runner()
+    result = runner.invoke(
+        cli, ["scrape-file", "--server", server.socket_path,
+              "--mimetype=application/not_supported", VALID_PDF]
+    )
+
+    assert result.exit_code == 2
+    assert "Given mimetype application/not_supported is not supported" \
+        in result.stderr
+
+
+def test_stale_socket(tmp_path):
+    """Test that a stale socket is replaced but an active one is not."""
+    socket_path = tmp_path / "scraper.sock"
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.bind(str(socket_path))
+
+    with ScraperServer(socket_path) as server:
+        with pytest.raises(OSError):
+            ScraperServer(socket_path)
+        assert server.socket_path == str(socket_path)
+
+    assert not socket_path.exists()
@@ -10,14 +10,18 @@ The module tests that:
       in that file.
     - If custom environment variables are supplied, they are used when running
       the command.
+    - AsyncShell runs commands using asyncio subprocesses and produces the
+      same results as Shell.
+    - Results of AsyncShell can not be read before the command is run.
 """
 
+import asyncio
 import os
 from tempfile import TemporaryFile
 
 import pytest
 
-from file_scraper.shell import Shell
+from file_scraper.shell import AsyncShell, Shell
 
 
 @pytest.mark.parametrize(
@@ -79,3 +83,50 @@ def test_shell_with_env():
     assert shell.returncode == 0
     assert shell.stdout == "testing\n"
     assert not shell.stderr
+
+
+@pytest.mark.parametrize(
+    ["command", "expected_returncode", "expected_stdout"],
+    [
+        (["echo", "testing"], 0, "testing\n"),
+        (["seq", "5"], 0, "1\n2\n3\n4\n5\n"),
+        (["ls", "nonexistentdir"], 2, ""),
+    ]
+)
+def test_async_shell(command, expected_returncode, expected_stdout):
+    """
+    Test running commands with asyncio subprocesses.
+
+    :command: Shell command
+    :expected_returncode: Expected return code
+    :expected_stdout: Expected stdout
+    """
+    shell = AsyncShell(command)
+    results = asyncio.run(shell.apopen())
+
+    assert results["returncode"] == expected_returncode
+    assert shell.returncode == expected_returncode
+    assert shell.stdout == expected_stdout
+    assert isinstance(shell.stdout_raw, bytes)
+    assert isinstance(shell.stderr, str)
+    assert (shell.stderr == "") == (expected_returncode == 0)
+
+
+def test_async_shell_concurrent():
+    """Test that multiple commands can be run concurrently."""
+    async def _run_all(shells):
+        return await asyncio.gather(*(shell.apopen() for shell in shells))
+
+    shells = [AsyncShell(["echo", str(number)]) for number in range(10)]
+    asyncio.run(_run_all(shells))
+
+    for number, shell in enumerate(shells):
+        assert shell.returncode == 0
+        assert shell.stdout == f"{number}\n"
+
+
+def test_async_shell_not_run():
+    """Test that the results can not be read before running the command."""
+    shell = AsyncShell(["echo", "testing"])
+    with pytest.raises(RuntimeError):
+        assert shell.returncode
@@ -0,0 +1,140 @@
+"""
+Tests for reading a file once for several consumers.
+
+This module tests that:
+    - every consumer gets the whole file, also when the file is read in
+      small chunks.
+    - a consumer which stops reading early does not block the other
+      consumers, and the file is not read further if all consumers are
+      done.
+    - exceptions raised by the consumers are returned from result(), and
+      errors reading the file are raised to the reading function.
+    - checksums calculated from the stream are the same as calculated
+      from the file.
+    - extractors give the same results when the file is streamed to them
+      as when they read the file by themselves.
+"""
+from pathlib import Path
+
+import pytest
+
+from file_scraper.csv_extractor.csv_extractor import CsvExtractor
+from file_scraper.json.json_extractor import JsonExtractor
+from file_scraper.streaming import (
+    ChecksumConsumer,
+    ThreadedConsumer,
+    consume_file,
+    stream_file,
+)
+from file_scraper.textfile.textfile_extractor import TextEncodingExtractor
+from file_scraper.utils import hexdigests
+
+PNG_FILE = "tests/data/image_png/valid_1.2.png"
+
+
+def test_stream_file():
+    """Test that every consumer gets the whole file."""
+    expected = Path(PNG_FILE).read_bytes()
+    consumers = [ThreadedConsumer(lambda infile: infile.read())
+                 for _ in range(3)]
+
+    stream_file(PNG_FILE, consumers, chunk_size=10)
+
+    assert [consumer.result() for consumer in consumers] == [expected] * 3
+
+
+def test_consumer_done_early():
+    """Test that a consumer reading only the beginning of the file does
+    not block the other consumers or the reading."""
+    expected = Path(PNG_FILE).read_bytes()
+    partial = ThreadedConsumer(lambda infile: infile.read(8))
+    full = ThreadedConsumer(lambda infile: infile.read())
+
+    stream_file(PNG_FILE, [partial, full], chunk_size=10)
+    assert partial.result() == expected[:8]
+    assert full.result() == expected
+
+    chunks = []
+
+    def _read_head(infile):
+        chunks.append(infile.read(8))
+
+    partial = ThreadedConsumer(_read_head, maxsize=1)
+    stream_file(PNG_FILE, [partial], chunk_size=10)
+    assert chunks == [expected[:8]]
+    assert partial.done
+
+
+def test_consumer_exception():
+    """Test that an exception raised by a consumer is raised by result()."""
+    def _fail(infile):
+        infile.read(1)
+        raise ValueError("Invalid file")
+
+    consumer = ThreadedConsumer(_fail)
+    with pytest.raises(RuntimeError):
+        consumer.result()
+
+    stream_file(PNG_FILE, [consumer], chunk_size=10)
+    with pytest.raises(ValueError, match="Invalid file"):
+        consumer.result()
+
+
+def test_read_error(tmp_path):
+    """Test that an error opening the file is raised to the consumer."""
+    consumer = ThreadedConsumer(lambda infile: infile.read())
+    with pytest.raises(FileNotFoundError):
+        consume_file(tmp_path / "nonexistent", consumer)
+
+    checksums = ChecksumConsumer(["MD5"])
+    stream_file(tmp_path / "nonexistent", [checksums])
+    with pytest.raises(FileNotFoundError):
+        checksums.hexdigests()
+
+
+def test_checksum_consumer():
+    """Test that the checksums of the stream are the checksums of the
+    file."""
+    consumer = ChecksumConsumer(["MD5", "SHA-256"])
+    stream_file(PNG_FILE, [consumer], chunk_size=100)
+
+    assert consumer.hexdigests() == hexdigests(PNG_FILE, ["MD5", "SHA-256"])
+
+
+@pytest.mark.parametrize(
+    ("extractor_class", "filename", "mimetype", "charset"),
+    [
+        (CsvExtractor, "tests/data/text_csv/valid__ascii.csv", "text/csv",
+         "UTF-8"),
+        (CsvExtractor, "tests/data/text_csv/invalid__missing_end_quote.csv",
+         "text/csv", "UTF-8"),
+        (JsonExtractor, "tests/data/application_json/valid__.json",
+         "application/json", None),
+        (JsonExtractor,
+         "tests/data/application_json/"
+         "invalid__property_needs_doublequotes.json",
+         "application/json", None),
+        (TextEncodingExtractor, "tests/data/text_plain/valid__utf8_bom.txt",
+         "text/plain", "UTF-8"),
+        (TextEncodingExtractor, "tests/data/text_plain/valid__iso8859.txt",
+         "text/plain", "UTF-8"),
+    ]
+)
+def test_streamed_extractors(extractor_class, filename, mimetype, charset):
+    """Test that the extractors give the same results from a shared stream
+    as when reading the file by themselves."""
+    def _extractor():
+        return extractor_class(filename=Path(filename), mimetype=mimetype,
+                               charset=charset)
+
+    direct = _extractor()
+    direct.extract()
+
+    streamed = [_extractor() for _ in range(2)]
+    stream_file(filename, [extractor.stream_consumer()
+                           for extractor in streamed], chunk_size=16)
+    for extractor in streamed:
+        extractor.extract()
+        assert extractor.info() == direct.info()
+        assert [stream.to_dict() for stream in extractor.streams] == \
+            [stream.to_dict() for stream in direct.streams]
@@ -0,0 +1,130 @@
+"""
+Tests for the tool version registry.
+
+This module tests that:
+    - the version of a tool is resolved only once.
+    - the versions are resolved separately for different arguments.
+    - the versions are resolved again when they have expired.
+    - exceptions raised by the resolver are not stored.
+    - the version of a tool is resolved only once by concurrent threads.
+    - the tools of the scrapers are resolved only once per process.
+"""
+import threading
+import time
+
+import pytest
+
+from file_scraper import tool_versions
+from file_scraper.shell import Shell
+from file_scraper.tool_versions import ToolVersionRegistry
+
+
+def test_resolve_once():
+    """Test that the resolver is called only once."""
+    registry = ToolVersionRegistry()
+    calls = []
+
+    def _resolver():
+        calls.append(1)
+        return "1.0"
+
+    assert registry.get("tool", _resolver) == "1.0"
+    assert registry.get("tool", _resolver) == "1.0"
+    assert len(calls) == 1
+
+    registry.clear("tool")
+    assert registry.get("tool", _resolver) == "1.0"
+    assert len(calls) == 2
+
+
+def test_decorator_arguments():
+    """Test that the decorated function is called once per arguments."""
+    calls = []
+
+    @tool_versions.tool_version("test-tool")
+    def _version(path):
+        calls.append(path)
+        return f"{path}-1.0"
+
+    try:
+        assert _version("a") == "a-1.0"
+        assert _version("b") == "b-1.0"
+        assert _version("a") == "a-1.0"
+        assert calls == ["a", "b"]
+    finally:
+        tool_versions.clear()
+
+
+def test_ttl():
+    """Test that the versions are resolved again after the ttl."""
+    registry = ToolVersionRegistry(ttl=0.1)
+    versions = iter(["1.0", "2.0"])
+
+    assert registry.get("tool", lambda: next(versions)) == "1.0"
+    assert registry.get("tool", lambda: next(versions)) == "1.0"
+    time.sleep(0.2)
+    assert registry.get("tool", lambda: next(versions)) == "2.0"
+
+
+def test_exception_not_stored():
+    """Test that the version is resolved again if the resolver fails."""
+    registry = ToolVersionRegistry()
+
+    def _fail():
+        raise ValueError("Tool not found")
+
+    with pytest.raises(ValueError):
+        registry.get("tool", _fail)
+    assert registry.get("tool", lambda: "1.0") == "1.0"
+
+
+def test_concurrent_resolve():
+    """Test that concurrent threads call the resolver only once."""
+    registry = ToolVersionRegistry()
+    calls = []
+
+    def _resolver():
+        calls.append(1)
+        time.sleep(0.1)
+        return "1.0"
+
+    results = []
+    threads = [
+        threading.Thread(
+            target=lambda: results.append(registry.get("tool", _resolver))
+        )
+        for _ in range(5)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == ["1.0"] * 5
+    assert len(calls) == 1
+
+
+def test_scraper_tools_resolved_once(monkeypatch):
+    """Test that extractor tools do not run a subprocess for every file."""
+    # pylint: disable=import-outside-toplevel
+    from file_scraper.ffmpeg.ffmpeg_extractor import FFMpegMetaExtractor
+
+    tool_versions.clear()
+    commands = []
+    original_init = Shell.__init__
+
+    def _init(self, command, *args, **kwargs):
+        commands.append(command)
+        original_init(self, command, *args, **kwargs)
+
+    monkeypatch.setattr(Shell, "__init__", _init)
+
+    extractor = FFMpegMetaExtractor(
+        filename="tests/data/video_mp4/invalid__empty.mp4",
+        mimetype="video/mp4"
+    )
+    first = extractor.tools()
+    second = extractor.tools()
+
+    assert first == second
+    assert len(commands) == 1
@@ -9,6 +9,9 @@ requirements:
         - MD5 algorithm can also be used.
         - An extra hash can be given to the function and this extra hash is
           appended to the file in calculation
+    - hexdigests
+        - Returns the same hashes as hexdigest for several algorithms,
+          also when the file is hashed in a background thread.
     - iso8601_duration
         - Seconds are rounded to two decimal places according to normal rules.
         - If decimal places are not needed, they are not printed, i.e. 1 s
@@ -41,6 +44,8 @@ requirements:
     - iter_utf_bytes_trivial
         - UTF iterator works as designed if there is only UTF control
           character (c3) in a file
+    - iter_utf_ranges
+        - The ranges are the positions of the chunks of the UTF iterator
 """
 
 import zipfile
@@ -51,9 +56,11 @@ import pytest
 from file_scraper.utils import (
     concat,
     hexdigest,
+    hexdigests,
     is_zipfile,
     iso8601_duration,
     iter_utf_bytes,
+    iter_utf_ranges,
     strip_zeros,
     parse_exif_version
 )
@@ -88,6 +95,38 @@ def test_hexdigest(filepath, extra_hash, algorithm, expected_hash):
                          extra_hash=extra_hash) == expected_hash
 
 
+@pytest.mark.parametrize(
+    ["chunk_size", "threaded"],
+    [
+        (1024 * 1024, True),
+        (100, True),
+        (100, False),
+    ]
+)
+def test_hexdigests(chunk_size, threaded):
+    """
+    Test that hexdigests returns the same hashes as hexdigest.
+
+    The small chunk size makes the file larger than a single chunk, so the
+    hashes are updated in a background thread if threaded is True.
+    """
+    filepath = "tests/data/image_png/valid_1.2.png"
+    assert hexdigests(
+        filepath, ["MD5", "SHA-1", "sha256"], chunk_size=chunk_size,
+        threaded=threaded
+    ) == {
+        "MD5": hexdigest(filepath, "MD5"),
+        "SHA-1": hexdigest(filepath, "SHA-1"),
+        "sha256": hexdigest(filepath, "sha256"),
+    }
+
+
+def test_hexdigests_invalid_algorithm():
+    """Test that an unsupported algorithm raises ValueError."""
+    with pytest.raises(ValueError):
+        hexdigests("tests/data/image_png/valid_1.2.png", ["MD5", "foo"])
+
+
 @pytest.mark.parametrize(
     ["seconds", "expected_output"],
     [
@@ -219,6 +258,38 @@ def test_iter_utf_bytes_trivial():
         assert original_bytes == chunks
 
 
+@pytest.mark.parametrize(
+    "filename, charset", [
+        ("valid__utf8_multibyte.txt", "UTF-8"),
+        ("valid__utf16le_multibyte.txt", "UTF-16"),
+        ("valid__utf16be_multibyte.txt", "UTF-16"),
+        ("invalid__utf8_just_c3.txt", "UTF-8"),
+        ("valid__iso8859.txt", "ISO-8859-15"),
+        ]
+)
+@pytest.mark.parametrize("prefix_size", [0, 3])
+def test_iter_utf_ranges(filename, charset, prefix_size):
+    """
+    Test that the ranges are the positions of the chunks given by the
+    utf iterator.
+
+    :filename: Test file name
+    :charset: Character encoding
+    :prefix_size: Number of bytes given as prefix to the iterator
+    """
+    with open("tests/data/text_plain/" + filename, "rb") as infile:
+        original_bytes = infile.read()
+        for chunksize in range(4, 40):
+            infile.seek(0)
+            prefix = infile.read(prefix_size)
+            chunks = list(iter_utf_bytes(infile, chunksize, charset,
+                                         prefix=prefix))
+            ranges = iter_utf_ranges(infile, chunksize, charset,
+                                     prefix_size=len(prefix))
+            assert [original_bytes[start:end]
+                    for start, end in ranges] == chunks
+
+
 def test_zipfile(monkeypatch):
     """
     Test that is_zipfile returns false for a ZIP file that is accepted by